@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Tick -> OHLC bar resampling, so indicators run on recorded ticks exactly as they run on
+the terminal's copy_rates_from_pos() bars.
+
+- resample(): one vectorized pass per timeframe (bucket = epoch second // bar seconds):
+  open / close from the first / last tick, high / low with maximum / minimum.reduceat,
+  tick count, lowest spread in points; rows in the copy_rates dtype (RATES_DTYPE)
+- Prices: bid (what the terminal builds its bars from), ask or mid
+- BarFeed: M1 / M5 / M15 / H1 (any TIMEFRAMES key) x bid / ask / mid, updated
+  incrementally with new tick blocks: the forming bar is merged with the block's first
+  bar, the rest are appended, only the last `keep` bars are held. Ticks older than the
+  newest one seen are dropped
+- BarFeed.copy_rates_from_pos(symbol, timeframe, start_pos, count) takes the terminal's
+  TIMEFRAME_* values and answers like the terminal (oldest first, start_pos 0 = the
+  forming bar), so get_ma / get_atr / market_prediction run unchanged on it;
+  sim_terminal answers copy_rates_from_pos from one
+- sma() / atr() / trend_signal(): market_prediction's MA50 / MA200 / ATR rule for every
+  bar of a rates array at once (bar i as the newest bar), for backtests
+
+Usage:
+  python bars.py XAUUSD_ticks.npy --timeframe M15 --price mid --out XAUUSD_M15.npy
+  python bars.py XAUUSD_ticks.csv --timeframe M15 --signal
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from equity_curve import tick_chunks
+
+TIMEFRAMES = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400}   # bar seconds
+MT5_TIMEFRAMES = {1: "M1", 5: "M5", 15: "M15", 30: "M30", 16385: "H1", 16388: "H4"}      # TIMEFRAME_* values
+PRICES = ("bid", "ask", "mid")
+KEEP = 5000             # bars held per timeframe and price (MA200 on H1 needs 200)
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+
+SIGNALS = ("ALTERNATE", "BUY", "SELL", "WAIT")   # trend_signal codes, market_prediction's answers
+ALTERNATE, BUY, SELL, WAIT = range(4)
+
+
+def timeframe_name(timeframe):
+    """'M15' or mt5.TIMEFRAME_M15 -> 'M15'."""
+    name = MT5_TIMEFRAMES.get(timeframe, timeframe)
+    if name not in TIMEFRAMES:
+        raise ValueError(f"unsupported timeframe {timeframe!r} ({' / '.join(TIMEFRAMES)})")
+    return name
+
+
+def _price(bid, ask, price):
+    if price == "bid":
+        return bid
+    if price == "ask":
+        return ask
+    if price == "mid":
+        return (bid + ask) * 0.5
+    raise ValueError(f"unknown price '{price}' ({' / '.join(PRICES)})")
+
+
+# ------------------- Resampling ------------------- #
+_FIELDS = ("time", "tick_volume", "spread", "open", "high", "low", "close")
+
+
+def _buckets(time_msc, seconds):
+    """Bar open times, and where each bar's ticks start and end."""
+    t = time_msc // 1000 // seconds * seconds
+    starts = np.flatnonzero(np.concatenate(([True], t[1:] != t[:-1]))) if len(t) else np.zeros(0, dtype=np.int64)
+    ends = np.append(starts[1:], len(t))
+    return t[starts], starts, ends
+
+
+def _ohlc(price, starts, ends):
+    if not len(starts):
+        return price[:0], price[:0], price[:0], price[:0]
+    return price[starts], np.maximum.reduceat(price, starts), np.minimum.reduceat(price, starts), price[ends - 1]
+
+
+def _spread(bid, ask, point):
+    return np.rint((ask - bid) / point).astype(np.int32) if point else np.zeros(len(bid), dtype=np.int32)
+
+
+def _lowest(spread, starts):
+    return np.minimum.reduceat(spread, starts) if len(starts) else spread[:0]
+
+
+def resample(time_msc, bid, ask, timeframe="M15", price="bid", point=None):
+    """Bars of one timeframe from time-ordered tick arrays; spread in points when point is given."""
+    time_msc = np.asarray(time_msc, dtype=np.int64)
+    bid, ask = np.asarray(bid, dtype=np.float64), np.asarray(ask, dtype=np.float64)
+    t, starts, ends = _buckets(time_msc, TIMEFRAMES[timeframe_name(timeframe)])
+    out = np.zeros(len(starts), dtype=RATES_DTYPE)
+    columns = (t, ends - starts, _lowest(_spread(bid, ask, point), starts)) + _ohlc(_price(bid, ask, price), starts, ends)
+    for name, col in zip(_FIELDS, columns):
+        out[name] = col
+    return out
+
+
+# ------------------- Incremental feed ------------------- #
+class _Series:
+    """The newest `keep` bars of one timeframe and price, in a buffer compacted when it fills."""
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.buf = np.zeros(2 * keep, dtype=RATES_DTYPE)
+        self.cols = [self.buf[name] for name in _FIELDS]
+        self.n = 0
+
+    @property
+    def bars(self):
+        return self.buf[:self.n]
+
+    def add(self, columns):
+        """Append bars given as _FIELDS columns; a first bar at the forming bar's time is merged into it."""
+        time, volume, spread, open_, high, low, close = columns
+        m = len(time)
+        if not m:
+            return
+        j = self.n - 1
+        if self.n and time[0] == self.cols[0][j]:
+            _, c_volume, c_spread, _, c_high, c_low, c_close = self.cols
+            c_volume[j] += volume[0]
+            c_spread[j] = min(c_spread[j], spread[0])
+            c_high[j] = max(c_high[j], high[0])
+            c_low[j] = min(c_low[j], low[0])
+            c_close[j] = close[0]
+            if m == 1:
+                return
+            columns = [col[1:] for col in columns]
+            m -= 1
+        if m >= self.keep:
+            for dst, col in zip(self.cols, columns):
+                dst[:self.keep] = col[-self.keep:]
+            self.n = self.keep
+            return
+        if self.n + m > len(self.buf):
+            kept = self.keep - m
+            self.buf[:kept] = self.buf[self.n - kept:self.n]
+            self.n = kept
+        for dst, col in zip(self.cols, columns):
+            dst[self.n:self.n + m] = col
+        self.n += m
+
+
+class BarFeed:
+    """Bars of several timeframes and prices kept current from tick blocks."""
+
+    def __init__(self, symbol=None, timeframes=("M1", "M5", "M15", "H1"), prices=PRICES, point=None, keep=KEEP):
+        self.symbol = symbol
+        self.timeframes = tuple(timeframe_name(tf) for tf in timeframes)
+        self.prices = tuple(prices)
+        self.point = point
+        self.series = {(tf, p): _Series(keep) for tf in self.timeframes for p in self.prices}
+        self.last_msc = None
+        self.ticks = 0
+
+    def update(self, time_msc, bid, ask):
+        """Add time-ordered tick arrays; ticks older than the newest one already seen are dropped."""
+        time_msc = np.asarray(time_msc, dtype=np.int64)
+        bid, ask = np.asarray(bid, dtype=np.float64), np.asarray(ask, dtype=np.float64)
+        if self.last_msc is not None and len(time_msc) and time_msc[0] < self.last_msc:
+            fresh = time_msc >= self.last_msc
+            time_msc, bid, ask = time_msc[fresh], bid[fresh], ask[fresh]
+        if not len(time_msc):
+            return self
+        self.last_msc = int(time_msc[-1])
+        self.ticks += len(time_msc)
+        spread = _spread(bid, ask, self.point)
+        values = {p: _price(bid, ask, p) for p in self.prices}
+        for tf in self.timeframes:
+            t, starts, ends = _buckets(time_msc, TIMEFRAMES[tf])
+            head = (t, ends - starts, _lowest(spread, starts))
+            for p in self.prices:
+                self.series[(tf, p)].add(head + _ohlc(values[p], starts, ends))
+        return self
+
+    def feed(self, ticks):
+        """Add ticks from a .npy / CSV path, a structured array or [(msc, bid, ask)]."""
+        for time_msc, bid, ask in tick_chunks(ticks):
+            self.update(time_msc, bid, ask)
+        return self
+
+    def rates(self, timeframe="M15", price="bid", count=None, start_pos=0):
+        """Copy of up to `count` bars ending `start_pos` bars before the forming one, oldest first."""
+        bars = self.series[(timeframe_name(timeframe), price)].bars
+        end = len(bars) - start_pos
+        if end <= 0:
+            return bars[:0].copy()
+        return bars[max(0, end - count) if count is not None else 0:end].copy()
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        """mt5.copy_rates_from_pos() on the bid bars (None when there are none, like the terminal)."""
+        if self.symbol is not None and symbol != self.symbol:
+            return None
+        bars = self.rates(timeframe, "bid", count, start_pos)
+        return bars if len(bars) else None
+
+
+# ------------------- Indicators ------------------- #
+def sma(values, period):
+    """Mean of the last `period` values at every index (NaN until there are that many): get_ma per bar."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def atr(rates, period=14):
+    """Mean true range of the last `period` bars at every index (NaN before bar `period`): get_atr per bar."""
+    high, low, close = rates["high"], rates["low"], rates["close"]
+    out = np.full(len(rates), np.nan)
+    if len(rates) < period + 1:
+        return out
+    prev = close[:-1]
+    tr = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - prev), np.abs(low[1:] - prev)))
+    out[1:] = sma(tr, period)
+    return out
+
+
+def trend_signal(rates, fast=50, slow=200, atr_period=14, threshold=5.0):
+    """
+    market_prediction() for every bar as the newest one: WAIT above the ATR threshold,
+    BUY / SELL on the fast / slow MA order, ALTERNATE when flat or short of data.
+    Bar i's close is only final when bar i + 1 opens: act on code[i] from there on.
+    """
+    close = rates["close"]
+    ma_fast, ma_slow, vol = sma(close, fast), sma(close, slow), atr(rates, atr_period)
+    code = np.full(len(rates), ALTERNATE, dtype=np.int8)
+    ready = ~(np.isnan(ma_fast) | np.isnan(ma_slow) | np.isnan(vol))
+    code[ready & (ma_fast > ma_slow)] = BUY
+    code[ready & (ma_fast < ma_slow)] = SELL
+    code[ready & (vol > threshold)] = WAIT
+    return code
+
+
+def _iso(seconds):
+    return datetime.fromtimestamp(int(seconds), timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resample recorded ticks into OHLC bars.")
+    parser.add_argument("ticks", help=".npy in the copy_ticks dtype, or an MT5 tick export / CSV")
+    parser.add_argument("--timeframe", default="M15", choices=list(TIMEFRAMES))
+    parser.add_argument("--price", default="bid", choices=PRICES)
+    parser.add_argument("--point", type=float, default=0.01, help="for the spread column (0: leave it 0)")
+    parser.add_argument("--out", help="write the bars as .npy (RATES_DTYPE)")
+    parser.add_argument("--signal", action="store_true", help="print market_prediction's answer per bar change")
+    parser.add_argument("--threshold", type=float, default=5.0, help="ATR above which the signal is WAIT")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    ticks, parts = 0, []
+    for time_msc, bid, ask in tick_chunks(args.ticks):
+        parts.append(resample(time_msc, bid, ask, args.timeframe, args.price, args.point))
+        ticks += len(time_msc)
+    # a bar cut by a block edge comes out in two pieces: fold them the way BarFeed does
+    series = _Series(sum(len(p) for p in parts) + 1)
+    for p in parts:
+        series.add([p[name] for name in _FIELDS])
+    rates = series.bars
+    print(f"📊 {ticks:,} ticks -> {len(rates):,} {args.timeframe} {args.price} bars "
+          f"in {time.perf_counter() - t0:.2f}s")
+    if len(rates):
+        print(f"   {_iso(rates['time'][0])} .. {_iso(rates['time'][-1])}, "
+              f"close {rates['close'][0]:.2f} -> {rates['close'][-1]:.2f}")
+    if args.out:
+        np.save(args.out, rates)
+        print(f"💾 {args.out}")
+    if args.signal and len(rates):
+        code = trend_signal(rates, threshold=args.threshold)
+        changes = np.flatnonzero(np.concatenate(([True], code[1:] != code[:-1])))
+        for i in changes.tolist():
+            print(f"   {_iso(rates['time'][i])}  {SIGNALS[code[i]]}")
+        counts = np.bincount(code, minlength=len(SIGNALS))
+        print("🧭 " + ", ".join(f"{SIGNALS[k]} {c / len(code):.0%}" for k, c in enumerate(counts.tolist())))
+
+
+if __name__ == "__main__":
+    main()
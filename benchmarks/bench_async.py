@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MT5 calls/s for several strategies, sequential vs the mt5_async facade.
+
+- Terminal: sim_terminal.SimTerminal behind a --latency-us round trip per call
+  (time.sleep, which releases the GIL the way the terminal IPC wait does)
+- Each of --strategies strategies loops --iterations times: symbol_info_tick,
+  positions_get, orders_get, then --work-us of its own CPU (decision logic)
+- sequential: one thread, strategies round robin, each call blocks (today's scripts)
+- async await: one coroutine per strategy on mt5_async.AsyncMT5, reads awaited one by one
+- async gather: the three reads issued together (pipelined) and awaited as a batch
+- Reports wall time, calls/s, speed-up over sequential, terminal calls actually made
+  (identical reads queued together are coalesced) and loop wakeups per call
+
+Usage:
+  python benchmarks/bench_async.py --strategies 4 --iterations 300 --latency-us 200 --work-us 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from mt5_async import AsyncMT5
+from sim_terminal import SimTerminal, scenario_ticks
+
+SYMBOL = "XAUUSD_"
+
+
+class RoundTrip:
+    """Terminal-like proxy that pays a fixed round trip before each call."""
+
+    def __init__(self, sim, latency_s):
+        self._sim = sim
+        self._latency = latency_s
+
+    def __getattr__(self, name):
+        attr = getattr(self._sim, name)
+        if not callable(attr) or isinstance(attr, type):
+            return attr
+        latency, sleep = self._latency, time.sleep
+
+        def call(*args, **kwargs):
+            sleep(latency)
+            return attr(*args, **kwargs)
+        return call
+
+
+def spin(us):
+    end = time.perf_counter_ns() + us * 1000
+    while time.perf_counter_ns() < end:
+        pass
+
+
+def terminal(args):
+    return RoundTrip(SimTerminal(scenario_ticks("chop", seconds=6 * 3600)), args.latency_us / 1e6)
+
+
+def sequential(args):
+    mt5 = terminal(args)
+    t = time.perf_counter()
+    for _ in range(args.iterations):
+        for _ in range(args.strategies):
+            mt5.symbol_info_tick(SYMBOL)
+            mt5.positions_get(symbol=SYMBOL)
+            mt5.orders_get(symbol=SYMBOL)
+            spin(args.work_us)
+    return time.perf_counter() - t, None
+
+
+def concurrent(args, gather):
+    amt5 = AsyncMT5(terminal(args))
+
+    async def strategy():
+        for _ in range(args.iterations):
+            if gather:
+                await asyncio.gather(amt5.symbol_info_tick(SYMBOL), amt5.positions_get(symbol=SYMBOL),
+                                     amt5.orders_get(symbol=SYMBOL))
+            else:
+                await amt5.symbol_info_tick(SYMBOL)
+                await amt5.positions_get(symbol=SYMBOL)
+                await amt5.orders_get(symbol=SYMBOL)
+            spin(args.work_us)
+
+    async def main():
+        await asyncio.gather(*(strategy() for _ in range(args.strategies)))
+
+    t = time.perf_counter()
+    asyncio.run(main())
+    wall = time.perf_counter() - t
+    amt5.close()
+    return wall, amt5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategies", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=300, help="loop iterations per strategy")
+    parser.add_argument("--latency-us", type=float, default=200.0, help="terminal round trip per call")
+    parser.add_argument("--work-us", type=float, default=100.0, help="strategy CPU per iteration")
+    args = parser.parse_args()
+
+    calls = args.strategies * args.iterations * 3
+    print(f"🧪 {args.strategies} strategies × {args.iterations} iterations, {calls} calls, "
+          f"{args.latency_us:g} µs round trip, {args.work_us:g} µs work per iteration")
+    base = None
+    for label, run in (("sequential", sequential),
+                       ("async await", lambda a: concurrent(a, gather=False)),
+                       ("async gather", lambda a: concurrent(a, gather=True))):
+        wall, amt5 = run(args)
+        base = base or wall
+        extra = ""
+        if amt5 is not None:
+            extra = (f", {amt5.calls} terminal calls ({amt5.coalesced} coalesced), "
+                     f"{amt5.wakeups / calls:.2f} loop wakeups/call")
+        print(f"⏱ {label:<13}: {wall:6.2f}s {calls / wall:>8,.0f} calls/s (×{base / wall:.2f}){extra}")
+
+
+if __name__ == "__main__":
+    main()
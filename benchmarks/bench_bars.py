@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bars resampling, incremental updates and market_prediction offline.
+
+- --days of synthetic ticks (random walk, irregular 0.2-2 s spacing, varying spread)
+- resample: ticks/s for M1 / M5 / M15 / H1 x bid / ask / mid in one pass
+- incremental: the same ticks fed to a BarFeed in --block sized blocks; its bars must
+  equal the one-pass bars, and both must equal a per-tick Python dict loop
+- indicators: sma / atr / trend_signal on every bar against get_ma / get_atr's loops
+  over copy_rates_from_pos windows
+- prediction: losereduction.market_prediction() at --checks points of the run, once on
+  sim_terminal (the terminal path) and once with bar_feed set (the offline path); both
+  answers must equal trend_signal's code for the forming bar
+
+Usage:
+  python benchmarks/bench_bars.py --days 30 --block 100
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bars import SIGNALS, TIMEFRAMES, BarFeed, atr, resample, sma, trend_signal
+from sim_terminal import SimTerminal
+
+START_MSC = 1_735_689_600_000  # 2025-01-01
+POINT = 0.01
+SCRIPT = "version 0.1/losereduction.py"
+
+
+def synthetic_ticks(days, seed=3):
+    rng = np.random.default_rng(seed)
+    n = int(days * 86400 / 1.1)
+    time_msc = START_MSC + np.cumsum(rng.integers(200, 2000, n)).astype(np.int64)
+    bid = np.round(2650.0 + np.cumsum(rng.standard_t(4, n) * 0.05), 2)
+    ask = np.round(bid + rng.integers(15, 35, n) * POINT, 2)
+    return time_msc, bid, ask
+
+
+def naive_bars(time_msc, price, seconds):
+    """{bar time: [open, high, low, close, ticks]} one tick at a time."""
+    out = {}
+    for msc, p in zip(time_msc.tolist(), price.tolist()):
+        key = msc // 1000 // seconds * seconds
+        bar = out.get(key)
+        if bar is None:
+            out[key] = [p, p, p, p, 1]
+        else:
+            bar[1] = max(bar[1], p)
+            bar[2] = min(bar[2], p)
+            bar[3] = p
+            bar[4] += 1
+    return out
+
+
+def loop_ma(rates, period):
+    if rates is None or len(rates) < period:
+        return None
+    return sum(rates["close"][-period:]) / period
+
+
+def loop_atr(rates, period):
+    if rates is None or len(rates) < period + 1:
+        return None
+    h, l, c = rates["high"], rates["low"], rates["close"]
+    trs = [max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1])) for i in range(1, len(rates))]
+    return sum(trs[-period:]) / period
+
+
+def load_script(sim):
+    sys.modules["MetaTrader5"] = sim
+    spec = importlib.util.spec_from_file_location("bench_losereduction", os.path.join(ROOT, SCRIPT))
+    mod = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(mod)
+    finally:
+        sys.modules.pop("MetaTrader5", None)
+    return mod
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--block", type=int, default=100, help="ticks per incremental update")
+    parser.add_argument("--check", type=int, default=300_000, help="ticks compared with the Python loop")
+    parser.add_argument("--checks", type=int, default=40, help="market_prediction calls compared")
+    args = parser.parse_args()
+
+    time_msc, bid, ask = synthetic_ticks(args.days)
+    n = len(time_msc)
+    timeframes = ("M1", "M5", "M15", "H1")
+    prices = ("bid", "ask", "mid")
+
+    t = time.perf_counter()
+    whole = {(tf, p): resample(time_msc, bid, ask, tf, p, POINT) for tf in timeframes for p in prices}
+    resample_s = time.perf_counter() - t
+
+    feed = BarFeed(timeframes=timeframes, prices=prices, point=POINT, keep=1 << 16)
+    t = time.perf_counter()
+    for i in range(0, n, args.block):
+        feed.update(time_msc[i:i + args.block], bid[i:i + args.block], ask[i:i + args.block])
+    feed_s = time.perf_counter() - t
+    differ = sum(not np.array_equal(feed.rates(tf, p), whole[(tf, p)]) for tf in timeframes for p in prices)
+
+    m = min(args.check, n)
+    worst, missing = 0.0, 0
+    t = time.perf_counter()
+    for tf in timeframes:
+        loop = naive_bars(time_msc[:m], (bid[:m] + ask[:m]) * 0.5, TIMEFRAMES[tf])
+        got = resample(time_msc[:m], bid[:m], ask[:m], tf, "mid")
+        missing += len(loop) != len(got)
+        for row in got:
+            o, h, l, c, k = loop[int(row["time"])]
+            worst = max(worst, abs(row["open"] - o), abs(row["high"] - h), abs(row["low"] - l),
+                        abs(row["close"] - c), abs(int(row["tick_volume"]) - k))
+    loop_rate = m * len(timeframes) / (time.perf_counter() - t)
+
+    rates = whole[("M15", "bid")]
+    ma50, ma200, vol = sma(rates["close"], 50), sma(rates["close"], 200), atr(rates, 14)
+    ind_worst = 0.0
+    for i in range(0, len(rates), max(1, len(rates) // 200)):
+        window = rates[max(0, i - 299):i + 1]
+        for got, want in ((ma50[i], loop_ma(window, 50)), (ma200[i], loop_ma(window, 200)),
+                          (vol[i], loop_atr(window, 14))):
+            if want is None:
+                ind_worst = max(ind_worst, 0.0 if np.isnan(got) else np.inf)
+            else:
+                ind_worst = max(ind_worst, abs(got - want))
+    code = trend_signal(rates)
+
+    # market_prediction on the simulated terminal and on a bar_feed, at points through the run
+    ticks = list(zip(time_msc.tolist(), bid.tolist(), ask.tolist()))
+    sim = SimTerminal(ticks, call_cost=0.0)
+    mod = load_script(sim)
+    offline = BarFeed("XAUUSD_", timeframes=("M15",), prices=("bid",), point=POINT)
+    fed = 0
+    step = (time_msc[-1] - time_msc[0]) / 1000 / (args.checks + 1)
+    agree = 0
+    answers = {}
+    sink = io.StringIO()
+    for _ in range(args.checks):
+        sim.sleep(step)
+        with contextlib.redirect_stdout(sink):
+            mod.bar_feed = None
+            live = mod.market_prediction(mod.SYMBOL)
+            offline.update(time_msc[fed:sim.cursor + 1], bid[fed:sim.cursor + 1], ask[fed:sim.cursor + 1])
+            fed = sim.cursor + 1
+            mod.bar_feed = offline
+            replayed = mod.market_prediction(mod.SYMBOL)
+        forming = np.searchsorted(rates["time"], time_msc[sim.cursor] // 1000 // 900 * 900)
+        expected = SIGNALS[trend_signal(np.concatenate((rates[max(0, forming - 299):forming],
+                                                        offline.rates("M15", count=1))))[-1]]
+        agree += live == replayed == expected
+        answers[expected] = answers.get(expected, 0) + 1
+
+    print(f"📈 {n:,} ticks ({args.days:g} days), {len(timeframes)} timeframes x {len(prices)} prices")
+    print(f"⏱ resample : {resample_s:.2f}s ({n / resample_s / 1e6:.1f}M ticks/s for all 12 series)")
+    print(f"⏱ feed     : {feed_s:.2f}s in {args.block}-tick blocks ({n / feed_s / 1e6:.2f}M ticks/s, "
+          f"{feed_s / (n / args.block) * 1e6:.0f} µs per update), {differ} series differ from the one-pass bars")
+    print(f"✅ check    : {m:,} ticks x {len(timeframes)} timeframes within {worst:.1e} of the Python loop, "
+          f"{missing} bar count mismatches (loop: {loop_rate / 1e6:.2f}M ticks/s)")
+    print(f"✅ indicators: MA50 / MA200 / ATR within {ind_worst:.1e} of get_ma / get_atr on {len(rates):,} M15 bars; "
+          "signal " + ", ".join(f"{s} {np.mean(code == k):.0%}" for k, s in enumerate(SIGNALS)))
+    print(f"🧭 prediction: {agree}/{args.checks} market_prediction calls agree on terminal, bar_feed and "
+          f"trend_signal ({', '.join(f'{k} {v}' for k, v in sorted(answers.items()))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cassette record overhead, size and replay speed on a full strategy run.
+
+- record: pv_increment runs --hours of simulated chop (time_warp) once bare and once
+  with mt5_cassette.Recorder between the script and the simulated terminal
+- per call: positions_get with --legs open positions, bare vs recorded (the cost the
+  live loop pays; encoding and writing happen on the recorder thread)
+- replay: the same script against mt5_cassette.Player in strict mode (same functions,
+  same arguments, same order) on the virtual clock, no terminal at all
+
+Usage:
+  python benchmarks/bench_cassette.py --hours 2 --legs 10
+"""
+
+import argparse
+import json
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from mt5_cassette import CassetteEnd, Player, Recorder
+from sim_terminal import SimTerminal, scenario_ticks
+from time_warp import VirtualClock, warp
+
+SCRIPT = os.path.join(ROOT, "version 0.1", "pv_increment.py")
+SPEC = {"symbol": "XAUUSD_", "magic": 1, "gap": 2.0, "mode": "auto", "pattern": "even", "loss_target": 500.0}
+
+
+def per_call(legs, n):
+    sim = SimTerminal(scenario_ticks("chop", seconds=3600))
+    sim.call_cost = 0.0
+    for _ in range(legs):
+        sim.order_send({"action": sim.TRADE_ACTION_DEAL, "symbol": "XAUUSD_", "volume": 0.01,
+                        "type": sim.ORDER_TYPE_BUY})
+    with tempfile.TemporaryDirectory() as d:
+        rec = Recorder(sim, os.path.join(d, "calls.cas"))
+        t = time.perf_counter()
+        for _ in range(n):
+            sim.positions_get(symbol="XAUUSD_")
+        bare = (time.perf_counter() - t) / n
+        t = time.perf_counter()
+        for _ in range(n):
+            rec.positions_get(symbol="XAUUSD_")
+        recorded = (time.perf_counter() - t) / n
+        rec.close()
+        size = os.path.getsize(os.path.join(d, "calls.cas")) / n
+    return bare * 1e6, recorded * 1e6, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--legs", type=int, default=10, help="open positions for the per-call test")
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    ticks = scenario_ticks("chop", seconds=args.hours * 3600)
+    with tempfile.TemporaryDirectory() as d:
+        cwd = os.getcwd()
+        os.chdir(d)
+        try:
+            path = os.path.join(d, "run.cas")
+            bare = warp(SCRIPT, ticks, SPEC)
+            recorders = []
+            recorded = warp(SCRIPT, ticks, SPEC, wrap=lambda sim: recorders.append(Recorder(sim, path)) or recorders[0])
+            recorders[0].close()
+            size = os.path.getsize(path)
+
+            player = Player(path, match="strict")
+            sys.modules["MetaTrader5"] = player
+            os.environ["STRATEGY_SPEC"] = json.dumps(SPEC)
+            devnull, stdout = open(os.devnull, "w", encoding="utf-8"), sys.stdout
+            sys.stdout = devnull
+            t = time.perf_counter()
+            try:
+                with VirtualClock(player):
+                    runpy.run_path(SCRIPT, run_name="__main__")
+            except CassetteEnd:
+                pass
+            finally:
+                replay_s = time.perf_counter() - t
+                sys.stdout = stdout
+                devnull.close()
+        finally:
+            os.chdir(cwd)
+
+    calls = recorded["mt5_calls"]
+    assert player._pos == len(player._calls) == calls, (player._pos, len(player._calls), calls)
+    bare_us, rec_us, call_bytes = per_call(args.legs, args.calls)
+
+    print(f"📼 pv_increment, {recorded['sim_hours']:.1f} simulated hours, {calls} MT5 calls, {recorded['fills']} fills")
+    print(f"⏱ run bare     : {bare['wall_s']:.2f}s")
+    print(f"⏱ run recorded : {recorded['wall_s']:.2f}s "
+          f"({(recorded['wall_s'] - bare['wall_s']) / calls * 1e6:+.1f} µs per call, "
+          f"{size / 1e6:.2f} MB, {size / calls:.0f} bytes/call)")
+    print(f"🔁 per call     : positions_get with {args.legs} legs {bare_us:.1f} µs bare, "
+          f"{rec_us:.1f} µs recorded ({call_bytes:.0f} bytes)")
+    print(f"▶️ replay strict: {player._pos}/{calls} calls in {replay_s:.2f}s "
+          f"({calls / replay_s:,.0f} calls/s), identical call sequence")
+
+
+if __name__ == "__main__":
+    main()
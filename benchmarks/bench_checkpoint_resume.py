@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: checkpoint write cost per state transition and warm-resume recovery time.
+
+- write: save_checkpoint() of a realistic cycle state (atomic temp file + fsync + replace)
+- recover: load_checkpoint() + reconcile() against N live positions / 1 pending
+  (the part of run_cycle(resume=...) that runs before the first loop iteration)
+
+Usage:
+  python benchmarks/bench_checkpoint_resume.py --legs 50 --runs 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cycle_checkpoint import save_checkpoint, load_checkpoint, reconcile
+
+Position = namedtuple("Position", "ticket magic type volume price_open")
+Order = namedtuple("Order", "ticket magic type volume_current price_open")
+
+
+def make_state(legs):
+    return {
+        "symbol": "XAUUSD_", "magic": 12345, "gap": 2.0, "gap_pts": 200, "vol_index": legs + 1,
+        "last_buy_pts": 348512, "last_order_type": "SELL", "pending_price": 3483.12,
+        "pending_volume": 0.06, "triggered_cum_tp": 12.5, "projected_cum_tp": 15.5,
+        "baseline_equity": 0.0, "triggered_count": legs,
+        "tickets": [1000 + i for i in range(legs)],
+        "order_log": [{"ticket": 1000 + i, "type": "BUY" if i % 2 == 0 else "SELL",
+                       "volume": 0.06, "cumulative_tp": 0.5 * i} for i in range(legs)],
+    }
+
+
+def pct(samples, q):
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--legs", type=int, default=50, help="open legs in the ladder")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    state = make_state(args.legs)
+    positions = [Position(t, 12345, i % 2, 0.06, 3485.0) for i, t in enumerate(state["tickets"])]
+    orders = [Order(9999, 12345, 5, 0.06, 3483.12)]
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "checkpoint.json")
+        writes = []
+        for _ in range(args.runs):
+            t = time.perf_counter()
+            save_checkpoint(path, state)
+            writes.append((time.perf_counter() - t) * 1e3)
+
+        recover = []
+        for _ in range(args.runs):
+            t = time.perf_counter()
+            loaded = load_checkpoint(path)
+            live = reconcile(loaded, positions, orders, magic=12345)
+            recover.append((time.perf_counter() - t) * 1e3)
+        assert live["status"] == "resume" and len(live["known"]) == args.legs
+        size = os.path.getsize(path)
+
+    print(f"📦 checkpoint size: {size} bytes ({args.legs} legs)")
+    print(f"💾 write   ms: mean={statistics.mean(writes):.3f} p50={pct(writes, 0.5):.3f} p99={pct(writes, 0.99):.3f}")
+    print(f"♻️ recover ms: mean={statistics.mean(recover):.3f} p50={pct(recover, 0.5):.3f} p99={pct(recover, 0.99):.3f}")
+    print("   (plus one positions_get + orders_get round trip to the terminal)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cycle reconstruction (cycle_analytics) over months of synthetic deal history.
+
+- --ladders ladders (magic numbers) each run --per-day cycles a day for --days days:
+  1-12 "Cyclic BUY/SELL STOP" entries with growing volume, then "Close by script" closes
+  of every leg with random P&L, commission and swap; a few cycles are left open across
+  a long gap (script restarted) so the gap rule is exercised too
+- Deals are history_deals_get()-style namedtuples (sim_terminal.TradeDeal), interleaved
+  across ladders by time like a real account history
+- Reports deals/s from the tuples (incl. column extraction) and from ready columns, and
+  checks the reconstructed cycle count and net P&L against what was generated
+
+Usage:
+  python benchmarks/bench_cycles.py --days 90 --ladders 6 --per-day 40
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from cycle_analytics import analyze_cycles, deal_columns, ladder_summary
+from sim_terminal import TradeDeal
+
+START_MSC = 1_751_328_000_000  # 2025-07-01
+
+
+def synthetic_deals(days, ladders, per_day, seed=7):
+    rng = random.Random(seed)
+    deals = []
+    ticket = 1_000_000
+    cycles = 0
+    left_open = 0
+    net = 0.0
+    for magic in range(1001, 1001 + ladders):
+        t = START_MSC + rng.randrange(60_000)
+        end = START_MSC + days * 86_400_000
+        spacing = 86_400_000 // per_day
+        while t < end:
+            legs = rng.randint(1, 12)
+            open_legs = []
+            for k in range(legs):
+                side = k % 2
+                volume = round(0.01 * (k + 1), 2)
+                ticket += 1
+                deals.append(TradeDeal(ticket, ticket, t // 1000, t, side, 0, magic, ticket, 3, volume, 3400.0,
+                                       -0.07 * volume * 100, 0.0, 0.0, 0.0, "XAUUSD_",
+                                       f"Cyclic {'BUY' if side == 0 else 'SELL'} STOP"))
+                open_legs.append((ticket, side, volume))
+                net += deals[-1].commission
+                t += rng.randrange(5_000, 600_000)
+            cycles += 1
+            if rng.random() < 0.01:  # left open, script restarted hours later
+                left_open += 1
+                t += 8 * 3_600_000
+                continue
+            for position, side, volume in open_legs:
+                profit = round(rng.gauss(1.0, 20.0) * volume * 10, 2)
+                swap = -0.5 if rng.random() < 0.1 else 0.0
+                ticket += 1
+                deals.append(TradeDeal(ticket, ticket, t // 1000, t, 1 - side, 1, magic, position, 3, volume, 3400.0,
+                                       0.0, swap, profit, 0.0, "XAUUSD_", "Close by script"))
+                net += profit + swap
+                t += rng.randrange(50, 500)
+            t += rng.randrange(spacing // 2, spacing * 3 // 2)
+    deals.sort(key=lambda d: d.time_msc)
+    return deals, cycles, left_open, net
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--ladders", type=int, default=6)
+    parser.add_argument("--per-day", type=int, default=40, help="cycles per ladder per day")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    deals, cycles, left_open, net = synthetic_deals(args.days, args.ladders, args.per_day)
+    print(f"🧾 {len(deals):,} deals, {cycles:,} cycles over {args.days} days, {args.ladders} ladders")
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        t = time.perf_counter()
+        result = analyze_cycles(deals)
+        best = min(best, time.perf_counter() - t)
+    cols = deal_columns(deals)
+    best_cols = float("inf")
+    for _ in range(args.repeat):
+        t = time.perf_counter()
+        analyze_cycles(cols)
+        best_cols = min(best_cols, time.perf_counter() - t)
+
+    assert result["cycles"] == cycles, (result["cycles"], cycles)
+    assert int((~result["flat"]).sum()) == left_open, (int((~result["flat"]).sum()), left_open)
+    assert abs(result["net"].sum() - net) < 1e-6 * max(1.0, abs(net)), (result["net"].sum(), net)
+    print(f"⏱ from deal tuples : {best:.3f}s ({len(deals) / best:,.0f} deals/s)")
+    print(f"⏱ from columns     : {best_cols:.3f}s ({len(deals) / best_cols:,.0f} deals/s)")
+    print(f"✅ {result['cycles']:,} cycles reconstructed, net {result['net'].sum():,.2f} matches, "
+          f"{int((~result['flat']).sum())} left open, max legs {int(result['max_legs'].max())}, "
+          f"peak volume {float(result['peak_volume'].max()):.2f}")
+    for row in ladder_summary(result)[:3]:
+        print(f"   magic {row['magic']}: {row['cycles']} cycles, win {row['win_rate']:.0%}, net {row['net']:,.2f}, "
+              f"worst {row['worst']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
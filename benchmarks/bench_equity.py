@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: equity_curve build and query over months of ticks.
+
+- --days of synthetic 1 s ticks (random walk) saved as a copy_ticks-style .npy, and
+  ladder cycles opened / closed at those tick prices every --cycle-minutes
+- build: ticks marked per second and peak RSS (ticks are read through a memmap and
+  marked CHUNK at a time, so memory does not grow with the range)
+- check: the first --check ticks against a per-tick Python loop over the deals
+- query: a fresh EquityCurve (memmap) answering at(), one day between(), and an
+  hourly sample() of the whole range
+
+Usage:
+  python benchmarks/bench_equity.py --days 60
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from equity_curve import EquityCurve, build
+from sim_terminal import TradeDeal
+from tick_bus import TICK_DTYPE
+
+START_MSC = 1_751_328_000_000  # 2025-07-01
+
+
+def synthetic_ticks(days, seed=7):
+    n = days * 86400
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks["time_msc"] = START_MSC + np.arange(n, dtype=np.int64) * 1000
+    ticks["bid"] = np.round(3300.0 + np.cumsum(rng.normal(0.0, 0.08, n)), 2)
+    ticks["ask"] = ticks["bid"] + 0.20
+    return ticks
+
+
+def synthetic_deals(ticks, cycle_minutes, seed=7):
+    rng = random.Random(seed)
+    deals = []
+    ticket = 1_000_000
+    i = 0
+    step = cycle_minutes * 60
+    while i + step < len(ticks):
+        legs = []
+        for k in range(rng.randint(1, 6)):
+            j = i + k * rng.randint(10, step // 8)
+            side = k % 2
+            price = float(ticks["ask"][j] if side == 0 else ticks["bid"][j])
+            volume = round(0.01 * (k + 1), 2)
+            ticket += 1
+            deals.append(TradeDeal(ticket, ticket, int(ticks["time_msc"][j]) // 1000, int(ticks["time_msc"][j]), side,
+                                   0, 1, ticket, 3, volume, price, -0.07 * volume * 100, 0.0, 0.0, 0.0,
+                                   "XAUUSD_", "Cyclic STOP"))
+            legs.append((ticket, side, volume, price))
+        j = i + step - rng.randint(1, 30)
+        for position, side, volume, price in legs:
+            close = float(ticks["bid"][j] if side == 0 else ticks["ask"][j])
+            profit = round(((close - price) if side == 0 else (price - close)) * volume * 100, 2)
+            ticket += 1
+            deals.append(TradeDeal(ticket, ticket, int(ticks["time_msc"][j]) // 1000, int(ticks["time_msc"][j]),
+                                   1 - side, 1, 1, position, 3, volume, close, 0.0, 0.0, profit, 0.0,
+                                   "XAUUSD_", "Close by script"))
+        i += step
+    return deals
+
+
+def naive_equity(ticks, deals, balance, n):
+    deals = sorted(deals, key=lambda d: (d.time_msc, d.ticket))
+    j, positions, out = 0, {}, np.empty(n)
+    for i in range(n):
+        t, bid, ask = int(ticks["time_msc"][i]), float(ticks["bid"][i]), float(ticks["ask"][i])
+        while j < len(deals) and deals[j].time_msc <= t:
+            d = deals[j]
+            j += 1
+            balance += d.profit + d.commission + d.swap + d.fee
+            if d.entry == 0:
+                positions[d.position_id] = (d.type, d.volume, d.price)
+            else:
+                positions.pop(d.position_id, None)
+        out[i] = balance + sum(((bid - p) if side == 0 else (p - ask)) * v * 100
+                               for side, v, p in positions.values())
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--cycle-minutes", type=int, default=30)
+    parser.add_argument("--check", type=int, default=200_000, help="ticks compared with the per-tick loop")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        ticks = synthetic_ticks(args.days)
+        deals = synthetic_deals(ticks, args.cycle_minutes)
+        path = os.path.join(d, "ticks.npy")
+        np.save(path, ticks)
+        del ticks
+        rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        t = time.perf_counter()
+        summary = build(os.path.join(d, "curve"), path, deals, "XAUUSD_", balance=10_000.0)
+        wall = time.perf_counter() - t
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        size = sum(e.stat().st_size for e in os.scandir(os.path.join(d, "curve")))
+
+        ticks = np.load(path, mmap_mode="r")
+        n = min(args.check, len(ticks))
+        t = time.perf_counter()
+        expected = naive_equity(ticks, deals, 10_000.0, n)
+        naive_s = time.perf_counter() - t
+        t = time.perf_counter()
+        curve = EquityCurve(os.path.join(d, "curve"))
+        open_ms = (time.perf_counter() - t) * 1e3
+        err = float(np.abs(curve["equity"][:n] - expected).max())
+
+        mid = START_MSC + args.days * 43_200_000
+        t = time.perf_counter()
+        for k in range(1000):
+            curve.at(mid + k * 997)
+        at_us = (time.perf_counter() - t) / 1000 * 1e6
+        t = time.perf_counter()
+        day = curve.between(mid, mid + 86_400_000)
+        day_min = float(day["equity"].min())
+        day_ms = (time.perf_counter() - t) * 1e3
+        t = time.perf_counter()
+        hourly = curve.sample(3600)
+        sample_ms = (time.perf_counter() - t) * 1e3
+
+    rows = summary["rows"]
+    print(f"📈 {rows:,} ticks ({args.days} days), {summary['deals']:,} deals")
+    print(f"⏱ build   : {wall:.2f}s ({rows / wall / 1e6:.1f}M ticks/s), {size / 1e6:.0f} MB curve, "
+          f"peak RSS {rss:.0f} MB (was {rss0:.0f} MB before the build)")
+    print(f"✅ check   : first {n:,} ticks within {err:.1e} of the per-tick loop "
+          f"(loop: {n / naive_s / 1e3:,.0f}k ticks/s, {wall / rows * n / naive_s:.3f}× its time)")
+    print(f"🔎 query   : open {open_ms:.2f} ms, at() {at_us:.1f} µs, one day between() + min {day_ms:.1f} ms "
+          f"(min {day_min:.2f}), hourly sample {len(hourly['time_msc'])} rows in {sample_ms:.1f} ms")
+    print(f"📉 max drawdown {summary['max_drawdown']:.2f} ({summary['max_drawdown_pct']:.2%}) at "
+          f"{summary['max_drawdown_at']}, longest under water {summary['longest_underwater_s'] / 3600:.1f}h, "
+          f"under water {summary['underwater_share']:.0%}, in market {summary['in_market_share']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
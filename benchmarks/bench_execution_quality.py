@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark: execution_quality over a long synthetic history.
+
+- --orders pending stops, each written to a real journal file the way place_pending_stop
+  does (ORDER_REQUEST, RETRY on rejects, ORDER_RESULT), filled with random slippage and
+  closed the way close_all_positions does (RETRY on requotes, CLOSE), plus the matching deals
+- analyze: seconds for the whole report (joins + tables), from deal tuples and from columns
+- check: per-order slippage, send latency and retry counts against a dict-based Python loop
+- what-if: requote rate per deviation and reject rate per stop buffer against the
+  distributions the history was generated from
+
+Usage:
+  python benchmarks/bench_execution_quality.py --orders 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from cycle_analytics import deal_columns
+from event_journal import CLOSE, ORDER_REQUEST, ORDER_RESULT, RETRY, TRIGGER, Journal
+from execution_quality import DEAL_FIELDS, analyze, close_fills, load_journals, pending_fills
+from sim_terminal import TradeDeal
+
+POINT = 0.01
+START_NS = 1_760_000_000 * 10**9
+
+
+class FakeClock:
+    """Stands in for perf_counter_ns / time_ns while the journal is written."""
+
+    def __init__(self):
+        self.ns = START_NS
+
+    def __call__(self):
+        return self.ns
+
+
+def write_history(path, orders, seed=7):
+    rng = random.Random(seed)
+    clock = FakeClock()
+    real = time.perf_counter_ns, time.time_ns
+    time.perf_counter_ns = time.time_ns = clock
+    journal = Journal(path)
+    deals, expected = [], {}
+    ticket = 1_000_000
+    price = 3300.0
+    try:
+        for k in range(orders):
+            side = 1 if k % 2 == 0 else -1
+            price = round(price + rng.gauss(0, 0.5), 2)
+            bid, ask = price, round(price + 0.20, 2)
+            stop = round(ask + 0.05 if side > 0 else bid - 0.05, 2)
+            ref = journal.next_ref()
+            journal.record(ORDER_REQUEST, ref=ref, side=side, price=stop, volume=0.01, bid=bid, ask=ask)
+            t0 = clock.ns
+            attempts = 0
+            while True:
+                attempts += 1
+                clock.ns += int(rng.expovariate(1 / 40e6))          # send round trip, mean 40 ms
+                move = int(rng.expovariate(1 / 2.0))                # adverse quote move in points
+                q_bid, q_ask = (bid, round(ask + move * POINT, 2)) if side > 0 else (round(bid - move * POINT, 2), ask)
+                if move > 5 and attempts == 1:                      # stops_level + 5 pts buffer
+                    journal.record(RETRY, ref=ref, side=side, price=stop, volume=0.01, bid=q_bid, ask=q_ask,
+                                   retcode=10015, attempt=attempts)
+                    continue
+                ticket += 1
+                order = ticket
+                journal.record(ORDER_RESULT, ref=ref, ticket=order, side=side, price=stop, volume=0.01,
+                               bid=q_bid, ask=q_ask, retcode=10009, attempt=attempts)
+                break
+            send_ms = (clock.ns - t0) / 1e6
+
+            clock.ns += int(rng.uniform(1, 600) * 1e9)              # resting until triggered
+            fill = round(stop + side * int(rng.expovariate(1 / 3.0)) * POINT, 2)
+            ticket += 1
+            position = ticket
+            msc = clock.ns // 1_000_000
+            deals.append(TradeDeal(ticket, order, msc // 1000, msc, 0 if side > 0 else 1, 0, 1, position, 3, 0.01,
+                                   fill, 0.0, 0.0, 0.0, 0.0, "XAUUSD_", "Cyclic STOP"))
+            clock.ns += int(rng.uniform(100, 1500) * 1e6)
+            journal.record(TRIGGER, ticket=position, side=side, price=stop, fill=fill, volume=0.01)
+
+            clock.ns += int(rng.uniform(1, 60) * 1e9)
+            sent = round(price + rng.gauss(0, 0.3), 2)
+            close_side = -side
+            retries = 0
+            while True:
+                clock.ns += int(rng.expovariate(1 / 40e6))
+                slip = int(rng.expovariate(1 / 8.0)) - 2
+                if rng.random() < 0.05:
+                    retries += 1
+                    journal.record(RETRY, ticket=position, side=close_side, price=sent, volume=0.01,
+                                   retcode=10004, attempt=retries, note="close")
+                    clock.ns += 1_000_000_000
+                    continue
+                break
+            close = round(sent + close_side * slip * POINT, 2)
+            ticket += 1
+            msc = clock.ns // 1_000_000
+            deals.append(TradeDeal(ticket, 0, msc // 1000, msc, 1 if side > 0 else 0, 1, 1, position, 3, 0.01,
+                                   close, 0.0, 0.0, 0.0, 0.0, "XAUUSD_", "Close by script"))
+            journal.record(CLOSE, ticket=position, side=close_side, price=sent, fill=close, volume=0.01,
+                           retcode=10009, attempt=retries + 1)
+            expected[order] = ((fill - stop) * side / POINT, send_ms, attempts - 1, (close - sent) * close_side / POINT)
+    finally:
+        time.perf_counter_ns, time.time_ns = real
+        journal.close()
+    return deals, expected
+
+
+def naive(records, deals):
+    """Dict joins in a Python loop: {order ticket: (pending slippage, send ms, retries, close slippage)}."""
+    requests, retries, closes = {}, {}, {}
+    by_order = {d.order: d for d in deals if d.entry == 0}
+    by_position = {d.position_id: d for d in deals if d.entry == 1}
+    out = {}
+    results = []
+    for r in records:
+        kind = r["kind"]
+        if kind == ORDER_REQUEST:
+            requests[r["ref"]] = r["mono_ns"]
+        elif kind == RETRY and r["ref"]:
+            retries[r["ref"]] = retries.get(r["ref"], 0) + 1
+        elif kind == ORDER_RESULT:
+            results.append(r)
+        elif kind == CLOSE:
+            closes[r["ticket"]] = r
+    for r in results:
+        d = by_order[r["ticket"]]
+        c = closes[d.position_id]
+        exit_deal = by_position[d.position_id]
+        out[int(r["ticket"])] = ((d.price - r["price"]) * r["side"] / POINT,
+                                 (r["mono_ns"] - requests[r["ref"]]) / 1e6, retries.get(r["ref"], 0),
+                                 (exit_deal.price - c["price"]) * c["side"] / POINT)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--check", type=int, default=50_000, help="orders compared with the Python loop")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "journal.jnl")
+        t = time.perf_counter()
+        deals, expected = write_history(path, args.orders)
+        gen_s = time.perf_counter() - t
+        size = os.path.getsize(path)
+
+        t = time.perf_counter()
+        records = load_journals([path])
+        load_s = time.perf_counter() - t
+    t = time.perf_counter()
+    report = analyze(records, deals, POINT)
+    analyze_s = time.perf_counter() - t
+    cols = deal_columns(deals, DEAL_FIELDS)
+    t = time.perf_counter()
+    analyze(records, cols, POINT)
+    columns_s = time.perf_counter() - t
+    pend = pending_fills(records, cols, POINT)
+    closes = close_fills(records, cols, POINT)
+    close_slip = dict(zip(closes["ticket"].tolist(), closes["slippage"].tolist()))
+    pos_of = {d.order: d.position_id for d in deals if d.entry == 0}
+
+    cut = np.flatnonzero(records["kind"] == CLOSE)[min(args.check, len(expected)) - 1] + 1
+    t = time.perf_counter()
+    loop = naive(records[:cut], deals)
+    naive_s = time.perf_counter() - t
+    worst = 0.0
+    for i, order in enumerate(pend["ticket"][:len(loop)].tolist()):
+        slip, send_ms, retries, cslip = loop[order]
+        exp = expected[order]
+        got = (pend["slippage"][i], pend["send_ms"][i], int(pend["attempts"][i]) - 1, close_slip[pos_of[order]])
+        worst = max(worst, abs(got[0] - slip), abs(got[1] - send_ms), abs(got[2] - retries), abs(got[3] - cslip),
+                    abs(got[0] - exp[0]), abs(got[1] - exp[1]), abs(got[2] - exp[2]), abs(got[3] - exp[3]))
+
+    n_rec = len(records)
+    p, c = report["pending"], report["close"]
+    print(f"📒 {args.orders:,} orders, {n_rec:,} journal records ({size / 1e6:.1f} MB), {len(deals):,} deals "
+          f"(generated in {gen_s:.1f}s)")
+    print(f"⏱ load    : {load_s:.2f}s   analyze: {analyze_s:.2f}s from deal tuples, {columns_s:.2f}s from columns "
+          f"({args.orders / columns_s / 1e3:,.0f}k orders/s)")
+    print(f"✅ check   : {len(loop):,} orders within {worst:.1e} of the generator and the Python loop "
+          f"(loop: {len(loop) / naive_s / 1e3:,.1f}k orders/s, {columns_s / args.orders * len(loop) / naive_s:.3f}× its time)")
+    print(f"📉 pending slippage mean {p['slippage_points']['mean']:.2f} pts (p99 {p['slippage_points']['p99']:.0f}), "
+          f"send p50 {p['send_ms']['p50']:.1f} ms, {p['stop_rejects']:,} stop-level rejects")
+    print(f"📉 close slippage mean {c['slippage_points']['mean']:.2f} pts (p99 {c['slippage_points']['p99']:.0f}), "
+          f"{c['requotes']:,} requotes, retry time p99 {c['retry_s']['p99']:.1f}s")
+    dev = {row["deviation"]: row["requote_rate"] for row in report["deviation"]}
+    buf = {row["buffer"]: row["reject_rate"] for row in report["stop_buffer"]}
+    print("🔁 requote rate by deviation: " + ", ".join(f"{k}={v:.1%}" for k, v in dev.items()))
+    print("🧱 reject rate by stop buffer: " + ", ".join(f"{k}={v:.1%}" for k, v in buf.items())
+          + f"  (history rejected {p['stop_rejects'] / p['placed']:.1%} at 5)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmark: gap_pattern tables against the hand-coded ladders, live and in replay.
+
+- live: for each built-in pattern, --triggers random fills (slipped fill price, random
+  quote) stepped through GapMachine and through the script's own if / else logic
+  (new gap*.py, November Buy, November Sell, buy incress sell static) in integer points;
+  every (side, price, ladder index) must match; ns per trigger for both
+- replay: walk_forward.replay() of a grid mixing all four patterns over --days of
+  synthetic ticks against a per-tick Python loop driving GapMachine on the same ticks
+  (net, cycles, wins, losses must match), and its throughput
+
+Usage:
+  python benchmarks/bench_gap_pattern.py --triggers 200000 --days 6
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from gap_pattern import PATTERNS, GapMachine, compile_pattern
+from risk_of_ruin import ladder_preset
+from tick_bus import TICK_DTYPE
+from walk_forward import EPS, LEGS, TickStore, build_store, make_grid, replay
+
+START_MSC = 1_735_689_600_000  # 2025-01-01
+POINT = 0.01
+
+
+# ------------------- The scripts' own placement logic ------------------- #
+class Alternate:
+    """new gap666666.py run_cycle."""
+
+    def __init__(self, gap, entry, bid, ask):
+        self.gap, self.k = gap, 0
+        self.last_buy = ask + entry
+        self.first = ("BUY", self.last_buy, 0)
+
+    def on_fill(self, side, fill, bid, ask):
+        self.k += 1
+        if side == "BUY":
+            self.last_buy = fill
+            return "SELL", self.last_buy - self.gap, self.k
+        self.last_buy += self.gap
+        return "BUY", self.last_buy, self.k
+
+
+class FixedBuy:
+    """November Buy 2 and 4 gap -1.py: BUY at base, SELL at base - SELL_GAP * sell_step."""
+
+    def __init__(self, gap, entry, bid, ask):
+        self.gap, self.k, self.sell_step = gap, 0, 1
+        self.base = ask + entry
+        self.first = ("BUY", self.base, 0)
+
+    def on_fill(self, side, fill, bid, ask):
+        self.k += 1
+        if side == "BUY":
+            price = self.base - self.gap * self.sell_step
+            self.sell_step += 1
+            return "SELL", price, self.k
+        return "BUY", self.base, self.k
+
+
+class ProgressiveBuy:
+    """November Sell buy 2 and 4 gap -1.py: SELL at the anchor, BUY at anchor + buy_step."""
+
+    def __init__(self, gap, entry, bid, ask):
+        self.gap, self.k, self.buy_step = gap, 0, 1
+        self.base = bid - entry
+        self.first = ("SELL", self.base, 0)
+
+    def on_fill(self, side, fill, bid, ask):
+        self.k += 1
+        if side == "SELL":
+            price = self.base + self.gap * self.buy_step
+            self.buy_step += 1
+            return "BUY", price, self.k
+        return "SELL", self.base, self.k
+
+
+class StaticSell:
+    """buy incress sell static .py: BUY at ask + step * GAP, SELL fixed once at the first SELL."""
+
+    def __init__(self, gap, entry, bid, ask):
+        self.gap, self.entry, self.k, self.step = gap, entry, 0, 1
+        self.sell_fixed = None
+        self.first = ("BUY", ask + self.step * gap, 0)
+
+    def on_fill(self, side, fill, bid, ask):
+        self.k += 1
+        if side == "BUY":
+            if self.sell_fixed is None:
+                self.sell_fixed = bid - self.entry
+            return "SELL", self.sell_fixed, self.k
+        self.step += 1
+        return "BUY", ask + self.step * self.gap, self.k
+
+
+SCRIPTS = {"alternate": Alternate, "fixed_buy": FixedBuy, "progressive_buy": ProgressiveBuy, "static_sell": StaticSell}
+
+
+def fills(n, seed):
+    """(slippage, spread, quote offset) per trigger."""
+    rng = random.Random(seed)
+    return [(rng.randint(0, 5), rng.randint(15, 35), rng.randint(-50, 50)) for _ in range(n)]
+
+
+def drive(engine, first, steps):
+    side, price, vol = first
+    out = []
+    for slip, spread, drift in steps:
+        fill = price + slip if side == "BUY" else price - slip
+        bid = fill + drift
+        side, price, vol = engine.on_fill(side, fill, bid, bid + spread)
+        out.append((side, price, vol))
+    return out
+
+
+# ------------------- Replay reference ------------------- #
+def synthetic_ticks(days, seed=23):
+    n = days * 86400
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks["time_msc"] = START_MSC + np.arange(n, dtype=np.int64) * 1000
+    ticks["bid"] = np.round(2650.0 + np.cumsum(rng.standard_t(4, n) * 0.06), 2)
+    ticks["ask"] = np.round(ticks["bid"] + rng.integers(15, 35, n) * POINT, 2)
+    return ticks
+
+
+def naive_replay(bid, ask, params, contract_size=100.0):
+    """One set, one tick at a time, with GapMachine placing every pending."""
+    usd = contract_size * POINT
+    vols = ladder_preset(params["ladder"], LEGS).volumes.tolist()
+    tp_unit, sl = params["profit_unit"] / usd, -params["loss_target"] / usd
+    machine = GapMachine(params["pattern"], int(round(params["gap"] / POINT)), params["entry"])
+    side, level, vi = machine.start(int(bid[0]), int(ask[0]))
+    bv = bc = sv = sc = tvol = realized = 0.0
+    cycles = wins = losses = 0
+    for i in range(1, len(bid)):
+        b, a = int(bid[i]), int(ask[i])
+        while (a >= level) if side == "BUY" else (b <= level):
+            vol = vols[min(vi, LEGS - 1)]
+            if side == "BUY":
+                bv += vol
+                bc += vol * a
+            else:
+                sv += vol
+                sc += vol * b
+            tvol += vol
+            side, level, vi = machine.on_fill(side, a if side == "BUY" else b, b, a)
+        pnl = bv * b - bc + sc - sv * a
+        if machine.k and (pnl >= tvol * tp_unit - EPS or pnl <= sl + EPS):
+            realized += pnl
+            cycles += 1
+            wins += pnl >= tvol * tp_unit - EPS
+            losses += pnl < tvol * tp_unit - EPS
+            side, level, vi = machine.start(b, a)
+            bv = bc = sv = sc = tvol = 0.0
+    b, a = int(bid[-1]), int(ask[-1])
+    return (realized + bv * b - bc + sc - sv * a) * usd, cycles, wins, losses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--triggers", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=6)
+    parser.add_argument("--check", type=int, default=200_000, help="ticks compared with the Python loop")
+    args = parser.parse_args()
+
+    gap, entry, bid0 = 100, 10, 300_000
+    steps = fills(args.triggers, 1)
+    print(f"{'pattern':<16} {'states':>6} {'rules':>5} {'mismatches':>10} {'table ns':>9} {'script ns':>9}")
+    for name, script in SCRIPTS.items():
+        t = time.perf_counter()
+        pattern = compile_pattern(name)
+        compile_us = (time.perf_counter() - t) * 1e6
+        machine = GapMachine(pattern, gap, entry)
+        first = machine.start(bid0, bid0 + 20)
+        ref = script(gap, entry, bid0, bid0 + 20)
+        t = time.perf_counter()
+        got = drive(machine, first, steps)
+        table_ns = (time.perf_counter() - t) / len(steps) * 1e9
+        t = time.perf_counter()
+        want = drive(ref, ref.first, steps)
+        script_ns = (time.perf_counter() - t) / len(steps) * 1e9
+        bad = (first != ref.first) + sum(g != w for g, w in zip(got, want))
+        print(f"{name:<16} {len(pattern.states):>6} {len(pattern.rules):>5} {bad:>10} {table_ns:>9.0f} {script_ns:>9.0f}"
+              f"   (compiled in {compile_us:.0f} µs)")
+
+    grid = [dict(g, pattern=p) for p in PATTERNS
+            for g in make_grid([1.0, 2.0, 3.0], [25.0, 50.0], [300.0, 1000.0], [10, 30], ["gap666"])]
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "ticks.npy")
+        np.save(path, synthetic_ticks(args.days))
+        build_store(path, os.path.join(d, "store"), POINT)
+        os.remove(path)
+        store = TickStore(os.path.join(d, "store"))
+        n = min(args.check, len(store))
+        sample = grid[::3]
+        got = replay(store, 0, n, sample)
+        bid, ask = np.asarray(store["bid"][:n]), np.asarray(store["ask"][:n])
+        worst, mismatched = 0.0, 0
+        t = time.perf_counter()
+        for i, params in enumerate(sample):
+            net, cycles, wins, losses = naive_replay(bid, ask, params)
+            worst = max(worst, abs(net - got["net"][i]))
+            mismatched += (cycles, wins, losses) != (got["cycles"][i], got["wins"][i], got["losses"][i])
+        naive_rate = n * len(sample) / (time.perf_counter() - t)
+        t = time.perf_counter()
+        res = replay(store, 0, len(store), grid)
+        replay_s = time.perf_counter() - t
+        rows = len(store)
+
+    print(f"✅ replay  : {len(sample)} sets ({len(PATTERNS)} patterns) over {n:,} ticks, net within {worst:.1e}, "
+          f"{mismatched} cycle count mismatches (GapMachine loop: {naive_rate / 1e6:.2f}M set-ticks/s)")
+    print(f"⏱ replay  : {len(grid)} sets x {rows:,} ticks in {replay_s:.2f}s "
+          f"({len(grid) * rows / replay_s / 1e6:,.0f}M set-ticks/s), {int(res['cycles'].sum()):,} cycles")
+    for k, p in enumerate(PATTERNS):
+        part = slice(k * len(grid) // len(PATTERNS), (k + 1) * len(grid) // len(PATTERNS))
+        print(f"   {p:<16} best net {res['net'][part].max():>9.2f}  cycles {int(res['cycles'][part].sum()):>6,}  "
+              f"stop losses {int(res['losses'][part].sum()):>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time until an N-level BUY STOP grid is live, GridPlacer vs the old mt3_pending loop.
+
+- A fake terminal answers every call after --latency ms and counts calls that arrive
+  while another is still inside it (must be 0: GridPlacer sends from one thread)
+- The old loop placed one order per 1 s iteration (orders_get + order_send each time),
+  so its time-to-grid is estimated as levels * (1 s + 2 round trips)
+- Also times maintain() refilling the grid after a burst of fills
+
+Usage:
+  python benchmarks/bench_grid_placement.py --levels 50 --latency 15
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fixed_point import PriceScale
+from grid_placer import GridPlacer
+from order_mirror import OrderMirror
+
+
+class FakeTerminal:
+    TRADE_ACTION_PENDING, TRADE_ACTION_REMOVE, TRADE_ACTION_MODIFY = 5, 8, 7
+    TRADE_RETCODE_PLACED, TRADE_RETCODE_DONE = 10008, 10009
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP = 4, 5
+    ORDER_FILLING_FOK, ORDER_TIME_GTC = 0, 0
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1e3
+        self.lock = threading.Lock()
+        self.tickets = itertools.count(1000)
+        self.book = {}
+        self.calls = 0
+        self.overlaps = 0       # calls made while another was still in the terminal
+
+    def _wait(self):
+        self.calls += 1
+        if not self.lock.acquire(blocking=False):
+            self.overlaps += 1
+            self.lock.acquire()
+        try:
+            time.sleep(self.latency)
+        finally:
+            self.lock.release()
+
+    def symbol_info_tick(self, symbol):
+        self._wait()
+        return SimpleNamespace(bid=3484.80, ask=3485.00)
+
+    def orders_get(self, symbol=None):
+        self._wait()
+        return [SimpleNamespace(ticket=t, magic=r["magic"], type=r["type"], price_open=r["price"],
+                                volume_current=r["volume"], time_setup=0) for t, r in list(self.book.items())]
+
+    def order_send(self, request):
+        self._wait()
+        ticket = next(self.tickets)
+        self.book[ticket] = request
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, order=ticket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=15.0, help="ms per terminal round trip")
+    parser.add_argument("--fills", type=int, default=10, help="levels filled before the maintain() run")
+    args = parser.parse_args()
+
+    mt5 = FakeTerminal(args.latency)
+    scale = PriceScale(point=0.01, digits=2, stops_level=30, freeze_level=10)
+    mirror = OrderMirror(mt5, "XAUUSD_", magic=123456, interval=0.0)
+    grid = GridPlacer(mt5, mirror, scale, "XAUUSD_", "BUY", 0.01, scale.to_points(1.0), args.levels, 123456,
+                      log=lambda *a: None)
+
+    t = time.perf_counter()
+    placed = grid.start(scale.to_points(3485.00))
+    start_ms = (time.perf_counter() - t) * 1e3
+    assert placed == args.levels, placed
+
+    # fill the lowest levels outside the script, then let maintain() notice and refill
+    for level in sorted(grid.grid)[:args.fills]:
+        mt5.book.pop(grid.grid[level])
+    t = time.perf_counter()
+    gone = grid.maintain()
+    refill_ms = (time.perf_counter() - t) * 1e3
+    assert len(gone) == args.fills and len(grid.grid) == args.levels
+
+    legacy_s = args.levels * (1.0 + 2 * args.latency / 1e3)
+    print(f"🧱 {args.levels}-level grid, {args.latency:.0f} ms round trips, {mt5.calls} terminal calls, "
+          f"{mt5.overlaps} overlapping {'✅' if not mt5.overlaps else '❌'}")
+    print(f"🚀 GridPlacer.start : {start_ms:8.1f} ms ({start_ms / args.levels:.1f} ms per level)")
+    print(f"♻️ maintain() after {args.fills} fills: {refill_ms:8.1f} ms")
+    print(f"🐢 old mt3 loop (est): {legacy_s * 1e3:8.1f} ms  ({legacy_s * 1e3 / start_ms:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
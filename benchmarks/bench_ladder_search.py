@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ladder_search cross-entropy search against grid and random search.
+
+- --days of 1 s synthetic ticks (fat-tailed random walk) built into a tick store
+- cem: --generations x --batch designs with successive halving over --folds
+- random: as many designs drawn uniformly from the same space, every one on every fold
+- grid: gap x profit unit x gap growth over the fixed gap666 volumes (what a grid can
+  afford), every one on every fold
+- per method: best net (in sample), design-fold replays, seconds; and the generation
+  at which the search passed the best random / grid result
+
+Usage:
+  python benchmarks/bench_ladder_search.py --days 30 --generations 10 --batch 48
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from ladder_search import Evaluator, LadderSpace, search
+from tick_bus import TICK_DTYPE
+from walk_forward import build_store, make_grid
+
+START_MSC = 1_735_689_600_000  # 2025-01-01
+POINT = 0.01
+
+
+def synthetic_ticks(days, seed=5):
+    n = days * 86400
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks["time_msc"] = START_MSC + np.arange(n, dtype=np.int64) * 1000
+    ticks["bid"] = np.round(2650.0 + np.cumsum(rng.standard_t(4, n) * 0.06), 2)
+    ticks["ask"] = np.round(ticks["bid"] + rng.integers(15, 35, n) * POINT, 2)
+    return ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=48)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    space = LadderSpace(levels=8, loss_target=500.0)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "ticks.npy")
+        np.save(path, synthetic_ticks(args.days))
+        meta = build_store(path, os.path.join(d, "store"), POINT)
+        os.remove(path)
+        store = os.path.join(d, "store")
+
+        def evaluator(keep):
+            return Evaluator(store, 0, meta["rows"], args.folds, keep, workers=args.workers)
+
+        ev = evaluator(0.5)
+        t = time.perf_counter()
+        best, scores, history = search(ev, space, args.generations, args.batch, log=lambda *a: None)
+        cem_s = time.perf_counter() - t
+        ev.close()
+
+        n = args.generations * args.batch
+        rng = np.random.default_rng(99)
+        ev_rand = evaluator(1.0)
+        t = time.perf_counter()
+        rand = ev_rand.score([space.decode(x) for x in rng.random((n, space.dims))])
+        rand_s = time.perf_counter() - t
+        ev_rand.close()
+
+        grid = make_grid([0.5, 1.0, 1.5, 2.0, 3.0, 5.0], [10.0, 25.0, 50.0, 75.0, 100.0], [500.0], [10], ["gap666"])
+        grid = [dict(g, gap_growth=growth) for g in grid for growth in (0.0, 0.5, 1.0)]
+        ev_grid = evaluator(1.0)
+        t = time.perf_counter()
+        gres = ev_grid.score(grid)
+        grid_s = time.perf_counter() - t
+        ev_grid.close()
+
+    rand_best, grid_best = float(rand["net"].max()), float(gres["net"].max())
+    passed = {name: next((h["generation"] for h in history if h["best_net"] > value), None)
+              for name, value in (("random", rand_best), ("grid", grid_best))}
+    print(f"📈 {meta['rows']:,} ticks ({args.days} days) in {args.folds} folds, {args.workers} worker(s)")
+    print(f"{'method':<8} {'designs':>8} {'replays':>8} {'seconds':>8} {'best net':>10}")
+    print(f"{'cem':<8} {n:>8} {ev.evaluations:>8} {cem_s:>8.1f} {scores['net']:>10.2f}")
+    print(f"{'random':<8} {n:>8} {ev_rand.evaluations:>8} {rand_s:>8.1f} {rand_best:>10.2f}")
+    print(f"{'grid':<8} {len(grid):>8} {ev_grid.evaluations:>8} {grid_s:>8.1f} {grid_best:>10.2f}")
+    print(f"✂️ early stopping ran {ev.evaluations / (n * args.folds):.0%} of the design-fold replays")
+    for name, gen in passed.items():
+        if gen:
+            print(f"🏁 passed the best {name} design at generation {gen} ({history[gen - 1]['evaluations']} replays)")
+        else:
+            print(f"🏁 did not pass the best {name} design")
+    print(f"🏆 {best}")
+
+
+if __name__ == "__main__":
+    main()
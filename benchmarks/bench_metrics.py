@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of recording hot-path latencies with metrics.py.
+
+- Histogram.record() on random durations from 1 µs to 1 s (every bucket region)
+- wrap() overhead: a timed no-op call vs the bare call (best of --repeats rounds, positional
+  and keyword); fails (exit 1) when the positional call (get_tick(), order_send(request))
+  adds more than --wrap-budget ns; a keyword call also builds and unpacks a kwargs dict
+- One /metrics scrape over HTTP with --histograms histograms registered, and the
+  p50 / p99 read back against the exact values (relative error of the buckets)
+
+Usage:
+  python benchmarks/bench_metrics.py --records 500000 --histograms 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=500_000)
+    parser.add_argument("--histograms", type=int, default=10)
+    parser.add_argument("--port", type=int, default=9199)
+    parser.add_argument("--repeats", type=int, default=15, help="rounds per wrap() timing, best one kept")
+    parser.add_argument("--wrap-budget", type=int, default=750, help="max ns wrap() may add per call")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    values = [int(10 ** rng.uniform(3, 9)) for _ in range(args.records)]
+    hist = metrics.histogram("bench_record_seconds", "Random durations")
+    record = hist.record
+
+    t = time.perf_counter()
+    for v in values:
+        record(v)
+    record_ns = (time.perf_counter() - t) * 1e9 / args.records
+    t = time.perf_counter()
+    for v in values:
+        pass
+    loop_ns = (time.perf_counter() - t) * 1e9 / args.records
+
+    def noop(symbol=None):
+        return None
+    timed = metrics.wrap(noop, "bench_wrap_seconds")
+    n = args.records // 5
+
+    def loop(call, kw):
+        t = time.perf_counter()
+        if kw:
+            for _ in range(n):
+                call(symbol="XAUUSD")
+        else:
+            for _ in range(n):
+                call()
+        return (time.perf_counter() - t) * 1e9 / n
+
+    def added(kw):
+        """Best wrapped round minus best bare round, the two interleaved so drift hits both."""
+        bare, wrapped = [], []
+        for _ in range(args.repeats):
+            bare.append(loop(noop, kw))
+            wrapped.append(loop(timed, kw))
+        return min(wrapped) - min(bare)
+    wrap_ns = added(False)
+    wrap_kw_ns = added(True)
+    wrap_ok = wrap_ns <= args.wrap_budget
+
+    for i in range(args.histograms - 2):
+        h = metrics.histogram(f"bench_extra_{i}_seconds")
+        for v in values[:1000]:
+            h.record(v)
+    server = metrics.start_http_server(args.port)
+    t = time.perf_counter()
+    body = urllib.request.urlopen(f"http://127.0.0.1:{args.port}/metrics").read()
+    scrape_ms = (time.perf_counter() - t) * 1e3
+    server.shutdown()
+
+    exact = sorted(values)
+    print(f"📈 {args.records} records over 1 µs .. 1 s")
+    print(f"⏱ record()      : {record_ns - loop_ns:.0f} ns (loop overhead {loop_ns:.0f} ns excluded)")
+    print(f"⏱ wrap() adds   : {wrap_ns:.0f} ns per call (clock reads included, budget {args.wrap_budget} ns) "
+          f"{'✅' if wrap_ok else '❌'}, {wrap_kw_ns:.0f} ns with a keyword")
+    print(f"🌐 scrape       : {scrape_ms:.1f} ms, {len(body) / 1e3:.1f} kB for {args.histograms} histograms")
+    for q in (50, 99):
+        true = exact[min(len(exact) - 1, int(q / 100 * len(exact)))]
+        got = hist.percentile(q)
+        print(f"🎯 p{q}: exact={true / 1e6:.3f} ms histogram={got / 1e6:.3f} ms "
+              f"({(got - true) / true * 100:+.1f}%)")
+    if not wrap_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
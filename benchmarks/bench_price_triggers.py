@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tick-to-order latency, in-process TriggerBook vs the old AutoHotkey hand-off.
+
+- in-process: TriggerBook.on_tick() with --alerts armed levels, the crossing alert's
+  action calling a fake order_send that answers after --latency ms
+- AHK route: the part we can measure here is starting a child process per trigger
+  (subprocess.Popen of a no-op interpreter); AutoHotkey then still has to find the MT5
+  window and click the order in, so the real route is slower than this floor
+- Also reports the per-tick cost of on_tick() when nothing fires
+
+Usage:
+  python benchmarks/bench_price_triggers.py --alerts 10000 --runs 200 --latency 15
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fixed_point import PriceScale
+from price_triggers import TriggerBook, market_order
+
+
+class FakeTerminal:
+    TRADE_ACTION_DEAL, ORDER_TYPE_BUY, ORDER_TYPE_SELL = 1, 0, 1
+    ORDER_TIME_GTC, ORDER_FILLING_FOK = 0, 0
+    TRADE_RETCODE_DONE = 10009
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1e3
+
+    def order_send(self, request):
+        time.sleep(self.latency)
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, price=request["price"])
+
+
+def pct(samples, q):
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=10_000, help="armed alerts besides the one that fires")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=15.0, help="ms per order_send round trip")
+    args = parser.parse_args()
+
+    scale = PriceScale(point=0.01, digits=2)
+    mt5 = FakeTerminal(args.latency)
+    rng = random.Random(1)
+    book = TriggerBook(scale)
+    for _ in range(args.alerts):  # far from the market: never fire during the run
+        book.add(round(rng.uniform(3600, 3900), 2), "ask", "above")
+        book.add(round(rng.uniform(3000, 3300), 2), "bid", "below")
+
+    quiet = SimpleNamespace(bid=3484.80, ask=3485.00)
+    t = time.perf_counter()
+    for _ in range(100_000):
+        book.on_tick(quiet)
+    tick_us = (time.perf_counter() - t) * 1e6 / 100_000
+
+    trigger = []
+    send = []
+    for _ in range(args.runs):
+        book.add(3485.00, "ask", "above", action=market_order(mt5, "XAUUSD_", "BUY", 0.01))
+        t0 = time.perf_counter_ns()
+        fired = book.on_tick(quiet)
+        done = time.perf_counter_ns()
+        assert len(fired) == 1 and fired[0].result.retcode == FakeTerminal.TRADE_RETCODE_DONE
+        trigger.append((fired[0].fired_at - t0) / 1e3)
+        send.append((done - t0) / 1e6)
+
+    spawn = []
+    for _ in range(min(args.runs, 30)):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        proc.wait()
+        spawn.append((time.perf_counter() - t0) * 1e3)
+
+    print(f"🔔 {2 * args.alerts} armed alerts, order_send latency {args.latency:.0f} ms")
+    print(f"⏱ on_tick (no fire)      : {tick_us:.2f} µs/tick")
+    print(f"⚡ tick -> alert fired    : p50={pct(trigger, 0.5):.1f} µs p99={pct(trigger, 0.99):.1f} µs")
+    print(f"📤 tick -> order_send done: p50={pct(send, 0.5):.2f} ms p99={pct(send, 0.99):.2f} ms")
+    print(f"🐢 AHK route floor (process spawn only): p50={statistics.median(spawn):.1f} ms "
+          f"+ GUI clicks + the same order round trip")
+
+
+if __name__ == "__main__":
+    main()
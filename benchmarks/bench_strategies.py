@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cycle strategies end to end against the deterministic simulated terminal.
+
+- Scenarios (sim_terminal.scenario_ticks): trend, chop, spike, --minutes of ticks each
+- Each strategy script is imported fresh with sim_terminal.SimTerminal installed as
+  MetaTrader5, then its cycle function runs until TP / SL or the ticks run out;
+  sleep() in the script advances the simulated clock instead of blocking
+- Reports per run: loop iterations/s (positions_get polls per wall second), MT5 calls
+  per trigger (p50 of the calls from a fill up to the next accepted pending, the poll that
+  sees the fill and the order_send included), polling calls (every other call), trigger ->
+  next pending latency (wall µs of strategy CPU, and simulated ms including poll
+  intervals) and the cycle outcome
+- --json writes the rows for later runs to --compare against
+
+Usage:
+  python benchmarks/bench_strategies.py --minutes 10 --json bench_v1.json
+  python benchmarks/bench_strategies.py --only gap666 --compare bench_v1.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from sim_terminal import SCENARIOS, ScenarioEnd, SimTerminal, scenario_ticks
+
+GAP = 2.0
+SPEC = {"symbol": "XAUUSD_", "magic": 12345, "gap": GAP, "entry": "ask+10", "mode": "manual",
+        "pattern": "even", "loss_target": 500.0}
+
+# name -> (script, cycle call)
+STRATEGIES = {
+    "gap666": ("manual seprate script/new gap666666.py",
+               lambda m: m.run_cycle(m.volume_pattern_generator(), GAP)),
+    "pv_increment": ("version 0.1/pv_increment.py",
+                     lambda m: m.run_cycle(m.volume_pattern_gen("even"), m.profit_pattern_gen("even"), GAP)),
+    "november_buy": ("manual seprate script/November Buy 2 and 4 gap -1.py",
+                     lambda m: m.run_cycle(m.volume_pattern_generator())),
+    "november_sell": ("manual seprate script/November Sell buy 2 and 4 gap -1.py",
+                      lambda m: m.run_pattern(m.volume_pattern_generator())),
+    "buy_static": ("version 0.2/buy incress sell static .py",
+                   lambda m: m.run_bot()),
+}
+
+
+class SimTime:
+    """Stand-in for the script's `time` module: sleep()/time() use the simulated clock."""
+
+    def __init__(self, sim):
+        self.sleep = sim.sleep
+        self.time = sim.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def pct(samples, q):
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))] if samples else None
+
+
+def latencies(sim):
+    """Each fill -> the first pending accepted after it (wall µs, simulated ms, (calls at fill, calls at order))."""
+    wall, simulated, calls = [], [], []
+    placements = sim.placements
+    j = 0
+    for fill_sim, fill_ns, _, _, fill_calls in sim.fills:
+        while j < len(placements) and placements[j][1] < fill_ns:
+            j += 1
+        if j == len(placements):
+            break
+        wall.append((placements[j][1] - fill_ns) / 1e3)
+        simulated.append((placements[j][0] - fill_sim) * 1e3)
+        calls.append((fill_calls, placements[j][4]))
+    return wall, simulated, calls
+
+
+def run_one(name, scenario, minutes, workdir):
+    script, cycle = STRATEGIES[name]
+    sim = SimTerminal(scenario_ticks(scenario, seconds=minutes * 60))
+    os.environ["STRATEGY_SPEC"] = json.dumps(dict(SPEC, name=name))
+    sys.modules["MetaTrader5"] = sim
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    mod = None
+    result = "end"
+    sink = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sink):
+            spec = importlib.util.spec_from_file_location(f"bench_{name}_{scenario}", os.path.join(ROOT, script))
+            mod = importlib.util.module_from_spec(spec)
+            try:
+                spec.loader.exec_module(mod)
+            except ImportError as e:
+                return {"strategy": name, "scenario": scenario, "skipped": str(e)}
+            mod.time = SimTime(sim)
+            if hasattr(mod, "play_mp3_repeat"):
+                mod.play_mp3_repeat = lambda *a, **k: None
+            if hasattr(mod, "dashboard"):
+                mod.dashboard.stream = sink
+            t0 = time.perf_counter()
+            try:
+                result = cycle(mod) or "done"
+            except ScenarioEnd:
+                pass
+    finally:
+        wall = time.perf_counter() - t0
+        with contextlib.redirect_stdout(sink):
+            if mod is not None and hasattr(mod, "dashboard"):
+                mod.dashboard.stop()
+            if mod is not None and hasattr(mod, "journal"):
+                mod.journal.close()
+        os.chdir(cwd)
+        del os.environ["STRATEGY_SPEC"]
+        sys.modules.pop("MetaTrader5", None)
+
+    wall_lat, sim_lat, windows = latencies(sim)
+    calls = sum(sim.calls.values())
+    handled = end = 0
+    for start, stop in windows:          # fills that share one order overlap: count each call once
+        handled += max(0, stop - max(start, end))
+        end = max(end, stop)
+    iterations = sim.calls.get("positions_get", 0)
+    triggers = len(sim.fills)
+    return {
+        "strategy": name, "scenario": scenario, "result": result,
+        "wall_s": round(wall, 4), "sim_s": round(sim.clock - sim.ticks[0][0] / 1000.0, 1),
+        "ticks": sim.cursor + 1, "iterations": iterations,
+        "iterations_per_s": round(iterations / wall, 1) if wall else None,
+        "mt5_calls": calls, "calls_by_fn": dict(sorted(sim.calls.items(), key=lambda kv: -kv[1])),
+        "triggers": triggers, "calls_per_trigger": pct([stop - start for start, stop in windows], 0.5),
+        "polling_calls": calls - handled,
+        "trigger_to_order_wall_us_p50": pct(wall_lat, 0.5), "trigger_to_order_wall_us_p99": pct(wall_lat, 0.99),
+        "trigger_to_order_sim_ms_p50": pct(sim_lat, 0.5), "trigger_to_order_sim_ms_p99": pct(sim_lat, 0.99),
+        "balance": round(sim.balance, 2),
+    }
+
+
+def _fmt(val, spec):
+    return format(val, spec) if val is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", action="append", choices=sorted(STRATEGIES), help="strategy (repeatable)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="scenario (repeatable)")
+    parser.add_argument("--minutes", type=float, default=10.0, help="simulated minutes of ticks per scenario")
+    parser.add_argument("--json", help="write the result rows to this file")
+    parser.add_argument("--compare", help="earlier --json output to diff against")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.only or STRATEGIES:
+            for scenario in args.scenario or SCENARIOS:
+                rows.append(run_one(name, scenario, args.minutes, workdir))
+
+    old = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = {(r["strategy"], r["scenario"]): r for r in json.load(f)["rows"]}
+
+    print(f"🧪 {len(rows)} runs, {args.minutes:g} simulated minutes per scenario")
+    print(f"{'strategy':<14} {'scenario':<7} {'result':<7} {'iter/s':>10} {'trig':>5} {'calls/trig':>10} {'polling':>8} "
+          f"{'t->o µs p50':>11} {'p99':>8} {'t->o sim ms':>11}  {'vs old iter/s':>13}")
+    for r in rows:
+        if "skipped" in r:
+            print(f"{r['strategy']:<14} {r['scenario']:<7} ⏭ skipped ({r['skipped']})")
+            continue
+        prev = old.get((r["strategy"], r["scenario"]))
+        delta = ""
+        if prev and prev.get("iterations_per_s"):
+            delta = f"{r['iterations_per_s'] / prev['iterations_per_s'] - 1:+.1%}"
+        print(f"{r['strategy']:<14} {r['scenario']:<7} {r['result']:<7} {_fmt(r['iterations_per_s'], '>10.0f')} "
+              f"{r['triggers']:>5} {_fmt(r['calls_per_trigger'], '>10')} {r['polling_calls']:>8,} "
+              f"{_fmt(r['trigger_to_order_wall_us_p50'], '>11.0f')} {_fmt(r['trigger_to_order_wall_us_p99'], '>8.0f')} "
+              f"{_fmt(r['trigger_to_order_sim_ms_p50'], '>11.1f')}  {delta:>13}")
+    ran = [r for r in rows if "skipped" not in r]
+    if ran:
+        print(f"⏱ total wall {sum(r['wall_s'] for r in ran):.1f}s for "
+              f"{sum(r['sim_s'] for r in ran) / 3600:.1f} simulated hours "
+              f"(median {statistics.median(r['iterations_per_s'] or 0 for r in ran):.0f} iterations/s)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "minutes": args.minutes, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "rows": rows}, f, indent=1)
+        print(f"💾 wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tick fan-out through the shared-memory bus to N consumer processes.
+
+- The feeder (this process) publishes --ticks ticks at --rate ticks/s; each tick carries
+  its publish time (CLOCK_MONOTONIC, shared by all processes) in the `last` field
+- Every consumer attaches a TickReader, spins on read() and records publish -> seen lag
+- Terminal load is one copy_ticks_from per feeder poll however many consumers attach,
+  versus one symbol_info_tick per consumer per loop without the bus
+
+Usage:
+  python benchmarks/bench_tick_bus.py --consumers 8 --ticks 20000 --rate 2000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from tick_bus import TICK_DTYPE, TickFeeder
+
+CONSUMER = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import numpy as np
+from tick_bus import TickReader
+r = TickReader(sys.argv[2])
+total, lags, last = int(sys.argv[3]), [], -1.0
+print("ready", flush=True)
+while len(lags) < total:
+    view = r.read()
+    if len(view):
+        now = time.monotonic_ns() / 1e3
+        lags.extend((now - view.last).tolist())
+        assert view.last[0] > last  # same order for every consumer
+        last = view.last[-1]
+    else:
+        time.sleep(0.0002)
+lags = np.asarray(lags)
+print(json.dumps({"p50": float(np.percentile(lags, 50)), "p99": float(np.percentile(lags, 99)),
+                  "max": float(lags.max()), "dropped": r.dropped, "n": len(lags)}), flush=True)
+r.close()
+"""
+
+
+class NoTerminal:
+    def symbol_info_tick(self, symbol):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--consumers", type=int, default=8)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=2000.0, help="ticks per second")
+    parser.add_argument("--batch", type=int, default=4, help="ticks per publish (one copy_ticks_from)")
+    args = parser.parse_args()
+
+    symbol = f"BENCH{os.getpid()}"
+    feeder = TickFeeder(NoTerminal(), symbol, capacity=65536)
+    procs = [subprocess.Popen([sys.executable, "-c", CONSUMER, ROOT, symbol, str(args.ticks)],
+                              stdout=subprocess.PIPE, text=True) for _ in range(args.consumers)]
+    for p in procs:
+        assert p.stdout.readline().strip() == "ready"
+
+    batch = np.zeros(args.batch, dtype=TICK_DTYPE)
+    interval = args.batch / args.rate
+    publishes = 0
+    t0 = time.perf_counter()
+    sent = 0
+    while sent < args.ticks:
+        n = min(args.batch, args.ticks - sent)
+        batch["last"][:n] = time.monotonic_ns() / 1e3
+        batch["time_msc"][:n] = sent + np.arange(n)
+        feeder.publish(batch[:n])
+        publishes += 1
+        sent += n
+        time.sleep(max(0.0, t0 + publishes * interval - time.perf_counter()))
+    elapsed = time.perf_counter() - t0
+
+    results = [json.loads(p.stdout.readline()) for p in procs]
+    for p in procs:
+        p.wait()
+    feeder.close()
+
+    print(f"📡 {args.ticks} ticks in {elapsed:.1f}s to {args.consumers} consumers ({publishes} publishes)")
+    print(f"⏱ lag µs: p50={np.median([r['p50'] for r in results]):.0f} "
+          f"p99={max(r['p99'] for r in results):.0f} max={max(r['max'] for r in results):.0f}")
+    print(f"🧮 dropped: {sum(r['dropped'] for r in results)}")
+    print(f"🔌 terminal calls: {publishes} with the bus vs "
+          f"{args.consumers * publishes} polling per consumer at the same rate")
+
+
+if __name__ == "__main__":
+    main()
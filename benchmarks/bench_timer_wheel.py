@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: timer_wheel.TimerWheel cost per operation as the number of timers grows.
+
+- N timers spread over --horizon seconds (flattens, session edges, cooldowns)
+- schedule / cancel: µs per operation
+- loop step: one advance() of a 5 s check interval with nothing due (what every main-loop
+  iteration pays) and next_deadline() for the sleep
+- wake+fire: µs per expired timer, waking at each deadline in turn (advance over the
+  ticks slept through, then the callback)
+- baseline: a plain list scanned every loop step (deadline polling) and heapq
+
+Usage:
+  python benchmarks/bench_timer_wheel.py --sizes 100 1000 10000 100000
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from timer_wheel import TimerWheel
+
+START = 1_760_000_000.0
+
+
+def noop(*args):
+    pass
+
+
+def per_op(fn, n):
+    t = time.perf_counter_ns()
+    fn()
+    return (time.perf_counter_ns() - t) / n / 1e3
+
+
+def bench_wheel(deadlines, steps):
+    clock = [START]
+    wheel = TimerWheel(clock=lambda: clock[0])
+    timers = []
+    sched = per_op(lambda: timers.extend(wheel.at(d, noop) for d in deadlines), len(deadlines))
+    wheel.at(START - 1, noop)  # first step primes next_deadline
+    wheel.advance()
+
+    def loop():
+        for i in range(steps):
+            clock[0] = START + (i % 2) * 1e-3  # nothing due: stays inside the first tick
+            wheel.advance()
+            wheel.next_deadline()
+    step = per_op(loop, steps)
+    victims = timers[::10]
+    cancel = per_op(lambda: [wheel.cancel(t) for t in victims], len(victims))
+    left = len(wheel)
+
+    pending = sorted(t.at for t in timers if t.active)
+
+    def sweep():  # the loop wakes at each deadline (what wait() does)
+        for at in pending:
+            clock[0] = at
+            wheel.advance()
+    fire = per_op(sweep, left)
+    assert len(wheel) == 0 and wheel.fired == left + 1
+    return sched, step, cancel, fire
+
+
+def bench_poll(deadlines, steps):
+    pending = list(deadlines)
+    now = START
+
+    def loop():
+        for _ in range(steps):
+            due = [d for d in pending if d <= now]
+            if due:
+                pass
+            min(pending)
+    return per_op(loop, steps)
+
+
+def bench_heap(deadlines, steps):
+    heap = []
+    sched = per_op(lambda: [heapq.heappush(heap, (d, i)) for i, d in enumerate(deadlines)], len(deadlines))
+    now = START
+
+    def loop():
+        for _ in range(steps):
+            while heap and heap[0][0] <= now:
+                heapq.heappop(heap)
+            heap[0]
+    step = per_op(loop, steps)
+    fire = per_op(lambda: [heapq.heappop(heap) for _ in range(len(heap))], len(deadlines))
+    return sched, step, fire
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10_000, 100_000])
+    parser.add_argument("--horizon", type=float, default=86400.0, help="seconds the deadlines spread over")
+    parser.add_argument("--steps", type=int, default=2000, help="loop steps measured")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"⏲ timers spread over {args.horizon / 3600:g}h; µs per operation")
+    print(f"{'timers':>8} {'schedule':>9} {'loop step':>10} {'cancel':>8} {'wake+fire':>9} | "
+          f"{'poll step':>10} | {'heap push':>9} {'heap step':>9} {'heap pop':>9}")
+    for n in args.sizes:
+        deadlines = [START + 1.0 + rng.random() * args.horizon for _ in range(n)]
+        sched, step, cancel, fire = bench_wheel(deadlines, args.steps)
+        poll = bench_poll(deadlines, max(10, args.steps * 100 // n))
+        hsched, hstep, hfire = bench_heap(deadlines, args.steps)
+        print(f"{n:>8} {sched:>9.2f} {step:>10.2f} {cancel:>8.2f} {fire:>9.2f} | {poll:>10.1f} | "
+              f"{hsched:>9.2f} {hstep:>9.2f} {hfire:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: virtual_account_client against a new connection per call, on the real API.
+
+- serves overideesssss/virtual_account_api.py (its Flask app on a threaded werkzeug server,
+  state and audit files in a temp dir) on a free local port
+- --fills add_profit_per_trade reports (amounts drawn from a few values) sent four ways:
+  urllib.request per fill (a new connection each, what a hand-rolled integration does), the
+  pooled client one request per fill over keep-alive, the pooled client batched (fills
+  coalesced per amount, batches pipelined) and the asyncio client with --concurrency
+  reporters; fills/s for each, and every way must move the balance by exactly its fills
+- account(): a cold GET, an ETag revalidation (304) and a cache hit, µs each
+
+Usage:
+  python benchmarks/bench_virtual_account.py --fills 2000 --batch 50 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "overideesssss"))
+from virtual_account_client import AsyncVirtualAccountClient, VirtualAccountClient
+
+AMOUNTS = (5.0, 7.5, 10.0, 12.5)
+
+
+def serve(workdir):
+    """The API on a free port with its files in `workdir`; (url, token, stop)."""
+    from werkzeug.serving import make_server
+    os.chdir(workdir)           # DATA_FILE and AUDIT_CSV are relative paths
+    import virtual_account_api as api
+    server = make_server("127.0.0.1", 0, api.app, threaded=True, request_handler=api.NoDelayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", api.API_TOKEN, server.shutdown
+
+
+def per_call(url, token, amounts):
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json", "X-Actor": "bench"}
+    for amount in amounts:
+        body = json.dumps({"op": "add_profit_per_trade", "amount": amount, "trades": 1}).encode()
+        with urllib.request.urlopen(urllib.request.Request(f"{url}/modify", body, headers, method="POST")) as resp:
+            resp.read()
+
+
+def pooled(url, token, amounts):
+    with VirtualAccountClient(url, token, actor="bench") as va:
+        for amount in amounts:
+            va.modify("add_profit_per_trade", amount, trades=1)
+        return va.stats()
+
+
+def batched(url, token, amounts, batch):
+    with VirtualAccountClient(url, token, actor="bench", batch_size=batch) as va:
+        for amount in amounts:
+            va.add_profit_per_trade(amount)
+        return va.stats()
+
+
+def concurrent(url, token, amounts, concurrency):
+    async def run():
+        async with AsyncVirtualAccountClient(url, token, actor="bench", pool_size=concurrency) as va:
+            await asyncio.gather(*(va.modify("add_profit_per_trade", amount, trades=1) for amount in amounts))
+            return va.stats()
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fills", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50, help="trades per batch for the batched client")
+    parser.add_argument("--concurrency", type=int, default=8, help="connections of the asyncio client")
+    parser.add_argument("--reads", type=int, default=200, help="account() calls timed per case")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    amounts = [rng.choice(AMOUNTS) for _ in range(args.fills)]
+    expected = sum(amounts)
+    with tempfile.TemporaryDirectory() as d:
+        cwd = os.getcwd()
+        url, token, stop = serve(d)
+        try:
+            probe = VirtualAccountClient(url, token, max_age=0.0)
+            ways = (("per call", lambda: per_call(url, token, amounts)),
+                    ("pooled", lambda: pooled(url, token, amounts)),
+                    ("batched", lambda: batched(url, token, amounts, args.batch)),
+                    ("asyncio", lambda: concurrent(url, token, amounts, args.concurrency)))
+            rows = []
+            for name, run in ways:
+                before = probe.account()["balance"]
+                t = time.perf_counter()
+                stats = run() or {}
+                seconds = time.perf_counter() - t
+                moved = probe.account()["balance"] - before
+                rows.append((name, seconds, stats, abs(moved - expected) < 1e-6))
+
+            cold = VirtualAccountClient(url, token)
+            t = time.perf_counter()
+            cold.account()
+            cold_us = (time.perf_counter() - t) * 1e6
+            t = time.perf_counter()
+            for _ in range(args.reads):
+                cold.account(max_age=0.0)
+            revalidate_us = (time.perf_counter() - t) / args.reads * 1e6
+            t = time.perf_counter()
+            for _ in range(args.reads):
+                cold.account(max_age=60.0)
+            hit_us = (time.perf_counter() - t) / args.reads * 1e6
+            reads = cold.stats()
+            cold.close()
+            probe.close()
+        finally:
+            stop()
+            os.chdir(cwd)
+
+    print(f"📈 {args.fills:,} fills, {expected:,.2f} of profit, API on {url}")
+    print(f"{'way':<9} {'seconds':>8} {'fills/s':>9} {'requests':>9} {'connections':>11} {'balance':>8}")
+    base = rows[0][1]
+    for name, seconds, stats, ok in rows:
+        print(f"{name:<9} {seconds:>8.2f} {args.fills / seconds:>9,.0f} {stats.get('requests', args.fills):>9,} "
+              f"{stats.get('connections', args.fills):>11,} {'✅' if ok else '❌':>7}   x{base / seconds:.1f}")
+    print(f"⏱ account(): cold {cold_us:.0f} µs, revalidated {revalidate_us:.0f} µs "
+          f"({reads['revalidated']}/{args.reads} answered 304), cache hit {hit_us:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: walk_forward replay throughput and a full walk-forward over synthetic ticks.
+
+- --days of 1 s synthetic ticks (random walk, varying spread) built into a tick store
+- check: replay() of a few parameter sets over the first --check ticks against a per-tick
+  Python loop of the same cycle logic (net, cycles, wins, losses must match)
+- replay: ticks x parameter sets per second for one window of the grid
+- walk-forward: all windows with --workers processes sharing the memmapped store
+
+Usage:
+  python benchmarks/bench_walk_forward.py --days 120 --workers 2
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from risk_of_ruin import ladder_preset
+from tick_bus import TICK_DTYPE
+from walk_forward import EPS, LEGS, TickStore, build_store, make_grid, replay, summarize, walk_forward
+
+START_MSC = 1_735_689_600_000  # 2025-01-01
+POINT = 0.01
+
+
+def synthetic_ticks(days, seed=11):
+    n = days * 86400
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    ticks["time_msc"] = START_MSC + np.arange(n, dtype=np.int64) * 1000
+    ticks["bid"] = np.round(2650.0 + np.cumsum(rng.standard_t(4, n) * 0.06), 2)
+    ticks["ask"] = np.round(ticks["bid"] + rng.integers(15, 35, n) * POINT, 2)
+    return ticks
+
+
+def naive_replay(bid, ask, params, contract_size=100.0):
+    """One parameter set, one tick at a time (the run_cycle logic with fills at the market)."""
+    usd = contract_size * POINT
+    gap = int(round(params["gap"] / POINT))
+    vols = ladder_preset(params["ladder"], LEGS).volumes.tolist()
+    tp_unit, sl = params["profit_unit"] / usd, -params["loss_target"] / usd
+    level = int(ask[0]) + params["entry"]
+    side, last_buy, k = 1, level, 0
+    bv = bc = sv = sc = tvol = realized = 0.0
+    cycles = wins = losses = 0
+    for i in range(1, len(bid)):
+        b, a = int(bid[i]), int(ask[i])
+        while (a >= level) if side == 1 else (b <= level):
+            vol = vols[min(k, LEGS - 1)]
+            if side == 1:
+                bv += vol
+                bc += vol * a
+                last_buy = a
+                level = last_buy - gap
+            else:
+                sv += vol
+                sc += vol * b
+                last_buy += gap
+                level = last_buy
+            tvol += vol
+            k += 1
+            side = -side
+        pnl = bv * b - bc + sc - sv * a
+        if k and (pnl >= tvol * tp_unit - EPS or pnl <= sl + EPS):
+            realized += pnl
+            cycles += 1
+            wins += pnl >= tvol * tp_unit - EPS
+            losses += pnl < tvol * tp_unit - EPS
+            side, level, k = 1, a + params["entry"], 0
+            last_buy = level
+            bv = bc = sv = sc = tvol = 0.0
+    b, a = int(bid[-1]), int(ask[-1])
+    return (realized + bv * b - bc + sc - sv * a) * usd, cycles, wins, losses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--train-days", type=float, default=30.0)
+    parser.add_argument("--test-days", type=float, default=10.0)
+    parser.add_argument("--check", type=int, default=400_000, help="ticks compared with the Python loop")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    grid = make_grid([1.0, 1.5, 2.0, 3.0, 4.0], [25.0, 50.0, 75.0], [300.0, 500.0, 1000.0], [10, 30],
+                     ["gap666", "gap1010"])
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "ticks.npy")
+        np.save(path, synthetic_ticks(args.days))
+        t = time.perf_counter()
+        meta = build_store(path, os.path.join(d, "store"), POINT)
+        store_s = time.perf_counter() - t
+        os.remove(path)
+        store = TickStore(os.path.join(d, "store"))
+        size = sum(e.stat().st_size for e in os.scandir(os.path.join(d, "store")))
+
+        n = min(args.check, len(store))
+        sample = grid[::7]
+        got = replay(store, 0, n, sample)
+        bid, ask = np.asarray(store["bid"][:n]), np.asarray(store["ask"][:n])
+        t = time.perf_counter()
+        worst, mismatched = 0.0, 0
+        for i, params in enumerate(sample):
+            net, cycles, wins, losses = naive_replay(bid, ask, params)
+            worst = max(worst, abs(net - got["net"][i]))
+            mismatched += (cycles, wins, losses) != (got["cycles"][i], got["wins"][i], got["losses"][i])
+        naive_rate = n * len(sample) / (time.perf_counter() - t)
+
+        window = min(len(store), int(args.train_days * 86400))
+        t = time.perf_counter()
+        res = replay(store, 0, window, grid)
+        replay_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        results = walk_forward(os.path.join(d, "store"), grid, args.train_days, args.test_days, workers=args.workers)
+        wf_s = time.perf_counter() - t
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    s = summarize(results)
+    print(f"📦 store   : {meta['rows']:,} ticks ({args.days} days) in {store_s:.1f}s, {size / 1e6:.0f} MB on disk")
+    print(f"✅ check   : {len(sample)} sets over {n:,} ticks, net within {worst:.1e}, "
+          f"{mismatched} cycle count mismatches (loop: {naive_rate / 1e6:.2f}M set-ticks/s)")
+    print(f"⏱ replay  : {len(grid)} sets x {window:,} ticks in {replay_s:.2f}s "
+          f"({len(grid) * window / replay_s / 1e6:,.0f}M set-ticks/s, {len(grid) * window / replay_s / naive_rate:,.0f}× the loop), "
+          f"{int(res['cycles'].sum()):,} cycles")
+    print(f"🚶 walk    : {s['windows']} windows ({args.train_days:g}d train / {args.test_days:g}d test) in {wf_s:.1f}s "
+          f"with {args.workers} worker(s), parent peak RSS {rss:.0f} MB (mostly the synthetic tick generation)")
+    eff = f"{s['efficiency']:.2f}" if s["efficiency"] is not None else "n/a"
+    print(f"📊 OOS net {s['oos_net']:.2f} over {s['oos_days']} days, {s['oos_positive_windows']}/{s['windows']} "
+          f"windows positive, efficiency {eff}, {s['distinct_params']} distinct sets chosen")
+
+
+if __name__ == "__main__":
+    main()
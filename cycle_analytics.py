@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Cycle reconstruction and per-cycle analytics from MT5 deal history.
+
+- Deals (history_deals_get() tuples, a pandas DataFrame of them, or a dict of columns)
+  are sorted by (symbol, magic, time) once and everything else is NumPy over those arrays
+- A cycle of a ladder (magic + symbol) starts at its first deal, after the ladder went
+  flat (open volume back to 0), at the first entry after a run of closing deals
+  ("Close by script", "Equity TP close", broker [tp]/[sl]/[so] closes), or after more
+  than max_gap seconds without a deal (script restarted with legs left open)
+- Per cycle: triggers (entries from "... STOP" pendings, e.g. "Cyclic BUY STOP"), legs,
+  max open legs, peak open volume, duration, realized P&L, commission, swap, fee, net,
+  and whether it finished flat
+- ladder_summary() rolls cycles up per ladder: how many, win rate, net, average / worst
+  cycle, to see which ladders actually make money
+- cycles_frame() turns the result into a pandas DataFrame for printing / CSV
+
+Usage:
+    deals = mt5.history_deals_get(datetime(2025, 7, 1), datetime.now())
+    cycles = analyze_cycles(deals)
+    for row in ladder_summary(cycles): print(row)
+"""
+
+import numpy as np
+
+from fixed_point import volumes_to_steps
+
+MAX_GAP = 6 * 3600                  # seconds without a deal that split a ladder into two cycles
+CLOSE_PREFIXES = ("Close", "Equity TP", "[tp", "[sl", "[so")
+TRIGGER_MARK = "STOP"               # entry comment of a filled pending ("Cyclic BUY STOP")
+VOLUME_STEP = 0.0001                # volumes are summed as integer multiples of this
+
+DEAL_TYPE_BUY, DEAL_TYPE_SELL = 0, 1
+DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DEAL_ENTRY_INOUT, DEAL_ENTRY_OUT_BY = 0, 1, 2, 3
+
+FIELDS = ("ticket", "time_msc", "type", "entry", "magic", "volume", "commission", "swap", "profit", "fee",
+          "symbol", "comment")
+
+
+def deal_columns(deals, fields=FIELDS, trades_only=True):
+    """Deal tuples / DataFrame / dict -> dict of NumPy arrays (None if there are no deals)."""
+    if hasattr(deals, "columns") or isinstance(deals, dict):
+        cols = {f: np.asarray(deals[f]) for f in fields if f in deals}
+    else:
+        deals = list(deals)
+        if not deals:
+            return None
+        index = {f: i for i, f in enumerate(deals[0]._fields)}
+        values = list(zip(*deals))
+        cols = {f: np.asarray(values[index[f]]) for f in fields if f in index}
+    if "ticket" not in cols:  # empty DataFrame from an empty history
+        return None
+    if "fee" not in cols:
+        cols["fee"] = np.zeros(len(cols["ticket"]))
+    keep = (cols["type"] == DEAL_TYPE_BUY) | (cols["type"] == DEAL_TYPE_SELL)  # no balance / credit rows
+    if trades_only and not keep.all():
+        cols = {f: a[keep] for f, a in cols.items()}
+    return cols if len(cols["ticket"]) else None
+
+
+def _within(values, group_start, delta):
+    """Running sum of `delta` restarted at each group start (values = global cumsum)."""
+    base = values[group_start] - delta[group_start]
+    return values - base
+
+
+def analyze_cycles(deals, max_gap=MAX_GAP, close_prefixes=CLOSE_PREFIXES, trigger_mark=TRIGGER_MARK):
+    """Group deals into ladder cycles. Returns a dict of per-cycle NumPy columns (empty if no deals)."""
+    cols = deal_columns(deals)
+    if cols is None:
+        return {"cycles": 0}
+    symbols, sym_code = np.unique(cols["symbol"].astype(str), return_inverse=True)
+    order = np.lexsort((cols["ticket"], cols["time_msc"], cols["magic"], sym_code))
+    sym_code = sym_code[order]
+    c = {f: a[order] for f, a in cols.items()}
+    n = len(order)
+    idx = np.arange(n)
+    t = c["time_msc"].astype(np.int64)
+    magic = c["magic"].astype(np.int64)
+    entry = c["entry"]
+    comment = c["comment"].astype(str)
+
+    is_in = entry == DEAL_ENTRY_IN
+    is_out = (entry == DEAL_ENTRY_OUT) | (entry == DEAL_ENTRY_OUT_BY)
+    is_close = is_out & np.logical_or.reduce([np.char.startswith(comment, p) for p in close_prefixes])
+    is_trigger = is_in & (np.char.find(comment, trigger_mark) >= 0)
+
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = (sym_code[1:] != sym_code[:-1]) | (magic[1:] != magic[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, idx, 0))
+
+    steps = volumes_to_steps(c["volume"], VOLUME_STEP)
+    dvol = np.where(is_in, steps, np.where(is_out, -steps, 0))
+    dlegs = is_in.astype(np.int64) - is_out
+    open_vol = _within(np.cumsum(dvol), group_start, dvol)
+    open_legs = _within(np.cumsum(dlegs), group_start, dlegs)
+
+    start = new_group.copy()
+    prev_flat = np.zeros(n, dtype=bool)
+    prev_flat[1:] = open_vol[:-1] <= 0
+    after_close = np.zeros(n, dtype=bool)
+    after_close[1:] = is_close[:-1] & is_in[1:]
+    gap = np.zeros(n, dtype=bool)
+    gap[1:] = (t[1:] - t[:-1]) > max_gap * 1000
+    start |= prev_flat | after_close | gap
+    starts = np.flatnonzero(start)
+    ends = np.append(starts[1:], n) - 1
+    cycle = np.cumsum(start) - 1
+
+    # open legs / volume counted from the cycle's own start (a gap split keeps what was open)
+    legs_now = open_legs - (open_legs[starts] - dlegs[starts])[cycle]
+    vol_now = open_vol - (open_vol[starts] - dvol[starts])[cycle]
+
+    def total(a):
+        return np.add.reduceat(np.asarray(a, dtype=np.float64), starts)
+
+    profit, commission, swap, fee = (total(c[f]) for f in ("profit", "commission", "swap", "fee"))
+    return {
+        "cycles": len(starts),
+        "symbol": symbols[sym_code[starts]],
+        "magic": magic[starts],
+        "start_msc": t[starts],
+        "end_msc": t[ends],
+        "duration_s": (t[ends] - t[starts]) / 1000.0,
+        "deals": ends - starts + 1,
+        "legs": np.add.reduceat(is_in.astype(np.int64), starts),
+        "triggers": np.add.reduceat(is_trigger.astype(np.int64), starts),
+        "max_legs": np.maximum.reduceat(legs_now, starts),
+        "peak_volume": np.maximum.reduceat(vol_now, starts) * VOLUME_STEP,
+        "profit": profit,
+        "commission": commission,
+        "swap": swap,
+        "fee": fee,
+        "net": profit + commission + swap + fee,
+        "flat": vol_now[ends] <= 0,
+        "last_comment": comment[ends],
+    }
+
+
+def ladder_summary(cycles):
+    """Per (symbol, magic): cycles, wins, win rate, net, mean / worst / best cycle, mean legs."""
+    if not cycles["cycles"]:
+        return []
+    keys, inv = np.unique(np.char.add(cycles["symbol"].astype(str), "#" + cycles["magic"].astype(str)),
+                          return_inverse=True)
+    count = np.bincount(inv)
+    net = np.bincount(inv, weights=cycles["net"])
+    wins = np.bincount(inv, weights=cycles["net"] > 0)
+    legs = np.bincount(inv, weights=cycles["legs"])
+    worst = np.full(len(keys), np.inf)
+    np.minimum.at(worst, inv, cycles["net"])
+    best = np.full(len(keys), -np.inf)
+    np.maximum.at(best, inv, cycles["net"])
+    rows = []
+    for k, key in enumerate(keys):
+        symbol, magic = key.rsplit("#", 1)
+        rows.append({"symbol": symbol, "magic": int(magic), "cycles": int(count[k]), "wins": int(wins[k]),
+                     "win_rate": round(float(wins[k] / count[k]), 3), "net": round(float(net[k]), 2),
+                     "mean_net": round(float(net[k] / count[k]), 2), "worst": round(float(worst[k]), 2),
+                     "best": round(float(best[k]), 2), "mean_legs": round(float(legs[k] / count[k]), 1)})
+    return sorted(rows, key=lambda row: row["net"], reverse=True)
+
+
+def cycles_frame(cycles):
+    """pandas DataFrame with one row per cycle (times as datetimes)."""
+    import pandas as pd
+
+    df = pd.DataFrame({k: v for k, v in cycles.items() if k != "cycles"})
+    if len(df):
+        df["start"] = pd.to_datetime(df.pop("start_msc"), unit="ms")
+        df["end"] = pd.to_datetime(df.pop("end_msc"), unit="ms")
+    return df
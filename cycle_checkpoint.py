@@ -0,0 +1,95 @@
+"""
+Crash-safe checkpoints for run_cycle state and warm resume.
+
+- save_checkpoint() writes compact JSON to a temp file, fsyncs it and os.replace()s
+  it over the previous one, so a crash leaves either the old or the new state, never half
+- Generators are not serializable: the checkpoint stores how many values were taken
+  (vol_index) and advance() fast-forwards a fresh generator on resume; gap-pattern
+  scripts (new gap*.py) store machine.snapshot() instead and restore() it, their volumes
+  coming from a VolumeTape indexed by the pattern's ladder index
+- reconcile() compares the checkpoint with live positions_get / orders_get so the
+  cycle can continue the same ladder instead of placing a fresh initial BUY STOP
+- Every script names its checkpoint with checkpoint_path(strategy, symbol, magic) and
+  stores the strategy id in the state: two scripts sharing a symbol, magic and working
+  directory never load each other's ladder (resumable() and reconcile() refuse it)
+"""
+
+import json
+import os
+import time
+from itertools import islice
+
+
+def checkpoint_path(strategy, symbol, magic):
+    return f"checkpoint_{strategy}_{symbol}_{magic}.json"
+
+
+def resumable(state, strategy, symbol):
+    """True when `state` is a checkpoint this script (strategy id) wrote for `symbol`."""
+    return state is not None and state.get("strategy") == strategy and state.get("symbol") == symbol
+
+
+def save_checkpoint(path, state):
+    state = dict(state, saved_at=time.time())
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # unreadable checkpoint -> start a fresh cycle
+
+
+def clear_checkpoint(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def advance(gen, n):
+    """Skip the first n values of a generator (restores vol_gen position)."""
+    next(islice(gen, n, n), None)
+    return gen
+
+
+def reconcile(state, positions, orders, magic=None, strategy=None):
+    """
+    Match a checkpoint against the live terminal.
+
+    Returns dict:
+      known     - live positions that the checkpoint already knew about
+      new       - live positions opened while the script was down (pending triggered)
+      missing   - checkpoint tickets no longer open (closed externally / SL)
+      pending   - live pending orders of this strategy
+      status    - "resume" (ladder still live), "replace_pending" (positions live but the
+                  pending is gone and nothing new triggered), "stale" (nothing live) or
+                  "foreign" (the checkpoint was written by another strategy)
+    """
+    if strategy is not None and state.get("strategy") != strategy:
+        return {"known": [], "new": [], "missing": [], "pending": list(orders), "status": "foreign"}
+    if magic is not None:
+        positions = [p for p in positions if getattr(p, "magic", magic) == magic]
+        orders = [o for o in orders if getattr(o, "magic", magic) == magic]
+    recorded = set(state.get("tickets", []))
+    known = [p for p in positions if p.ticket in recorded]
+    new = [p for p in positions if p.ticket not in recorded]
+    live = {p.ticket for p in positions}
+    missing = sorted(recorded - live)
+
+    if not positions and not orders:
+        status = "stale"
+    elif not orders and not new and state.get("pending_price") is not None:
+        status = "replace_pending"
+    else:
+        status = "resume"
+    return {"known": known, "new": new, "missing": missing, "pending": list(orders), "status": status}
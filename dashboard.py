@@ -0,0 +1,127 @@
+"""
+Throttled terminal dashboard for the cycle scripts.
+
+- The trading loop only calls update() / log() / loop_tick(): dict writes and deque
+  appends, no terminal I/O
+- A daemon thread redraws a fixed block of status lines at FPS frames per second
+  from the latest snapshot, printing queued log lines above it
+- One panel per strategy name: P&L, TP target, pending price, trigger count and
+  loop latency (last / avg / max over the last WINDOW iterations)
+- Before start() (or after stop()) log() prints directly, so prompts still work
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+FPS = 4          # frames per second
+WINDOW = 500     # loop periods kept per panel for latency stats
+
+
+class Dashboard:
+    def __init__(self, fps=FPS, stream=None):
+        self.interval = 1.0 / fps
+        self.stream = stream or sys.stdout
+        self._panels = {}        # name -> latest fields
+        self._periods = {}       # name -> deque of loop periods (seconds)
+        self._last_tick = {}     # name -> perf_counter of previous loop_tick
+        self._logs = deque()
+        self._drawn = 0
+        self._last_frame = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- called from the trading loop (no I/O) ---------- #
+    def update(self, name, **fields):
+        panel = self._panels.get(name)
+        if panel is None:
+            panel = self._panels[name] = {}
+        panel.update(fields)
+
+    def loop_tick(self, name):
+        """Mark one loop iteration; the period since the previous mark feeds the latency stats."""
+        t = time.perf_counter()
+        prev = self._last_tick.get(name)
+        self._last_tick[name] = t
+        if prev is not None:
+            periods = self._periods.get(name)
+            if periods is None:
+                periods = self._periods[name] = deque(maxlen=WINDOW)
+            periods.append(t - prev)
+
+    def log(self, *args):
+        line = " ".join(str(a) for a in args)
+        if self._thread is None:
+            print(line)
+        else:
+            self._logs.append(line)
+
+    # ---------- renderer thread ---------- #
+    def start(self):
+        if self._thread is not None:
+            return
+        if os.name == "nt":
+            os.system("")  # enable ANSI cursor control in the Windows console
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dashboard", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._render()   # final frame + any logs still queued
+        self._drawn = 0
+        self._last_frame = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._render()
+
+    def _render(self):
+        lines = [self._panel_line(name, dict(panel)) for name, panel in list(self._panels.items())]
+        if not self._logs and lines == self._last_frame:
+            return  # nothing changed since the last frame
+        self._last_frame = lines
+        out = []
+        if self._drawn:
+            out.append(f"\x1b[{self._drawn}F\x1b[J")  # back to the top of the last frame
+        while self._logs:
+            out.append(self._logs.popleft() + "\n")
+        if lines:
+            out.append("\n".join(lines) + "\n")
+        self._drawn = len(lines)
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+
+    def _panel_line(self, name, p):
+        parts = [f"[{name}]"]
+        if "balance" in p:
+            parts.append(f"💵 Balance: {p['balance']:.2f}")
+        if "profit" in p:
+            parts.append(f"📊 P&L: {p['profit']:+.2f}")
+        if "target" in p:
+            parts.append(f"🎯 Target: {_fmt(p['target'])}")
+        if "pending" in p:
+            parts.append(f"⏳ Pending: {_fmt(p['pending'])}")
+        if "triggers" in p:
+            parts.append(f"🔔 Trades: {p['triggers']}")
+        for key, val in p.items():
+            if key not in ("balance", "profit", "target", "pending", "triggers"):
+                parts.append(f"{key}={_fmt(val)}")
+        periods = list(self._periods.get(name, ()))
+        if periods:
+            avg = sum(periods) / len(periods)
+            parts.append(f"⏱ loop {periods[-1] * 1e3:.1f}/{avg * 1e3:.1f}/{max(periods) * 1e3:.1f} ms")
+        return " | ".join(parts)
+
+
+def _fmt(val):
+    if isinstance(val, float):
+        return f"{val:.2f}"
+    return "N/A" if val is None else str(val)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Mark-to-market equity curve at tick resolution from deal history + recorded ticks.
+
+- Deals become step functions, one row per deal, all cumulative sums: cash (profit,
+  commission, swap, fee and balance operations), open BUY / SELL volume and volume x
+  open price (closes use the position's volume-weighted open price), open legs
+- Each tick looks its step up with searchsorted and is marked in closed form:
+    floating = contract * (bid * buy_vol - buy_cost + sell_cost - ask * sell_vol)
+  so there is no per-tick Python loop; ticks are processed in CHUNK-sized blocks
+  with the running peak / under-water state carried across blocks
+- Output directory: one raw file per column (<name>.dat, CURVE_DTYPE) + summary.json
+  (max drawdown, longest / total time under water, exposure); EquityCurve maps the
+  columns read-only, so a month range or a resampled view only touches the pages of the
+  columns it reads, and lookups binary-search the contiguous time column
+- One symbol per curve (its ticks mark its positions); balance operations count
+  toward balance; closes of positions opened before the deal range are ignored
+
+Usage:
+  python equity_curve.py build --ticks XAUUSD_ticks.npy --symbol XAUUSD_ --from 2025-07-01 --out runs/equity
+  python equity_curve.py show runs/equity --from 2025-09-01 --to 2025-09-08 --step 3600
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from cycle_analytics import DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DEAL_ENTRY_OUT_BY, DEAL_TYPE_BUY, DEAL_TYPE_SELL, deal_columns
+
+CHUNK = 1 << 20         # ticks marked per block
+CONTRACT_SIZE = 100.0   # XAUUSD: 100 oz per lot
+
+CURVE_DTYPE = np.dtype([
+    ("time_msc", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("balance", "<f8"), ("floating", "<f8"),
+    ("equity", "<f8"), ("drawdown", "<f8"), ("net_lots", "<f8"), ("gross_lots", "<f8"), ("legs", "<i4"),
+])
+DEAL_FIELDS = ("ticket", "time_msc", "type", "entry", "position_id", "volume", "price", "commission", "swap",
+               "profit", "fee", "symbol")
+
+
+def _msc(value):
+    """datetime / 'YYYY-MM-DD' / epoch ms -> epoch ms (naive datetimes taken as UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d")
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def _iso(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="seconds") if ms else None
+
+
+# ------------------- Deal steps ------------------- #
+def deal_steps(deals, symbol):
+    """
+    Cumulative state after each deal, with a leading all-zero row (before the first deal):
+    time_msc, cash, buy_vol, buy_cost, sell_vol, sell_cost, legs. Also the unmatched close count.
+    """
+    cols = deal_columns(deals, DEAL_FIELDS, trades_only=False)
+    if cols is None:
+        zero = np.zeros(1)
+        return {"time_msc": np.zeros(0, dtype=np.int64), "cash": zero, "buy_vol": zero, "buy_cost": zero,
+                "sell_vol": zero, "sell_cost": zero, "legs": np.zeros(1, dtype=np.int64), "unmatched": 0, "deals": 0}
+    order = np.lexsort((cols["ticket"], cols["time_msc"]))
+    c = {f: a[order] for f, a in cols.items()}
+    dtype = c["type"]
+    trade = ((dtype == DEAL_TYPE_BUY) | (dtype == DEAL_TYPE_SELL)) & (c["symbol"].astype(str) == symbol)
+    balance_op = ~((dtype == DEAL_TYPE_BUY) | (dtype == DEAL_TYPE_SELL))
+    cash = np.where(trade | balance_op, c["profit"] + c["commission"] + c["swap"] + c["fee"], 0.0)
+
+    entry = c["entry"]
+    is_in = trade & (entry == DEAL_ENTRY_IN)
+    is_out = trade & ((entry == DEAL_ENTRY_OUT) | (entry == DEAL_ENTRY_OUT_BY))
+    volume = c["volume"].astype(np.float64)
+    pos = c["position_id"].astype(np.int64)
+
+    # per position: opened volume, volume-weighted open price, side; closes matched to it
+    pos_ids, inv = np.unique(pos, return_inverse=True)
+    in_vol = np.bincount(inv, weights=np.where(is_in, volume, 0.0), minlength=len(pos_ids))
+    in_cost = np.bincount(inv, weights=np.where(is_in, volume * c["price"], 0.0), minlength=len(pos_ids))
+    pos_side = np.full(len(pos_ids), -1)
+    pos_side[inv[is_in]] = dtype[is_in]
+    matched = in_vol[inv] > 0
+    unmatched = int((is_out & ~matched).sum())
+    is_out &= matched
+    open_px = np.divide(in_cost, in_vol, out=np.zeros_like(in_cost), where=in_vol > 0)[inv]
+
+    # legs: a position counts from its first entry until its closed volume reaches the opened volume
+    out_vol = np.where(is_out, volume, 0.0)
+    by_pos = np.lexsort((np.arange(len(pos)), inv))
+    closed = np.empty_like(out_vol)
+    run = np.cumsum(out_vol[by_pos])
+    first = np.ones(len(by_pos), dtype=bool)
+    first[1:] = inv[by_pos][1:] != inv[by_pos][:-1]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(by_pos)), 0))
+    closed[by_pos] = run - (run[group_start] - out_vol[by_pos][group_start])
+    opened_first = np.zeros(len(pos), dtype=bool)
+    first_in = np.full(len(pos_ids), len(pos))
+    np.minimum.at(first_in, inv[is_in], np.flatnonzero(is_in))
+    opened_first[first_in[first_in < len(pos)]] = True
+    fully_closed = is_out & (closed >= in_vol[inv] - 1e-9) & (closed - out_vol < in_vol[inv] - 1e-9)
+    dlegs = opened_first.astype(np.int64) - fully_closed
+
+    sign = np.where(is_in, 1.0, np.where(is_out, -1.0, 0.0))
+    side = pos_side[inv]
+    dvol = sign * volume
+    buy, sell = side == DEAL_TYPE_BUY, side == DEAL_TYPE_SELL
+
+    def steps(a):
+        return np.concatenate(([0.0], np.cumsum(a)))
+
+    return {
+        "time_msc": c["time_msc"].astype(np.int64),
+        "cash": steps(cash),
+        "buy_vol": steps(np.where(buy, dvol, 0.0)),
+        "buy_cost": steps(np.where(buy, dvol * open_px, 0.0)),
+        "sell_vol": steps(np.where(sell, dvol, 0.0)),
+        "sell_cost": steps(np.where(sell, dvol * open_px, 0.0)),
+        "legs": np.concatenate(([0], np.cumsum(dlegs))),
+        "unmatched": unmatched,
+        "deals": int(trade.sum()),
+    }
+
+
+# ------------------- Tick sources ------------------- #
+def tick_chunks(ticks, chunk=CHUNK):
+    """Yield (time_msc, bid, ask) array blocks from a .npy / CSV path, a structured array or [(msc, bid, ask)]."""
+    if isinstance(ticks, str):
+        if ticks.endswith(".npy"):
+            ticks = np.load(ticks, mmap_mode="r")
+        else:
+            from sim_terminal import load_ticks
+            ticks = load_ticks(ticks)
+    if isinstance(ticks, np.ndarray) and ticks.dtype.names:
+        for i in range(0, len(ticks), chunk):
+            block = ticks[i:i + chunk]
+            yield (np.asarray(block["time_msc"], dtype=np.int64), np.asarray(block["bid"], dtype=np.float64),
+                   np.asarray(block["ask"], dtype=np.float64))
+        return
+    for i in range(0, len(ticks), chunk):
+        block = np.asarray(ticks[i:i + chunk], dtype=np.float64).reshape(-1, 3)
+        yield block[:, 0].astype(np.int64), block[:, 1], block[:, 2]
+
+
+# ------------------- Build ------------------- #
+def build(out_dir, ticks, deals, symbol, balance=0.0, contract_size=CONTRACT_SIZE):
+    """Mark every tick, write the column files + summary.json into out_dir, return the summary."""
+    t0 = time.perf_counter()
+    st = deal_steps(deals, symbol)
+    os.makedirs(out_dir, exist_ok=True)
+    deal_t = st["time_msc"]
+    peak, peak_at = -np.inf, None
+    max_dd, max_dd_pct, dd_at, dd_peak_at = 0.0, 0.0, None, None
+    uw_start = None              # time the open under-water run began
+    longest, longest_span = 0, None
+    underwater_ms = exposed_ms = 0
+    max_gross, max_legs = 0.0, 0
+    first = last = None
+    prev_t = None
+    rows = 0
+    files = {name: open(os.path.join(out_dir, f"{name}.dat"), "wb") for name in CURVE_DTYPE.names}
+    try:
+        for t, bid, ask in tick_chunks(ticks):
+            if not len(t):
+                continue
+            k = np.searchsorted(deal_t, t, side="right")
+            bv, sv = st["buy_vol"][k], st["sell_vol"][k]
+            bal = balance + st["cash"][k]
+            flt = contract_size * (bid * bv - st["buy_cost"][k] + st["sell_cost"][k] - ask * sv)
+            eq = bal + flt
+            run_peak = np.maximum(np.maximum.accumulate(eq), peak)
+            dd = eq - run_peak
+            gross = bv + sv
+            legs = st["legs"][k]
+            block = {"time_msc": t, "bid": bid, "ask": ask, "balance": bal, "floating": flt, "equity": eq,
+                     "drawdown": dd, "net_lots": bv - sv, "gross_lots": gross, "legs": legs}
+            for name, f in files.items():
+                f.write(np.ascontiguousarray(block[name], dtype=CURVE_DTYPE[name]).tobytes())
+
+            # max drawdown (and the peak it fell from)
+            i = int(np.argmin(dd))
+            if dd[i] < max_dd:
+                max_dd, dd_at = float(dd[i]), int(t[i])
+                max_dd_pct = float(dd[i] / run_peak[i]) if run_peak[i] > 0 else 0.0
+                at_peak = np.flatnonzero(eq[:i + 1] >= run_peak[i])
+                dd_peak_at = int(t[at_peak[-1]]) if len(at_peak) else peak_at
+            new_peaks = np.flatnonzero(eq >= run_peak)
+            if len(new_peaks):
+                peak_at = int(t[new_peaks[-1]])
+            peak = float(run_peak[-1])
+
+            # time under water / in the market: each tick holds its state until the next one
+            dt = np.diff(t, append=t[-1])
+            if prev_t is not None:
+                underwater_ms += int(t[0] - prev_t) * prev_uw
+                exposed_ms += int(t[0] - prev_t) * prev_exposed
+            uw = dd < -1e-9
+            underwater_ms += int(dt[uw].sum())
+            exposed_ms += int(dt[gross > 0].sum())
+            edges = np.flatnonzero(np.diff(np.concatenate(([uw_start is not None], uw)).astype(np.int8)))
+            for e in edges:  # run starts (+1) and recoveries (-1); few per block
+                if uw[e]:
+                    uw_start = int(t[e])
+                else:
+                    if int(t[e]) - uw_start > longest:
+                        longest, longest_span = int(t[e]) - uw_start, (uw_start, int(t[e]))
+                    uw_start = None
+            prev_t, prev_uw, prev_exposed = int(t[-1]), bool(uw[-1]), bool(gross[-1] > 0)
+            max_gross = max(max_gross, float(gross.max()))
+            max_legs = max(max_legs, int(legs.max()))
+            first = int(t[0]) if first is None else first
+            last = int(t[-1])
+            rows += len(t)
+            final_balance, final_equity = float(bal[-1]), float(eq[-1])
+    finally:
+        for f in files.values():
+            f.close()
+    if uw_start is not None and last - uw_start > longest:
+        longest, longest_span = last - uw_start, (uw_start, last)
+
+    span = (last - first) if rows else 0
+    summary = {
+        "symbol": symbol, "rows": rows, "columns": CURVE_DTYPE.descr, "deals": st["deals"],
+        "unmatched_closes": st["unmatched"], "from": _iso(first), "to": _iso(last),
+        "start_balance": balance, "contract_size": contract_size,
+        "final_balance": round(final_balance, 2) if rows else balance,
+        "final_equity": round(final_equity, 2) if rows else balance,
+        "max_drawdown": round(max_dd, 2), "max_drawdown_pct": round(max_dd_pct, 4),
+        "max_drawdown_at": _iso(dd_at), "max_drawdown_peak_at": _iso(dd_peak_at),
+        "longest_underwater_s": longest / 1000,
+        "longest_underwater": [_iso(longest_span[0]), _iso(longest_span[1])] if longest_span else None,
+        "underwater_share": round(underwater_ms / span, 4) if span else 0.0,
+        "in_market_share": round(exposed_ms / span, 4) if span else 0.0,
+        "max_gross_lots": round(max_gross, 4), "max_legs": max_legs,
+        "build_s": round(time.perf_counter() - t0, 3),
+    }
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=1)
+    return summary
+
+
+# ------------------- Query ------------------- #
+class EquityCurve:
+    """Read-only memmapped columns of a built curve; queries only touch the pages they read."""
+
+    def __init__(self, out_dir):
+        with open(os.path.join(out_dir, "summary.json"), encoding="utf-8") as f:
+            self.summary = json.load(f)
+        rows = self.summary["rows"]
+        self.columns = {}
+        for name in CURVE_DTYPE.names:
+            dtype = CURVE_DTYPE[name]
+            self.columns[name] = (np.memmap(os.path.join(out_dir, f"{name}.dat"), dtype=dtype, mode="r",
+                                            shape=(rows,)) if rows else np.zeros(0, dtype))
+        self.times = self.columns["time_msc"]
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def between(self, start=None, end=None):
+        """{column: memmap view} for start <= time < end (nothing copied)."""
+        lo = 0 if start is None else int(np.searchsorted(self.times, _msc(start), side="left"))
+        hi = len(self.times) if end is None else int(np.searchsorted(self.times, _msc(end), side="left"))
+        return {name: col[lo:hi] for name, col in self.columns.items()}
+
+    def at(self, when):
+        """{column: value} as of `when` (the last tick at or before it), or None before the first tick."""
+        i = int(np.searchsorted(self.times, _msc(when), side="right")) - 1
+        return {name: col[i].item() for name, col in self.columns.items()} if i >= 0 else None
+
+    def sample(self, step_s, start=None, end=None, columns=None):
+        """{column: array} with the last row of every step_s bucket (copies only those rows)."""
+        names = columns or CURVE_DTYPE.names
+        if not len(self.times):
+            return {name: self.columns[name][:0] for name in names}
+        lo = int(self.times[0]) if start is None else _msc(start)
+        hi = int(self.times[-1]) if end is None else _msc(end)
+        grid = np.arange(lo, hi + 1, int(step_s * 1000), dtype=np.int64)
+        idx = np.searchsorted(self.times, grid, side="right") - 1
+        idx = np.unique(idx[idx >= 0])
+        return {name: self.columns[name][idx] for name in names}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick-resolution equity / drawdown curve from deals + ticks.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="deals from the terminal (history_deals_get) + recorded ticks")
+    b.add_argument("--ticks", required=True, help=".npy (copy_ticks dtype) or MT5 tick CSV")
+    b.add_argument("--symbol", default="XAUUSD_")
+    b.add_argument("--from", dest="from_date", default="2020-01-01")
+    b.add_argument("--to", dest="to_date", help="default: now")
+    b.add_argument("--balance", type=float, help="balance before the first deal (default: derived from the account)")
+    b.add_argument("--contract", type=float, help="contract size (default: symbol_info)")
+    b.add_argument("--out", default=os.path.join("runs", "equity"))
+    s = sub.add_parser("show", help="summary and a resampled view of a built curve")
+    s.add_argument("dir")
+    s.add_argument("--from", dest="from_date")
+    s.add_argument("--to", dest="to_date")
+    s.add_argument("--step", type=float, default=3600.0, help="seconds per printed row")
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        import MetaTrader5 as mt5
+
+        if not mt5.initialize():
+            raise SystemExit(f"MT5 initialize failed: {mt5.last_error()}")
+        try:
+            date_to = datetime.strptime(args.to_date, "%Y-%m-%d") if args.to_date else datetime.now()
+            deals = mt5.history_deals_get(datetime.strptime(args.from_date, "%Y-%m-%d"), date_to) or ()
+            balance = args.balance
+            if balance is None:  # today's balance minus every cash movement since the range start
+                balance = mt5.account_info().balance - sum(d.profit + d.commission + d.swap + d.fee for d in deals)
+            contract = args.contract or mt5.symbol_info(args.symbol).trade_contract_size
+        finally:
+            mt5.shutdown()
+        summary = build(args.out, args.ticks, deals, args.symbol, balance, contract)
+        print(json.dumps(summary, indent=1))
+        return
+
+    curve = EquityCurve(args.dir)
+    print(json.dumps(curve.summary, indent=1))
+    print(f"{'time (UTC)':<20} {'equity':>11} {'balance':>11} {'drawdown':>10} {'net lots':>9} {'legs':>5}")
+    rows = curve.sample(args.step, args.from_date, args.to_date)
+    for i in range(len(rows["time_msc"])):
+        print(f"{datetime.fromtimestamp(rows['time_msc'][i] / 1000, timezone.utc):%Y-%m-%d %H:%M:%S} "
+              f"{rows['equity'][i]:>11.2f} {rows['balance'][i]:>11.2f} {rows['drawdown'][i]:>10.2f} "
+              f"{rows['net_lots'][i]:>9.2f} {rows['legs'][i]:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Append-only binary event journal for the cycle scripts.
+
+- Every record is length-prefixed: <u32 length><fixed 90-byte body><utf-8 note>
+- The fixed body holds kind, perf_counter_ns (monotonic), wall-clock ns, ref,
+  ticket, side, requested price, fill price, volume, bid, ask, value, retcode, attempt
+- record() only puts a tuple on a queue; a background thread packs, writes and
+  flushes whenever the queue runs dry, so a crash loses at most the last few events
+- load_session() reads a journal back into NumPy arrays for latency / slippage work
+
+Usage (reader):
+  python event_journal.py journal_XAUUSD_20251103_101500.jnl --point 0.01
+"""
+
+import argparse
+import queue
+import struct
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # only the reader needs NumPy
+    np = None
+
+# ------------------- Record layout ------------------- #
+SESSION, TICK, TRIGGER, ORDER_REQUEST, ORDER_RESULT, RETRY, CLOSE = range(7)
+KIND_NAMES = ["SESSION", "TICK", "TRIGGER", "ORDER_REQUEST", "ORDER_RESULT", "RETRY", "CLOSE"]
+
+BUY, SELL = 1, -1
+
+_BODY = struct.Struct("<BqqqqbddddddiI")
+_LEN = struct.Struct("<I")
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ("kind", "u1"), ("mono_ns", "<i8"), ("wall_ns", "<i8"), ("ref", "<i8"), ("ticket", "<i8"),
+        ("side", "i1"), ("price", "<f8"), ("fill", "<f8"), ("volume", "<f8"), ("bid", "<f8"),
+        ("ask", "<f8"), ("value", "<f8"), ("retcode", "<i4"), ("attempt", "<u4"),
+    ])
+    assert RECORD_DTYPE.itemsize == _BODY.size
+
+
+def side_code(side):
+    """'BUY' / 'SELL' (or an mt5 position/order type int) -> +1 / -1."""
+    if side in ("BUY", 0):
+        return BUY
+    if side in ("SELL", 1):
+        return SELL
+    return 0
+
+
+# ------------------- Writer ------------------- #
+class Journal:
+    def __init__(self, path, note=""):
+        self.path = path
+        self._q = queue.SimpleQueue()
+        self._ref = 0
+        self._file = open(path, "ab", buffering=1 << 20)
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+        self.record(SESSION, note=note)
+
+    def next_ref(self):
+        """Id linking an ORDER_REQUEST to its ORDER_RESULT / RETRY records."""
+        self._ref += 1
+        return self._ref
+
+    def record(self, kind, ref=0, ticket=0, side=0, price=0.0, fill=0.0, volume=0.0,
+               bid=0.0, ask=0.0, value=0.0, retcode=0, attempt=0, note=""):
+        self._q.put((kind, time.perf_counter_ns(), time.time_ns(), ref, ticket or 0, side,
+                     price or 0.0, fill or 0.0, volume or 0.0, bid or 0.0, ask or 0.0,
+                     value or 0.0, retcode or 0, attempt, note))
+
+    def close(self):
+        self._q.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        f = self._file
+        while True:
+            item = self._q.get()
+            while item is not None:
+                note = item[-1].encode("utf-8") if item[-1] else b""
+                body = _BODY.pack(*item[:-1])
+                f.write(_LEN.pack(len(body) + len(note)))
+                f.write(body)
+                f.write(note)
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            f.flush()  # queue drained: push the batch to the OS
+            if item is None:
+                return
+
+
+# ------------------- Reader ------------------- #
+def load_session(path):
+    """
+    Returns (records, notes): records is a structured array with RECORD_DTYPE,
+    notes a list of the per-record note strings (same index).
+    A truncated final record (crash mid-write) is ignored.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    bodies = bytearray()
+    notes = []
+    pos, end, size = 0, len(data), _BODY.size
+    while pos + 4 <= end:
+        (length,) = _LEN.unpack_from(data, pos)
+        if pos + 4 + length > end:
+            break
+        start = pos + 4
+        bodies += data[start:start + size]
+        notes.append(data[start + size:start + length].decode("utf-8", "replace"))
+        pos = start + length
+    return np.frombuffer(bytes(bodies), dtype=RECORD_DTYPE), notes
+
+
+def order_latencies_ms(records):
+    """ORDER_REQUEST -> ORDER_RESULT latency per ref (ms), for refs that have both."""
+    req = records[records["kind"] == ORDER_REQUEST]
+    res = records[records["kind"] == ORDER_RESULT]
+    refs, ri, si = np.intersect1d(req["ref"], res["ref"], return_indices=True)
+    return refs, (res["mono_ns"][si] - req["mono_ns"][ri]) / 1e6
+
+
+def slippage_points(records, point):
+    """Signed slippage of filled results in points (positive = worse for us)."""
+    res = records[(records["kind"] == ORDER_RESULT) & (records["fill"] != 0.0)]
+    return res["side"] * (res["fill"] - res["price"]) / point
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a binary event journal.")
+    parser.add_argument("path")
+    parser.add_argument("--point", type=float, default=0.01, help="Symbol point size for slippage.")
+    args = parser.parse_args()
+
+    records, _ = load_session(args.path)
+    print(f"📒 {args.path}: {len(records)} records")
+    for code, name in enumerate(KIND_NAMES):
+        n = int((records["kind"] == code).sum())
+        if n:
+            print(f"  {name:<14} {n}")
+    if len(records):
+        span = (records["mono_ns"][-1] - records["mono_ns"][0]) / 1e9
+        print(f"  span           {span:.1f}s")
+
+    _, lat = order_latencies_ms(records)
+    if len(lat):
+        p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+        print(f"⏱ order latency ms: p50={p50:.2f} p90={p90:.2f} p99={p99:.2f} max={lat.max():.2f}")
+    slip = slippage_points(records, args.point)
+    if len(slip):
+        print(f"📉 slippage points: mean={slip.mean():.2f} max={slip.max():.2f} (n={len(slip)})")
+    retries = int((records["kind"] == RETRY).sum())
+    print(f"🔁 retries: {retries}")
+
+
+if __name__ == "__main__":
+    main()
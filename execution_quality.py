@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Execution quality: what we asked for (event journal) against what the broker filled
+(history_deals_get), over whole histories.
+
+- Pending stops: ORDER_RESULT records (requested stop price, order ticket) are joined to
+  the entry deal of that order; per fill: slippage in points, send latency (request ->
+  result, monotonic), resting time (placed -> filled) and trigger lag (fill -> the
+  script's TRIGGER record)
+- Closes: CLOSE records (tick price sent with deviation=SLIPPAGE, position ticket) are
+  joined to the position's exit deal; per close: slippage, attempts, time lost to retries
+- Retcodes of every result / retry, split into pending and close sends, with requotes
+  (REQUOTE, PRICE_CHANGED, PRICE_OFF) and stop rejects (INVALID_PRICE, INVALID_STOPS)
+- deviation_table(): for each candidate deviation, the share of closes that would have
+  filled at once (the rest are requoted and retried) and the slippage still accepted
+- stop_buffer_table(): a clamped stop sits stops_level + buffer points from the quote it
+  was priced on; it is rejected when the market moves more than the buffer toward it
+  before the server checks. The move is the quote at request (ORDER_REQUEST bid/ask)
+  against the quote the result reports, so each candidate buffer gets a reject rate
+- Slippage is signed: positive = worse for us (BUY filled higher / SELL filled lower),
+  rounded to 0.001 point so price float noise does not cross a deviation / buffer edge
+- Everything is joins by searchsorted over sorted ticket columns, no per-order loop
+
+Usage:
+  python execution_quality.py journal_XAUUSD_*.jnl --from 2025-07-01 --point 0.01
+  python execution_quality.py journal_XAUUSD_*.jnl --deviations 5 10 20 50 500 --buffers 0 1 2 5 10
+"""
+
+import argparse
+import glob
+from datetime import datetime
+
+import numpy as np
+
+from cycle_analytics import DEAL_ENTRY_IN, DEAL_ENTRY_OUT, DEAL_ENTRY_OUT_BY, deal_columns
+from event_journal import CLOSE, ORDER_REQUEST, ORDER_RESULT, RECORD_DTYPE, RETRY, TRIGGER, load_session
+
+DEVIATIONS = (0, 2, 5, 10, 20, 50, 100, 200, 500)   # points; the scripts send SLIPPAGE = 500
+BUFFERS = (0, 1, 2, 3, 5, 10, 20)                   # points beyond stops_level; the scripts use 2
+
+RETCODE_NAMES = {
+    10004: "REQUOTE", 10006: "REJECT", 10008: "PLACED", 10009: "DONE", 10010: "DONE_PARTIAL",
+    10013: "INVALID", 10014: "INVALID_VOLUME", 10015: "INVALID_PRICE", 10016: "INVALID_STOPS",
+    10018: "MARKET_CLOSED", 10019: "NO_MONEY", 10020: "PRICE_CHANGED", 10021: "PRICE_OFF",
+    10024: "TOO_MANY_REQUESTS", 10031: "CONNECTION", 10036: "POSITION_CLOSED",
+}
+REQUOTE_RETCODES = (10004, 10020, 10021)
+STOP_REJECT_RETCODES = (10015, 10016)
+
+DEAL_FIELDS = ("ticket", "order", "time_msc", "type", "entry", "position_id", "price", "volume")
+
+
+# ------------------- Inputs ------------------- #
+def load_journals(paths):
+    """Concatenate several session journals; refs are offset so they stay unique across sessions."""
+    parts, offset = [], 0
+    for path in paths:
+        records, _ = load_session(path)
+        records = records.copy()
+        linked = records["ref"] != 0
+        records["ref"][linked] += offset
+        if linked.any():
+            offset = int(records["ref"].max())
+        parts.append(records)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=RECORD_DTYPE)
+
+
+def _lookup(keys, table):
+    """Index of each key in `table` (first match), -1 where absent."""
+    if not len(table):
+        return np.full(len(keys), -1)
+    order = np.argsort(table, kind="stable")
+    pos = np.searchsorted(table[order], keys)
+    pos = np.minimum(pos, len(table) - 1)
+    hit = table[order][pos] == keys
+    return np.where(hit, order[pos], -1)
+
+
+# ------------------- Pending stops ------------------- #
+def pending_fills(records, deals, point):
+    """Per placed pending (ORDER_RESULT): requested price, fill, slippage and timings (NaN if not filled)."""
+    res = records[records["kind"] == ORDER_RESULT]
+    req = records[records["kind"] == ORDER_REQUEST]
+    n = len(res)
+    out = {
+        "ticket": res["ticket"], "side": res["side"].astype(np.int64), "price": res["price"],
+        "attempts": res["attempt"].astype(np.int64), "filled": np.zeros(n, dtype=bool),
+        "fill": np.full(n, np.nan), "slippage": np.full(n, np.nan), "send_ms": np.full(n, np.nan),
+        "rest_s": np.full(n, np.nan), "trigger_lag_ms": np.full(n, np.nan),
+    }
+    ri = _lookup(res["ref"], req["ref"])
+    sent = ri >= 0
+    out["send_ms"][sent] = (res["mono_ns"][sent] - req["mono_ns"][ri[sent]]) / 1e6
+    if deals is None or not n:
+        return out
+
+    is_in = deals["entry"] == DEAL_ENTRY_IN
+    d_order, d_price = deals["order"][is_in].astype(np.int64), deals["price"][is_in]
+    d_msc, d_pos = deals["time_msc"][is_in].astype(np.int64), deals["position_id"][is_in].astype(np.int64)
+    di = _lookup(res["ticket"], d_order)
+    hit = di >= 0
+    out["filled"] = hit
+    out["fill"][hit] = d_price[di[hit]]
+    out["slippage"][hit] = np.round(out["side"][hit] * (d_price[di[hit]] - res["price"][hit]) / point, 3)
+    out["rest_s"][hit] = (d_msc[di[hit]] - res["wall_ns"][hit] // 1_000_000) / 1000.0
+
+    trig = records[records["kind"] == TRIGGER]
+    ti = _lookup(d_pos[di[hit]], trig["ticket"])
+    seen = ti >= 0
+    lag = np.full(int(hit.sum()), np.nan)
+    lag[seen] = trig["wall_ns"][ti[seen]] / 1e6 - d_msc[di[hit]][seen]
+    out["trigger_lag_ms"][hit] = lag
+    return out
+
+
+# ------------------- Closes ------------------- #
+def close_fills(records, deals, point):
+    """Per successful close (CLOSE record): price sent, fill, slippage, attempts, seconds lost to retries."""
+    cl = records[records["kind"] == CLOSE]
+    n = len(cl)
+    fill = np.where(cl["fill"] != 0.0, cl["fill"], np.nan)   # the result price until the deal is found
+    out = {
+        "ticket": cl["ticket"], "side": cl["side"].astype(np.int64), "price": cl["price"], "fill": fill,
+        "attempts": cl["attempt"].astype(np.int64), "retry_s": np.zeros(n), "lag_ms": np.full(n, np.nan),
+    }
+    # close retries carry the position ticket and no ref; the first one marks the first attempt
+    rt = records[(records["kind"] == RETRY) & (records["ref"] == 0) & (records["ticket"] != 0)]
+    first = _lookup(cl["ticket"], rt["ticket"])
+    retried = first >= 0
+    out["retry_s"][retried] = (cl["mono_ns"][retried] - rt["mono_ns"][first[retried]]) / 1e9
+
+    if deals is not None and n:
+        is_out = (deals["entry"] == DEAL_ENTRY_OUT) | (deals["entry"] == DEAL_ENTRY_OUT_BY)
+        d_pos, d_price = deals["position_id"][is_out].astype(np.int64), deals["price"][is_out]
+        d_msc = deals["time_msc"][is_out].astype(np.int64)
+        di = _lookup(cl["ticket"], d_pos)
+        hit = di >= 0
+        out["fill"][hit] = d_price[di[hit]]
+        out["lag_ms"][hit] = cl["wall_ns"][hit] / 1e6 - d_msc[di[hit]]
+    out["slippage"] = np.round(out["side"] * (out["fill"] - cl["price"]) / point, 3)
+    return out
+
+
+# ------------------- Retcodes ------------------- #
+def send_masks(records):
+    """Record masks of every send outcome: pending (results + their retries) and close (closes + retries)."""
+    kind, ref = records["kind"], records["ref"]
+    return {
+        "pending": (kind == ORDER_RESULT) | ((kind == RETRY) & (ref != 0)),
+        "close": (kind == CLOSE) | ((kind == RETRY) & (ref == 0)),
+    }
+
+
+def retcode_counts(records):
+    """{'pending': {name: count}, 'close': {...}} over every send outcome."""
+    out = {}
+    for group, mask in send_masks(records).items():
+        codes, counts = np.unique(records["retcode"][mask], return_counts=True)
+        out[group] = {RETCODE_NAMES.get(int(c), str(int(c))): int(k) for c, k in zip(codes, counts)}
+    return out
+
+
+def _count(records, mask, codes):
+    return int(np.isin(records["retcode"][mask], codes).sum())
+
+
+# ------------------- What-if ------------------- #
+def deviation_table(slippage, deviations=DEVIATIONS):
+    """Per deviation: closes filled at once, requoted share, mean / max accepted slippage (points)."""
+    s = np.asarray(slippage, dtype=np.float64)
+    s = s[~np.isnan(s)]
+    rows = []
+    for dev in deviations:
+        ok = s <= dev
+        acc = s[ok]
+        rows.append({"deviation": dev, "filled": int(ok.sum()), "requoted": int((~ok).sum()),
+                     "requote_rate": round(float((~ok).mean()), 4) if len(s) else 0.0,
+                     "mean_slip": round(float(acc.mean()), 2) if len(acc) else 0.0,
+                     "max_slip": round(float(acc.max()), 2) if len(acc) else 0.0})
+    return rows
+
+
+def quote_moves(records, point):
+    """Adverse quote move (points) between each pending request and its first send outcome, NaN if unknown."""
+    req = records[records["kind"] == ORDER_REQUEST]
+    outcome = records[send_masks(records)["pending"]]
+    if not len(outcome):
+        return np.full(len(req), np.nan)
+    oi = _lookup(req["ref"], outcome["ref"])   # journal order: the first outcome of each request
+    o = outcome[np.maximum(oi, 0)]
+    known = (oi >= 0) & (o["bid"] != 0.0) & (o["ask"] != 0.0) & (req["bid"] != 0.0)
+    move = np.round(np.where(req["side"] > 0, o["ask"] - req["ask"], req["bid"] - o["bid"]) / point, 3)
+    return np.where(known, move, np.nan)
+
+
+def stop_buffer_table(records, point, buffers=BUFFERS):
+    """Per buffer: placements whose quote moved further than the buffer (would be rejected if clamped)."""
+    move = quote_moves(records, point)
+    move = move[~np.isnan(move)]
+    rows = []
+    for buf in buffers:
+        rejected = int((move > buf).sum())
+        rows.append({"buffer": buf, "requests": len(move), "rejected": rejected,
+                     "reject_rate": round(rejected / len(move), 4) if len(move) else 0.0})
+    return rows
+
+
+# ------------------- Summary ------------------- #
+def _stats(values):
+    v = np.asarray(values, dtype=np.float64)
+    v = v[~np.isnan(v)]
+    if not len(v):
+        return {"n": 0}
+    p50, p90, p99 = np.percentile(v, [50, 90, 99])
+    return {"n": len(v), "mean": round(float(v.mean()), 2), "p50": round(float(p50), 2),
+            "p90": round(float(p90), 2), "p99": round(float(p99), 2), "max": round(float(v.max()), 2)}
+
+
+def analyze(records, deals, point, deviations=DEVIATIONS, buffers=BUFFERS):
+    """Everything above for one history. `deals` may be tuples, a DataFrame or columns (or None)."""
+    cols = deal_columns(deals, DEAL_FIELDS) if deals is not None else None
+    pend = pending_fills(records, cols, point)
+    closes = close_fills(records, cols, point)
+    masks = send_masks(records)
+    retries = records["kind"] == RETRY
+    return {
+        "pending": {
+            "placed": len(pend["ticket"]), "filled": int(pend["filled"].sum()),
+            "retries": int((retries & masks["pending"]).sum()),
+            "stop_rejects": _count(records, masks["pending"], STOP_REJECT_RETCODES),
+            "slippage_points": _stats(pend["slippage"]), "send_ms": _stats(pend["send_ms"]),
+            "rest_s": _stats(pend["rest_s"]), "trigger_lag_ms": _stats(pend["trigger_lag_ms"]),
+        },
+        "close": {
+            "closed": len(closes["ticket"]), "retries": int((retries & masks["close"]).sum()),
+            "requotes": _count(records, masks["close"], REQUOTE_RETCODES),
+            "slippage_points": _stats(closes["slippage"]), "attempts": _stats(closes["attempts"]),
+            "retry_s": _stats(closes["retry_s"]), "lag_ms": _stats(closes["lag_ms"]),
+        },
+        "retcodes": retcode_counts(records),
+        "deviation": deviation_table(closes["slippage"], deviations),
+        "stop_buffer": stop_buffer_table(records, point, buffers),
+    }
+
+
+def _print_stats(label, stats, unit):
+    if not stats["n"]:
+        print(f"  {label:<16} -")
+        return
+    print(f"  {label:<16} n={stats['n']:<6} mean={stats['mean']:.2f} p50={stats['p50']:.2f} "
+          f"p90={stats['p90']:.2f} p99={stats['p99']:.2f} max={stats['max']:.2f} {unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requested vs filled prices and latencies from journals + deals.")
+    parser.add_argument("journals", nargs="+", help="event journal files (globs allowed)")
+    parser.add_argument("--point", type=float, default=0.01)
+    parser.add_argument("--from", dest="from_date", default="2020-01-01", help="deal history start (YYYY-MM-DD)")
+    parser.add_argument("--no-deals", action="store_true", help="journal only (no terminal)")
+    parser.add_argument("--deviations", type=int, nargs="+", default=list(DEVIATIONS))
+    parser.add_argument("--buffers", type=int, nargs="+", default=list(BUFFERS))
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.journals for p in (glob.glob(pattern) or [pattern])})
+    records = load_journals(paths)
+    deals = None
+    if not args.no_deals:
+        import MetaTrader5 as mt5
+
+        if not mt5.initialize():
+            raise SystemExit(f"MT5 initialize failed: {mt5.last_error()}")
+        try:
+            deals = mt5.history_deals_get(datetime.strptime(args.from_date, "%Y-%m-%d"), datetime.now()) or ()
+        finally:
+            mt5.shutdown()
+
+    report = analyze(records, deals, args.point, args.deviations, args.buffers)
+    p, c = report["pending"], report["close"]
+    print(f"📒 {len(paths)} journal(s), {len(records)} records")
+    print(f"⏳ pending stops: {p['placed']} placed, {p['filled']} filled, {p['retries']} retries "
+          f"({p['stop_rejects']} stop-level rejects)")
+    _print_stats("slippage", p["slippage_points"], "pts")
+    _print_stats("send", p["send_ms"], "ms")
+    _print_stats("resting", p["rest_s"], "s")
+    _print_stats("trigger lag", p["trigger_lag_ms"], "ms")
+    print(f"✅ closes: {c['closed']} closed, {c['retries']} retries, {c['requotes']} requotes")
+    _print_stats("slippage", c["slippage_points"], "pts")
+    _print_stats("attempts", c["attempts"], "")
+    _print_stats("retry time", c["retry_s"], "s")
+    _print_stats("deal -> journal", c["lag_ms"], "ms")
+    for group, counts in report["retcodes"].items():
+        print(f"🔢 {group} retcodes: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    print(f"\n{'deviation':>9} {'filled':>7} {'requoted':>9} {'rate':>7} {'mean slip':>10} {'max slip':>9}")
+    for row in report["deviation"]:
+        print(f"{row['deviation']:>9} {row['filled']:>7} {row['requoted']:>9} {row['requote_rate']:>7.2%} "
+              f"{row['mean_slip']:>10.2f} {row['max_slip']:>9.2f}")
+    print(f"\n{'buffer':>6} {'requests':>9} {'rejected':>9} {'rate':>7}")
+    for row in report["stop_buffer"]:
+        print(f"{row['buffer']:>6} {row['requests']:>9} {row['rejected']:>9} {row['reject_rate']:>7.2%}")
+
+
+if __name__ == "__main__":
+    main()
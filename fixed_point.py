@@ -0,0 +1,108 @@
+"""
+Exact fixed-point price / volume arithmetic for the MT5 cycle scripts.
+
+- Prices are held as integer *points* (price / symbol point), volumes as integer
+  *steps* (volume / volume_step)
+- All grid / gap / stop-distance math runs on plain ints, so a ladder built from
+  a base price never drifts by a point because of float rounding
+- Floats only appear at the API boundary: reading ticks and filling order_send requests
+- The *_array helpers do the same conversion on NumPy arrays for backtests
+"""
+
+try:
+    import numpy as np
+except ImportError:  # live scripts do not need NumPy
+    np = None
+
+
+class PriceScale:
+    """Integer points / volume steps for one symbol (built from mt5.symbol_info)."""
+
+    def __init__(self, point, digits, vol_min=0.01, vol_step=0.01, vol_max=100.0, stops_level=0, freeze_level=0):
+        self.point = float(point)
+        self.digits = int(digits)
+        # points per 1.0 of price, e.g. 100 for XAUUSD with point=0.01
+        self.points_per_unit = int(round(1.0 / self.point))
+
+        self.vol_step = float(vol_step or 0.01)
+        self.vol_digits = _decimals(self.vol_step)
+        self.min_steps = int(round(float(vol_min or self.vol_step) / self.vol_step))
+        self.max_steps = int(round(float(vol_max or 100.0) / self.vol_step))
+        self.stops_level = int(stops_level or 0)  # already in points
+        self.freeze_level = int(freeze_level or 0)
+
+    @classmethod
+    def from_symbol_info(cls, info):
+        return cls(
+            point=info.point,
+            digits=info.digits,
+            vol_min=info.volume_min,
+            vol_step=info.volume_step,
+            vol_max=info.volume_max,
+            stops_level=info.trade_stops_level,
+            freeze_level=getattr(info, "trade_freeze_level", 0),
+        )
+
+    # ---------- price <-> points ---------- #
+    def to_points(self, price: float) -> int:
+        return int(round(price * self.points_per_unit))
+
+    def to_price(self, points: int) -> float:
+        return round(points / self.points_per_unit, self.digits)
+
+    def units_to_points(self, units: int) -> int:
+        """Whole price units (e.g. SELL_GAP=1 -> $1) as points."""
+        return int(units) * self.points_per_unit
+
+    def whole_part(self, points: int) -> int:
+        """Integer price part of a point value (int(price) without the float)."""
+        return points // self.points_per_unit
+
+    def frac_part(self, points: int) -> int:
+        """Fractional price part in points (price - int(price) without the float)."""
+        return points % self.points_per_unit
+
+    # ---------- broker stop distance ---------- #
+    def min_buy_stop(self, ask_points: int, buffer_points: int = 2) -> int:
+        return ask_points + self.stops_level + buffer_points
+
+    def max_sell_stop(self, bid_points: int, buffer_points: int = 2) -> int:
+        return bid_points - self.stops_level - buffer_points
+
+    def min_stop_distance(self, buffer_points: int = 2) -> int:
+        """Closest a pending may sit to the market: stops_level, and freeze_level so it stays editable."""
+        return max(self.stops_level, self.freeze_level) + buffer_points
+
+    def clamp_stop(self, side: str, price_points: int, tick, buffer_points: int = 2) -> int:
+        """Push a BUY/SELL STOP level far enough from the market to be accepted."""
+        if side == "BUY":
+            return max(price_points, self.min_buy_stop(self.to_points(tick.ask), buffer_points))
+        return min(price_points, self.max_sell_stop(self.to_points(tick.bid), buffer_points))
+
+    # ---------- volume <-> steps ---------- #
+    def to_steps(self, vol: float) -> int:
+        """Volume as a whole number of volume_step, clamped to the broker min/max."""
+        steps = int(round(vol / self.vol_step))
+        return max(self.min_steps, min(steps, self.max_steps))
+
+    def to_volume(self, steps: int) -> float:
+        return round(steps * self.vol_step, self.vol_digits)
+
+    def normalize_volume(self, vol: float) -> float:
+        return self.to_volume(self.to_steps(vol))
+
+
+def _decimals(value: float) -> int:
+    text = f"{value:.10f}".rstrip("0")
+    return len(text.split(".")[1]) if "." in text else 0
+
+
+# ------------------- Vectorized (backtests) ------------------- #
+def prices_to_points(prices, point):
+    """float price array -> int64 points array."""
+    return np.rint(np.asarray(prices, dtype=np.float64) / point).astype(np.int64)
+
+
+def volumes_to_steps(volumes, vol_step):
+    return np.rint(np.asarray(volumes, dtype=np.float64) / vol_step).astype(np.int64)
+
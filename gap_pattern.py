@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Gap patterns as data: a small DSL compiled into a transition table
+(state, fill side) -> (next side, price formula, volume index, register updates, next state).
+
+- One rule per line, actions separated by ";":
+    start: n = 1; BUY at ask + gap * n
+    on BUY: anchor = fill; SELL at anchor - gap
+    on SELL in chain: n = n + 1; BUY at ask + gap * n; goto chain
+  `start` places the first pending of a cycle, `on SIDE [in STATE]` runs when the pending
+  of that side fills while the machine is in STATE (default "main")
+- Registers, all in integer points: fill (the fill price), ask / bid (quote at the fill),
+  anchor, base (the start price), entry and gap (strategy parameters; replay feeds the
+  per-leg gap schedule); counters n (pattern step, starts at 0) and k (fills in the cycle,
+  this one included). anchor = expr and n = expr update them, in order, before the order
+  price is computed; vol = expr picks the ladder index of the new pending (default k)
+- Expressions are linear: + - * ( ) over registers and numbers (points), plus gap * n
+  and gap * k. Compiling substitutes the updates into the price, so every rule becomes a
+  fixed coefficient row over [fill, anchor, base, ask, bid, entry, gap, gap*n, gap*k, 1]
+  and one trigger costs a dict lookup and three short dot products
+- GapMachine runs a compiled pattern live (checkpointable state); walk_forward.replay
+  gathers the same tables with NumPy for every parameter set at once
+- Stop-level clamping stays with the order sender: the table gives the intended price
+- PATTERNS holds the four hand-coded ladders: alternate (new gap*.py), fixed_buy
+  (November Buy: BUY fixed, SELLs one gap lower each time), progressive_buy (November
+  Sell: SELL fixed, BUYs one gap higher each time) and static_sell (buy incress sell
+  static: BUY step gaps above the ask, SELL fixed at the first SELL's price)
+
+Usage:
+  python gap_pattern.py fixed_buy                 # print the compiled table
+  python gap_pattern.py my_pattern.gap --fills BUY SELL BUY SELL --gap 100
+"""
+
+import argparse
+import re
+from collections import namedtuple
+
+import numpy as np
+
+REGISTERS = ("fill", "anchor", "base", "ask", "bid", "entry", "gap", "gap*n", "gap*k", "1")
+COUNTERS = ("n", "k", "1")
+SIDES = ("BUY", "SELL")         # table column: 0 = BUY fill, 1 = SELL fill
+
+PATTERNS = {
+    "alternate": """
+        # new gap666666.py: SELL one gap under the last BUY fill, BUY one gap over the last BUY
+        start: BUY at ask + entry
+        on BUY: anchor = fill; SELL at anchor - gap
+        on SELL: anchor = anchor + gap; BUY at anchor
+    """,
+    "fixed_buy": """
+        # November Buy: BUY always at the first BUY price, SELL n gaps under it (n = 1, 2, ...)
+        start: BUY at ask + entry
+        on BUY: n = n + 1; SELL at base - gap * n
+        on SELL: BUY at base
+    """,
+    "progressive_buy": """
+        # November Sell: SELL always at the first SELL price, BUY n gaps over it (n = 1, 2, ...)
+        start: SELL at bid - entry
+        on SELL: n = n + 1; BUY at base + gap * n
+        on BUY: SELL at base
+    """,
+    "static_sell": """
+        # buy incress sell static: BUY n gaps over the ask, SELL fixed where the first SELL went
+        start: n = 1; BUY at ask + gap * n
+        on BUY: anchor = bid - entry; SELL at anchor; goto chain
+        on SELL in chain: n = n + 1; BUY at ask + gap * n
+        on BUY in chain: SELL at anchor
+    """,
+}
+
+Rule = namedtuple("Rule", "side price anchor count vol state")   # side index, coefficient tuples, state index
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?)|([A-Za-z_]\w*)|(\S))")
+_RULE = re.compile(r"^(?:start|on\s+(BUY|SELL)(?:\s+in\s+(\w+))?)\s*:\s*(.*)$", re.IGNORECASE)
+
+
+class PatternError(ValueError):
+    pass
+
+
+# ------------------- Expressions ------------------- #
+def _scale(form, c):
+    return {key: v * c for key, v in form.items()}
+
+
+def _add(a, b, sign=1.0):
+    out = dict(a)
+    for key, v in b.items():
+        out[key] = out.get(key, 0.0) + sign * v
+    return {key: v for key, v in out.items() if v}
+
+
+def _mul(a, b):
+    if set(a) <= {"1"}:
+        return _scale(b, a.get("1", 0.0))
+    if set(b) <= {"1"}:
+        return _scale(a, b.get("1", 0.0))
+    if set(b) == {"gap"}:
+        a, b = b, a
+    if set(a) == {"gap"} and set(b) <= set(COUNTERS):
+        g = a["gap"]
+        return {("gap" if key == "1" else f"gap*{key}"): g * v for key, v in b.items()}
+    raise PatternError("only number * expression and gap * (n / k / number) can be multiplied")
+
+
+class _Parser:
+    def __init__(self, text, env):
+        self.tokens = [m.groups() for m in _TOKEN.finditer(text) if any(m.groups())]
+        self.pos = 0
+        self.env = env
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, None)
+
+    def take(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        form = self.expr()
+        if self.pos < len(self.tokens):
+            raise PatternError(f"unexpected {''.join(t for t in self.peek() if t)!r}")
+        return form
+
+    def expr(self):
+        form = self.term()
+        while self.peek()[2] in ("+", "-"):
+            sign = 1.0 if self.take()[2] == "+" else -1.0
+            form = _add(form, self.term(), sign)
+        return form
+
+    def term(self):
+        form = self.factor()
+        while self.peek()[2] == "*":
+            self.take()
+            form = _mul(form, self.factor())
+        return form
+
+    def factor(self):
+        number, name, op = self.take()
+        if number is not None:
+            return {"1": float(number)}
+        if name is not None:
+            if name not in self.env:
+                raise PatternError(f"unknown name '{name}' ({', '.join(k for k in self.env if '*' not in k)})")
+            return dict(self.env[name])
+        if op == "(":
+            form = self.expr()
+            if self.take()[2] != ")":
+                raise PatternError("missing ')'")
+            return form
+        if op == "-":
+            return _scale(self.factor(), -1.0)
+        raise PatternError(f"unexpected {op!r}" if op else "expression ends too early")
+
+
+def _row(form, keys, what):
+    bad = set(form) - set(keys)
+    if bad:
+        hint = " (n / k count steps: use gap * n for prices)" if bad & {"n", "k"} else ""
+        raise PatternError(f"{what} cannot use {', '.join(sorted(bad))}{hint}")
+    return tuple(float(form.get(key, 0.0)) for key in keys)
+
+
+def _compile_rule(actions, start, states):
+    """Actions -> Rule with the anchor / n updates substituted into every later expression."""
+    env = {name: {name: 1.0} for name in ("fill", "anchor", "base", "ask", "bid", "entry", "gap", "n", "k")}
+    env["gap*n"], env["gap*k"] = {"gap*n": 1.0}, {"gap*k": 1.0}
+    if start:
+        for name in ("fill", "anchor", "base"):
+            env.pop(name)
+        env["n"], env["k"], env["gap*n"], env["gap*k"] = {}, {}, {}, {}
+    side = price = vol = None
+    anchor_set = False
+    state = None
+    for action in (a.strip() for a in actions.split(";")):
+        if not action:
+            continue
+        m = re.match(r"^(anchor|n|vol)\s*=\s*(.+)$", action) or re.match(r"^(BUY|SELL)\s+at\s+(.+)$", action, re.I)
+        if m is None:
+            g = re.match(r"^goto\s+(\w+)$", action)
+            if g is None:
+                raise PatternError(f"cannot read '{action}' (anchor = / n = / vol = / BUY at / SELL at / goto)")
+            state = states.setdefault(g.group(1), len(states))
+            continue
+        key, text = m.group(1), m.group(2)
+        form = _Parser(text, env).parse()
+        if key == "n":
+            _row(form, COUNTERS, "n")
+            env["n"] = form
+            env["gap*n"] = _mul({"gap": 1.0}, form)
+        elif key == "anchor":
+            env["anchor"] = form
+            anchor_set = True
+        elif key == "vol":
+            vol = _row(form, COUNTERS, "vol")
+        else:
+            if side is not None:
+                raise PatternError("one order per rule")
+            side, price = SIDES.index(key.upper()), _row(form, REGISTERS, "a price")
+    if side is None:
+        raise PatternError("a rule needs an order (BUY at ... / SELL at ...)")
+    anchor = _row(env["anchor"], REGISTERS, "anchor") if anchor_set or not start else None
+    count = _row(env["n"], COUNTERS, "n")
+    return Rule(side, price, anchor, count, vol or _row({"k": 1.0}, COUNTERS, "vol"), state)
+
+
+def compile_pattern(source, name=None):
+    """DSL text or a PATTERNS name -> GapPattern."""
+    if source in PATTERNS:
+        name, source = source, PATTERNS[source]
+    name = name or next((key for key, text in PATTERNS.items() if text == source), "custom")
+    states = {"main": 0}
+    start, rules = None, {}
+    for no, line in enumerate(source.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        m = _RULE.match(line)
+        try:
+            if m is None:
+                raise PatternError("expected 'start: ...' or 'on BUY|SELL [in STATE]: ...'")
+            fill_side, in_state, actions = m.groups()
+            if fill_side is None:
+                if start is not None:
+                    raise PatternError("more than one start rule")
+                start = _compile_rule(actions, True, states)
+                continue
+            key = (states.setdefault(in_state or "main", len(states)), SIDES.index(fill_side.upper()))
+            if key in rules:
+                raise PatternError(f"two rules for {fill_side.upper()} fills in state '{in_state or 'main'}'")
+            rules[key] = _compile_rule(actions, False, states)
+        except PatternError as e:
+            raise PatternError(f"line {no}: {e}") from None
+    if start is None:
+        raise PatternError("no start rule")
+    return GapPattern(name, source, start, rules, states)
+
+
+# ------------------- Compiled pattern ------------------- #
+class GapPattern:
+    """Transition table of one pattern, as dict rules (live) and dense arrays (replay)."""
+
+    def __init__(self, name, source, start, rules, states):
+        self.name = name
+        self.source = source
+        self.start = start
+        self.rules = rules
+        self.states = tuple(sorted(states, key=states.get))
+        self._check()
+
+    def _check(self):
+        """Every (state, side) a pending can be left in must have a rule."""
+        seen, todo = set(), [(self.start.state or 0, self.start.side)]
+        while todo:
+            key = todo.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            rule = self.rules.get(key)
+            if rule is None:
+                raise PatternError(f"{self.name}: no rule for a {SIDES[key[1]]} fill in state '{self.states[key[0]]}'")
+            todo.append((key[0] if rule.state is None else rule.state, rule.side))
+
+    def table(self, n_states=None):
+        """Dense arrays indexed [state, fill side]; unused cells keep a zero row and `defined` False."""
+        s = n_states or len(self.states)
+        out = {
+            "defined": np.zeros((s, 2), dtype=bool),
+            "side": np.zeros((s, 2), dtype=np.int64),           # +1 BUY / -1 SELL, like replay's side
+            "price": np.zeros((s, 2, len(REGISTERS))),
+            "anchor": np.zeros((s, 2, len(REGISTERS))),
+            "count": np.zeros((s, 2, len(COUNTERS))),
+            "vol": np.zeros((s, 2, len(COUNTERS))),
+            "state": np.zeros((s, 2), dtype=np.int64),
+        }
+        for (state, side), rule in self.rules.items():
+            out["defined"][state, side] = True
+            out["side"][state, side] = 1 if rule.side == 0 else -1
+            out["price"][state, side] = rule.price
+            out["anchor"][state, side] = rule.anchor
+            out["count"][state, side] = rule.count
+            out["vol"][state, side] = rule.vol
+            out["state"][state, side] = state if rule.state is None else rule.state
+        return out
+
+    def describe(self):
+        def form(row, keys):
+            terms = [f"{c:+g}*{k}" if k != "1" else f"{c:+g}" for c, k in zip(row, keys) if c]
+            return " ".join(terms) or "0"
+
+        start = self.start
+        lines = [f"pattern {self.name}: {len(self.states)} state(s), {len(self.rules)} rule(s)",
+                 f"  start -> {SIDES[start.side]} at {form(start.price, REGISTERS)}, n = {form(start.count, COUNTERS)}"
+                 f", state {self.states[start.state or 0]}"]
+        for (state, side), rule in sorted(self.rules.items()):
+            nxt = self.states[state if rule.state is None else rule.state]
+            lines.append(f"  ({self.states[state]}, {SIDES[side]}) -> {SIDES[rule.side]} at {form(rule.price, REGISTERS)}"
+                         f" | anchor = {form(rule.anchor, REGISTERS)} | n = {form(rule.count, COUNTERS)}"
+                         f" | vol = {form(rule.vol, COUNTERS)} | -> {nxt}")
+        return "\n".join(lines)
+
+
+def _dot(row, values):
+    return sum(c * v for c, v in zip(row, values) if c)
+
+
+def _source(row, var):
+    """A row as Python source over `var`, e.g. "r[0] - r[6]"; integer coefficients stay integer."""
+    out = []
+    for i, c in enumerate(row):
+        if c:
+            c = float(c)
+            c = int(c) if c.is_integer() else c
+            out.append(f"{var}[{i}]" if c == 1 else f"-{var}[{i}]" if c == -1 else f"{c!r} * {var}[{i}]")
+    return " + ".join(out).replace("+ -", "- ") or "0"
+
+
+def _move(rule):
+    """One function per rule: (registers, counters) -> (price, anchor, n, vol), built once per machine."""
+    fields = [(rule.price, "r"), (rule.anchor, "r"), (rule.count, "c"), (rule.vol, "c")]
+    return eval("lambda r, c: (" + ", ".join(f"int(round({_source(row, v)}))" for row, v in fields) + ")")
+
+
+class GapMachine:
+    """
+    One pattern run live. Prices in integer points (PriceScale.to_points). start() and
+    on_fill() return (side "BUY" / "SELL", price points, ladder index) of the next pending.
+    """
+
+    def __init__(self, pattern, gap, entry=0):
+        self.pattern = pattern if isinstance(pattern, GapPattern) else compile_pattern(pattern)
+        self.gap = int(gap)
+        self.entry = int(entry)
+        self.state = self.anchor = self.base = self.n = self.k = 0
+        self.side = None
+        # per (state, fill side): next side, next state and the rule's formulas as one function
+        self.moves = {key: (SIDES[r.side], r.state, _move(r)) for key, r in self.pattern.rules.items()}
+
+    def _regs(self, fill, bid, ask):
+        g = self.gap
+        return (fill, self.anchor, self.base, ask, bid, self.entry, g, g * self.n, g * self.k, 1)
+
+    def start(self, bid, ask, price=None):
+        """First pending of a cycle; `price` (points) replaces the start rule's price, e.g. an operator's pick."""
+        rule = self.pattern.start
+        self.state, self.n, self.k, self.anchor, self.base = 0, 0, 0, 0, 0
+        regs = self._regs(0, bid, ask)
+        price = int(round(_dot(rule.price, regs))) if price is None else int(price)
+        self.base = price
+        self.anchor = price if rule.anchor is None else int(round(_dot(rule.anchor, regs)))
+        self.n = int(round(_dot(rule.count, (0, 0, 1))))
+        self.state = rule.state or 0
+        self.side = SIDES[rule.side]
+        return self.side, price, int(round(_dot(rule.vol, (0, 0, 1))))
+
+    def on_fill(self, side, fill, bid, ask):
+        move = self.moves.get((self.state, 0 if side == "BUY" else 1))
+        if move is None:
+            raise PatternError(f"{self.pattern.name}: no rule for a {side} fill in state '{self.pattern.states[self.state]}'")
+        nxt, state, formulas = move
+        self.k += 1
+        # every formula is over the registers before the updates
+        price, self.anchor, self.n, vol = formulas(self._regs(fill, bid, ask), (self.n, self.k, 1))
+        if state is not None:
+            self.state = state
+        self.side = nxt
+        return nxt, price, vol
+
+    def snapshot(self):
+        return {"pattern": self.pattern.name, "state": self.state, "anchor": self.anchor, "base": self.base,
+                "n": self.n, "k": self.k, "side": self.side}
+
+    def restore(self, snap):
+        for key in ("state", "anchor", "base", "n", "k", "side"):
+            setattr(self, key, snap[key])
+        return self
+
+
+class VolumeTape:
+    """Ladder volumes by index over a volume generator (values are pulled once and kept)."""
+
+    def __init__(self, gen):
+        self.gen = gen
+        self.seen = []
+
+    def __getitem__(self, i):
+        while len(self.seen) <= i:
+            self.seen.append(next(self.gen))
+        return self.seen[i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a gap pattern and show its table / a fill sequence.")
+    parser.add_argument("pattern", help=f"pattern name ({' / '.join(PATTERNS)}) or a file with DSL rules")
+    parser.add_argument("--fills", nargs="*", default=[], metavar="SIDE", help="fill sides to step through")
+    parser.add_argument("--gap", type=int, default=100, help="points")
+    parser.add_argument("--entry", type=int, default=10, help="points")
+    parser.add_argument("--ask", type=int, default=300000, help="points (fills happen at the pending price)")
+    parser.add_argument("--spread", type=int, default=20, help="points")
+    args = parser.parse_args()
+
+    if args.pattern in PATTERNS:
+        pattern = compile_pattern(args.pattern)
+    else:
+        with open(args.pattern, "r") as f:
+            pattern = compile_pattern(f.read(), name=args.pattern)
+    print(pattern.describe())
+    machine = GapMachine(pattern, args.gap, args.entry)
+    side, price, vol = machine.start(args.ask - args.spread, args.ask)
+    print(f"▶ start: {side} at {price} (vol #{vol})")
+    for fill_side in args.fills:
+        if fill_side.upper() != side:
+            print(f"⚠️ the pending is a {side}: a {fill_side.upper()} fill cannot happen")
+            break
+        bid, ask = (price - args.spread, price) if side == "BUY" else (price, price + args.spread)
+        side, price, vol = machine.on_fill(side, price, bid, ask)
+        print(f"🔔 {fill_side.upper()} filled -> {side} at {price} (vol #{vol}, n={machine.n}, "
+              f"state {pattern.states[machine.state]})")
+
+
+if __name__ == "__main__":
+    main()
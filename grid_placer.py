@@ -0,0 +1,126 @@
+"""
+Laddered pending-order grid: build, validate and submit the whole ladder at once.
+
+- The ladder is computed up front in integer points (start + i * step, up for BUY STOP,
+  down for SELL STOP) and checked against stops_level / freeze_level in one pass
+- Every request of the ladder is built and pre-validated before the first order_send,
+  then the lot goes out back to back on the caller's thread (the MetaTrader5 package is
+  not thread-safe, see mt5_async.py): no tick or orders query between sends, and no
+  loop iteration per order
+- maintain() keeps the grid at `levels` live pendings: levels that left the book (filled
+  or removed, seen through the OrderMirror) are replaced by new levels past the far end,
+  and levels whose order_send failed are retried while they are still valid
+"""
+
+def build_ladder(start_points, step_points, levels, direction=1):
+    return [start_points + direction * i * step_points for i in range(levels)]
+
+
+def validate_levels(scale, levels_pts, side, tick, buffer_points=2):
+    """Split levels into (valid, rejected) against the broker's stop / freeze distance."""
+    dist = scale.min_stop_distance(buffer_points)
+    if side == "BUY":
+        limit = scale.to_points(tick.ask) + dist
+        valid = [p for p in levels_pts if p >= limit]
+    else:
+        limit = scale.to_points(tick.bid) - dist
+        valid = [p for p in levels_pts if p <= limit]
+    ok = set(valid)
+    return valid, [p for p in levels_pts if p not in ok]
+
+
+class GridPlacer:
+    def __init__(self, mt5, mirror, scale, symbol, side, volume, step_points, levels, magic,
+                 deviation=50, comment="Grid", log=print):
+        self.mt5 = mt5
+        self.mirror = mirror
+        self.scale = scale
+        self.symbol = symbol
+        self.side = side
+        self.direction = 1 if side == "BUY" else -1
+        self.volume = volume
+        self.step = step_points
+        self.levels = levels
+        self.magic = magic
+        self.deviation = deviation
+        self.comment = comment
+        self.log = log
+        self.order_type = mt5.ORDER_TYPE_BUY_STOP if side == "BUY" else mt5.ORDER_TYPE_SELL_STOP
+        self.grid = {}          # level (points) -> ticket, None while not placed
+        self.filled = []        # levels that left the book, in order
+        self.next_level = None  # first level past the far end of the grid
+        self.sent = 0
+
+    def _request(self, level_pts):
+        self.sent += 1
+        return {
+            "action": self.mt5.TRADE_ACTION_PENDING,
+            "symbol": self.symbol,
+            "volume": self.volume,
+            "type": self.order_type,
+            "price": self.scale.to_price(level_pts),
+            "deviation": self.deviation,
+            "type_filling": self.mt5.ORDER_FILLING_FOK,
+            "type_time": self.mt5.ORDER_TIME_GTC,
+            "comment": f"{self.comment} {self.sent}",
+            "magic": self.magic,
+        }
+
+    def submit(self, levels_pts):
+        """Send pendings for the given (validated) levels back to back. Returns how many were placed."""
+        requests = [self._request(p) for p in levels_pts]
+        send, ok = self.mirror.send, (self.mt5.TRADE_RETCODE_DONE, self.mt5.TRADE_RETCODE_PLACED)
+        placed = 0
+        for level, request in zip(levels_pts, requests):
+            result = send(request)
+            if result is not None and result.retcode in ok:
+                self.grid[level] = result.order
+                placed += 1
+            else:
+                self.grid[level] = None
+                self.log(f"❌ {self.side} STOP at {self.scale.to_price(level)} failed: "
+                         f"{getattr(result, 'retcode', result)}")
+        return placed
+
+    def start(self, start_points):
+        """Place the full ladder. A start too close to the market is lifted to the first valid level."""
+        tick = self.mt5.symbol_info_tick(self.symbol)
+        dist = self.scale.min_stop_distance()
+        if self.side == "BUY":
+            start_points = max(start_points, self.scale.to_points(tick.ask) + dist)
+        else:
+            start_points = min(start_points, self.scale.to_points(tick.bid) - dist)
+        ladder = build_ladder(start_points, self.step, self.levels, self.direction)
+        self.next_level = ladder[-1] + self.direction * self.step
+        valid, rejected = validate_levels(self.scale, ladder, self.side, tick)
+        for level in rejected:
+            self.log(f"⚠️ Level {self.scale.to_price(level)} inside stops/freeze distance — skipped")
+        return self.submit(valid)
+
+    def maintain(self):
+        """Refill the grid after fills / removals. Returns the levels that left the book."""
+        self.mirror.maybe_reconcile()
+        gone = [level for level, ticket in self.grid.items()
+                if ticket is not None and ticket not in self.mirror.orders]
+        for level in gone:
+            del self.grid[level]
+            self.filled.append(level)
+
+        missing = self.levels - len(self.grid)
+        extend = build_ladder(self.next_level, self.step, missing, self.direction) if missing > 0 else []
+        if extend:
+            self.next_level = extend[-1] + self.direction * self.step
+        retry = [level for level, ticket in self.grid.items() if ticket is None]
+        if not extend and not retry:
+            return gone
+
+        tick = self.mt5.symbol_info_tick(self.symbol)
+        valid, rejected = validate_levels(self.scale, retry + extend, self.side, tick)
+        for level in rejected:
+            self.grid.pop(level, None)  # market already moved through it
+        self.submit(valid)
+        return gone
+
+    @property
+    def far_level(self):
+        return self.next_level - self.direction * self.step
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Adaptive search over ladder designs, scored on recorded ticks with walk_forward.replay().
+
+- A design: the volume of each of LEVELS levels in volume steps (the last one repeats),
+  profit_unit ($ of TP per lot triggered: PROFIT_UNIT, formula25's 25 / 14.6), gap (price
+  units) and gap_growth (gap * (1 + growth * leg); 1 = SELL_GAP * sell_step). loss_target
+  and entry stay fixed: the risk budget is an input, not something to optimize away
+- Cross-entropy search: every generation samples --batch designs from independent
+  normals over the unit cube (profit unit and gap decoded on a log scale), scores them
+  and refits mean / sigma to the --elite best. Sigma shrinks as the elite agrees, so the
+  search settles in a few hundred designs where a grid over 8 levels x 10 steps x the
+  scalars would need billions
+- Early stopping (successive halving): the history is cut into --folds consecutive
+  segments; after each one only the best --keep share of the batch (by net so far) goes
+  on to the next, and designs past --max-losses stop-loss cycles or --max-lots open lots
+  are dropped as hopeless. Elites are ranked by folds survived, then net
+- Each fold's survivors are split across a process pool that stays up for the whole
+  search; workers replay their share (NumPy over designs) on the memory-mapped store
+- The best design prints as a strategy spec fragment (ladder, gap, profit_unit, ...)
+
+Usage:
+  python ladder_search.py runs/ticks_XAUUSD --from 2025-01-01 --to 2025-07-01 --levels 8 \\
+      --generations 12 --batch 64 --folds 4 --workers 4
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from walk_forward import TickStore, replay
+
+LEVELS = 8
+ELITE = 0.2             # share of a batch the distribution is refitted to
+SMOOTHING = 0.7         # weight of the elite statistics in each refit
+MIN_SIGMA = 0.02        # unit-cube sigma floor (keeps exploring around the optimum)
+
+
+def _day_msc(day):
+    return int(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+# ------------------- Design space ------------------- #
+class LadderSpace:
+    """Unit-cube genome <-> replay() parameter dict."""
+
+    def __init__(self, levels=LEVELS, max_steps=10, vol_step=0.01, profit_unit=(5.0, 100.0), gap=(0.5, 5.0),
+                 gap_growth=(0.0, 1.0), loss_target=500.0, entry=10):
+        self.levels = levels
+        self.max_steps = max_steps
+        self.vol_step = vol_step
+        self.profit_unit = profit_unit
+        self.gap = gap
+        self.gap_growth = gap_growth
+        self.loss_target = loss_target
+        self.entry = entry
+        self.dims = levels + 3
+
+    def decode(self, x):
+        steps = 1 + np.rint(x[:self.levels] * (self.max_steps - 1)).astype(int)
+        lo, hi = self.profit_unit
+        profit_unit = lo * (hi / lo) ** x[self.levels]
+        lo, hi = self.gap
+        gap = lo * (hi / lo) ** x[self.levels + 1]
+        lo, hi = self.gap_growth
+        growth = lo + (hi - lo) * x[self.levels + 2]
+        return {
+            "volumes": [round(s * self.vol_step, 2) for s in steps.tolist()],
+            "profit_unit": round(float(profit_unit) * 2) / 2,
+            "gap": round(float(gap), 2),
+            "gap_growth": round(float(growth), 3),
+            "loss_target": self.loss_target,
+            "entry": self.entry,
+        }
+
+
+# ------------------- Evaluation ------------------- #
+_stores = {}
+
+
+def _replay_share(path, lo, hi, designs, contract_size):
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = TickStore(path)
+    return replay(store, lo, hi, designs, contract_size)
+
+
+class Evaluator:
+    """Successive-halving scorer over consecutive folds of [lo, hi) with an optional process pool."""
+
+    def __init__(self, path, lo, hi, folds=4, keep=0.5, max_losses=None, max_lots=None, contract_size=100.0,
+                 workers=1):
+        self.path = path
+        edges = np.linspace(lo, hi, folds + 1).astype(np.int64)
+        self.folds = list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+        self.keep = keep
+        self.max_losses = max_losses
+        self.max_lots = max_lots
+        self.contract_size = contract_size
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        self.evaluations = 0     # design x fold replays
+        self.set_ticks = 0
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def _replay(self, lo, hi, designs):
+        if self.pool is None or len(designs) < 2 * self.workers:
+            return _replay_share(self.path, lo, hi, designs, self.contract_size)
+        shares = [list(part) for part in np.array_split(np.arange(len(designs)), self.workers)]
+        jobs = [self.pool.submit(_replay_share, self.path, lo, hi, [designs[i] for i in part], self.contract_size)
+                for part in shares]
+        parts = [job.result() for job in jobs]
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def score(self, designs):
+        """Per design: net over the folds it ran, folds survived, stop losses, peak open lots."""
+        n = len(designs)
+        net, losses, lots = np.zeros(n), np.zeros(n, dtype=np.int64), np.zeros(n)
+        folds = np.zeros(n, dtype=np.int64)
+        alive = np.arange(n)
+        for f, (lo, hi) in enumerate(self.folds):
+            res = self._replay(lo, hi, [designs[i] for i in alive])
+            net[alive] += res["net"]
+            losses[alive] += res["losses"]
+            lots[alive] = np.maximum(lots[alive], res["max_lots"])
+            folds[alive] += 1
+            self.evaluations += len(alive)
+            self.set_ticks += len(alive) * (hi - lo)
+            hopeless = np.zeros(len(alive), dtype=bool)
+            if self.max_losses is not None:
+                hopeless |= losses[alive] > self.max_losses
+            if self.max_lots is not None:
+                hopeless |= lots[alive] > self.max_lots
+            alive = alive[~hopeless]
+            if f < len(self.folds) - 1 and len(alive) > 1:
+                survivors = max(1, math.ceil(self.keep * len(alive)))
+                alive = alive[np.argsort(-net[alive], kind="stable")[:survivors]]
+            if not len(alive):
+                break
+        return {"net": net, "folds": folds, "losses": losses, "max_lots": lots}
+
+
+# ------------------- Search ------------------- #
+def search(evaluator, space, generations=12, batch=64, elite=ELITE, seed=1, log=print):
+    """Cross-entropy search; returns (best design, its scores, per-generation history)."""
+    rng = np.random.default_rng(seed)
+    mean = np.full(space.dims, 0.5)
+    sigma = np.full(space.dims, 0.3)
+    n_elite = max(2, int(round(elite * batch)))
+    best, best_key, best_scores = None, None, None
+    history = []
+    for gen in range(generations):
+        x = np.clip(rng.normal(mean, sigma, (batch, space.dims)), 0.0, 1.0)
+        designs = [space.decode(row) for row in x]
+        s = evaluator.score(designs)
+        order = np.lexsort((-s["net"], -s["folds"]))   # most folds survived, then net
+        top = order[:n_elite]
+        mean = SMOOTHING * x[top].mean(axis=0) + (1 - SMOOTHING) * mean
+        sigma = np.maximum(SMOOTHING * x[top].std(axis=0) + (1 - SMOOTHING) * sigma, MIN_SIGMA)
+        i = int(order[0])
+        key = (int(s["folds"][i]), float(s["net"][i]))
+        if best_key is None or key > best_key:
+            best, best_key = designs[i], key
+            best_scores = {k: v[i].item() for k, v in s.items()}
+        full = s["folds"] == len(evaluator.folds)
+        history.append({"generation": gen + 1, "evaluations": evaluator.evaluations, "best_net": best_key[1],
+                        "batch_best": float(s["net"][i]), "finished": int(full.sum()),
+                        "sigma": round(float(sigma.mean()), 4)})
+        log(f"🧬 gen {gen + 1:>3}: best {best_key[1]:>10.2f}  batch best {s['net'][i]:>10.2f}  "
+            f"{int(full.sum()):>3}/{batch} ran every fold  sigma {sigma.mean():.3f}  "
+            f"evaluations {evaluator.evaluations}")
+    return best, best_scores, history
+
+
+def spec_fragment(design):
+    """TOML lines for a strategies.toml [[strategy]] entry."""
+    lines = [f"ladder = [{', '.join(f'{v:g}' for v in design['volumes'])}]",
+             f"gap = {design['gap']:g}", f"profit_unit = {design['profit_unit']:g}",
+             f"loss_target = {design['loss_target']:g}", f"entry = \"ask+{design['entry']}\""]
+    if design.get("gap_growth"):
+        lines.append(f"# gap_growth = {design['gap_growth']:g} (gap * (1 + growth * leg); fixed-gap scripts ignore it)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-entropy search over ladder designs on recorded ticks.")
+    parser.add_argument("store", help="tick store built by walk_forward.py store")
+    parser.add_argument("--from", dest="from_date", help="YYYY-MM-DD (default: first tick)")
+    parser.add_argument("--to", dest="to_date", help="YYYY-MM-DD (default: last tick)")
+    parser.add_argument("--levels", type=int, default=LEVELS)
+    parser.add_argument("--max-steps", type=int, default=10, help="largest level volume in volume steps")
+    parser.add_argument("--vol-step", type=float, default=0.01)
+    parser.add_argument("--profit-unit", type=float, nargs=2, default=[5.0, 100.0], metavar=("LO", "HI"))
+    parser.add_argument("--gap", type=float, nargs=2, default=[0.5, 5.0], metavar=("LO", "HI"))
+    parser.add_argument("--gap-growth", type=float, nargs=2, default=[0.0, 1.0], metavar=("LO", "HI"))
+    parser.add_argument("--loss-target", type=float, default=500.0)
+    parser.add_argument("--entry", type=int, default=10, help="first BUY STOP: ask + points")
+    parser.add_argument("--generations", type=int, default=12)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--elite", type=float, default=ELITE)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--keep", type=float, default=0.5, help="share of a batch that goes on to the next fold")
+    parser.add_argument("--max-losses", type=int, help="stop-loss cycles after which a design is dropped")
+    parser.add_argument("--max-lots", type=float, help="peak open lots after which a design is dropped")
+    parser.add_argument("--contract-size", type=float, default=100.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    store = TickStore(args.store)
+    lo = store.index(_day_msc(args.from_date)) if args.from_date else 0
+    hi = store.index(_day_msc(args.to_date)) if args.to_date else len(store)
+    space = LadderSpace(args.levels, args.max_steps, args.vol_step, tuple(args.profit_unit), tuple(args.gap),
+                        tuple(args.gap_growth), args.loss_target, args.entry)
+    evaluator = Evaluator(args.store, lo, hi, args.folds, args.keep, args.max_losses, args.max_lots,
+                          args.contract_size, args.workers)
+    print(f"🔎 {hi - lo:,} ticks in {args.folds} folds, {args.generations} generations x {args.batch} designs")
+    t0 = time.perf_counter()
+    try:
+        best, scores, _ = search(evaluator, space, args.generations, args.batch, args.elite, args.seed)
+    finally:
+        evaluator.close()
+    elapsed = time.perf_counter() - t0
+    full = args.generations * args.batch * args.folds
+    print(f"⏱ {elapsed:.1f}s, {evaluator.evaluations} design-fold replays "
+          f"({evaluator.evaluations / full:.0%} of running every design on every fold), "
+          f"{evaluator.set_ticks / elapsed / 1e6:,.0f}M design-ticks/s")
+    print(f"🏆 net {scores['net']:.2f}, {scores['losses']} stop losses, peak {scores['max_lots']:.2f} lots")
+    print(spec_fragment(best))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,16 +13,25 @@ Behavior:
 """
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 import pygame
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cycle_checkpoint import save_checkpoint, load_checkpoint, clear_checkpoint, advance, reconcile, checkpoint_path, resumable
+from fixed_point import PriceScale
+from tick_bus import tick_source
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD_"    # trading symbol (must match your MT5 symbol name)
 SLIPPAGE = 500
 MAGIC = 12345
 LOSS_TARGET = 500.0       # equity loss stop (in $)
 PROFIT_UNIT = 600          # profit per volume unit for TP calculation
+STRATEGY_ID = "november_buy"     # stored in the checkpoint: another script's state is never resumed
+CHECKPOINT_FILE = checkpoint_path(STRATEGY_ID, SYMBOL, MAGIC)  # cycle state, rewritten atomically on every transition
 
 # ---------------- SELL GAP (Option 1: integer steps) ---------------- #
 SELL_GAP = 1              # integer gap (1 => pattern: 4054 -> 4053 -> 4052 ...)
@@ -31,6 +40,7 @@ SELL_GAP = 1              # integer gap (1 => pattern: 4054 -> 4053 -> 4052 ...)
 # ------------------- Globals ------------------- #
 order_log = []            # stores history of triggered trades (includes pattern_price)
 base_buy_price = None     # will be set to the actual placed BUY STOP price (float with decimals)
+base_buy_pts = None       # same price in integer points (used for all pattern math)
 sell_step = 1             # SELL #1 -> step=1 (pattern subtracts SELL_GAP*1), increments after placing SELL
 sell_next_price = None    # for visibility/debug
 
@@ -61,17 +71,17 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+# Integer points / volume steps for all pattern math
+scale = PriceScale.from_symbol_info(symbol_info)
+
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
 
 def normalize_volume(vol: float) -> float:
-    if vol <= vol_min:
-        return vol_min
-    steps = round((vol - vol_min) / vol_step)
-    normalized = vol_min + steps * vol_step
-    normalized = max(vol_min, min(normalized, vol_max))
-    return float(round(normalized, 8))
+    return scale.normalize_volume(vol)
 
 def printl(*args, **kwargs):
     print(f"[{now()}]", *args, **kwargs)
@@ -140,10 +150,10 @@ def close_all_positions(max_attempts=0, delay=1.0):
                 attempt += 1
                 if pos.type == mt5.POSITION_TYPE_BUY:
                     close_type = mt5.ORDER_TYPE_SELL
-                    price = mt5.symbol_info_tick(SYMBOL).bid
+                    price = get_tick().bid
                 else:
                     close_type = mt5.ORDER_TYPE_BUY
-                    price = mt5.symbol_info_tick(SYMBOL).ask
+                    price = get_tick().ask
 
                 request = {
                     "action": mt5.TRADE_ACTION_DEAL,
@@ -195,21 +205,13 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
     """
     cancel_all_pending()
     volume = normalize_volume(volume)
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick available to place order.")
         return None
 
-    if order_side == "BUY":
-        mt_type = mt5.ORDER_TYPE_BUY_STOP
-        min_price = tick.ask + stop_level + (2 * point)
-        price = max(base_price, min_price)
-    else:
-        mt_type = mt5.ORDER_TYPE_SELL_STOP
-        max_price = tick.bid - stop_level - (2 * point)
-        price = min(base_price, max_price)
-
-    price = round(price, digits)
+    mt_type = mt5.ORDER_TYPE_BUY_STOP if order_side == "BUY" else mt5.ORDER_TYPE_SELL_STOP
+    price = scale.to_price(scale.clamp_stop(order_side, scale.to_points(base_price), tick))
     request = {
         "action": mt5.TRADE_ACTION_PENDING,
         "symbol": SYMBOL,
@@ -239,40 +241,101 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
             return None
 
 # ------------------- Trading Cycle (Option C with Option A pattern output) ------------------- #
-def run_cycle(vol_gen):
-    global base_buy_price, sell_step, sell_next_price
-
-    tick = mt5.symbol_info_tick(SYMBOL)
-    if not tick:
-        printl("❌ No tick data available. Cannot run cycle.")
-        return "error"
-
-    base_ask = tick.ask
-
-    # AUTO MODE: pick initial BUY STOP as ASK adjusted by broker stop distance
-    min_buy_stop = base_ask + stop_level + (2 * point)
-    buy_price = round(min_buy_stop, digits)
-
-    first_vol = next(vol_gen)
-    cumulative_tp = first_vol * PROFIT_UNIT
-
-    printl(f"🟢 Auto BUY STOP selected & adjusted to {buy_price} (market ask={base_ask})")
-    active_price = place_pending_stop("BUY", buy_price, first_vol)
-    if not active_price:
-        return "error"
-
-    # lock base_buy_price to the actually placed BUY STOP price (float with decimals)
-    base_buy_price = active_price
-    last_buy_price = base_buy_price
-    last_order_type = "BUY"
-    last_positions = mt5.positions_get(symbol=SYMBOL) or []
-    last_pos_count = len(last_positions)
-    baseline_equity = account_equity_profit()
-    triggered_count = 0
-    last_trigger_info = None
-
-    printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
-    printl(f"💰 Initial cumulative TP target = ${cumulative_tp:.2f}\n")
+def run_cycle(vol_gen, resume=None):
+    global base_buy_price, base_buy_pts, sell_step, sell_next_price
+
+    live = None
+    if resume is not None:
+        recovery_start = time.perf_counter()
+        live = reconcile(resume, mt5.positions_get(symbol=SYMBOL) or [], mt5.orders_get(symbol=SYMBOL) or [], MAGIC, STRATEGY_ID)
+        if live["status"] == "foreign":
+            printl(f"📂 {CHECKPOINT_FILE} was written by another strategy — starting a fresh cycle.")
+        if live["status"] in ("stale", "foreign"):
+            if live["status"] == "stale":
+                printl("📂 Checkpoint found but no positions/pendings are live any more — starting a fresh cycle.")
+            clear_checkpoint(CHECKPOINT_FILE)
+            resume = None
+
+    if resume is None:
+        tick = get_tick()
+        if not tick:
+            printl("❌ No tick data available. Cannot run cycle.")
+            return "error"
+
+        base_ask = tick.ask
+
+        # AUTO MODE: pick initial BUY STOP as ASK adjusted by broker stop distance
+        buy_price = scale.to_price(scale.min_buy_stop(scale.to_points(base_ask)))
+
+        first_vol = next(vol_gen)
+        vol_index = 1  # values taken from vol_gen (restores it on resume)
+        cumulative_tp = first_vol * PROFIT_UNIT
+
+        printl(f"🟢 Auto BUY STOP selected & adjusted to {buy_price} (market ask={base_ask})")
+        active_price = place_pending_stop("BUY", buy_price, first_vol)
+        if not active_price:
+            return "error"
+
+        # lock base_buy_price to the actually placed BUY STOP price (float with decimals)
+        base_buy_price = active_price
+        base_buy_pts = scale.to_points(active_price)
+        last_order_type = "BUY"
+        pending_volume = first_vol
+        last_positions = mt5.positions_get(symbol=SYMBOL) or []
+        last_pos_count = len(last_positions)
+        handled_tickets = [p.ticket for p in last_positions]
+        baseline_equity = account_equity_profit()
+        triggered_count = 0
+        last_trigger_info = None
+
+        printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
+        printl(f"💰 Initial cumulative TP target = ${cumulative_tp:.2f}\n")
+    else:
+        # warm resume: same anchor, same SELL step, same baseline, vol_gen fast-forwarded
+        vol_index = resume["vol_index"]
+        advance(vol_gen, vol_index)
+        base_buy_pts = resume["base_buy_pts"]
+        base_buy_price = scale.to_price(base_buy_pts)
+        sell_step = resume["sell_step"]
+        last_order_type = resume["last_order_type"]
+        active_price = resume["pending_price"]
+        pending_volume = resume["pending_volume"]
+        cumulative_tp = resume["cumulative_tp"]
+        baseline_equity = resume["baseline_equity"]
+        triggered_count = resume["triggered_count"]
+        order_log[:] = resume.get("order_log", [])
+        handled_tickets = [p.ticket for p in live["known"]]
+        # positions opened while we were down show up as new triggers in the loop
+        last_positions = live["known"]
+        last_pos_count = len(last_positions)
+        last_trigger_info = None
+
+        if live["status"] == "replace_pending":
+            printl(f"♻️ Pending {last_order_type} STOP is gone — placing it again at {active_price}")
+            active_price = place_pending_stop(last_order_type, active_price, pending_volume)
+        recovery_ms = (time.perf_counter() - recovery_start) * 1e3
+        printl(f"♻️ Resumed pattern: base={base_buy_price}, sell_step={sell_step}, triggers={triggered_count}, "
+               f"new while down={len(live['new'])}, recovery={recovery_ms:.1f} ms")
+
+    def checkpoint():
+        save_checkpoint(CHECKPOINT_FILE, {
+            "strategy": STRATEGY_ID,
+            "symbol": SYMBOL,
+            "magic": MAGIC,
+            "vol_index": vol_index,
+            "base_buy_pts": base_buy_pts,
+            "sell_step": sell_step,
+            "last_order_type": last_order_type,
+            "pending_price": active_price,
+            "pending_volume": pending_volume,
+            "cumulative_tp": cumulative_tp,
+            "baseline_equity": baseline_equity,
+            "triggered_count": triggered_count,
+            "tickets": handled_tickets,
+            "order_log": order_log,
+        })
+
+    checkpoint()
 
     # ---------------- MAIN LOOP ----------------
     while True:
@@ -318,16 +381,17 @@ def run_cycle(vol_gen):
                     printl(f"🎯 This position caused TP to be reached! Profit={cur_total_profit:.2f} ≥ Target={cumulative_tp:.2f}")
                     printl(f"📌 Triggering position details: {last_trigger_info}")
                     close_all_positions()
+                    clear_checkpoint(CHECKPOINT_FILE)
                     return "profit"
 
                 # Prepare pattern_price for logging (integer part pattern)
                 # If BUY triggered: pattern_price = int(base_buy_price)
                 # If SELL triggered: pattern_price = int(base_buy_price) - SELL_GAP * (sell_step - 1)
                 if pos.type == mt5.POSITION_TYPE_BUY:
-                    pattern_price_display = int(base_buy_price)
+                    pattern_price_display = scale.whole_part(base_buy_pts)
                 else:
                     # For a SELL that just triggered, the step used was (sell_step - 1)
-                    pattern_price_display = int(base_buy_price) - SELL_GAP * (sell_step - 1)
+                    pattern_price_display = scale.whole_part(base_buy_pts) - SELL_GAP * (sell_step - 1)
 
                 # store actual close if available (we'll store open price now; actual close recorded in summary when closing)
                 order_log.append({
@@ -341,40 +405,33 @@ def run_cycle(vol_gen):
 
                 # update cumulative TP target with next volume
                 next_vol = next(vol_gen)
+                vol_index += 1
                 cumulative_tp += next_vol * PROFIT_UNIT
 
                 # ------------------ Corrected Pattern Logic (placement using integer SELL_GAP) ------------------
                 # BUY is fixed at base_buy_price (locked to the first placed BUY)
                 # SELL placement computes integer pattern target and attaches fractional part of base_buy_price
                 if pos.type == mt5.POSITION_TYPE_BUY:
-                    # fractional part of base_buy_price preserved for decimal
-                    frac = base_buy_price - int(base_buy_price)
-
-                    # compute pattern integer for this sell placement: int(base) - SELL_GAP * sell_step
-                    pattern_integer = int(base_buy_price) - SELL_GAP * sell_step
-
-                    # desired decimal sell = pattern_integer + frac
-                    desired_sell = pattern_integer + frac
+                    # int(base) - SELL_GAP * sell_step with the fractional part of base preserved;
+                    # in points that is just base minus whole units, so nothing is lost to float
+                    desired_sell_pts = base_buy_pts - scale.units_to_points(SELL_GAP * sell_step)
 
                     # check current tick to ensure SELL stop is valid (must be sufficiently below market)
-                    tick_now = mt5.symbol_info_tick(SYMBOL)
+                    tick_now = get_tick()
                     if not tick_now:
                         printl("❌ No tick available while computing SELL price.")
                         return "error"
 
                     # broker maximum allowed SELL price (anything higher / closer than this will be rejected)
-                    max_allowed_sell = tick_now.bid - stop_level - (2 * point)
+                    max_allowed_sell_pts = scale.max_sell_stop(scale.to_points(tick_now.bid))
 
-                    # If desired_sell is TOO CLOSE (i.e., desired_sell > max_allowed_sell), push it further down
-                    if desired_sell > max_allowed_sell:
-                        # we need to push desired_sell down so it's <= max_allowed_sell - 1*point
-                        # compute difference in points; convert to decimal shift by point
-                        # set desired_sell to max_allowed_sell - 1*point (keep fractional part as much as possible)
-                        desired_sell = max_allowed_sell - (1 * point)
+                    # If desired SELL is TOO CLOSE, push it one point below the broker maximum
+                    if desired_sell_pts > max_allowed_sell_pts:
+                        desired_sell_pts = max_allowed_sell_pts - 1
 
                     # set the next SELL price (decimal) for placement
                     next_side = "SELL"
-                    next_price = round(desired_sell, digits)
+                    next_price = scale.to_price(desired_sell_pts)
                     sell_next_price = next_price  # for debug/visibility
 
                     # increment step so next SELL will be further down (pattern integer also uses this)
@@ -383,7 +440,7 @@ def run_cycle(vol_gen):
                 else:
                     # SELL triggered -> always place BUY at fixed base price (decimal)
                     next_side = "BUY"
-                    next_price = round(base_buy_price, digits)
+                    next_price = scale.to_price(base_buy_pts)
 
                 # ------------------------------------------------------------
 
@@ -393,6 +450,9 @@ def run_cycle(vol_gen):
 
                 active_price = place_pending_stop(next_side, next_price, next_vol)
                 last_order_type = next_side
+                pending_volume = next_vol
+                handled_tickets.append(pos.ticket)
+                checkpoint()
 
             last_pos_count = current_count
             last_positions = positions
@@ -414,16 +474,23 @@ def run_cycle(vol_gen):
                 printl("📌 TP hit but trigger position not identified in loop (maybe was closed externally).")
                 printl(f"📌 Account state: {last_trigger_info}")
             close_all_positions()
+            clear_checkpoint(CHECKPOINT_FILE)
             return "profit"
         if total_profit <= -LOSS_TARGET:
             printl(f"\n❌ SL hit! Profit={total_profit:.2f} ≤ -{LOSS_TARGET}")
             close_all_positions()
+            clear_checkpoint(CHECKPOINT_FILE)
             return "loss"
 
 # ------------------- Main ------------------- #
 def main():
     try:
         vol_gen = volume_pattern_generator()
+        state = load_checkpoint(CHECKPOINT_FILE)
+        if resumable(state, STRATEGY_ID, SYMBOL):
+            printl(f"📂 Resuming cycle from {CHECKPOINT_FILE} (sell_step={state['sell_step']}, triggers={state['triggered_count']})")
+            run_cycle(vol_gen, resume=state)
+            return
         printl("🚀 Starting automated cycle (Option C) — using live market price for initial BUY.")
         run_cycle(vol_gen)
     except KeyboardInterrupt:
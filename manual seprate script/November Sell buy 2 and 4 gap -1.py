@@ -1,7 +1,12 @@
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tick_bus import tick_source
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD_"    # adjust to your broker symbol
 SLIPPAGE = 500
@@ -44,6 +49,8 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
@@ -101,7 +108,7 @@ def place_pending_stop(order_side: str, base_price: float, volume: float):
     """
     cancel_all_pending()
     volume = normalize_volume(volume)
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick available.")
         return None
@@ -144,7 +151,7 @@ def place_pending_stop(order_side: str, base_price: float, volume: float):
 def run_pattern(vol_gen):
     global base_buy_price, fixed_decimal, base_int, buy_step, next_pending_price
 
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick data available.")
         return
@@ -209,7 +216,7 @@ def run_pattern(vol_gen):
                     candidate_price = candidate_integer + fixed_decimal
 
                     # ensure broker min for BUY
-                    tick_now = mt5.symbol_info_tick(SYMBOL)
+                    tick_now = get_tick()
                     if not tick_now:
                         printl("❌ No tick available while computing BUY candidate.")
                         return "error"
@@ -245,7 +252,7 @@ def run_pattern(vol_gen):
             positions_all = mt5.positions_get(symbol=SYMBOL) or []
             for p in positions_all:
                 close_type = mt5.ORDER_TYPE_SELL if p.type == mt5.POSITION_TYPE_BUY else mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(SYMBOL).bid if close_type == mt5.ORDER_TYPE_SELL else mt5.symbol_info_tick(SYMBOL).ask
+                price = get_tick().bid if close_type == mt5.ORDER_TYPE_SELL else get_tick().ask
                 req = {
                     "action": mt5.TRADE_ACTION_DEAL,
                     "symbol": SYMBOL,
@@ -266,7 +273,7 @@ def run_pattern(vol_gen):
             positions_all = mt5.positions_get(symbol=SYMBOL) or []
             for p in positions_all:
                 close_type = mt5.ORDER_TYPE_SELL if p.type == mt5.POSITION_TYPE_BUY else mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(SYMBOL).bid if close_type == mt5.ORDER_TYPE_SELL else mt5.symbol_info_tick(SYMBOL).ask
+                price = get_tick().bid if close_type == mt5.ORDER_TYPE_SELL else get_tick().ask
                 req = {
                     "action": mt5.TRADE_ACTION_DEAL,
                     "symbol": SYMBOL,
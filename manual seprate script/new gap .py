@@ -9,10 +9,18 @@ Cyclic BUY/SELL STOP script for MetaTrader5 with cumulative TP.
 """
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 import pygame
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard import Dashboard
+from event_journal import (Journal, TICK, TRIGGER, ORDER_REQUEST, ORDER_RESULT, RETRY, CLOSE,
+                           side_code)
+from tick_bus import tick_source
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD"    # trading symbol
 SLIPPAGE = 500
@@ -22,6 +30,8 @@ PROFIT_UNIT = 5.0          # profit per volume unit for TP calculation
 
 # ------------------- Globals ------------------- #
 order_log = []  # stores history of triggered trades
+dashboard = Dashboard()  # status line is redrawn by its own thread, loop never prints
+journal = Journal(f"journal_{SYMBOL}_{datetime.now():%Y%m%d_%H%M%S}.jnl", note=__file__)  # survives crashes
 
 # ------------------- MT5 Init ------------------- #
 if not mt5.initialize():
@@ -50,6 +60,8 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
@@ -63,11 +75,11 @@ def normalize_volume(vol: float) -> float:
     return float(round(normalized, 8))
 
 def printl(*args, **kwargs):
-    print(f"[{now()}]", *args, **kwargs)
+    dashboard.log(f"[{now()}]", *args)
 
 # ------------------- sound Generator (hardcoded) ------------------- #
 def play_mp3_repeat(file_path, repeat=2, gap=0.1, label="🔊 Custom Sound"):
-    print(f"{label} (×{repeat})")
+    printl(f"{label} (×{repeat})")
     pygame.mixer.init()
     pygame.mixer.music.load(file_path)
     for _ in range(repeat):
@@ -126,10 +138,10 @@ def close_all_positions(max_attempts=0, delay=1.0):
                 attempt += 1
                 if pos.type == mt5.POSITION_TYPE_BUY:
                     close_type = mt5.ORDER_TYPE_SELL
-                    price = mt5.symbol_info_tick(SYMBOL).bid
+                    price = get_tick().bid
                 else:
                     close_type = mt5.ORDER_TYPE_BUY
-                    price = mt5.symbol_info_tick(SYMBOL).ask
+                    price = get_tick().ask
 
                 request = {
                     "action": mt5.TRADE_ACTION_DEAL,
@@ -144,10 +156,15 @@ def close_all_positions(max_attempts=0, delay=1.0):
                 }
                 result = mt5.order_send(request)
                 if result and getattr(result, "retcode", None) == mt5.TRADE_RETCODE_DONE:
+                    journal.record(CLOSE, ticket=pos.ticket, side=side_code(close_type), price=price,
+                                   fill=result.price, volume=pos.volume, retcode=result.retcode, attempt=attempt)
                     printl(f"✅ Closed position {pos.ticket} at {price} (attempts={attempt})")
                     break
                 else:
                     err = getattr(result, "retcode", mt5.last_error())
+                    journal.record(RETRY, ticket=pos.ticket, side=side_code(close_type), price=price,
+                                   volume=pos.volume, retcode=getattr(result, "retcode", 0), attempt=attempt,
+                                   note="close")
                     printl(f"⚠️ Failed to close position {pos.ticket} (retcode={err}), attempt={attempt}... retrying")
                     time.sleep(delay)
                 if max_attempts > 0 and attempt >= max_attempts:
@@ -160,13 +177,13 @@ def close_all_positions(max_attempts=0, delay=1.0):
 
 
     if order_log:
-        print("\n📊 Trading Summary:")
-        print(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
-        print("-" * 50)
+        dashboard.log("\n📊 Trading Summary:")
+        dashboard.log(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
+        dashboard.log("-" * 50)
         for entry in order_log:
-            print(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
-        print("-" * 50)
-        print(f"✅ Total Orders: {len(order_log)}\n")
+            dashboard.log(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
+        dashboard.log("-" * 50)
+        dashboard.log(f"✅ Total Orders: {len(order_log)}\n")
 
 def account_equity_profit():
     ai = mt5.account_info()
@@ -177,7 +194,7 @@ def account_equity_profit():
 def place_pending_stop(order_side: str, base_price: float, volume: float, max_attempts=0, delay=1.0):
     cancel_all_pending()
     volume = normalize_volume(volume)
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick available to place order.")
         return None
@@ -205,15 +222,23 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
         "magic": MAGIC,
     }
 
+    ref = journal.next_ref()
+    journal.record(ORDER_REQUEST, ref=ref, side=side_code(order_side), price=price, volume=volume,
+                   bid=tick.bid, ask=tick.ask)
     attempt = 0
     while True:
         attempt += 1
         result = mt5.order_send(request)
         if result is not None and getattr(result, "retcode", None) == mt5.TRADE_RETCODE_DONE:
+            journal.record(ORDER_RESULT, ref=ref, ticket=result.order, side=side_code(order_side), price=price,
+                           volume=volume, bid=result.bid, ask=result.ask, retcode=result.retcode, attempt=attempt)
             printl(f"✅ {order_side} STOP placed at {price} vol={volume} (attempts={attempt})")
             return price
         else:
             err = getattr(result, "retcode", mt5.last_error())
+            journal.record(RETRY, ref=ref, side=side_code(order_side), price=price, volume=volume,
+                           bid=getattr(result, "bid", 0.0), ask=getattr(result, "ask", 0.0),
+                           retcode=getattr(result, "retcode", 0), attempt=attempt)
             printl(f"⚠️ Failed to place {order_side} STOP (retcode={err}), attempt={attempt}... retrying")
             time.sleep(delay)
         if max_attempts > 0 and attempt >= max_attempts:
@@ -370,7 +395,7 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
               f"{entry['tp_target']:<9.2f} | {(entry['tp_target'] + PROFIT_UNIT):<8.2f}")
     print("==============================================================\n")
 def run_cycle(vol_gen, gap):
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick data available. Cannot run cycle.")
         return "error"
@@ -406,13 +431,16 @@ def run_cycle(vol_gen, gap):
 
     printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
     printl(f"💰 Initial cumulative TP target = ${cumulative_tp:.2f}\n")
+    dashboard.start()
 
     # ---------------- MAIN LOOP ----------------
     while True:
         time.sleep(1)
+        dashboard.loop_tick(SYMBOL)
         ai = mt5.account_info()
         if ai:
-            print(f"\r💵 Balance: {ai.balance:.2f} | 📊 Profit: {ai.profit:+.2f} | 🎯 TP Target: {cumulative_tp:.2f}", end="", flush=True)
+            dashboard.update(SYMBOL, balance=ai.balance, profit=ai.profit, target=cumulative_tp,
+                             pending=active_price, triggers=triggered_count)
 
         acc_profit = account_equity_profit()
         positions = mt5.positions_get(symbol=SYMBOL) or []
@@ -430,6 +458,12 @@ def run_cycle(vol_gen, gap):
                 pos_type_str = "BUY" if pos.type == mt5.POSITION_TYPE_BUY else "SELL"
                 cur_total_profit = account_equity_profit() - baseline_equity
 
+                tick_now = get_tick()
+                if tick_now:
+                    journal.record(TICK, ticket=pos.ticket, bid=tick_now.bid, ask=tick_now.ask)
+                journal.record(TRIGGER, ticket=pos.ticket, side=side_code(pos.type), price=active_price,
+                               fill=pos.price_open, volume=pos.volume, value=cumulative_tp)
+
                 # Record order details
                 summary_log.append({
                     "trigger": triggered_count,
@@ -465,7 +499,7 @@ def run_cycle(vol_gen, gap):
                     next_price = last_buy_price
 
                 printl(f"📈 Next {next_side} STOP placed at {next_price} (vol={next_vol}, new TP target={cumulative_tp:.2f})")
-                place_pending_stop(next_side, next_price, next_vol)
+                active_price = place_pending_stop(next_side, next_price, next_vol)
 
             last_pos_count = current_count
             last_positions = positions
@@ -487,16 +521,16 @@ def run_cycle(vol_gen, gap):
 
 # ================= SUMMARY TABLE ================= #
 def print_summary_table(summary_log):
-    print("\n\n📊 Trading Summary:")
-    print("Trig | Ticket   | Type | Volume | Profit   | TP Target | Cum TP")
-    print("-" * 62)
+    dashboard.log("\n\n📊 Trading Summary:")
+    dashboard.log("Trig | Ticket   | Type | Volume | Profit   | TP Target | Cum TP")
+    dashboard.log("-" * 62)
 
     for s in summary_log:
-        print(f"{s['trigger']:<4} | {s['ticket']:<8} | {s['type']:<4} | "
-              f"{s['volume']:<6.2f} | {s['profit']:+7.2f} | {s['tp_target']:<9.2f} | {s['cum_tp']:<8.2f}")
+        dashboard.log(f"{s['trigger']:<4} | {s['ticket']:<8} | {s['type']:<4} | "
+                      f"{s['volume']:<6.2f} | {s['profit']:+7.2f} | {s['tp_target']:<9.2f} | {s['cum_tp']:<8.2f}")
 
-    print("-" * 62)
-    print(f"✅ Total Orders: {len(summary_log)}\n")
+    dashboard.log("-" * 62)
+    dashboard.log(f"✅ Total Orders: {len(summary_log)}\n")
 
 # ------------------- Main ------------------- #
 def main():
@@ -512,6 +546,8 @@ def main():
     except KeyboardInterrupt:
         printl("🛑 Script stopped by user.")
     finally:
+        journal.close()
+        dashboard.stop()
         mt5.shutdown()
         printl("MT5 connection closed.")
 
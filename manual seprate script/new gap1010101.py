@@ -9,10 +9,16 @@ Cyclic BUY/SELL STOP script for MetaTrader5 with cumulative TP.
 """
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 import pygame
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard import Dashboard
+from tick_bus import tick_source
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD"    # trading symbol
 SLIPPAGE = 500
@@ -22,6 +28,7 @@ PROFIT_UNIT = 50000          # profit per volume unit for TP calculation
 
 # ------------------- Globals ------------------- #
 order_log = []  # stores history of triggered trades
+dashboard = Dashboard()  # status line is redrawn by its own thread, loop never prints
 
 # ------------------- MT5 Init ------------------- #
 if not mt5.initialize():
@@ -50,6 +57,8 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
@@ -63,11 +72,11 @@ def normalize_volume(vol: float) -> float:
     return float(round(normalized, 8))
 
 def printl(*args, **kwargs):
-    print(f"[{now()}]", *args, **kwargs)
+    dashboard.log(f"[{now()}]", *args)
 
 # ------------------- sound Generator (hardcoded) ------------------- #
 def play_mp3_repeat(file_path, repeat=2, gap=0.1, label="🔊 Custom Sound"):
-    print(f"{label} (×{repeat})")
+    printl(f"{label} (×{repeat})")
     pygame.mixer.init()
     pygame.mixer.music.load(file_path)
     for _ in range(repeat):
@@ -128,10 +137,10 @@ def close_all_positions(max_attempts=0, delay=1.0):
                 attempt += 1
                 if pos.type == mt5.POSITION_TYPE_BUY:
                     close_type = mt5.ORDER_TYPE_SELL
-                    price = mt5.symbol_info_tick(SYMBOL).bid
+                    price = get_tick().bid
                 else:
                     close_type = mt5.ORDER_TYPE_BUY
-                    price = mt5.symbol_info_tick(SYMBOL).ask
+                    price = get_tick().ask
 
                 request = {
                     "action": mt5.TRADE_ACTION_DEAL,
@@ -162,13 +171,13 @@ def close_all_positions(max_attempts=0, delay=1.0):
 
 
     if order_log:
-        print("\n📊 Trading Summary:")
-        print(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
-        print("-" * 50)
+        dashboard.log("\n📊 Trading Summary:")
+        dashboard.log(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
+        dashboard.log("-" * 50)
         for entry in order_log:
-            print(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
-        print("-" * 50)
-        print(f"✅ Total Orders: {len(order_log)}\n")
+            dashboard.log(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
+        dashboard.log("-" * 50)
+        dashboard.log(f"✅ Total Orders: {len(order_log)}\n")
 
 def account_equity_profit():
     ai = mt5.account_info()
@@ -179,7 +188,7 @@ def account_equity_profit():
 def place_pending_stop(order_side: str, base_price: float, volume: float, max_attempts=0, delay=1.0):
     cancel_all_pending()
     volume = normalize_volume(volume)
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick available to place order.")
         return None
@@ -224,7 +233,7 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
 
 # ------------------- Trading Cycle ------------------- #
 def run_cycle(vol_gen, gap):
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick data available. Cannot run cycle.")
         return "error"
@@ -261,13 +270,16 @@ def run_cycle(vol_gen, gap):
 
     printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
     printl(f"💰 Initial cumulative TP target = ${cumulative_tp:.2f}\n")
+    dashboard.start()
 
     # ---------------- MAIN LOOP ----------------
     while True:
         time.sleep(1)  # refresh every second
+        dashboard.loop_tick(SYMBOL)
         ai = mt5.account_info()
         if ai:
-            print(f"\r💵 Balance: {ai.balance:.2f} | 📊 Profit: {ai.profit:+.2f} | 🎯 TP Target: {cumulative_tp:.2f}", end="", flush=True)
+            dashboard.update(SYMBOL, balance=ai.balance, profit=ai.profit, target=cumulative_tp,
+                             pending=active_price, triggers=triggered_count)
 
         acc_profit = account_equity_profit()
         positions = mt5.positions_get(symbol=SYMBOL) or []
@@ -376,6 +388,7 @@ def main():
     except KeyboardInterrupt:
         printl("🛑 Script stopped by user.")
     finally:
+        dashboard.stop()
         mt5.shutdown()
         printl("MT5 connection closed.")
 
@@ -768,19 +768,50 @@ Cyclic BUY/SELL STOP script for MetaTrader5 with cumulative TP.
 
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 import pygame
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cycle_checkpoint import save_checkpoint, load_checkpoint, clear_checkpoint, reconcile, checkpoint_path, resumable
+from dashboard import Dashboard
+from event_journal import (Journal, TICK, TRIGGER, ORDER_REQUEST, ORDER_RESULT, RETRY, CLOSE,
+                           side_code)
+import metrics
+from fixed_point import PriceScale
+from gap_pattern import GapMachine, VolumeTape
+from strategy_runner import load_instance_spec, entry_price, ladder_generator
+from tick_bus import tick_source
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD_"    # trading symbol
 SLIPPAGE = 500
 MAGIC = 12345
 LOSS_TARGET = 500.0       # equity loss stop (in $)
 PROFIT_UNIT = 50          # profit per volume unit for TP calculation
+METRICS_PORT = 9108      # Prometheus text on http://127.0.0.1:METRICS_PORT/metrics (0 = off)
+GAP_PATTERN = "alternate"  # gap_pattern name or DSL rules: where each next pending goes
+ENTRY_POINTS = 10        # "entry" register of the pattern (points)
+
+# Headless run: strategy_runner passes the instance spec, which overrides the config and prompts
+SPEC = load_instance_spec()
+if SPEC:
+    SYMBOL = SPEC["symbol"]
+    MAGIC = SPEC["magic"]
+    LOSS_TARGET = SPEC.get("loss_target", LOSS_TARGET)
+    PROFIT_UNIT = SPEC.get("profit_unit", PROFIT_UNIT)
+    METRICS_PORT = SPEC.get("metrics_port", METRICS_PORT)
+    GAP_PATTERN = SPEC.get("gap_pattern", GAP_PATTERN)
+
+STRATEGY_ID = "gap666"     # stored in the checkpoint: another script's state is never resumed
+CHECKPOINT_FILE = checkpoint_path(STRATEGY_ID, SYMBOL, MAGIC)  # cycle state, rewritten atomically on every transition
 
 # ------------------- Globals ------------------- #
 order_log = []  # stores history of triggered trades
+dashboard = Dashboard()  # status line is redrawn by its own thread, loop never prints
+journal = Journal(f"journal_{SYMBOL}_{datetime.now():%Y%m%d_%H%M%S}.jnl", note=__file__)  # survives crashes
 
 # ------------------- MT5 Init ------------------- #
 if not mt5.initialize():
@@ -809,24 +840,38 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+# Integer points / volume steps for all grid math
+scale = PriceScale.from_symbol_info(symbol_info)
+
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
+# ------------------- Metrics ------------------- #
+# Hot-path MT5 calls go through timed wrappers; each record costs well under 1 µs
+get_tick = metrics.wrap(get_tick, "mt5_symbol_info_tick_seconds", "Latest tick (tick bus or symbol_info_tick)")
+order_send = metrics.wrap(mt5.order_send, "mt5_order_send_seconds")
+positions_get = metrics.wrap(mt5.positions_get, "mt5_positions_get_seconds")
+account_info = metrics.wrap(mt5.account_info, "mt5_account_info_seconds")
+order_results = metrics.counter("mt5_order_send_results_total", "order_send results by retcode")
+loop_period = metrics.histogram("loop_period_seconds", "Main loop period")
+trigger_delay = metrics.histogram("trigger_detect_delay_seconds",
+                                  "Position open to detection, measured on the server tick clock")
+trigger_to_pending = metrics.histogram("trigger_to_pending_seconds",
+                                       "Trigger detected to next pending STOP accepted")
+flatten_duration = metrics.histogram("flatten_duration_seconds", "Close all positions and pending orders")
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
 
 def normalize_volume(vol: float) -> float:
-    if vol <= vol_min:
-        return vol_min
-    steps = round((vol - vol_min) / vol_step)
-    normalized = vol_min + steps * vol_step
-    normalized = max(vol_min, min(normalized, vol_max))
-    return float(round(normalized, 8))
+    return scale.normalize_volume(vol)
 
 def printl(*args, **kwargs):
-    print(f"[{now()}]", *args, **kwargs)
+    dashboard.log(f"[{now()}]", *args)
 
 # ------------------- sound Generator (hardcoded) ------------------- #
 def play_mp3_repeat(file_path, repeat=2, gap=0.1, label="🔊 Custom Sound"):
-    print(f"{label} (×{repeat})")
+    printl(f"{label} (×{repeat})")
     try:
         pygame.mixer.init()
         pygame.mixer.music.load(file_path)
@@ -840,6 +885,9 @@ def play_mp3_repeat(file_path, repeat=2, gap=0.1, label="🔊 Custom Sound"):
 
 # ------------------- Volume Generator (hardcoded) ------------------- #
 def volume_pattern_generator():
+    if SPEC and SPEC.get("ladder"):
+        yield from ladder_generator(SPEC["ladder"])
+        return
     pattern = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06]
     for vol in pattern:
         yield vol
@@ -847,11 +895,11 @@ def volume_pattern_generator():
         yield 0.06  # continue with 0.06 for all remaining orders
 
 def account_balance():
-    ai = mt5.account_info()
+    ai = account_info()
     return ai.balance if ai else 0.0
 
 def account_equity_profit():
-    ai = mt5.account_info()
+    ai = account_info()
     if ai:
         return ai.profit
     return 0.0
@@ -871,7 +919,7 @@ def cancel_all_pending():
                 "magic": o.magic if hasattr(o, "magic") else MAGIC,
                 "comment": "Cancel pending by script"
             }
-            mt5.order_send(req)
+            order_send(req)
             removed += 1
         except Exception as e:
             printl("Warning cancelling order:", e)
@@ -880,7 +928,8 @@ def cancel_all_pending():
     return removed
 
 def close_all_positions(max_attempts=0, delay=1.0):
-    positions = mt5.positions_get(symbol=SYMBOL)
+    flatten_start = time.perf_counter_ns()
+    positions = positions_get(symbol=SYMBOL)
     if positions:
         for pos in positions:
             attempt = 0
@@ -888,10 +937,10 @@ def close_all_positions(max_attempts=0, delay=1.0):
                 attempt += 1
                 if pos.type == mt5.POSITION_TYPE_BUY:
                     close_type = mt5.ORDER_TYPE_SELL
-                    price = mt5.symbol_info_tick(SYMBOL).bid
+                    price = get_tick().bid
                 else:
                     close_type = mt5.ORDER_TYPE_BUY
-                    price = mt5.symbol_info_tick(SYMBOL).ask
+                    price = get_tick().ask
 
                 request = {
                     "action": mt5.TRADE_ACTION_DEAL,
@@ -904,12 +953,17 @@ def close_all_positions(max_attempts=0, delay=1.0):
                     "magic": MAGIC,
                     "comment": "Close by script"
                 }
-                result = mt5.order_send(request)
+                result = order_send(request)
                 if result and getattr(result, "retcode", None) == mt5.TRADE_RETCODE_DONE:
+                    journal.record(CLOSE, ticket=pos.ticket, side=side_code(close_type), price=price,
+                                   fill=result.price, volume=pos.volume, retcode=result.retcode, attempt=attempt)
                     printl(f"✅ Closed position {pos.ticket} at {price} (attempts={attempt})")
                     break
                 else:
                     err = getattr(result, "retcode", mt5.last_error())
+                    journal.record(RETRY, ticket=pos.ticket, side=side_code(close_type), price=price,
+                                   volume=pos.volume, retcode=getattr(result, "retcode", 0), attempt=attempt,
+                                   note="close")
                     printl(f"⚠️ Failed to close position {pos.ticket} (retcode={err}), attempt={attempt}... retrying")
                     time.sleep(delay)
                 if max_attempts > 0 and attempt >= max_attempts:
@@ -917,36 +971,29 @@ def close_all_positions(max_attempts=0, delay=1.0):
                     break
 
     cancel_all_pending()
+    flatten_duration.since(flatten_start)
     printl("✅ All positions and pending orders closed.")
     play_mp3_repeat(r"C:\Users\hp\Downloads\cash-register-purchase-87313.mp3", repeat=2, label="💰 Profit Sound")
 
     if order_log:
-        print("\n📊 Trading Summary:")
-        print(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
-        print("-" * 50)
+        dashboard.log("\n📊 Trading Summary:")
+        dashboard.log(f"{'Ticket':<10} {'Type':<6} {'Volume':<8} {'Cumulative TP':<12}")
+        dashboard.log("-" * 50)
         for entry in order_log:
-            print(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
-        print("-" * 50)
-        print(f"✅ Total Orders: {len(order_log)}\n")
+            dashboard.log(f"{entry['ticket']:<10} {entry['type']:<6} {entry['volume']:<8} {entry['cumulative_tp']:<12}")
+        dashboard.log("-" * 50)
+        dashboard.log(f"✅ Total Orders: {len(order_log)}\n")
 
 def place_pending_stop(order_side: str, base_price: float, volume: float, max_attempts=0, delay=1.0):
     cancel_all_pending()
     volume = normalize_volume(volume)
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         printl("❌ No tick available to place order.")
         return None
 
-    if order_side == "BUY":
-        mt_type = mt5.ORDER_TYPE_BUY_STOP
-        min_price = tick.ask + stop_level + (2 * point)
-        price = max(base_price, min_price)
-    else:
-        mt_type = mt5.ORDER_TYPE_SELL_STOP
-        max_price = tick.bid - stop_level - (2 * point)
-        price = min(base_price, max_price)
-
-    price = round(price, digits)
+    mt_type = mt5.ORDER_TYPE_BUY_STOP if order_side == "BUY" else mt5.ORDER_TYPE_SELL_STOP
+    price = scale.to_price(scale.clamp_stop(order_side, scale.to_points(base_price), tick))
     request = {
         "action": mt5.TRADE_ACTION_PENDING,
         "symbol": SYMBOL,
@@ -960,15 +1007,24 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
         "magic": MAGIC,
     }
 
+    ref = journal.next_ref()
+    journal.record(ORDER_REQUEST, ref=ref, side=side_code(order_side), price=price, volume=volume,
+                   bid=tick.bid, ask=tick.ask)
     attempt = 0
     while True:
         attempt += 1
-        result = mt5.order_send(request)
+        result = order_send(request)
+        order_results.inc(f'retcode="{getattr(result, "retcode", "none")}"')
         if result is not None and getattr(result, "retcode", None) == mt5.TRADE_RETCODE_DONE:
+            journal.record(ORDER_RESULT, ref=ref, ticket=result.order, side=side_code(order_side), price=price,
+                           volume=volume, bid=result.bid, ask=result.ask, retcode=result.retcode, attempt=attempt)
             printl(f"✅ {order_side} STOP placed at {price} vol={volume} (attempts={attempt})")
             return price
         else:
             err = getattr(result, "retcode", mt5.last_error())
+            journal.record(RETRY, ref=ref, side=side_code(order_side), price=price, volume=volume,
+                           bid=getattr(result, "bid", 0.0), ask=getattr(result, "ask", 0.0),
+                           retcode=getattr(result, "retcode", 0), attempt=attempt)
             printl(f"⚠️ Failed to place {order_side} STOP (retcode={err}), attempt={attempt}... retrying")
             time.sleep(delay)
         if max_attempts > 0 and attempt >= max_attempts:
@@ -976,61 +1032,150 @@ def place_pending_stop(order_side: str, base_price: float, volume: float, max_at
             return None
 
 # ------------------- Trading Cycle ------------------- #
-def run_cycle(vol_gen, gap):
-    tick = mt5.symbol_info_tick(SYMBOL)
-    if not tick:
-        printl("❌ No tick data available. Cannot run cycle.")
-        return "error"
-
-    base_ask = tick.ask
-    options = [round(base_ask + i * point * 10, digits) for i in range(1, 4)]
-    print("\n👉 Choose starting BUY STOP price:")
-    for i, val in enumerate(options, 1):
-        print(f"{i}. {val}")
-    choice = input("Enter choice (1/2/3 or custom price): ").strip()
-
-    if choice in ["1", "2", "3"]:
-        buy_price = options[int(choice) - 1]
-    else:
-        try:
-            buy_price = float(choice)
-        except ValueError:
-            printl("Invalid price entered. Aborting cycle.")
+def run_cycle(vol_gen, gap, resume=None):
+    live = None
+    if resume is not None:
+        recovery_start = time.perf_counter()
+        live = reconcile(resume, positions_get(symbol=SYMBOL) or [], mt5.orders_get(symbol=SYMBOL) or [], MAGIC, STRATEGY_ID)
+        if live["status"] == "foreign":
+            printl(f"📂 {CHECKPOINT_FILE} was written by another strategy — starting a fresh cycle.")
+        if live["status"] in ("stale", "foreign"):
+            if live["status"] == "stale":
+                printl("📂 Checkpoint found but no positions/pendings are live any more — starting a fresh cycle.")
+            clear_checkpoint(CHECKPOINT_FILE)
+            resume = None
+
+    if resume is None:
+        tick = get_tick()
+        if not tick:
+            printl("❌ No tick data available. Cannot run cycle.")
             return "error"
 
-    # first pending volume (used to place first pending)
-    first_vol = next(vol_gen)
-
-    # triggered_cum_tp tracks only **triggered** positions (starts at 0)
-    triggered_cum_tp = 0.0
-    # projected shows what TP would be after placing the next pending (informational)
-    projected_cum_tp = first_vol * PROFIT_UNIT
-
-    active_price = place_pending_stop("BUY", buy_price, first_vol)
-    if not active_price:
-        return "error"
-
-    last_buy_price = buy_price
-    last_order_type = "BUY"
-    last_positions = mt5.positions_get(symbol=SYMBOL) or []
-    last_pos_count = len(last_positions)
-    baseline_equity = account_equity_profit()
-    triggered_count = 0
-    last_trigger_info = None
+        base_ask = tick.ask
+        ask_pts = scale.to_points(base_ask)
+        gap_pts = scale.to_points(gap)
+        machine = GapMachine(GAP_PATTERN, gap_pts, ENTRY_POINTS)
+        first_side, first_pts, first_index = machine.start(scale.to_points(tick.bid), ask_pts)
+        options = [scale.to_price(ask_pts + i * 10) for i in range(1, 4)]
+        if first_side != "BUY":
+            buy_price = scale.to_price(first_pts)
+            printl(f"🧩 Pattern {machine.pattern.name} starts with a {first_side} STOP at {buy_price}")
+        elif SPEC:
+            buy_price = entry_price(SPEC.get("entry", "ask+10"), tick, point, digits)
+            printl(f"🤖 Headless entry {SPEC.get('entry', 'ask+10')} -> BUY STOP {buy_price}")
+        else:
+            print("\n👉 Choose starting BUY STOP price:")
+            for i, val in enumerate(options, 1):
+                print(f"{i}. {val}")
+            choice = input("Enter choice (1/2/3 or custom price): ").strip()
+
+            if choice in ["1", "2", "3"]:
+                buy_price = options[int(choice) - 1]
+            else:
+                try:
+                    buy_price = float(choice)
+                except ValueError:
+                    printl("Invalid price entered. Aborting cycle.")
+                    return "error"
+
+        # the operator / spec entry picks the first BUY STOP, the pattern everything after it
+        if first_side == "BUY":
+            machine.start(scale.to_points(tick.bid), ask_pts, price=scale.to_points(buy_price))
+
+        # first pending volume (used to place first pending)
+        volumes = VolumeTape(vol_gen)
+        first_vol = volumes[first_index]
+
+        # triggered_cum_tp tracks only **triggered** positions (starts at 0)
+        triggered_cum_tp = 0.0
+        # projected shows what TP would be after placing the next pending (informational)
+        projected_cum_tp = first_vol * PROFIT_UNIT
+
+        active_price = place_pending_stop(first_side, buy_price, first_vol)
+        if not active_price:
+            return "error"
 
-    printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
-    printl(f"💰 Initial projected TP target (pending) = ${projected_cum_tp:.2f}\n")
+        last_order_type = first_side
+        pending_volume = first_vol
+        last_positions = positions_get(symbol=SYMBOL) or []
+        last_pos_count = len(last_positions)
+        handled_tickets = [p.ticket for p in last_positions]
+        baseline_equity = account_equity_profit()
+        triggered_count = 0
+        last_trigger_info = None
+
+        printl(f"📌 Baseline equity set at {baseline_equity:.2f}")
+        printl(f"💰 Initial projected TP target (pending) = ${projected_cum_tp:.2f}\n")
+    else:
+        # warm resume: same ladder, same pattern registers, same baseline
+        volumes = VolumeTape(vol_gen)
+        gap_pts = resume["gap_pts"]
+        last_order_type = resume["last_order_type"]
+        machine = GapMachine(resume.get("gap_pattern", GAP_PATTERN), gap_pts, ENTRY_POINTS)
+        if "pattern" in resume:
+            machine.restore(resume["pattern"])
+        else:  # checkpoint from before gap patterns: the alternating ladder's last BUY
+            machine.restore({"state": 0, "anchor": resume["last_buy_pts"], "base": resume["last_buy_pts"], "n": 0,
+                             "k": resume["triggered_count"], "side": last_order_type})
+        active_price = resume["pending_price"]
+        pending_volume = resume["pending_volume"]
+        triggered_cum_tp = resume["triggered_cum_tp"]
+        projected_cum_tp = resume["projected_cum_tp"]
+        baseline_equity = resume["baseline_equity"]
+        triggered_count = resume["triggered_count"]
+        order_log[:] = resume.get("order_log", [])
+        handled_tickets = [p.ticket for p in live["known"]]
+        # positions opened while we were down show up as new triggers in the loop
+        last_positions = live["known"]
+        last_pos_count = len(last_positions)
+        last_trigger_info = None
+
+        if live["status"] == "replace_pending":
+            printl(f"♻️ Pending {last_order_type} STOP is gone — placing it again at {active_price}")
+            active_price = place_pending_stop(last_order_type, active_price, pending_volume)
+        recovery_ms = (time.perf_counter() - recovery_start) * 1e3
+        printl(f"♻️ Resumed ladder: triggers={triggered_count}, new while down={len(live['new'])}, "
+               f"closed externally={len(live['missing'])}, recovery={recovery_ms:.1f} ms")
+
+    def checkpoint():
+        save_checkpoint(CHECKPOINT_FILE, {
+            "strategy": STRATEGY_ID,
+            "symbol": SYMBOL,
+            "magic": MAGIC,
+            "gap": gap,
+            "gap_pts": gap_pts,
+            "gap_pattern": machine.pattern.source,
+            "pattern": machine.snapshot(),
+            "last_order_type": last_order_type,
+            "pending_price": active_price,
+            "pending_volume": pending_volume,
+            "triggered_cum_tp": triggered_cum_tp,
+            "projected_cum_tp": projected_cum_tp,
+            "baseline_equity": baseline_equity,
+            "triggered_count": triggered_count,
+            "tickets": handled_tickets,
+            "order_log": order_log,
+        })
+
+    checkpoint()
+    dashboard.start()
 
     # ---------------- MAIN LOOP ----------------
+    last_loop = time.perf_counter_ns()
     while True:
         time.sleep(1)  # refresh every second
-        ai = mt5.account_info()
+        loop_start = time.perf_counter_ns()
+        loop_period.record(loop_start - last_loop)
+        last_loop = loop_start
+        dashboard.loop_tick(SYMBOL)
+        ai = account_info()
         if ai:
             # Show both triggered (actual) and projected (informational)
-            print(f"\r💵 Balance: {ai.balance:.2f} | 📊 Profit: {ai.profit:+.2f} | 🎯 Triggered TP: {triggered_cum_tp:.2f} | ⏳ Projected TP: {projected_cum_tp:.2f}", end="", flush=True)
+            dashboard.update(SYMBOL, balance=ai.balance, profit=ai.profit, target=triggered_cum_tp,
+                             projected=projected_cum_tp, pending=active_price, triggers=triggered_count)
 
         acc_profit = account_equity_profit()
-        positions = mt5.positions_get(symbol=SYMBOL) or []
+        positions = positions_get(symbol=SYMBOL) or []
 
         # Wait for first trigger
         if not positions:
@@ -1042,6 +1187,7 @@ def run_cycle(vol_gen, gap):
             last_ticket_set = set([lp.ticket for lp in last_positions])
             new_positions = [p for p in positions if p.ticket not in last_ticket_set]
             for pos in new_positions:
+                detected = time.perf_counter_ns()
                 triggered_count += 1
 
                 pos_type_str = "BUY" if pos.type == mt5.POSITION_TYPE_BUY else "SELL"
@@ -1050,6 +1196,14 @@ def run_cycle(vol_gen, gap):
                 added_tp = (pos.volume or 0.0) * PROFIT_UNIT
                 triggered_cum_tp += added_tp
 
+                tick_now = get_tick()
+                if tick_now:
+                    if tick_now.time_msc >= pos.time_msc:
+                        trigger_delay.record((tick_now.time_msc - pos.time_msc) * 1_000_000)
+                    journal.record(TICK, ticket=pos.ticket, bid=tick_now.bid, ask=tick_now.ask)
+                journal.record(TRIGGER, ticket=pos.ticket, side=side_code(pos.type), price=active_price,
+                               fill=pos.price_open, volume=pos.volume, value=triggered_cum_tp)
+
                 cur_total_profit = account_equity_profit() - baseline_equity
 
                 printl(f"\n\n🔔 Trigger #{triggered_count} → ticket={pos.ticket}, AFTER adding this trigger TP contribution = ${triggered_cum_tp:.2f}"
@@ -1070,6 +1224,7 @@ def run_cycle(vol_gen, gap):
                     printl(f"📌 Triggering position details: {last_trigger_info}")
                     # Close all positions and exit reporting 'profit'
                     close_all_positions()
+                    clear_checkpoint(CHECKPOINT_FILE)
                     return "profit"
 
                 # log this triggered order with the triggered cumulative TP at that moment
@@ -1080,23 +1235,23 @@ def run_cycle(vol_gen, gap):
                     "cumulative_tp": triggered_cum_tp
                 })
 
+                # next side / price / ladder index from the gap pattern's table (alternating GAP by default)
+                fill_pts = scale.to_points(pos.price_open)
+                quote = (scale.to_points(tick_now.bid), scale.to_points(tick_now.ask)) if tick_now else (fill_pts, fill_pts)
+                next_side, next_pts, next_index = machine.on_fill(pos_type_str, fill_pts, *quote)
+                next_price = scale.to_price(next_pts)
+
                 # compute next pending volume and projected TP (projected = triggered_cum_tp + next_vol*PROFIT_UNIT)
-                next_vol = next(vol_gen)
+                next_vol = volumes[next_index]
                 projected_cum_tp = triggered_cum_tp + next_vol * PROFIT_UNIT
 
-                # Alternating GAP logic to decide next side/price
-                if pos.type == mt5.POSITION_TYPE_BUY:
-                    last_buy_price = pos.price_open
-                    next_side = "SELL"
-                    next_price = round(last_buy_price - gap, digits)
-                else:
-                    next_side = "BUY"
-                    last_buy_price = round(last_buy_price + gap, digits)
-                    next_price = last_buy_price
-
                 printl(f"📈 Next {next_side} STOP placed at {next_price} (next vol={next_vol}, projected TP target={projected_cum_tp:.2f})")
                 active_price = place_pending_stop(next_side, next_price, next_vol)
+                trigger_to_pending.since(detected)
                 last_order_type = next_side
+                pending_volume = next_vol
+                handled_tickets.append(pos.ticket)
+                checkpoint()
 
             last_pos_count = current_count
             last_positions = positions
@@ -1118,17 +1273,30 @@ def run_cycle(vol_gen, gap):
                 printl("📌 TP hit but trigger position not identified in loop (maybe was closed externally).")
                 printl(f"📌 Account state: {last_trigger_info}")
             close_all_positions()
+            clear_checkpoint(CHECKPOINT_FILE)
             return "profit"
         if total_profit <= -LOSS_TARGET:
             printl(f"\n❌ SL hit! Profit={total_profit:.2f} ≤ -{LOSS_TARGET}")
             close_all_positions()
+            clear_checkpoint(CHECKPOINT_FILE)
             return "loss"
 
 # ------------------- Main ------------------- #
 def main():
     try:
         vol_gen = volume_pattern_generator()
-        gap = None
+        if METRICS_PORT:  # before the resume branch: a resumed cycle exports metrics too
+            try:
+                metrics.start_http_server(METRICS_PORT)
+                printl(f"📈 Metrics on http://127.0.0.1:{METRICS_PORT}/metrics")
+            except OSError as e:
+                printl(f"⚠️ Metrics endpoint not started on port {METRICS_PORT}: {e}")
+        state = load_checkpoint(CHECKPOINT_FILE)
+        if resumable(state, STRATEGY_ID, SYMBOL):
+            printl(f"📂 Resuming cycle from {CHECKPOINT_FILE} (gap={state['gap']}, triggers={state['triggered_count']})")
+            run_cycle(vol_gen, state["gap"], resume=state)
+            return
+        gap = SPEC["gap"] if SPEC else None
         while gap is None:
             try:
                 gap = float(input("Enter gap (distance between BUY and SELL in price units): ").strip())
@@ -1138,6 +1306,8 @@ def main():
     except KeyboardInterrupt:
         printl("🛑 Script stopped by user.")
     finally:
+        journal.close()
+        dashboard.stop()
         mt5.shutdown()
         printl("MT5 connection closed.")
 
@@ -1,6 +1,11 @@
 import MetaTrader5 as mt5
 import time
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from tick_bus import tick_source
 
 SYMBOL = "XAUUSD_"
 REFRESH_RATE = 1
@@ -10,6 +15,8 @@ if not mt5.initialize():
     print("MT5 init failed:", mt5.last_error())
     quit()
 
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 speeds = []
 last_price = None
 last_time = None
@@ -23,7 +30,7 @@ def draw_bar(speed):
 print(f"Speedometer started for {SYMBOL}...\n")
 
 while True:
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         print("No tick data")
         time.sleep(1)
@@ -1,6 +1,11 @@
 import MetaTrader5 as mt5
 import time
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from tick_bus import tick_source
 
 SYMBOL = "XAUUSD_"
 REFRESH_RATE = 1
@@ -15,6 +20,8 @@ if not mt5.initialize():
     print("MT5 init failed:", mt5.last_error())
     quit()
 
+get_tick = tick_source(mt5, SYMBOL)  # shared tick bus when tick_bus.py feeds SYMBOL, else the terminal
+
 speeds = []
 last_price = None
 last_time = None
@@ -23,7 +30,7 @@ trading_allowed = True
 print(f"Auto-Trade Controller started for {SYMBOL}...\n")
 
 def place_order(action, volume):
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         return False
     price = tick.ask if action == "BUY" else tick.bid
@@ -49,7 +56,7 @@ def place_order(action, volume):
 
 
 while True:
-    tick = mt5.symbol_info_tick(SYMBOL)
+    tick = get_tick()
     if not tick:
         print("No tick data")
         time.sleep(1)
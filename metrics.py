@@ -0,0 +1,198 @@
+"""
+Low-overhead metrics for the trading hot path, exposed in Prometheus text format.
+
+- Histogram: HDR-style log-linear buckets over integer nanoseconds. Each power of two
+  is split into 2**SUB_BITS linear sub-buckets (~6% relative error with SUB_BITS=4);
+  record() is one bit_length(), a shift and a list increment (a few hundred ns)
+- Counter: plain integer, labels folded into the metric name's label string
+- wrap(fn, name) times every call of fn into a histogram (for mt5.order_send etc.); the
+  wrapper holds the clock, fn and the bucket list in locals and buckets inline, so it adds
+  two clock reads and a few integer ops per call (~0.4 µs, see bench_metrics.py)
+- start_http_server(port) serves GET /metrics from a daemon thread; scraping reads
+  the bucket lists without stopping the trading loop
+
+Usage:
+  from metrics import histogram, wrap, start_http_server
+  loop_period = histogram("loop_period_seconds", "Main loop period")
+  order_send = wrap(mt5.order_send, "mt5_order_send_seconds")
+  start_http_server(9108)   # curl http://127.0.0.1:9108/metrics
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SUB_BITS = 4                 # 16 linear sub-buckets per power of two
+_SUB = 1 << SUB_BITS
+_MASK = _SUB - 1
+_LINEAR = 1 << (SUB_BITS + 1)
+MAX_NS = 1 << 40             # ~18 minutes; longer values land in the last bucket
+_BUCKETS = ((MAX_NS.bit_length() - SUB_BITS) << SUB_BITS) + _SUB
+
+PORT = 9108
+
+
+class Histogram:
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.counts = [0] * _BUCKETS
+        self.sum_ns = 0
+
+    def record(self, ns):
+        """Record one duration in integer nanoseconds."""
+        if ns < _LINEAR:
+            self.counts[ns if ns > 0 else 0] += 1
+        else:
+            shift = ns.bit_length() - SUB_BITS - 1
+            i = ((shift + 1) << SUB_BITS) | ((ns >> shift) & _MASK)
+            self.counts[i if i < _BUCKETS else _BUCKETS - 1] += 1
+        self.sum_ns += ns
+
+    def since(self, start_ns):
+        """record(perf_counter_ns() - start_ns)."""
+        self.record(time.perf_counter_ns() - start_ns)
+
+    @staticmethod
+    def bucket_upper(i):
+        """Exclusive upper bound (ns) of bucket i."""
+        if i < _LINEAR:
+            return i + 1
+        shift = (i >> SUB_BITS) - 1
+        return (_SUB + (i & _MASK) + 1) << shift
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, q):
+        """Upper bound (ns) of the bucket holding the q-th percentile (q in 0..100)."""
+        counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return 0
+        rank = max(1, int(round(q / 100.0 * total)))
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                return self.bucket_upper(i)
+        return self.bucket_upper(_BUCKETS - 1)
+
+    def reset(self):
+        self.counts[:] = [0] * _BUCKETS   # in place: wrap() holds the list
+        self.sum_ns = 0
+
+    def prometheus(self):
+        """Cumulative buckets at every power of two from 1 µs (le in seconds)."""
+        counts = list(self.counts)
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        i = 0
+        for exp in range(10, MAX_NS.bit_length()):  # 1024 ns .. MAX_NS
+            bound = 1 << exp
+            while i < _BUCKETS and self.bucket_upper(i) <= bound:
+                cumulative += counts[i]
+                i += 1
+            lines.append(f'{self.name}_bucket{{le="{bound / 1e9:.9g}"}} {cumulative}')
+        total = sum(counts)
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f"{self.name}_sum {self.sum_ns / 1e9:.9g}")
+        lines.append(f"{self.name}_count {total}")
+        return "\n".join(lines)
+
+
+class Counter:
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.values = {}   # label string ('' or 'retcode="10009"') -> count
+
+    def inc(self, labels="", n=1):
+        self.values[labels] = self.values.get(labels, 0) + n
+
+    def prometheus(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in list(self.values.items()):
+            lines.append(f"{self.name}{{{labels}}} {value}" if labels else f"{self.name} {value}")
+        return "\n".join(lines)
+
+
+# ------------------- Registry ------------------- #
+_registry = {}
+
+
+def histogram(name, help_text=""):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = Histogram(name, help_text)
+    return metric
+
+
+def counter(name, help_text=""):
+    metric = _registry.get(name)
+    if metric is None:
+        metric = _registry[name] = Counter(name, help_text)
+    return metric
+
+
+def wrap(fn, name, help_text=""):
+    """Return fn wrapped so every call's duration lands in histogram `name`."""
+    hist = histogram(name, help_text or f"Duration of {getattr(fn, '__name__', name)} calls")
+    clock = time.perf_counter_ns
+    counts = hist.counts
+    last = _BUCKETS - 1
+
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return fn(*args, **kwargs) if kwargs else fn(*args)
+        finally:
+            ns = clock() - start
+            if ns < _LINEAR:                    # Histogram.record(), inlined
+                counts[ns if ns > 0 else 0] += 1
+            else:
+                shift = ns.bit_length() - SUB_BITS - 1
+                i = ((shift + 1) << SUB_BITS) | ((ns >> shift) & _MASK)
+                counts[i if i < last else last] += 1
+            hist.sum_ns += ns
+    timed.__name__ = getattr(fn, "__name__", name)
+    return timed
+
+
+def render():
+    return "\n".join(metric.prometheus() for metric in list(_registry.values())) + "\n"
+
+
+def summary(scale=1e6, unit="ms"):
+    """One line per histogram: count / p50 / p99 / max-bucket, for printing at exit."""
+    out = []
+    for metric in list(_registry.values()):
+        if isinstance(metric, Histogram) and metric.count:
+            out.append(f"{metric.name:<40} n={metric.count:<7} p50={metric.percentile(50) / scale:.3f}{unit} "
+                       f"p99={metric.percentile(99) / scale:.3f}{unit} max≤{metric.percentile(100) / scale:.3f}{unit}")
+    return out
+
+
+# ------------------- HTTP endpoint ------------------- #
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of the strategy's console
+
+
+def start_http_server(port=PORT, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Asyncio facade over the blocking MetaTrader5 API.
+
+- One dedicated I/O thread owns the terminal connection: initialize(), every call and
+  shutdown() run there, in submission order (the MetaTrader5 package is not thread-safe,
+  and a positions_get() sent after an order_send() must see its fill)
+- `amt5.positions_get(symbol=...)` queues the call at once and returns an asyncio future;
+  awaiting it suspends only that coroutine, so several strategies, a dashboard and order
+  placement share one event loop and one process (instead of run_both.py's two)
+- Reads pipeline: whatever is queued when the I/O thread comes round (asyncio.gather of
+  independent reads, several strategies polling) runs back to back as one batch and is
+  completed with one event-loop wakeup; identical reads in a batch (two strategies polling
+  positions_get for the same symbol) cost one terminal call; a batch ends at order_send so
+  the sender gets its result at once and later reads see the fill
+- Constants (amt5.ORDER_TYPE_BUY, ...) pass straight through
+- AsyncMT5(fake) drives any terminal-like object (sim_terminal, mt5_cassette.Player)
+
+Usage:
+    async def watch(amt5, symbol):
+        while True:
+            tick, positions = await asyncio.gather(amt5.symbol_info_tick(symbol),
+                                                   amt5.positions_get(symbol=symbol))
+            ...
+            await asyncio.sleep(0.1)
+
+    mt5_async.run(lambda amt5: watch(amt5, "XAUUSD_"), lambda amt5: watch(amt5, "BTCUSD_"))
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+BATCH_MAX = 64                  # calls taken off the queue per batch, at most
+FLUSH_AFTER = {"order_send"}    # a batch ends here so the sender gets its result at once
+# Reads returning immutable tuples: identical ones queued in the same batch, with no other
+# call between them, run once and share the result (copy_ticks_* arrays are not shared)
+COALESCE = {"symbol_info_tick", "symbol_info", "account_info", "terminal_info", "positions_get",
+            "orders_get", "positions_total", "orders_total"}
+
+_STOP = object()
+
+
+def _resolve(done):
+    for fut, ok, value in done:
+        if fut.cancelled():
+            continue
+        if ok:
+            fut.set_result(value)
+        else:
+            fut.set_exception(value)
+
+
+class AsyncMT5:
+    """Awaitable MT5 calls executed in order on one dedicated terminal thread."""
+
+    def __init__(self, target=None):
+        if target is None:
+            import MetaTrader5 as target
+        self._target = target
+        self._q = queue.SimpleQueue()
+        self.calls = 0          # executed in the terminal
+        self.coalesced = 0      # answered from an identical read in the same batch
+        self.wakeups = 0        # call_soon_threadsafe hand-offs to event loops
+        self.busy_ns = 0        # I/O thread time spent inside the terminal
+        self._thread = threading.Thread(target=self._run, name="mt5-io", daemon=True)
+        self._thread.start()
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr) or isinstance(attr, type):
+            return attr
+        put = self._q.put
+
+        def call(*args, **kwargs):
+            fut = asyncio.get_running_loop().create_future()
+            put((name, attr, args, kwargs, fut))
+            return fut
+        call.__name__ = name
+        self.__dict__[name] = call  # next lookup skips __getattr__
+        return call
+
+    def __dir__(self):
+        return sorted(set(dir(self._target)) | set(self.__dict__))
+
+    # ------------------- I/O thread ------------------- #
+    def _run(self):
+        get, get_nowait = self._q.get, self._q.get_nowait
+        clock = time.perf_counter_ns
+        stopping = False
+        while not stopping:
+            batch = [get()]
+            while len(batch) < BATCH_MAX and batch[-1] is not _STOP and batch[-1][0] not in FLUSH_AFTER:
+                try:
+                    batch.append(get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            done = {}     # loop -> [(future, ok, value)]
+            shared = {}   # read key -> result, valid until the next non-read call in the batch
+            for name, fn, args, kwargs, fut in batch:
+                if fut.cancelled():
+                    continue
+                key = None
+                if name in COALESCE:
+                    key = (name, args, tuple(sorted(kwargs.items())))
+                    try:
+                        hash(key)
+                    except TypeError:
+                        key = None
+                if key is not None and key in shared:
+                    ok, value = True, shared[key]
+                    self.coalesced += 1
+                else:
+                    start = clock()
+                    try:
+                        ok, value = True, fn(*args, **kwargs)
+                    except Exception as e:
+                        ok, value = False, e
+                    self.busy_ns += clock() - start
+                    self.calls += 1
+                    if name not in COALESCE:
+                        shared.clear()  # may have changed terminal state
+                    elif key is not None and ok:
+                        shared[key] = value
+                done.setdefault(fut.get_loop(), []).append((fut, ok, value))
+            for loop, results in done.items():
+                self._deliver(loop, results)
+
+    def _deliver(self, loop, done):
+        self.wakeups += 1
+        try:
+            loop.call_soon_threadsafe(_resolve, done)
+        except RuntimeError:  # loop already closed; nobody is waiting
+            pass
+
+    # ------------------- Lifecycle ------------------- #
+    def close(self, timeout=5.0):
+        """Finish the queued calls and stop the I/O thread (does not shutdown() the terminal)."""
+        if self._thread.is_alive():
+            self._q.put(_STOP)
+            self._thread.join(timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.shutdown()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
+
+
+def run(*strategies, target=None):
+    """
+    Run strategy coroutines side by side on one facade. Each strategy is a callable taking
+    the AsyncMT5 and returning a coroutine; the first one to raise ends the run.
+    """
+    async def main():
+        async with AsyncMT5(target) as amt5:
+            if not await amt5.initialize():
+                print("❌ MT5 initialize() failed:", await amt5.last_error())
+                return
+            print("✅ MT5 connected")
+            await asyncio.gather(*(strategy(amt5) for strategy in strategies))
+    asyncio.run(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Record / replay cassette for MT5 API interactions.
+
+- Recorder(mt5, path) is a drop-in proxy: every API call's name, arguments, result,
+  wall time and duration go on a queue; a background thread encodes and writes them
+  (the calling thread pays one dict copy + queue put, like event_journal)
+- Records are length-prefixed: <u32 length><marshal payload>. Namedtuple results
+  (TradePosition, AccountInfo, ...) are stored once as a type (name + fields) and then
+  as bare value tuples; a result equal to the previous one of the same function (the
+  common case in polling loops) is stored as a one-byte marker; NumPy arrays
+  (copy_ticks_*) as dtype + raw bytes, datetimes as ISO strings. The module's
+  constants are stored up front, so replay does not need MetaTrader5 installed
+- Player(path) serves the recorded results back in order and raises CassetteMismatch
+  when the script asks for something else (match="sequence": same function in the same
+  order, "strict": same arguments too, "name": next result of the same function, for
+  threaded callers)
+- Replay runs on a virtual clock (time_warp.VirtualClock): sleep() costs nothing and
+  time / datetime follow the recorded wall times, so an incident re-runs at full speed;
+  input() answers given during the recording are replayed too
+
+Usage:
+  python mt5_cassette.py record incident.cas "manual seprate script/new gap666666.py"
+  python mt5_cassette.py replay incident.cas "manual seprate script/new gap666666.py" --profile replay.prof
+  python mt5_cassette.py show incident.cas
+"""
+
+import argparse
+import builtins
+import datetime as _dt
+import marshal
+import os
+import queue
+import runpy
+import struct
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # only needed when a recording contains arrays
+    np = None
+
+_LEN = struct.Struct("<I")
+_CONSTANTS, _TYPE, _CALL = range(3)
+_ARRAY, _DATETIME, _OTHER = -1, -2, -3   # type ids below 0 are built-in encodings
+_SAME = b"="                              # result equal to the previous one of the same function
+_PLAIN = frozenset((int, float, str, bool, bytes, type(None)))
+
+
+class CassetteEnd(BaseException):
+    """Replay ran past the last recorded call (BaseException: strategy code catches Exception)."""
+
+
+class CassetteMismatch(Exception):
+    pass
+
+
+# ------------------- Encoding ------------------- #
+class _Encoder:
+    """Values -> marshal-able data. Tagged tuples start with Ellipsis: (..., type_id, *payload)."""
+
+    def __init__(self, emit):
+        self.emit = emit   # called with (_TYPE, tid, typename, fields) the first time a type is seen
+        self.types = {}
+
+    def __call__(self, v):
+        t = type(v)
+        if t in _PLAIN:
+            return v
+        if t is tuple or t is list:
+            return t(self(x) for x in v)
+        if t is dict:
+            return {k: self(x) for k, x in v.items()}
+        if isinstance(v, tuple) and hasattr(t, "_fields"):
+            tid = self.types.get(t)
+            if tid is None:
+                tid = self.types[t] = len(self.types)
+                self.emit((_TYPE, tid, t.__name__, tuple(t._fields)))
+            values = tuple(v)
+            if all(type(x) in _PLAIN for x in values):  # MT5 records: flat numbers and strings
+                return (..., tid) + values
+            return (..., tid) + tuple(self(x) for x in values)
+        if np is not None and isinstance(v, np.ndarray):
+            return (..., _ARRAY, np.lib.format.dtype_to_descr(v.dtype), v.shape, v.tobytes())
+        if isinstance(v, _dt.datetime):
+            return (..., _DATETIME, v.isoformat())
+        if np is not None and isinstance(v, np.generic):
+            return v.item()
+        return (..., _OTHER, repr(v))
+
+
+class _Decoder:
+    def __init__(self):
+        self.types = {}
+
+    def add_type(self, tid, typename, fields):
+        self.types[tid] = namedtuple(typename, fields)
+
+    def __call__(self, v):
+        t = type(v)
+        if t is tuple:
+            if v and v[0] is ...:
+                tid = v[1]
+                if tid >= 0:
+                    return self.types[tid](*(self(x) for x in v[2:]))
+                if tid == _ARRAY:
+                    return np.frombuffer(v[4], dtype=np.dtype(v[2])).reshape(v[3]).copy()
+                if tid == _DATETIME:
+                    return _dt.datetime.fromisoformat(v[2])
+                return v[2]
+            return tuple(self(x) for x in v)
+        if t is list:
+            return [self(x) for x in v]
+        if t is dict:
+            return {k: self(x) for k, x in v.items()}
+        return v
+
+
+def _snapshot(v):
+    """Freeze mutable arguments at call time (request dicts get reused by the scripts)."""
+    t = type(v)
+    if t is dict:
+        return dict(v)
+    if t is list:
+        return list(v)
+    return v
+
+
+def _equal(a, b):
+    try:
+        return bool(a == b)
+    except ValueError:  # NumPy arrays: elementwise ==
+        return False
+
+
+# ------------------- Recorder ------------------- #
+class Recorder:
+    def __init__(self, target, path):
+        self._target = target
+        self._path = path
+        self._q = queue.SimpleQueue()
+        self._seq = 0
+        self._file = open(path, "wb", buffering=1 << 20)
+        self._thread = threading.Thread(target=self._run, name="cassette", daemon=True)
+        self._thread.start()
+        constants = {name: getattr(target, name) for name in dir(target)
+                     if name.isupper() and isinstance(getattr(target, name), (int, float, str))}
+        self._q.put((_CONSTANTS, constants))
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr) or isinstance(attr, type):
+            return attr
+        wrapper = self._wrap(name, attr)
+        self.__dict__[name] = wrapper
+        return wrapper
+
+    def _wrap(self, name, fn):
+        put = self._q.put
+        clock = time.perf_counter_ns
+        wall = time.time_ns
+
+        def wrapper(*args, **kwargs):
+            frozen = tuple(_snapshot(a) for a in args) if args else ()
+            start = clock()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:  # KeyboardInterrupt mid-call is part of the incident too
+                put((_CALL, name, wall(), clock() - start, frozen, kwargs, None,
+                     (isinstance(e, Exception), repr(e))))
+                raise
+            put((_CALL, name, wall(), clock() - start, frozen, kwargs, result, None))
+            return result
+        wrapper.__name__ = name
+        return wrapper
+
+    def record_input(self, prompt, answer):
+        self._q.put((_CALL, "input", time.time_ns(), 0, (prompt,), {}, answer, None))
+
+    def close(self):
+        self._q.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        f = self._file
+
+        def write(record):
+            payload = marshal.dumps(record)
+            f.write(_LEN.pack(len(payload)))
+            f.write(payload)
+
+        encode = _Encoder(write)
+        last = {}  # function name -> previous result
+        while True:
+            item = self._q.get()
+            while item is not None:
+                if item[0] == _CALL:
+                    kind, name, wall_ns, dur_ns, args, kwargs, result, error = item
+                    self._seq += 1
+                    prev = last.get(name, _SAME)
+                    same = prev is not _SAME and type(prev) is type(result) and _equal(prev, result)
+                    last[name] = result
+                    write((kind, self._seq, name, wall_ns, dur_ns, encode(args), encode(kwargs),
+                           _SAME if same else encode(result), error))
+                else:
+                    write((item[0], encode(item[1])))
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+            f.flush()  # queue drained: push the batch to the OS
+            if item is None:
+                return
+
+
+# ------------------- Reader / Player ------------------- #
+Call = namedtuple("Call", "seq name wall_ns dur_ns args kwargs result error")
+
+
+def load_cassette(path):
+    """Returns (constants, [Call, ...]) with results decoded. A truncated final record is ignored."""
+    with open(path, "rb") as f:
+        data = f.read()
+    decode = _Decoder()
+    constants, calls = {}, []
+    last = {}
+    pos, end = 0, len(data)
+    while pos + 4 <= end:
+        (length,) = _LEN.unpack_from(data, pos)
+        if pos + 4 + length > end:
+            break
+        record = marshal.loads(data[pos + 4:pos + 4 + length])
+        pos += 4 + length
+        if record[0] == _CALL:
+            _, seq, name, wall_ns, dur_ns, args, kwargs, result, error = record
+            result = last[name] if type(result) is bytes and result == _SAME else decode(result)
+            last[name] = result
+            calls.append(Call(seq, name, wall_ns, dur_ns, args, kwargs, result, error))
+        elif record[0] == _TYPE:
+            decode.add_type(*record[1:])
+        else:
+            constants = decode(record[1])
+    return constants, calls
+
+
+class Player:
+    def __init__(self, path, match="sequence"):
+        self._constants, self._calls = load_cassette(path)
+        self._match = match
+        self._pos = 0
+        self._by_name = {}
+        if match == "name":
+            for call in self._calls:
+                self._by_name.setdefault(call.name, deque()).append(call)
+        self._encode = _Encoder(lambda record: None)
+        self.clock = self._calls[0].wall_ns / 1e9 if self._calls else time.time()
+        self.served = 0
+
+    def __getattr__(self, name):
+        if name in self._constants:
+            return self._constants[name]
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def replay(*args, **kwargs):
+            return self._serve(name, args, kwargs)
+        replay.__name__ = name
+        self.__dict__[name] = replay
+        return replay
+
+    def _next(self, name):
+        if self._match == "name":
+            pending = self._by_name.get(name)
+            if not pending:
+                raise CassetteEnd(f"no recorded {name}() left after {self.served} calls")
+            return pending.popleft()
+        if self._pos >= len(self._calls):
+            raise CassetteEnd(f"cassette ended after {self.served} calls")
+        call = self._calls[self._pos]
+        self._pos += 1
+        return call
+
+    def _serve(self, name, args, kwargs):
+        call = self._next(name)
+        if call.name != name or (self._match == "strict" and
+                                 (call.args, call.kwargs) != (self._encode(args), self._encode(kwargs))):
+            raise CassetteMismatch(f"call #{call.seq}: recorded {call.name}{call.args} {call.kwargs}, "
+                                   f"replay asked for {name}{self._encode(args)} {self._encode(kwargs)}")
+        self.served += 1
+        self.clock = max(self.clock, call.wall_ns / 1e9)
+        if call.error:
+            is_exception, text = call.error
+            if not is_exception:
+                raise CassetteEnd(f"recording was interrupted in {name}(): {text}")
+            raise RuntimeError(f"recorded error: {text}")
+        return call.result
+
+    # virtual clock hooks (time_warp.VirtualClock)
+    def sleep(self, seconds):
+        self.clock += max(0.0, seconds)
+
+    def now(self):
+        return self.clock
+
+
+# ------------------- CLI ------------------- #
+def _run_script(script, argv):
+    sys.argv = [script] + argv
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    runpy.run_path(script, run_name="__main__")
+
+
+def cmd_record(args):
+    import MetaTrader5
+
+    recorder = Recorder(MetaTrader5, args.cassette)
+    sys.modules["MetaTrader5"] = recorder
+    real_input = builtins.input
+
+    def recorded_input(prompt=""):
+        answer = real_input(prompt)
+        recorder.record_input(prompt, answer)
+        return answer
+    builtins.input = recorded_input
+    try:
+        _run_script(args.script, args.args)
+    finally:
+        recorder.close()
+        print(f"📼 {recorder._seq} calls recorded to {args.cassette} ({os.path.getsize(args.cassette) / 1e3:.1f} kB)")
+
+
+def cmd_replay(args):
+    from time_warp import VirtualClock
+
+    player = Player(args.cassette, args.match)
+    sys.modules["MetaTrader5"] = player
+    builtins.input = lambda prompt="": player._serve("input", (prompt,), {})
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    outcome = "script returned"
+    try:
+        with VirtualClock(player):
+            if profiler:
+                profiler.enable()
+            _run_script(args.script, args.args)
+    except CassetteEnd as e:
+        outcome = str(e)
+    except SystemExit as e:
+        outcome = f"exit({e.code})"
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+    total = len(player._calls)
+    print(f"\n▶️ replayed {player.served}/{total} calls in {time.perf_counter() - t0:.2f}s — {outcome}")
+    if profiler:
+        print(f"🔬 profile written to {args.profile} (python -m pstats {args.profile})")
+
+
+def cmd_show(args):
+    constants, calls = load_cassette(args.cassette)
+    if not calls:
+        print("📼 empty cassette")
+        return
+    span = (calls[-1].wall_ns - calls[0].wall_ns) / 1e9
+    counts = {}
+    for c in calls:
+        n, t = counts.get(c.name, (0, 0))
+        counts[c.name] = (n + 1, t + c.dur_ns)
+    print(f"📼 {len(calls)} calls over {span:.1f}s, {len(constants)} constants, "
+          f"started {_dt.datetime.fromtimestamp(calls[0].wall_ns / 1e9):%Y-%m-%d %H:%M:%S}")
+    for name, (n, t) in sorted(counts.items(), key=lambda kv: -kv[1][1]):
+        print(f"  {name:<24} {n:>8} calls {t / 1e6:>10.1f} ms live")
+    for c in calls[:args.head]:
+        print(f"  #{c.seq:<6} {c.name}{c.args} {c.kwargs or ''} -> {c.error[1] if c.error else repr(c.result)[:120]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record / replay MT5 API calls of a strategy script.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="run a script live and record every MT5 call")
+    rec.add_argument("cassette")
+    rec.add_argument("script")
+    rec.add_argument("args", nargs=argparse.REMAINDER)
+    rep = sub.add_parser("replay", help="run a script against a recording, no terminal needed")
+    rep.add_argument("cassette")
+    rep.add_argument("script")
+    rep.add_argument("args", nargs=argparse.REMAINDER)
+    rep.add_argument("--match", choices=("sequence", "strict", "name"), default="sequence")
+    rep.add_argument("--profile", help="write cProfile stats of the replay here")
+    show = sub.add_parser("show", help="summarise a recording")
+    show.add_argument("cassette")
+    show.add_argument("--head", type=int, default=10, help="first N calls to print")
+    args = parser.parse_args()
+    {"record": cmd_record, "replay": cmd_replay, "show": cmd_show}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
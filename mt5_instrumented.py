@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Drop-in instrumented proxy for the MetaTrader5 module.
+
+- `import mt5_instrumented as mt5` instead of `import MetaTrader5 as mt5`: every API
+  function is wrapped on first use with a call counter, wall time (total / max),
+  failure tally (None / False results, by last_error code, and exceptions) and a
+  retcode tally for results that carry one (order_send, order_check)
+- Constants (mt5.ORDER_TYPE_BUY, ...) pass straight through
+- Optional argument sampling: keep the arguments of every Nth call (SAMPLE_EVERY)
+- dump() prints the table sorted by total time; stats() returns it as dicts
+- Instrumented(fake) wraps any terminal-like object (benchmarks, replay)
+- Run an unmodified script under the proxy:
+    python mt5_instrumented.py --sample 100 "manual seprate script/new gap .py"
+  installs it as sys.modules["MetaTrader5"] and dumps the table when the script exits
+"""
+
+import argparse
+import atexit
+import os
+import runpy
+import sys
+import time
+from collections import deque
+
+SAMPLE_EVERY = int(os.environ.get("MT5_SAMPLE_EVERY", "0"))  # 0 = no argument sampling
+SAMPLE_KEEP = 5                                            # samples kept per function
+
+
+class CallStats:
+    __slots__ = ("name", "calls", "total_ns", "max_ns", "failures", "exceptions", "errors",
+                 "retcodes", "samples")
+
+    def __init__(self, name, keep=SAMPLE_KEEP):
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.failures = 0        # None / False results
+        self.exceptions = 0
+        self.errors = {}         # last_error() code -> count, for failed calls
+        self.retcodes = {}       # result.retcode -> count
+        self.samples = deque(maxlen=keep)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0.0,
+            "max_ms": self.max_ns / 1e6,
+            "failures": self.failures,
+            "exceptions": self.exceptions,
+            "errors": dict(self.errors),
+            "retcodes": dict(self.retcodes),
+            "samples": list(self.samples),
+        }
+
+
+class Instrumented:
+    """Attribute proxy: callables come back wrapped (and cached), everything else as is."""
+
+    def __init__(self, target, sample_every=SAMPLE_EVERY, keep=SAMPLE_KEEP):
+        self._target = target
+        self._sample_every = sample_every
+        self._keep = keep
+        self._stats = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr) or isinstance(attr, type):
+            return attr
+        wrapper = self._wrap(name, attr)
+        self.__dict__[name] = wrapper  # next lookup skips __getattr__
+        return wrapper
+
+    def __dir__(self):
+        return sorted(set(dir(self._target)) | set(self.__dict__))
+
+    def _wrap(self, name, fn):
+        st = self._stats[name] = CallStats(name, self._keep)
+        sample_every = self._sample_every
+        target = self._target
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                st.exceptions += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                st.calls += 1
+                st.total_ns += elapsed
+                if elapsed > st.max_ns:
+                    st.max_ns = elapsed
+            if result is None or result is False:
+                st.failures += 1
+                try:
+                    code = target.last_error()[0]
+                except Exception:
+                    code = None
+                st.errors[code] = st.errors.get(code, 0) + 1
+            else:
+                retcode = getattr(result, "retcode", None)
+                if retcode is not None:
+                    st.retcodes[retcode] = st.retcodes.get(retcode, 0) + 1
+            if sample_every and st.calls % sample_every == 0:
+                st.samples.append((args, kwargs))
+            return result
+        wrapper.__name__ = name
+        wrapper.__wrapped__ = fn
+        return wrapper
+
+    # ------------------- Reports ------------------- #
+    def stats(self):
+        """Per-function stats, most total time first."""
+        rows = [st.as_dict() for st in self._stats.values() if st.calls]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self):
+        for name in list(self._stats):
+            self._stats[name] = CallStats(name, self._keep)
+            self.__dict__.pop(name, None)  # rewrap with the fresh stats on next use
+
+    def dump(self, file=None):
+        rows = self.stats()
+        grand = sum(row["total_ms"] for row in rows) or 1.0
+        lines = [f"{'function':<24} {'calls':>8} {'total ms':>11} {'share':>6} {'mean µs':>10} "
+                 f"{'max ms':>9} {'fail':>6}  retcodes / errors"]
+        lines.append("-" * len(lines[0]))
+        for row in rows:
+            tallies = ", ".join(f"{k}×{v}" for k, v in sorted(row["retcodes"].items(), key=lambda kv: -kv[1]))
+            if row["errors"]:
+                tallies += (" | " if tallies else "") + "err " + ", ".join(
+                    f"{k}×{v}" for k, v in sorted(row["errors"].items(), key=lambda kv: -kv[1]))
+            lines.append(f"{row['name']:<24} {row['calls']:>8} {row['total_ms']:>11.1f} "
+                         f"{row['total_ms'] / grand:>6.1%} {row['mean_us']:>10.1f} {row['max_ms']:>9.2f} "
+                         f"{row['failures'] + row['exceptions']:>6}  {tallies}")
+            for args, kwargs in row["samples"]:
+                lines.append(f"{'':<26}↳ args={args!r} kwargs={kwargs!r}")
+        print("\n".join(lines), file=file or sys.stdout)
+        return lines
+
+
+# ------------------- Module-level proxy ------------------- #
+_proxy = None
+
+
+def _default():
+    global _proxy
+    if _proxy is None:
+        import MetaTrader5
+        _proxy = Instrumented(MetaTrader5)
+    return _proxy
+
+
+def __getattr__(name):  # `import mt5_instrumented as mt5; mt5.order_send(...)`
+    if name.startswith("__"):
+        raise AttributeError(name)
+    return getattr(_default(), name)
+
+
+def stats():
+    return _default().stats()
+
+
+def dump(file=None):
+    return _default().dump(file)
+
+
+def reset():
+    _default().reset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a script with MetaTrader5 replaced by the instrumented proxy.")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    parser.add_argument("--sample", type=int, default=SAMPLE_EVERY, help="keep the arguments of every Nth call")
+    args = parser.parse_args()
+
+    import MetaTrader5
+    global _proxy
+    _proxy = Instrumented(MetaTrader5, sample_every=args.sample)
+    sys.modules["MetaTrader5"] = _proxy
+    atexit.register(_proxy.dump)  # also runs when the script calls quit()
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    runpy.run_path(args.script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Local mirror of this script's pending orders.
+
+- send() wraps mt5.order_send and updates the mirror from the result: a placed pending
+  is added, a TRADE_ACTION_REMOVE drops its ticket, so our own changes never need a query
+- Pendings that fill or are removed outside the script are picked up by one
+  orders_get(symbol=...) every RECONCILE_INTERVAL seconds, not one call per check
+- count() / alive(ticket) / tickets() answer from memory (and reconcile when due)
+- A lock guards the mirror so orders can be sent from worker threads
+"""
+
+import threading
+import time
+
+RECONCILE_INTERVAL = 5.0   # seconds between orders_get reconciles
+
+
+class OrderMirror:
+    def __init__(self, mt5, symbol, magic=None, interval=RECONCILE_INTERVAL):
+        self.mt5 = mt5
+        self.symbol = symbol
+        self.magic = magic               # None = mirror every pending on the symbol
+        self.interval = interval
+        self.orders = {}                 # ticket -> {"type", "price", "volume", "placed_at"}
+        self.last_reconcile = 0.0
+        self.reconciles = 0
+        self._lock = threading.Lock()
+        self.reconcile()
+
+    # ---------- updates ---------- #
+    def send(self, request):
+        """mt5.order_send + mirror update. Returns the order_send result unchanged."""
+        result = self.mt5.order_send(request)
+        self.on_result(request, result)
+        return result
+
+    def on_result(self, request, result):
+        if result is None or result.retcode not in (self.mt5.TRADE_RETCODE_DONE, self.mt5.TRADE_RETCODE_PLACED):
+            return
+        action = request.get("action")
+        with self._lock:
+            if action == self.mt5.TRADE_ACTION_PENDING and result.order:
+                self.orders[result.order] = {
+                    "type": request.get("type"),
+                    "price": request.get("price"),
+                    "volume": request.get("volume"),
+                    "placed_at": time.time(),
+                }
+            elif action == self.mt5.TRADE_ACTION_REMOVE:
+                self.orders.pop(request.get("order"), None)
+            elif action == self.mt5.TRADE_ACTION_MODIFY and request.get("order") in self.orders:
+                self.orders[request["order"]]["price"] = request.get("price")
+
+    def forget(self, ticket):
+        with self._lock:
+            self.orders.pop(ticket, None)
+
+    def reconcile(self):
+        """
+        Replace the mirror with the terminal's view (one orders_get call).
+        Returns (appeared, vanished) ticket lists; vanished = filled / cancelled elsewhere.
+        """
+        live = self.mt5.orders_get(symbol=self.symbol)
+        self.last_reconcile = time.monotonic()
+        if live is None:
+            return [], []  # terminal hiccup: keep the current mirror
+        if self.magic is not None:
+            live = [o for o in live if o.magic == self.magic]
+        with self._lock:
+            fresh = {o.ticket: {"type": o.type, "price": o.price_open, "volume": o.volume_current,
+                                "placed_at": self.orders.get(o.ticket, {}).get("placed_at", o.time_setup)}
+                     for o in live}
+            appeared = [t for t in fresh if t not in self.orders]
+            vanished = [t for t in self.orders if t not in fresh]
+            self.orders = fresh
+        self.reconciles += 1
+        return appeared, vanished
+
+    def maybe_reconcile(self):
+        if time.monotonic() - self.last_reconcile >= self.interval:
+            return self.reconcile()
+        return [], []
+
+    # ---------- queries (memory, reconcile when due) ---------- #
+    def count(self):
+        self.maybe_reconcile()
+        return len(self.orders)
+
+    def alive(self, ticket):
+        self.maybe_reconcile()
+        return ticket in self.orders
+
+    def tickets(self):
+        self.maybe_reconcile()
+        with self._lock:
+            return list(self.orders)
@@ -1,4 +1,5 @@
 from flask import Flask, request, jsonify
+from werkzeug.serving import WSGIRequestHandler
 from functools import wraps
 from datetime import datetime
 import csv, os, threading
@@ -15,6 +16,11 @@ AUDIT_CSV = "audit_log.csv"
 app = Flask(__name__)
 lock = threading.Lock()
 
+class NoDelayHandler(WSGIRequestHandler):
+    # headers and body go out as two writes; with Nagle on, a keep-alive client
+    # (virtual_account_client.py) waits out its delayed ACK (~40 ms) on every response
+    disable_nagle_algorithm = True
+
 # initial account state
 DEFAULT_STATE = {
     "login": "virtual-1001",
@@ -62,7 +68,10 @@ def require_token(func):
 @require_token
 def get_account():
     state = load_state()
-    return jsonify(state)
+    # ETag over the body: a client revalidating its cached snapshot (If-None-Match) gets a bodyless 304
+    resp = jsonify(state)
+    resp.add_etag()
+    return resp.make_conditional(request)
 
 @app.route("/modify", methods=["POST"])
 @require_token
@@ -138,4 +147,4 @@ if __name__ == "__main__":
     if not os.path.exists(AUDIT_CSV):
         open(AUDIT_CSV, "w").close()
     print(f"Starting virtual account API on port {APP_PORT}. Use header Authorization: Bearer {API_TOKEN}")
-    app.run(host="0.0.0.0", port=APP_PORT, debug=False)
+    app.run(host="0.0.0.0", port=APP_PORT, debug=False, threaded=True, request_handler=NoDelayHandler)
@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP/1.1 client for the virtual account API (virtual_account_api.py), sync and asyncio.
+
+- Keep-alive pool: requests reuse up to pool_size warm connections (plain sockets or TLS,
+  TCP_NODELAY, TCP_QUICKACK) instead of a TCP (+TLS) handshake per call; a pooled
+  connection the server closed while idle is seen before use and replaced
+- At most once for writes: a request is resent only when it provably never reached the
+  server (the socket took no byte of it) or is a GET; a POST /modify whose outcome is
+  unknown raises (OSError with .answered, the responses received) and is never resent,
+  so a fill cannot be credited twice
+- Pipelining: pipeline() and batch flushes write every request on one connection before
+  reading the responses, which the server returns in order (one round trip for the lot)
+- add_profit_per_trade() queues: fills with the same amount and reason coalesce into one
+  {"op": "add_profit_per_trade", "amount": a, "trades": n} (the API credits a * n and audits
+  "a x n"); the queue is sent at batch_size trades, flush_interval s after its first fill,
+  before every account() read and on close(); a failed send is not retried: the error's
+  .unconfirmed lists the fills without a response (check /audit before reporting them again)
+- account() keeps the last /account snapshot and its ETag: younger than max_age it is
+  returned as is, older it is revalidated with If-None-Match (a 304 carries no body); a
+  write through this client makes it stale
+- VirtualAccountClient (thread-safe) and AsyncVirtualAccountClient (one event loop) share
+  the request encoding, response parser, batching and cache; API errors raise
+  VirtualAccountError(status, message, payload)
+
+Usage:
+    with VirtualAccountClient("http://127.0.0.1:5000", token) as va:
+        va.add_profit_per_trade(12.5, reason="cycle 42")      # queued, sent in a batch
+        print(va.account()["balance"])
+
+    async with AsyncVirtualAccountClient("http://127.0.0.1:5000", token) as va:
+        await va.add_profit_per_trade(12.5)
+        print((await va.account())["balance"])
+
+    python overideesssss/virtual_account_client.py --token ... account
+    python overideesssss/virtual_account_client.py --token ... add-profit 12.5 --trades 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import select
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+
+MAX_LINE = 65536
+QUICKACK = getattr(socket, "TCP_QUICKACK", None)     # Linux only
+Response = namedtuple("Response", "status headers body keep_alive")
+
+_LINE, _READ = "line", "read"
+
+
+class VirtualAccountError(RuntimeError):
+    """The API answered with an error status."""
+
+    def __init__(self, status, message, payload=None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
+
+
+# ------------------- HTTP/1.1 ------------------- #
+def _response():
+    """
+    One response as a generator: yields (_LINE, None) for a line or (_READ, n) for n bytes
+    (None = to EOF) and is sent the bytes; returns a Response. Sync and asyncio drive it.
+    """
+    status_line = yield _LINE, None
+    if not status_line:
+        raise ConnectionError("connection closed before the response")
+    version, status, _ = (status_line.decode("latin-1").rstrip("\r\n") + "  ").split(" ", 2)
+    status = int(status)
+    headers = {}
+    while True:
+        line = yield _LINE, None
+        if not line:
+            raise ConnectionError("connection closed in the response headers")
+        if line in (b"\r\n", b"\n"):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    conn = headers.get("connection", "").lower()
+    keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+
+    if status in (204, 304) or 100 <= status < 200:
+        body = b""
+    elif "chunked" in headers.get("transfer-encoding", "").lower():
+        parts = []
+        while True:
+            size = int((yield _LINE, None).split(b";", 1)[0], 16)
+            if not size:
+                while (yield _LINE, None) not in (b"\r\n", b"\n", b""):
+                    pass                                    # trailers
+                break
+            parts.append((yield _READ, size))
+            yield _LINE, None                               # CRLF after the chunk
+        body = b"".join(parts)
+    elif "content-length" in headers:
+        n = int(headers["content-length"])
+        body = (yield _READ, n) if n else b""
+        if len(body) < n:
+            raise ConnectionError(f"connection closed after {len(body)} of {n} body bytes")
+    else:
+        body, keep_alive = (yield _READ, None), False       # delimited by the server closing
+    return Response(status, headers, body, keep_alive)
+
+
+def _quickack(sock):
+    """
+    Re-armed before every response: a server writing headers and body as two segments with
+    Nagle on (http.server, werkzeug) holds the body until the headers are ACKed, and a
+    delayed ACK costs ~40 ms per keep-alive response.
+    """
+    if QUICKACK is not None and sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, QUICKACK, 1)
+
+
+def _read_sync(f):
+    parser = _response()
+    want = next(parser)
+    try:
+        while True:
+            kind, n = want
+            want = parser.send(f.readline(MAX_LINE) if kind is _LINE else f.read() if n is None else f.read(n))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _read_async(reader):
+    parser = _response()
+    want = next(parser)
+    try:
+        while True:
+            kind, n = want
+            if kind is _LINE:
+                data = await reader.readline()
+            elif n is None:
+                data = await reader.read()
+            else:
+                try:
+                    data = await reader.readexactly(n)
+                except asyncio.IncompleteReadError as exc:
+                    data = exc.partial
+            want = parser.send(data)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _idempotent(req):
+    return req.startswith(b"GET ")
+
+
+def _dropped(sock):
+    """An idle keep-alive socket with something to read has been closed by the server (or is out of step)."""
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _decode(resp):
+    try:
+        payload = json.loads(resp.body) if resp.body else None
+    except ValueError:
+        payload = resp.body.decode("utf-8", "replace")
+    if resp.status >= 400:
+        message = payload.get("error", payload) if isinstance(payload, dict) else payload
+        raise VirtualAccountError(resp.status, f"HTTP {resp.status}: {message}", payload)
+    return payload
+
+
+# ------------------- Shared state ------------------- #
+class _ClientBase:
+    def __init__(self, url=None, token=None, actor=None, pool_size=4, timeout=10.0, batch_size=50,
+                 flush_interval=0.25, max_age=1.0, idle_timeout=30.0, ssl_context=None):
+        parts = urllib.parse.urlsplit(url or f"http://127.0.0.1:{os.getenv('VA_PORT', 5000)}")
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {parts.scheme!r}")
+        token = token or os.getenv("VA_API_TOKEN")
+        if not token:
+            raise ValueError("no API token (pass token= or set VA_API_TOKEN)")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.tls = ssl_context or (ssl.create_default_context() if parts.scheme == "https" else None)
+        self.prefix = parts.path.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self._fixed = [f"Host: {parts.netloc}", f"Authorization: Bearer {token}", "Accept: application/json"]
+        if actor:
+            self._fixed.append(f"X-Actor: {actor}")
+        self._idle = []                 # (connection, last used) most recent last
+        self._pending = {}              # (amount, reason) -> queued trades
+        self._pending_trades = 0
+        self._entries = 0               # add_profit_per_trade() calls behind the queue
+        self._snapshot = self._etag = None
+        self._fetched = 0.0
+        self._writes = 0                # bumped by every write; a snapshot older than a write is stale
+        self._snapshot_writes = -1
+        self._state = threading.Lock()  # _writes and the snapshot (the sync client's threads share them)
+        self.last_error = None          # exception of the last background flush
+        self.requests = 0               # sent to the server
+        self.connections = 0            # opened
+        self.pipelined = 0              # requests that shared a round trip with an earlier one
+        self.coalesced = 0              # queued fills merged into another fill's request
+        self.cache_hits = 0             # account() answered without a request
+        self.revalidated = 0            # account() answered by a 304
+
+    def _encode(self, method, path, payload=None, headers=()):
+        if method != "GET":
+            with self._state:
+                self._writes += 1
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", *self._fixed, *headers]
+        body = b""
+        if payload is not None:
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    def _queue(self, amount, trades, reason):
+        """Queues a fill; True when the batch is full."""
+        key = (float(amount), reason)
+        self._pending[key] = self._pending.get(key, 0) + int(trades)
+        self._pending_trades += int(trades)
+        self._entries += 1
+        return self._pending_trades >= self.batch_size
+
+    def _take(self):
+        """The queued fills as [(key, trades)], one request each, and the queue emptied."""
+        batch = list(self._pending.items())
+        self.coalesced += self._entries - len(batch)
+        self._pending.clear()
+        self._pending_trades = 0
+        self._entries = 0
+        return batch
+
+    def _unconfirmed(self, exc, batch):
+        """Tags a failed batch send with the fills that got no response; they are not resent."""
+        exc.unconfirmed = [(amount, trades, reason) for (amount, reason), trades in batch[exc.answered:]]
+        return exc
+
+    def _batch_requests(self, batch):
+        return [self._encode("POST", "/modify", {"op": "add_profit_per_trade", "amount": amount, "trades": trades,
+                                                 "reason": reason})
+                for (amount, reason), trades in batch]
+
+    def _cached(self, max_age):
+        with self._state:
+            if self._snapshot is None or self._snapshot_writes != self._writes:
+                return None
+            if time.monotonic() - self._fetched < (self.max_age if max_age is None else max_age):
+                self.cache_hits += 1
+                return dict(self._snapshot)
+        return None
+
+    def _account_request(self):
+        with self._state:
+            headers = (f"If-None-Match: {self._etag}",) if self._etag and self._snapshot is not None else ()
+            return self._encode("GET", "/account", headers=headers), self._writes
+
+    def _account_result(self, resp, writes):
+        with self._state:
+            if resp.status == 304 and self._snapshot is not None:
+                self.revalidated += 1
+            else:
+                self._snapshot = _decode(resp)
+                self._etag = resp.headers.get("etag")
+            self._fetched = time.monotonic()
+            self._snapshot_writes = writes
+            return dict(self._snapshot)
+
+    def _counted(self, n):
+        self.requests += n
+        self.pipelined += n - 1
+
+    def stats(self):
+        return {"requests": self.requests, "connections": self.connections, "pipelined": self.pipelined,
+                "coalesced": self.coalesced, "cache_hits": self.cache_hits, "revalidated": self.revalidated,
+                "queued_trades": self._pending_trades}
+
+
+def _close(conn):
+    sock, f = conn
+    f.close()
+    sock.close()
+
+
+# ------------------- Sync ------------------- #
+class VirtualAccountClient(_ClientBase):
+    """Pooled client for threads (pool_size connections at most); every call blocks for its response,
+    except add_profit_per_trade(), which queues."""
+
+    def __init__(self, url=None, token=None, **kwargs):
+        super().__init__(url, token, **kwargs)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.pool_size)     # connections in use, at most
+        self._timer = None
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.tls:
+            sock = self.tls.wrap_socket(sock, server_hostname=self.host)
+        self.connections += 1
+        return sock, sock.makefile("rb")
+
+    def _acquire(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, used = self._idle.pop()
+                if now - used < self.idle_timeout and not _dropped(conn[0]):
+                    return conn
+                _close(conn)
+        return self._connect()
+
+    def _release(self, conn, reuse):
+        if reuse:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append((conn, time.monotonic()))
+                    return
+        _close(conn)
+
+    def _exchange(self, reqs):
+        """
+        Writes every request, then reads the responses in order. After a failure, or a server
+        closing the connection early, the unanswered requests go out again on a new connection
+        only if none of their bytes was sent or all of them are GETs; otherwise the OSError
+        raised carries .answered.
+        """
+        out = []
+        retried = False
+        with self._slots:
+            while len(out) < len(reqs):
+                conn = self._acquire()
+                todo = reqs[len(out):]
+                data = b"".join(todo)
+                sent = 0
+                try:
+                    while sent < len(data):
+                        sent += conn[0].send(data[sent:])
+                    for _ in todo:
+                        _quickack(conn[0])
+                        out.append(_read_sync(conn[1]))
+                        if not out[-1].keep_alive:
+                            break
+                except OSError as exc:
+                    _close(conn)
+                    rest = reqs[len(out):]
+                    if not retried and (sent == 0 or all(map(_idempotent, rest))):
+                        retried = True
+                        continue
+                    exc.answered = len(out)
+                    raise
+                self._release(conn, out[-1].keep_alive and out[-1].status < 400)
+                rest = reqs[len(out):]
+                if rest and not all(map(_idempotent, rest)):
+                    exc = ConnectionError(f"server closed the connection after {len(out)} of {len(reqs)} responses")
+                    exc.answered = len(out)
+                    raise exc
+        with self._lock:
+            self._counted(len(reqs))
+        return out
+
+    def _send(self, batch, reqs):
+        try:
+            return self._exchange(reqs)
+        except OSError as exc:
+            raise self._unconfirmed(exc, batch)
+
+    def _take_batch(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return self._take()
+
+    def pipeline(self, calls):
+        """[(method, path, payload or None)] on one connection in one round trip; the decoded replies in order."""
+        return [_decode(r) for r in self._exchange([self._encode(m, path, body) for m, path, body in calls])]
+
+    def modify(self, op, amount, reason="", **fields):
+        payload = {"op": op, "amount": amount, "reason": reason, **fields}
+        return _decode(self._exchange([self._encode("POST", "/modify", payload)])[0])
+
+    def add_balance(self, amount, reason=""):
+        return self.modify("add_balance", amount, reason)
+
+    def set_balance(self, amount, equity=None, reason=""):
+        return self.modify("set_balance", amount, reason, **({} if equity is None else {"equity": equity}))
+
+    def add_profit_per_trade(self, amount, trades=1, reason=""):
+        """Queues `trades` x `amount` of profit; sent with the next batch (flush() to send now)."""
+        with self._lock:
+            full = self._queue(amount, trades, reason)
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._background_flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        except (OSError, VirtualAccountError) as exc:
+            self.last_error = exc
+
+    def flush(self):
+        """Sends the queued fills in one pipelined round trip; the API's replies."""
+        batch = self._take_batch()
+        return [_decode(r) for r in self._send(batch, self._batch_requests(batch))] if batch else []
+
+    def account(self, max_age=None):
+        """The /account snapshot, cached for max_age s then revalidated; queued fills go first, in the same round trip."""
+        batch = self._take_batch()
+        if not batch:
+            cached = self._cached(max_age)
+            if cached is not None:
+                return cached
+        reqs = self._batch_requests(batch)
+        get, writes = self._account_request()
+        resps = self._send(batch, reqs + [get])
+        for r in resps[:-1]:
+            _decode(r)
+        return self._account_result(resps[-1], writes)
+
+    def audit(self, n=200):
+        return _decode(self._exchange([self._encode("GET", f"/audit?n={int(n)}")])[0])
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                idle, self._idle = self._idle, []
+            for conn, _ in idle:
+                _close(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------- Asyncio ------------------- #
+class AsyncVirtualAccountClient(_ClientBase):
+    """Pooled client for one event loop; concurrent coroutines share pool_size connections."""
+
+    def __init__(self, url=None, token=None, **kwargs):
+        super().__init__(url, token, **kwargs)
+        self._slots = asyncio.Semaphore(self.pool_size)
+        self._flusher = None            # call_later handle of the pending batch
+        self._tasks = set()
+
+    async def _acquire(self):
+        now = time.monotonic()
+        while self._idle:
+            conn, used = self._idle.pop()
+            reader, writer = conn
+            if now - used < self.idle_timeout and not reader.at_eof() and not writer.is_closing():
+                return conn
+            writer.close()
+        conn = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, ssl=self.tls), self.timeout)
+        self.connections += 1
+        return conn
+
+    def _release(self, conn, reuse):
+        if reuse and len(self._idle) < self.pool_size:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            conn[1].close()
+
+    async def _exchange(self, reqs):
+        """As VirtualAccountClient._exchange; the transport buffers writes, so only GETs are resent."""
+        out = []
+        retried = False
+        async with self._slots:
+            while len(out) < len(reqs):
+                conn = await self._acquire()
+                reader, writer = conn
+                todo = reqs[len(out):]
+                try:
+                    writer.write(b"".join(todo))
+                    await writer.drain()
+                    for _ in todo:
+                        _quickack(writer.get_extra_info("socket"))
+                        out.append(await asyncio.wait_for(_read_async(reader), self.timeout))
+                        if not out[-1].keep_alive:
+                            break
+                except OSError as exc:
+                    writer.close()
+                    if not retried and all(map(_idempotent, reqs[len(out):])):
+                        retried = True
+                        continue
+                    exc.answered = len(out)
+                    raise
+                except BaseException:
+                    writer.close()          # cancelled mid-exchange: the connection is out of step
+                    raise
+                self._release(conn, out[-1].keep_alive and out[-1].status < 400)
+                rest = reqs[len(out):]
+                if rest and not all(map(_idempotent, rest)):
+                    exc = ConnectionError(f"server closed the connection after {len(out)} of {len(reqs)} responses")
+                    exc.answered = len(out)
+                    raise exc
+        self._counted(len(reqs))
+        return out
+
+    async def _send(self, batch, reqs):
+        try:
+            return await self._exchange(reqs)
+        except OSError as exc:
+            raise self._unconfirmed(exc, batch)
+
+    def _take_batch(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        return self._take()
+
+    async def pipeline(self, calls):
+        return [_decode(r) for r in await self._exchange([self._encode(m, path, body) for m, path, body in calls])]
+
+    async def modify(self, op, amount, reason="", **fields):
+        payload = {"op": op, "amount": amount, "reason": reason, **fields}
+        return _decode((await self._exchange([self._encode("POST", "/modify", payload)]))[0])
+
+    async def add_balance(self, amount, reason=""):
+        return await self.modify("add_balance", amount, reason)
+
+    async def set_balance(self, amount, equity=None, reason=""):
+        return await self.modify("set_balance", amount, reason, **({} if equity is None else {"equity": equity}))
+
+    async def add_profit_per_trade(self, amount, trades=1, reason=""):
+        if self._queue(amount, trades, reason):
+            await self.flush()
+        elif self._flusher is None:
+            self._flusher = asyncio.get_running_loop().call_later(self.flush_interval, self._background_flush)
+
+    def _background_flush(self):
+        self._flusher = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._flushed)
+
+    def _flushed(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.last_error = task.exception()
+
+    async def flush(self):
+        batch = self._take_batch()
+        return [_decode(r) for r in await self._send(batch, self._batch_requests(batch))] if batch else []
+
+    async def account(self, max_age=None):
+        batch = self._take_batch()
+        if not batch:
+            cached = self._cached(max_age)
+            if cached is not None:
+                return cached
+        reqs = self._batch_requests(batch)
+        get, writes = self._account_request()
+        resps = await self._send(batch, reqs + [get])
+        for r in resps[:-1]:
+            _decode(r)
+        return self._account_result(resps[-1], writes)
+
+    async def audit(self, n=200):
+        return _decode((await self._exchange([self._encode("GET", f"/audit?n={int(n)}")]))[0])
+
+    async def aclose(self):
+        try:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.flush()
+        finally:
+            idle, self._idle = self._idle, []
+            for (_, writer), _ in idle:
+                writer.close()
+            for (_, writer), _ in idle:
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=None, help="API base URL (default http://127.0.0.1:$VA_PORT)")
+    parser.add_argument("--token", default=None, help="bearer token (default $VA_API_TOKEN)")
+    parser.add_argument("--actor", default="client", help="X-Actor recorded in the audit log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("account")
+    sub.add_parser("audit").add_argument("-n", type=int, default=20)
+    for name in ("add-balance", "set-balance", "add-profit"):
+        p = sub.add_parser(name)
+        p.add_argument("amount", type=float)
+        p.add_argument("--reason", default="")
+        if name == "add-profit":
+            p.add_argument("--trades", type=int, default=1)
+    args = parser.parse_args()
+
+    with VirtualAccountClient(args.url, args.token, actor=args.actor) as va:
+        if args.command == "account":
+            out = va.account()
+        elif args.command == "audit":
+            out = va.audit(args.n)
+        elif args.command == "add-balance":
+            out = va.add_balance(args.amount, args.reason)
+        elif args.command == "set-balance":
+            out = va.set_balance(args.amount, reason=args.reason)
+        else:
+            va.add_profit_per_trade(args.amount, args.trades, args.reason)
+            out = va.flush()
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+In-process price-threshold triggers.
+
+- Alerts live in sorted integer-point books, one per (price source, direction):
+  "above" fires when the price >= level, "below" when the price <= level
+- on_tick() bisects each book once, so a tick costs O(log n + fired) no matter how
+  many alerts are armed, and pops the fired levels in one slice
+- An alert's action runs in the same process on the tick that crossed it; market_order()
+  builds an action that sends the DEAL request straight to mt5.order_send
+- Alerts are one-shot: they leave the book when they fire
+"""
+
+import itertools
+import time
+from bisect import bisect_left, bisect_right, insort
+
+
+class Alert:
+    __slots__ = ("id", "level", "source", "direction", "action", "label", "fired_at", "result")
+
+    def __init__(self, alert_id, level, source, direction, action, label):
+        self.id = alert_id
+        self.level = level          # integer points
+        self.source = source        # "ask" or "bid"
+        self.direction = direction  # "above" or "below"
+        self.action = action        # callable(alert, tick) -> result, or None
+        self.label = label
+        self.fired_at = None        # perf_counter_ns when on_tick() fired it
+        self.result = None
+
+
+class TriggerBook:
+    def __init__(self, scale):
+        self.scale = scale
+        self._ids = itertools.count(1)
+        # (source, direction) -> sorted [(level, id)]
+        self._books = {(s, d): [] for s in ("ask", "bid") for d in ("above", "below")}
+        self.alerts = {}
+
+    def add(self, price, source="ask", direction="above", action=None, label=""):
+        """Arm an alert at `price`. Returns its id."""
+        alert = Alert(next(self._ids), self.scale.to_points(price), source, direction, action, label)
+        self.alerts[alert.id] = alert
+        insort(self._books[(source, direction)], (alert.level, alert.id))
+        return alert.id
+
+    def remove(self, alert_id):
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        book = self._books[(alert.source, alert.direction)]
+        i = bisect_left(book, (alert.level, alert.id))
+        if i < len(book) and book[i][1] == alert_id:
+            del book[i]
+        return True
+
+    def __len__(self):
+        return len(self.alerts)
+
+    def on_tick(self, tick):
+        """Fire every alert crossed by this tick (running its action). Returns the fired alerts."""
+        fired = []
+        for source in ("ask", "bid"):
+            price = self.scale.to_points(getattr(tick, source))
+            above = self._books[(source, "above")]
+            if above and above[0][0] <= price:
+                i = bisect_right(above, (price, float("inf")))
+                fired.extend(above[:i])
+                del above[:i]
+            below = self._books[(source, "below")]
+            if below and below[-1][0] >= price:
+                i = bisect_left(below, (price, 0))
+                fired.extend(below[i:])
+                del below[i:]
+
+        alerts = []
+        for _, alert_id in fired:
+            alert = self.alerts.pop(alert_id)
+            alert.fired_at = time.perf_counter_ns()
+            if alert.action is not None:
+                alert.result = alert.action(alert, tick)
+            alerts.append(alert)
+        return alerts
+
+
+def market_order(mt5, symbol, side, volume, deviation=20, magic=0, comment="Price trigger"):
+    """Action that sends a market BUY/SELL at the crossing tick's price."""
+    def action(alert, tick):
+        request = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": symbol,
+            "volume": volume,
+            "type": mt5.ORDER_TYPE_BUY if side == "BUY" else mt5.ORDER_TYPE_SELL,
+            "price": tick.ask if side == "BUY" else tick.bid,
+            "deviation": deviation,
+            "magic": magic,
+            "comment": comment,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_FOK,
+        }
+        return mt5.order_send(request)
+    return action
+
+
+def run(mt5, symbol, book, interval=0.01, on_fire=None):
+    """Poll ticks until the book is empty; only evaluates when the tick actually changed."""
+    last_msc = None
+    while len(book):
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None or tick.time_msc == last_msc:
+            time.sleep(interval)
+            continue
+        last_msc = tick.time_msc
+        for alert in book.on_tick(tick):
+            if on_fire is not None:
+                on_fire(alert, tick)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo risk-of-ruin for the alternate BUY/SELL STOP volume ladders.
+
+- Price paths are block-bootstrapped from recorded tick moves (bid changes in points);
+  block starts come from a counter-based hash of (seed, path, block#), so any tick of any
+  path can be generated on demand without storing the paths
+- All paths of a batch advance together in NumPy: between two events a path's P&L is a
+  linear function of bid, so every path gets a [lo, hi] bid band (next trigger, TP, SL)
+  and the engine jumps CHUNK ticks at a time to the first tick that leaves the band
+- Ladders mirror the scripts: "climb" (new gap*.py: BUY legs step up by gap, SELL one gap
+  below the last BUY fill, cumulative TP = sum(vol) * PROFIT_UNIT) and "flip"
+  (pv_increment.py / 25%.py: pendings alternate between two levels, TP of the last leg)
+- Reports P(SL), P(TP), triggers to TP, worst open exposure and margin usage percentiles
+
+Usage:
+  python risk_of_ruin.py --ticks XAUUSD_ticks.csv --ladder gap666 --gap 2.0 --loss-target 500
+  python risk_of_ruin.py --ladder mega --gap 1.0 --loss-target 50 --paths 100000   (synthetic ticks)
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fixed_point import prices_to_points
+
+CHUNK = 128         # ticks generated per path per step of the engine
+BATCH = 16384       # paths simulated together (bounds memory to ~BATCH * CHUNK * 8 bytes per array)
+MAX_FILLS = 16      # pendings that can fill on a single tick (price gapping through several levels)
+
+TP, SL, TIMEOUT = 1, 2, 3
+_FAR = 2**30        # "never" for a band edge, in relative points
+
+
+# ------------------- Ladders ------------------- #
+class Ladder:
+    """volumes[k] = lots of leg k, targets[k] = $ TP once legs 0..k have triggered."""
+
+    def __init__(self, name, volumes, targets, geometry):
+        self.name = name
+        self.volumes = np.asarray(volumes, dtype=np.float64)
+        self.targets = np.asarray(targets, dtype=np.float64)
+        self.geometry = geometry  # "climb" or "flip"
+
+
+def _profit_pattern(mode, legs):
+    out = []
+    if mode == "even":
+        profit, step = 1.5, 2.0
+        for _ in range(legs):
+            out.append(profit)
+            profit += step
+            step += 1.0
+    elif mode == "mega":
+        out = [3.0 + 0.5 * k for k in range(legs)]
+    else:
+        base, step = 0.5, 0.5
+        for _ in range(legs):
+            out.append(base)
+            base += step
+            step += 0.5
+    return out
+
+
+def ladder_preset(name, legs=200, profit_unit=50.0, vol_min=0.01, vol_step=0.01):
+    """The ladders used by the scripts; sequences longer than `legs` repeat their last leg."""
+    k = np.arange(legs)
+    if name in ("gap666", "gap1010"):
+        cap = 0.06 if name == "gap666" else 0.10
+        vols = np.minimum(np.round(0.01 * (k + 1), 2), cap)
+        return Ladder(name, vols, np.cumsum(vols) * profit_unit, "climb")
+    if name == "formula25":
+        # pv_increment's formula25_generator: vol_min, vol_min+step, ... with target vol * 100
+        vols = np.round(vol_min + k * vol_step, 2)
+        return Ladder(name, vols, vols * 100.0, "flip")
+    offsets = {"ascending": k, "even": 2 * k + 1, "odd": 2 * k, "mega": None}
+    if name not in offsets:
+        raise ValueError(f"unknown ladder '{name}'")
+    vols = np.round(0.10 + k * vol_step if name == "mega" else vol_min + offsets[name] * vol_step, 2)
+    profit_mode = {"even": "even", "mega": "mega"}.get(name, "default")
+    return Ladder(name, vols, _profit_pattern(profit_mode, legs), "flip")
+
+
+LADDERS = ("gap666", "gap1010", "ascending", "even", "odd", "mega", "formula25")
+
+
+# ------------------- Tick source ------------------- #
+def load_tick_moves(path, point):
+    """
+    Bid moves in points from a tick file, plus the median spread in points.
+    Accepts .npy (bid array) or an MT5 tick export / CSV with BID (and ASK) columns;
+    empty BID cells (ask-only ticks) are forward-filled.
+    """
+    if path.endswith(".npy"):
+        bids = np.load(path).astype(np.float64)
+        return np.diff(prices_to_points(bids, point)), None
+    with open(path, "r", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        reader = csv.reader(f, csv.Sniffer().sniff(sample, delimiters=",;\t"))
+        header = [h.strip().strip("<>").lower() for h in next(reader)]
+        bi = header.index("bid")
+        ai = header.index("ask") if "ask" in header else None
+        bids, spreads = [], []
+        last_bid = None
+        for row in reader:
+            if bi < len(row) and row[bi].strip():
+                last_bid = float(row[bi])
+            if last_bid is None:
+                continue
+            bids.append(last_bid)
+            if ai is not None and ai < len(row) and row[ai].strip():
+                spreads.append(float(row[ai]) - last_bid)
+    moves = np.diff(prices_to_points(bids, point))
+    spread = int(round(np.median(spreads) / point)) if spreads else None
+    return moves, spread
+
+
+def synthetic_moves(n=1_000_000, sigma_points=3.0, seed=7):
+    """Fat-tailed random walk moves (Student-t, 3 dof) when no recorded ticks are available."""
+    rng = np.random.default_rng(seed)
+    return np.rint(rng.standard_t(3, n) * sigma_points).astype(np.int64)
+
+
+# ------------------- Random-access block bootstrap ------------------- #
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(x):
+    z = x + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def _block_starts(seed, path_ids, blocks, n_starts):
+    """Start offset of bootstrap block `blocks` of each path (pure function of seed/path/block)."""
+    key = np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    key = key ^ (path_ids.astype(np.uint64) << np.uint64(32)) ^ blocks.astype(np.uint64)
+    return (_splitmix64(key) % np.uint64(n_starts)).astype(np.int64)
+
+
+def _move_index(seed, path_ids, t, offsets, block, n_moves):
+    """Index into the recorded moves for ticks t + offsets of each path (CHUNK <= block)."""
+    n_starts = n_moves - block + 1
+    blk = t // block
+    pos = (t % block).astype(np.int32)
+    first = _block_starts(seed, path_ids, blk, n_starts).astype(np.int32)
+    idx = (first + pos)[:, None] + offsets
+    # rows that run past the end of their block continue in the next block
+    wrap = np.flatnonzero(pos > block - CHUNK)
+    if wrap.size:
+        second = _block_starts(seed, path_ids[wrap], blk[wrap] + 1, n_starts).astype(np.int32)
+        sub = idx[wrap]
+        over = pos[wrap, None] + offsets >= block
+        sub[over] += np.broadcast_to((second - first[wrap] - block)[:, None], sub.shape)[over]
+        idx[wrap] = sub
+    return idx
+
+
+# ------------------- Engine ------------------- #
+def simulate(moves, ladder, gap_points, loss_target, paths=100_000, max_ticks=50_000, block=500,
+             spread_points=20, entry_points=10, usd_per_lot_point=1.0, seed=1, workers=1):
+    """
+    Run `paths` cycles of one ladder. Prices are relative int points (start bid = 0).
+    usd_per_lot_point: $ per 1 lot per 1 point (contract_size * point, 1.0 for XAUUSD).
+    Batches are independent (paths are keyed by id), so workers > 1 gives identical results.
+
+    Returns dict of per-path arrays: outcome (1 TP / 2 SL / 3 timeout), triggers, ticks,
+    profit ($ at exit), gross_lots (open lots at exit), max_net_lots.
+    """
+    moves = np.asarray(moves, dtype=np.int32)
+    block = max(CHUNK, min(block, len(moves)))
+    jobs = [(np.arange(lo, min(lo + BATCH, paths), dtype=np.int64), moves, ladder, gap_points, loss_target,
+             max_ticks, block, spread_points, entry_points, usd_per_lot_point, seed)
+            for lo in range(0, paths, BATCH)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_simulate_batch, *zip(*jobs)))
+    else:
+        results = [_simulate_batch(*job) for job in jobs]
+    return {key: np.concatenate([res[key] for res in results]) for key in results[0]}
+
+
+def _simulate_batch(ids, moves, ladder, gap, loss_target, max_ticks, block, spread, entry,
+                    usd_per_lot_point, seed):
+    n = len(ids)
+    legs = len(ladder.volumes)
+    targets = ladder.targets / usd_per_lot_point         # $ -> lot*points
+    sl_level = -loss_target / usd_per_lot_point
+    climb = ladder.geometry == "climb"
+
+    t = np.zeros(n, dtype=np.int64)
+    bid = np.zeros(n, dtype=np.int64)
+    k = np.zeros(n, dtype=np.int64)                       # legs triggered
+    side = np.ones(n, dtype=np.int8)                      # side of the live pending
+    level = np.full(n, spread + entry, dtype=np.int64)    # first BUY STOP: ask + entry points
+    last_buy = level.copy()
+    buy_vol = np.zeros(n)
+    buy_cost = np.zeros(n)                                # sum(vol * fill) in lot*points
+    sell_vol = np.zeros(n)
+    sell_cost = np.zeros(n)
+    max_net = np.zeros(n)
+    outcome = np.zeros(n, dtype=np.int8)
+    offsets = np.arange(CHUNK, dtype=np.int32)
+
+    alive = np.arange(n)
+    while alive.size:
+        a = alive
+        # bid band inside which nothing can happen: next pending fill, TP and SL prices
+        hi = np.where(side[a] == 1, level[a] - spread, np.inf)
+        lo = np.where(side[a] == -1, level[a], -np.inf)
+        nv = buy_vol[a] - sell_vol[a]
+        c = sell_cost[a] - buy_cost[a] - sell_vol[a] * spread
+        has = k[a] > 0
+        tgt = targets[np.maximum(k[a] - 1, 0)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tp_px = (tgt - c) / nv
+            sl_px = (sl_level - c) / nv
+        long_, short = has & (nv > 1e-12), has & (nv < -1e-12)
+        hi = np.minimum(hi, np.where(long_, tp_px, np.where(short, sl_px, np.inf)))
+        lo = np.maximum(lo, np.where(long_, sl_px, np.where(short, tp_px, -np.inf)))
+
+        # band relative to the current bid in int32 points; one unsigned compare tests
+        # lo < path < hi (anything outside wraps to a large uint32)
+        hi = np.ceil(np.clip(hi - bid[a], -_FAR, _FAR)).astype(np.int32)
+        lo = np.floor(np.clip(lo - bid[a], -_FAR, _FAR)).astype(np.int32)
+        path = np.cumsum(moves[_move_index(seed, ids[a], t[a], offsets, block, len(moves))], axis=1,
+                         dtype=np.int32)
+        hit = (path - (lo + 1)[:, None]).view(np.uint32) >= (hi - lo - 1).view(np.uint32)[:, None]
+        first = hit.argmax(axis=1)
+        rows = np.arange(a.size)
+        any_hit = hit[rows, first]
+        first[~any_hit] = CHUNK - 1
+        t[a] += first + 1
+        bid[a] += path[rows, first]
+
+        e = a[any_hit]
+        for _ in range(MAX_FILLS):
+            fire = np.where(side[e] == 1, bid[e] + spread >= level[e], bid[e] <= level[e])
+            f = e[fire]
+            if not f.size:
+                break
+            vol = ladder.volumes[np.minimum(k[f], legs - 1)]
+            buy = side[f] == 1
+            fill = np.where(buy, np.maximum(level[f], bid[f] + spread), np.minimum(level[f], bid[f]))
+            buy_vol[f] += np.where(buy, vol, 0.0)
+            buy_cost[f] += np.where(buy, vol * fill, 0.0)
+            sell_vol[f] += np.where(buy, 0.0, vol)
+            sell_cost[f] += np.where(buy, 0.0, vol * fill)
+            max_net[f] = np.maximum(max_net[f], np.abs(buy_vol[f] - sell_vol[f]))
+            k[f] += 1
+            if climb:
+                last_buy[f] = np.where(buy, fill, last_buy[f] + gap)
+                level[f] = np.where(buy, last_buy[f] - gap, last_buy[f])
+            else:
+                level[f] = np.where(buy, level[f] - gap, level[f] + gap)
+            side[f] = -side[f]
+
+        pnl = buy_vol[e] * bid[e] - buy_cost[e] + sell_cost[e] - sell_vol[e] * (bid[e] + spread)
+        has = k[e] > 0
+        tp = has & (pnl >= targets[np.maximum(k[e] - 1, 0)])
+        outcome[e[tp]] = TP
+        outcome[e[has & ~tp & (pnl <= sl_level)]] = SL
+        outcome[a[(outcome[a] == 0) & (t[a] >= max_ticks)]] = TIMEOUT
+        alive = a[outcome[a] == 0]
+
+    profit = (buy_vol * bid - buy_cost + sell_cost - sell_vol * (bid + spread)) * usd_per_lot_point
+    return {"outcome": outcome, "triggers": k, "ticks": t, "profit": profit,
+            "gross_lots": buy_vol + sell_vol, "max_net_lots": max_net}
+
+
+# ------------------- Report ------------------- #
+def summarize(res, margin_per_lot, balance):
+    n = len(res["outcome"])
+    tp = res["outcome"] == TP
+    margin_pct = res["gross_lots"] * margin_per_lot / balance * 100.0
+    pct = (50, 95, 99, 100)
+    return {
+        "paths": n,
+        "p_sl": float((res["outcome"] == SL).mean()),
+        "p_tp": float(tp.mean()),
+        "p_timeout": float((res["outcome"] == TIMEOUT).mean()),
+        "triggers_to_tp": float(res["triggers"][tp].mean()) if tp.any() else None,
+        "mean_profit": float(res["profit"].mean()),
+        "gross_lots_pct": dict(zip(pct, np.percentile(res["gross_lots"], pct).round(2).tolist())),
+        "max_net_lots_pct": dict(zip(pct, np.percentile(res["max_net_lots"], pct).round(2).tolist())),
+        "margin_pct": dict(zip(pct, np.percentile(margin_pct, pct).round(1).tolist())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo risk of ruin for a volume ladder.")
+    parser.add_argument("--ticks", help="Tick file (.npy bids or MT5 tick CSV). Synthetic moves if omitted.")
+    parser.add_argument("--ladder", choices=LADDERS, default="gap666")
+    parser.add_argument("--gap", type=float, default=2.0, help="Gap in price units.")
+    parser.add_argument("--loss-target", type=float, default=500.0, help="Equity SL in $.")
+    parser.add_argument("--profit-unit", type=float, default=50.0, help="$ per lot for the climb ladders' TP.")
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--max-ticks", type=int, default=50_000, help="Ticks before a cycle counts as timeout.")
+    parser.add_argument("--block", type=int, default=500, help=f"Bootstrap block length in ticks (min {CHUNK}).")
+    parser.add_argument("--point", type=float, default=0.01)
+    parser.add_argument("--contract-size", type=float, default=100.0)
+    parser.add_argument("--spread", type=int, help="Spread in points (default: median of the tick file, else 20).")
+    parser.add_argument("--price", type=float, default=3400.0, help="Price level for margin.")
+    parser.add_argument("--leverage", type=float, default=100.0)
+    parser.add_argument("--balance", type=float, default=10_000.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes (one batch each).")
+    args = parser.parse_args()
+
+    if args.ticks:
+        moves, spread = load_tick_moves(args.ticks, args.point)
+        print(f"📥 {len(moves)} tick moves from {args.ticks}")
+    else:
+        moves, spread = synthetic_moves(), None
+        print("⚠️ No --ticks given: using a synthetic fat-tailed random walk")
+    spread = args.spread if args.spread is not None else (spread if spread is not None else 20)
+
+    ladder = ladder_preset(args.ladder, profit_unit=args.profit_unit)
+    gap_points = int(round(args.gap / args.point))
+    t0 = time.perf_counter()
+    res = simulate(moves, ladder, gap_points, args.loss_target, paths=args.paths, max_ticks=args.max_ticks,
+                   block=args.block, spread_points=spread, usd_per_lot_point=args.contract_size * args.point,
+                   seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    s = summarize(res, args.contract_size * args.price / args.leverage, args.balance)
+    print(f"\n🎲 {args.ladder} ({ladder.geometry}) gap={args.gap} SL=${args.loss_target} spread={spread}pt "
+          f"— {s['paths']} paths in {elapsed:.2f}s ({s['paths'] / elapsed:,.0f} paths/s)")
+    print(f"❌ P(SL)      = {s['p_sl']:.4f}")
+    print(f"🎯 P(TP)      = {s['p_tp']:.4f}  (triggers to TP: {s['triggers_to_tp'] or 0:.2f})")
+    print(f"⏳ P(timeout) = {s['p_timeout']:.4f}")
+    print(f"💰 Mean P&L   = {s['mean_profit']:.2f}")
+    print(f"📦 Gross lots   p50/p95/p99/max = {'/'.join(str(v) for v in s['gross_lots_pct'].values())}")
+    print(f"⚖️ Net lots     p50/p95/p99/max = {'/'.join(str(v) for v in s['max_net_lots_pct'].values())}")
+    print(f"🏦 Margin %     p50/p95/p99/max = {'/'.join(str(v) for v in s['margin_pct'].values())}")
+
+
+if __name__ == "__main__":
+    main()
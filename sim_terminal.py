@@ -0,0 +1,432 @@
+"""
+Deterministic simulated MT5 terminal for benchmarks and offline runs.
+
+- Drop-in for the MetaTrader5 module: same constants and the functions the scripts
+  use (symbol_info[_tick], account_info, positions_get, orders_get, order_send,
+  history_deals_get, copy_ticks_from, ...), results as namedtuples with MT5 field names;
+  copy_rates_from_pos() resamples the ticks seen so far into bid bars (bars.BarFeed)
+- Driven by a scripted tick list [(time_msc, bid, ask), ...] and a simulated clock:
+  every API call costs CALL_COST simulated seconds and sleep() advances the clock,
+  so busy loops and sleep-paced loops both walk through the ticks
+- Pending stops / limits fill on the first tick that crosses them (BUY at ask, SELL
+  at bid); positions carry floating profit, closes realise it into the balance
+- Same ticks + same calls -> same fills, tickets and results, on any machine
+- When the clock runs past the last tick, the next call raises ScenarioEnd
+- fills / placements keep (sim time, perf_counter_ns, ..., API calls so far) for latency and
+  calls-per-trigger measurements
+
+Usage:
+  sim = SimTerminal(scenario_ticks("chop", seconds=1800))   # or load_ticks("XAUUSD_ticks.csv")
+  sys.modules["MetaTrader5"] = sim     # before the strategy imports it
+"""
+
+import calendar
+import csv
+import itertools
+import math
+import random
+import time
+from collections import namedtuple
+
+CALL_COST = 0.0005         # simulated seconds per API call (local terminal IPC)
+TICK_INTERVAL_MS = 250     # scenario tick spacing
+
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+SymbolInfo = namedtuple("SymbolInfo", "name visible select point digits spread trade_stops_level "
+                                      "trade_freeze_level trade_contract_size volume_min volume_max "
+                                      "volume_step bid ask")
+AccountInfo = namedtuple("AccountInfo", "login balance equity profit margin margin_free leverage currency")
+TradePosition = namedtuple("TradePosition", "ticket time time_msc time_update type magic identifier volume "
+                                            "price_open sl tp price_current swap profit symbol comment")
+TradeOrder = namedtuple("TradeOrder", "ticket time_setup time_setup_msc type magic position_id volume_initial "
+                                      "volume_current price_open sl tp price_current symbol comment")
+TradeDeal = namedtuple("TradeDeal", "ticket order time time_msc type entry magic position_id reason volume "
+                                    "price commission swap profit fee symbol comment")
+OrderSendResult = namedtuple("OrderSendResult", "retcode deal order volume price bid ask comment request_id "
+                                                "retcode_external request")
+
+
+class ScenarioEnd(BaseException):
+    """The simulated clock ran past the last scripted tick (BaseException: strategy code catches Exception)."""
+
+
+class SimTerminal:
+    # ---------- MetaTrader5 constants (same values as the real module) ---------- #
+    TRADE_ACTION_DEAL, TRADE_ACTION_PENDING, TRADE_ACTION_SLTP = 1, 5, 6
+    TRADE_ACTION_MODIFY, TRADE_ACTION_REMOVE = 7, 8
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL, ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT = 0, 1, 2, 3
+    ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP = 4, 5
+    POSITION_TYPE_BUY, POSITION_TYPE_SELL = 0, 1
+    DEAL_TYPE_BUY, DEAL_TYPE_SELL = 0, 1
+    DEAL_ENTRY_IN, DEAL_ENTRY_OUT = 0, 1
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_RETURN = 0, 1, 2
+    ORDER_TIME_GTC, ORDER_TIME_DAY = 0, 1
+    TRADE_RETCODE_REQUOTE, TRADE_RETCODE_PLACED, TRADE_RETCODE_DONE = 10004, 10008, 10009
+    TRADE_RETCODE_INVALID, TRADE_RETCODE_INVALID_VOLUME = 10013, 10014
+    TRADE_RETCODE_INVALID_PRICE, TRADE_RETCODE_INVALID_STOPS = 10015, 10016
+    TRADE_RETCODE_NO_MONEY, TRADE_RETCODE_POSITION_CLOSED = 10019, 10036
+    COPY_TICKS_ALL, COPY_TICKS_INFO, COPY_TICKS_TRADE = -1, 1, 2
+    TIMEFRAME_M1, TIMEFRAME_M5, TIMEFRAME_M15, TIMEFRAME_M30 = 1, 5, 15, 30
+    TIMEFRAME_H1, TIMEFRAME_H4 = 16385, 16388
+
+    def __init__(self, ticks, point=0.01, digits=2, stops_level=0, freeze_level=0, contract_size=100.0,
+                 volume_min=0.01, volume_max=100.0, volume_step=0.01, balance=10_000.0, leverage=500,
+                 call_cost=CALL_COST):
+        self.ticks = [(int(t), float(b), float(a)) for t, b, a in ticks]
+        if not self.ticks:
+            raise ValueError("scenario has no ticks")
+        self.spec = dict(point=point, digits=digits, stops_level=stops_level, freeze_level=freeze_level,
+                         contract_size=contract_size, volume_min=volume_min, volume_max=volume_max,
+                         volume_step=volume_step)
+        self.call_cost = call_cost
+        self.leverage = leverage
+        self.balance = balance
+        self.clock = self.ticks[0][0] / 1000.0   # simulated epoch seconds
+        self.cursor = 0
+        self.tickets = itertools.count(100_001)
+        self.positions = {}    # ticket -> dict
+        self.orders = {}       # ticket -> dict
+        self.deals = []
+        self.calls = {}        # function name -> count
+        self.ncalls = 0        # all API calls so far
+        self.fills = []        # (sim_time, perf_counter_ns, ticket, side, ncalls)
+        self.placements = []   # (sim_time, perf_counter_ns, ticket, side, ncalls) for accepted pendings
+        self.bars = None       # bars.BarFeed over the ticks up to the clock, built on first copy_rates call
+        self.bars_cursor = 0
+        self.error = (1, "Success")
+
+    # ---------- clock ---------- #
+    def now(self):
+        return self.clock
+
+    def sleep(self, seconds):
+        self.clock += max(0.0, seconds)
+        self._sync()
+
+    def _call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.ncalls += 1
+        self.clock += self.call_cost
+        self._sync()
+
+    def _sync(self):
+        ticks = self.ticks
+        limit = self.clock * 1000.0
+        while self.cursor + 1 < len(ticks) and ticks[self.cursor + 1][0] <= limit:
+            self.cursor += 1
+            self._match()
+        if self.cursor + 1 == len(ticks) and limit > ticks[-1][0] + TICK_INTERVAL_MS * 4:
+            raise ScenarioEnd(f"scenario ended at {ticks[-1][0]} ms")
+
+    @property
+    def tick(self):
+        return self.ticks[self.cursor]
+
+    @property
+    def done(self):
+        return self.cursor + 1 == len(self.ticks)
+
+    # ---------- matching ---------- #
+    def _match(self):
+        msc, bid, ask = self.tick
+        for ticket, o in list(self.orders.items()):
+            t, price = o["type"], o["price"]
+            if ((t == self.ORDER_TYPE_BUY_STOP and ask >= price) or (t == self.ORDER_TYPE_BUY_LIMIT and ask <= price)):
+                del self.orders[ticket]
+                self._open(self.POSITION_TYPE_BUY, o["volume"], ask, o["magic"], o["symbol"], o["comment"], ticket)
+            elif ((t == self.ORDER_TYPE_SELL_STOP and bid <= price) or (t == self.ORDER_TYPE_SELL_LIMIT and bid >= price)):
+                del self.orders[ticket]
+                self._open(self.POSITION_TYPE_SELL, o["volume"], bid, o["magic"], o["symbol"], o["comment"], ticket)
+        for ticket, p in list(self.positions.items()):
+            mark = bid if p["type"] == self.POSITION_TYPE_BUY else ask
+            sl, tp = p["sl"], p["tp"]
+            long = p["type"] == self.POSITION_TYPE_BUY
+            if (sl and (mark <= sl if long else mark >= sl)) or (tp and (mark >= tp if long else mark <= tp)):
+                self._close(ticket, p["volume"], mark, "sl/tp")
+
+    def _open(self, side, volume, price, magic, symbol, comment, order):
+        msc = self.tick[0]
+        ticket = next(self.tickets)
+        self.positions[ticket] = dict(type=side, volume=volume, price=price, magic=magic, symbol=symbol,
+                                      comment=comment, time_msc=msc, sl=0.0, tp=0.0)
+        self._deal(order, side, self.DEAL_ENTRY_IN, ticket, volume, price, 0.0, magic, symbol, comment)
+        self.fills.append((msc / 1000.0, time.perf_counter_ns(), ticket, side, self.ncalls))
+        return ticket
+
+    def _close(self, ticket, volume, price, comment):
+        p = self.positions[ticket]
+        volume = min(volume, p["volume"])
+        profit = self._profit(p["type"], volume, p["price"], price)
+        self.balance += profit
+        p["volume"] = round(p["volume"] - volume, 8)
+        if p["volume"] <= 0:
+            del self.positions[ticket]
+        side = self.DEAL_TYPE_SELL if p["type"] == self.POSITION_TYPE_BUY else self.DEAL_TYPE_BUY
+        return self._deal(0, side, self.DEAL_ENTRY_OUT, ticket, volume, price, profit, p["magic"], p["symbol"], comment)
+
+    def _deal(self, order, side, entry, position, volume, price, profit, magic, symbol, comment):
+        msc = self.tick[0]
+        deal = TradeDeal(next(self.tickets), order, msc // 1000, msc, side, entry, magic, position, 0, volume,
+                         price, 0.0, 0.0, round(profit, 2), 0.0, symbol, comment)
+        self.deals.append(deal)
+        return deal
+
+    def _profit(self, side, volume, open_price, mark):
+        move = mark - open_price if side == self.POSITION_TYPE_BUY else open_price - mark
+        return move * volume * self.spec["contract_size"]
+
+    def floating(self):
+        _, bid, ask = self.tick
+        return sum(self._profit(p["type"], p["volume"], p["price"], bid if p["type"] == self.POSITION_TYPE_BUY else ask)
+                   for p in self.positions.values())
+
+    # ---------- session ---------- #
+    def initialize(self, *args, **kwargs):
+        self._call("initialize")
+        return True
+
+    def shutdown(self):
+        self.calls["shutdown"] = self.calls.get("shutdown", 0) + 1  # no clock step: runs in finally after ScenarioEnd
+        return True
+
+    def last_error(self):
+        return self.error
+
+    def symbol_select(self, symbol, enable=True):
+        self._call("symbol_select")
+        return True
+
+    # ---------- market data ---------- #
+    def symbol_info(self, symbol):
+        self._call("symbol_info")
+        s = self.spec
+        _, bid, ask = self.tick
+        return SymbolInfo(symbol, True, True, s["point"], s["digits"], int(round((ask - bid) / s["point"])),
+                          s["stops_level"], s["freeze_level"], s["contract_size"], s["volume_min"],
+                          s["volume_max"], s["volume_step"], bid, ask)
+
+    def symbol_info_tick(self, symbol):
+        self._call("symbol_info_tick")
+        msc, bid, ask = self.tick
+        return Tick(msc // 1000, bid, ask, 0.0, 0, msc, 6, 0.0)
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        import numpy as np
+        from tick_bus import TICK_DTYPE
+
+        self._call("copy_ticks_from")
+        start = date_from.timestamp() if hasattr(date_from, "timestamp") else float(date_from)
+        rows = [t for t in self.ticks[:self.cursor + 1] if t[0] >= start * 1000][:count]
+        out = np.zeros(len(rows), dtype=TICK_DTYPE)
+        for i, (msc, bid, ask) in enumerate(rows):
+            out[i] = (msc // 1000, bid, ask, 0.0, 0, msc, 6, 0.0)
+        return out
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        import numpy as np
+        from bars import TIMEFRAMES, BarFeed
+
+        self._call("copy_rates_from_pos")
+        if self.bars is None:
+            self.bars = BarFeed(None, TIMEFRAMES, ("bid",), self.spec["point"])
+        if self.bars_cursor <= self.cursor:
+            block = np.array(self.ticks[self.bars_cursor:self.cursor + 1])
+            self.bars.update(block[:, 0].astype(np.int64), block[:, 1], block[:, 2])
+            self.bars_cursor = self.cursor + 1
+        return self.bars.copy_rates_from_pos(symbol, timeframe, start_pos, count)
+
+    # ---------- account / trading state ---------- #
+    def account_info(self):
+        self._call("account_info")
+        profit = round(self.floating(), 2)
+        equity = self.balance + profit
+        margin = sum(p["volume"] * self.spec["contract_size"] * p["price"] for p in self.positions.values()) / self.leverage
+        return AccountInfo(5_000_001, round(self.balance, 2), round(equity, 2), profit, round(margin, 2),
+                           round(equity - margin, 2), self.leverage, "USD")
+
+    def positions_get(self, symbol=None, group=None, ticket=None):
+        self._call("positions_get")
+        _, bid, ask = self.tick
+        out = []
+        for t, p in self.positions.items():
+            if (symbol is not None and p["symbol"] != symbol) or (ticket is not None and t != ticket):
+                continue
+            mark = bid if p["type"] == self.POSITION_TYPE_BUY else ask
+            out.append(TradePosition(t, p["time_msc"] // 1000, p["time_msc"], p["time_msc"] // 1000, p["type"],
+                                     p["magic"], t, p["volume"], p["price"], p["sl"], p["tp"], mark, 0.0,
+                                     round(self._profit(p["type"], p["volume"], p["price"], mark), 2),
+                                     p["symbol"], p["comment"]))
+        return tuple(out)
+
+    def orders_get(self, symbol=None, group=None, ticket=None):
+        self._call("orders_get")
+        _, bid, ask = self.tick
+        out = []
+        for t, o in self.orders.items():
+            if (symbol is not None and o["symbol"] != symbol) or (ticket is not None and t != ticket):
+                continue
+            current = ask if o["type"] in (self.ORDER_TYPE_BUY_STOP, self.ORDER_TYPE_BUY_LIMIT) else bid
+            out.append(TradeOrder(t, o["time_msc"] // 1000, o["time_msc"], o["type"], o["magic"], 0, o["volume"],
+                                  o["volume"], o["price"], 0.0, 0.0, current, o["symbol"], o["comment"]))
+        return tuple(out)
+
+    def positions_total(self):
+        self._call("positions_total")
+        return len(self.positions)
+
+    def orders_total(self):
+        self._call("orders_total")
+        return len(self.orders)
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, ticket=None, position=None):
+        self._call("history_deals_get")
+        lo = date_from.timestamp() if hasattr(date_from, "timestamp") else (date_from or 0)
+        hi = date_to.timestamp() if hasattr(date_to, "timestamp") else (date_to or math.inf)
+        return tuple(d for d in self.deals
+                     if lo <= d.time <= hi and (ticket is None or d.ticket == ticket)
+                     and (position is None or d.position_id == position))
+
+    # ---------- order_send ---------- #
+    def order_send(self, request):
+        self._call("order_send")
+        _, bid, ask = self.tick
+        action = request.get("action")
+        if action == self.TRADE_ACTION_DEAL:
+            retcode, deal, order, price = self._send_deal(request, bid, ask)
+        elif action == self.TRADE_ACTION_PENDING:
+            retcode, deal, order, price = self._send_pending(request, bid, ask)
+        elif action == self.TRADE_ACTION_REMOVE:
+            retcode = self.TRADE_RETCODE_DONE if self.orders.pop(request.get("order"), None) else self.TRADE_RETCODE_INVALID
+            deal, order, price = 0, request.get("order", 0), 0.0
+        elif action == self.TRADE_ACTION_MODIFY:
+            o = self.orders.get(request.get("order"))
+            if o is None:
+                retcode = self.TRADE_RETCODE_INVALID
+            else:
+                o["price"] = round(request.get("price", o["price"]), self.spec["digits"])
+                retcode = self.TRADE_RETCODE_DONE
+            deal, order, price = 0, request.get("order", 0), request.get("price", 0.0)
+        elif action == self.TRADE_ACTION_SLTP:
+            p = self.positions.get(request.get("position"))
+            if p is None:
+                retcode = self.TRADE_RETCODE_POSITION_CLOSED
+            else:
+                p["sl"], p["tp"] = request.get("sl", 0.0) or 0.0, request.get("tp", 0.0) or 0.0
+                retcode = self.TRADE_RETCODE_DONE
+            deal, order, price = 0, 0, 0.0
+        else:
+            retcode, deal, order, price = self.TRADE_RETCODE_INVALID, 0, 0, 0.0
+        comment = "Request executed" if retcode in (self.TRADE_RETCODE_DONE, self.TRADE_RETCODE_PLACED) else "Rejected"
+        return OrderSendResult(retcode, deal, order, request.get("volume", 0.0), price, bid, ask, comment, 0, 0,
+                               dict(request))
+
+    def _volume_ok(self, volume):
+        s = self.spec
+        steps = volume / s["volume_step"]
+        return s["volume_min"] - 1e-9 <= volume <= s["volume_max"] + 1e-9 and abs(steps - round(steps)) < 1e-6
+
+    def _send_deal(self, request, bid, ask):
+        volume = request.get("volume", 0.0)
+        if not self._volume_ok(volume):
+            return self.TRADE_RETCODE_INVALID_VOLUME, 0, 0, 0.0
+        side = request.get("type")
+        price = ask if side == self.ORDER_TYPE_BUY else bid
+        position = request.get("position")
+        if position:
+            if position not in self.positions:
+                return self.TRADE_RETCODE_POSITION_CLOSED, 0, 0, 0.0
+            deal = self._close(position, volume, price, request.get("comment", ""))
+            return self.TRADE_RETCODE_DONE, deal.ticket, next(self.tickets), price
+        ticket = self._open(self.POSITION_TYPE_BUY if side == self.ORDER_TYPE_BUY else self.POSITION_TYPE_SELL,
+                            volume, price, request.get("magic", 0), request.get("symbol", ""),
+                            request.get("comment", ""), 0)
+        return self.TRADE_RETCODE_DONE, self.deals[-1].ticket, ticket, price
+
+    def _send_pending(self, request, bid, ask):
+        s = self.spec
+        volume = request.get("volume", 0.0)
+        if not self._volume_ok(volume):
+            return self.TRADE_RETCODE_INVALID_VOLUME, 0, 0, 0.0
+        kind = request.get("type")
+        price = round(request.get("price", 0.0), s["digits"])
+        gap = (max(s["stops_level"], s["freeze_level"]) - 0.5) * s["point"]
+        if ((kind == self.ORDER_TYPE_BUY_STOP and price < ask + gap)
+                or (kind == self.ORDER_TYPE_SELL_STOP and price > bid - gap)
+                or (kind == self.ORDER_TYPE_BUY_LIMIT and price > ask - gap)
+                or (kind == self.ORDER_TYPE_SELL_LIMIT and price < bid + gap)):
+            return self.TRADE_RETCODE_INVALID_PRICE, 0, 0, price
+        ticket = next(self.tickets)
+        self.orders[ticket] = dict(type=kind, volume=volume, price=price, magic=request.get("magic", 0),
+                                   symbol=request.get("symbol", ""), comment=request.get("comment", ""),
+                                   time_msc=self.tick[0])
+        side = "BUY" if kind in (self.ORDER_TYPE_BUY_STOP, self.ORDER_TYPE_BUY_LIMIT) else "SELL"
+        self.placements.append((self.clock, time.perf_counter_ns(), ticket, side, self.ncalls))
+        return self.TRADE_RETCODE_DONE, 0, ticket, price
+
+
+# ------------------- Scripted tick scenarios ------------------- #
+def scenario_ticks(name, seconds=1800, seed=7, start=3485.00, point=0.01, spread_points=20,
+                   start_msc=1_760_000_000_000):
+    """Fixed tick paths: 'trend' (steady drift up), 'chop' (mean-reverting band), 'spike' (quiet, jump, fade)."""
+    rng = random.Random(f"{name}:{seed}")
+    n = int(seconds * 1000 // TICK_INTERVAL_MS)
+    pts = 0.0
+    out = []
+    for i in range(n):
+        if name == "trend":
+            pts += 0.8 + rng.gauss(0, 6)
+        elif name == "chop":
+            pts += -0.02 * pts + rng.gauss(0, 8)
+        elif name == "spike":
+            pts += rng.gauss(0, 3)
+            if i == n // 3:
+                pts += 1500
+            elif i > n // 3:
+                pts -= 0.004 * pts
+        else:
+            raise ValueError(f"unknown scenario '{name}' (trend / chop / spike)")
+        bid = round(start + round(pts) * point, 8)
+        out.append((start_msc + i * TICK_INTERVAL_MS, bid, round(bid + spread_points * point, 8)))
+    return out
+
+
+SCENARIOS = ("trend", "chop", "spike")
+
+
+def load_ticks(path):
+    """
+    [(time_msc, bid, ask), ...] from recorded ticks: .npy in the copy_ticks / tick bus
+    dtype, or an MT5 tick export / CSV (<DATE> <TIME> <BID> <ASK>, or time_msc,bid,ask).
+    Empty BID / ASK cells are forward-filled.
+    """
+    if path.endswith(".npy"):
+        import numpy as np
+
+        arr = np.load(path)
+        return list(zip(arr["time_msc"].tolist(), arr["bid"].tolist(), arr["ask"].tolist()))
+    out = []
+    with open(path, "r", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        reader = csv.reader(f, csv.Sniffer().sniff(sample, delimiters=",;\t"))
+        header = [h.strip().strip("<>").lower() for h in next(reader)]
+        bi, ai = header.index("bid"), header.index("ask")
+        mi = header.index("time_msc") if "time_msc" in header else None
+        di, ti = (header.index("date"), header.index("time")) if mi is None else (None, None)
+        bid = ask = None
+        for row in reader:
+            if row[bi].strip():
+                bid = float(row[bi])
+            if row[ai].strip():
+                ask = float(row[ai])
+            if bid is None or ask is None:
+                continue
+            if mi is not None:
+                msc = int(row[mi])
+            else:  # 2025.10.17  09:30:01.250 (server time, kept as if UTC)
+                clock, _, frac = row[ti].strip().partition(".")
+                y, mo, d = (int(x) for x in row[di].strip().replace("-", ".").split("."))
+                h, mi_, sec = (int(x) for x in clock.split(":"))
+                msc = calendar.timegm((y, mo, d, h, mi_, sec)) * 1000 + int((frac or "0").ljust(3, "0")[:3])
+            out.append((msc, bid, ask))
+    return out
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Headless runner for the cycle scripts, driven by a TOML / YAML strategy spec.
+
+- Each [[strategy]] entry (merged over [defaults]) becomes one script process; the
+  instance spec is passed as JSON in the STRATEGY_SPEC environment variable and the
+  scripts read it instead of prompting with input()
+- Every instance runs in its own work dir (runs/<name>) so checkpoints / journals never clash
+- restart = true relaunches an instance when it exits (the checkpoint resumes the ladder);
+  auto mode only: a manual instance runs one cycle by design, so validate() refuses the pair
+- --dry-run validates every instance against cached symbol specs (symbol_specs.json)
+  without touching the terminal; --cache-symbols refreshes that cache from MT5
+
+Spec keys: name, script, symbol, magic, gap, entry ("ask+10", "bid-25" in points, or a
+price), ladder (list of volumes, last one repeats) or pattern, profit_unit, loss_target,
+mode ("manual" / "auto"), restart, metrics_port (Prometheus endpoint, unique per instance),
+gap_pattern (gap_pattern name or DSL rules; new gap*.py scripts).
+
+Usage:
+  python strategy_runner.py strategies.toml --dry-run
+  python strategy_runner.py strategies.toml --only gap666 --only pv_auto
+  python strategy_runner.py strategies.toml --cache-symbols
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPEC_ENV = "STRATEGY_SPEC"
+SYMBOL_CACHE = "symbol_specs.json"
+PATTERNS = ("ascending", "even", "odd", "mega", "formula25")
+REQUIRED = ("name", "script", "symbol", "magic", "gap")
+
+
+def now():
+    return time.strftime("%H:%M:%S")
+
+
+def printl(*args, **kwargs):
+    print(f"[{now()}]", *args, **kwargs)
+
+
+# ------------------- Spec loading ------------------- #
+def load_spec(path):
+    """Returns the list of instance dicts with [defaults] merged in."""
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise SystemExit("❌ PyYAML is not installed (pip install pyyaml) — or use a .toml spec")
+        with open(path, "r") as f:
+            doc = yaml.safe_load(f) or {}
+    else:
+        if tomllib is None:
+            raise SystemExit("❌ tomllib needs Python 3.11+ — or use a .yaml spec")
+        with open(path, "rb") as f:
+            doc = tomllib.load(f)
+    defaults = doc.get("defaults", {})
+    return [dict(defaults, **inst) for inst in doc.get("strategy", [])]
+
+
+# ------------------- Helpers used by the scripts ------------------- #
+def load_instance_spec():
+    """Instance spec passed by the runner, or None when the script was started by hand."""
+    raw = os.environ.get(SPEC_ENV)
+    return json.loads(raw) if raw else None
+
+
+def entry_price(rule, tick, point, digits):
+    """
+    Resolve an entry rule to a BUY STOP price:
+      "ask+10" -> ask + 10 points, "bid-25" -> bid - 25 points, 3485.5 -> fixed price
+    """
+    if isinstance(rule, (int, float)):
+        return round(float(rule), digits)
+    rule = str(rule).replace(" ", "").lower()
+    for base in ("ask", "bid"):
+        if rule.startswith(base):
+            offset = int(rule[len(base):] or 0)
+            return round(getattr(tick, base) + offset * point, digits)
+    return round(float(rule), digits)
+
+
+def ladder_generator(volumes):
+    """Yield the spec ladder, then keep repeating its last volume."""
+    for vol in volumes:
+        yield vol
+    while True:
+        yield volumes[-1]
+
+
+# ------------------- Dry run ------------------- #
+def validate(instances, symbols, root):
+    """Returns {name: [problems]} (empty list = OK). Pure Python, no terminal access."""
+    problems = {}
+    magics = {}
+    ports = {}
+    by_symbol = {}
+    for inst in instances:
+        name = inst.get("name", "?")
+        errs = problems[name] = []
+        for key in REQUIRED:
+            if key not in inst:
+                errs.append(f"missing '{key}'")
+        if errs:
+            continue
+
+        if not os.path.exists(os.path.join(root, inst["script"])):
+            errs.append(f"script not found: {inst['script']}")
+        if inst["magic"] in magics:
+            errs.append(f"magic {inst['magic']} already used by {magics[inst['magic']]}")
+        magics[inst["magic"]] = name
+        port = inst.get("metrics_port")
+        if port:
+            if port in ports:
+                errs.append(f"metrics_port {port} already used by {ports[port]}")
+            ports[port] = name
+        by_symbol.setdefault(inst["symbol"], []).append(name)
+
+        info = symbols.get(inst["symbol"])
+        if info is None:
+            errs.append(f"symbol {inst['symbol']} not in the symbol cache (run --cache-symbols)")
+            continue
+        point = info["point"]
+        gap_points = inst["gap"] / point
+        if abs(gap_points - round(gap_points)) > 1e-6:
+            errs.append(f"gap {inst['gap']} is not a whole number of points ({point})")
+        if round(gap_points) <= info.get("trade_stops_level", 0):
+            errs.append(f"gap {inst['gap']} is inside stops_level ({info['trade_stops_level']} points)")
+
+        step = info["volume_step"]
+        for vol in inst.get("ladder", []):
+            if not info["volume_min"] <= vol <= info["volume_max"]:
+                errs.append(f"ladder volume {vol} outside [{info['volume_min']}, {info['volume_max']}]")
+            elif abs(vol / step - round(vol / step)) > 1e-6:
+                errs.append(f"ladder volume {vol} is not a multiple of volume_step {step}")
+        if "pattern" in inst and inst["pattern"] not in PATTERNS:
+            errs.append(f"unknown pattern '{inst['pattern']}' (one of {', '.join(PATTERNS)})")
+        if "gap_pattern" in inst:
+            from gap_pattern import PatternError, compile_pattern
+            try:
+                compile_pattern(inst["gap_pattern"])
+            except PatternError as e:
+                errs.append(f"bad gap_pattern: {e}")
+
+        if "entry" in inst:
+            try:
+                tick = type("Tick", (), {"ask": 1.0, "bid": 1.0})
+                entry_price(inst["entry"], tick, point, info["digits"])
+            except ValueError:
+                errs.append(f"bad entry rule '{inst['entry']}'")
+        if inst.get("loss_target", 1) <= 0:
+            errs.append("loss_target must be > 0")
+        if inst.get("mode", "auto") not in ("manual", "auto"):
+            errs.append("mode must be 'manual' or 'auto'")
+        elif inst.get("restart") and inst.get("mode", "auto") == "manual":
+            errs.append("restart = true needs mode 'auto' (a manual instance runs one cycle)")
+
+    # the scripts track positions by symbol, so two instances on one symbol see each other's legs
+    for symbol, names in by_symbol.items():
+        if len(names) > 1:
+            for name in names:
+                problems[name].append(f"shares symbol {symbol} with {', '.join(n for n in names if n != name)}")
+    return problems
+
+
+def cache_symbols(instances, path):
+    import MetaTrader5 as mt5
+
+    if not mt5.initialize():
+        raise SystemExit(f"❌ MT5 initialize failed: {mt5.last_error()}")
+    cache = {}
+    try:
+        for symbol in sorted({inst["symbol"] for inst in instances if "symbol" in inst}):
+            mt5.symbol_select(symbol, True)
+            info = mt5.symbol_info(symbol)
+            if info is None:
+                printl(f"⚠️ symbol_info({symbol}) returned None")
+                continue
+            cache[symbol] = {key: getattr(info, key) for key in (
+                "point", "digits", "volume_min", "volume_step", "volume_max",
+                "trade_stops_level", "trade_freeze_level")}
+    finally:
+        mt5.shutdown()
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2)
+    printl(f"✅ Cached {len(cache)} symbol specs to {path}")
+
+
+# ------------------- Launch ------------------- #
+def launch(inst, root, workdir):
+    cwd = os.path.join(workdir, inst["name"])
+    os.makedirs(cwd, exist_ok=True)
+    env = dict(os.environ, **{SPEC_ENV: json.dumps(inst)})
+    log = open(os.path.join(cwd, "output.log"), "a")
+    proc = subprocess.Popen([sys.executable, os.path.join(root, inst["script"])],
+                            cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    printl(f"🚀 {inst['name']}: pid={proc.pid} ({inst['script']}, {inst['symbol']}, magic={inst['magic']})")
+    return proc
+
+
+def run(instances, root, workdir, restart_delay=5.0):
+    procs = {inst["name"]: (inst, launch(inst, root, workdir)) for inst in instances}
+    try:
+        while procs:
+            time.sleep(1)
+            for name, (inst, proc) in list(procs.items()):
+                code = proc.poll()
+                if code is None:
+                    continue
+                printl(f"🛑 {name} exited with code {code}")
+                if inst.get("restart") and inst.get("mode", "auto") == "auto":
+                    time.sleep(restart_delay)
+                    procs[name] = (inst, launch(inst, root, workdir))
+                else:
+                    del procs[name]
+    except KeyboardInterrupt:
+        printl("🛑 Stopping all instances...")
+        for inst, proc in procs.values():
+            proc.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run cycle scripts headless from a TOML/YAML strategy spec.")
+    parser.add_argument("spec")
+    parser.add_argument("--only", action="append", help="Run only these instance names (repeatable).")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the spec against cached symbol specs and exit.")
+    parser.add_argument("--symbols", default=SYMBOL_CACHE, help=f"Symbol spec cache (default: {SYMBOL_CACHE}).")
+    parser.add_argument("--cache-symbols", action="store_true", help="Refresh the symbol spec cache from MT5 and exit.")
+    parser.add_argument("--workdir", default="runs", help="Per-instance work dirs are created under here.")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    instances = load_spec(args.spec)
+    if args.only:
+        instances = [inst for inst in instances if inst.get("name") in args.only]
+
+    if args.cache_symbols:
+        cache_symbols(instances, args.symbols)
+        return
+
+    t = time.perf_counter()
+    symbols = {}
+    if os.path.exists(args.symbols):
+        with open(args.symbols, "r") as f:
+            symbols = json.load(f)
+    problems = validate(instances, symbols, root)
+    elapsed_ms = (time.perf_counter() - t) * 1e3
+
+    for name, errs in problems.items():
+        if errs:
+            printl(f"❌ {name}: " + "; ".join(errs))
+        else:
+            printl(f"✅ {name}")
+    printl(f"🔎 Validated {len(instances)} instance(s) in {elapsed_ms:.2f} ms")
+
+    if args.dry_run:
+        sys.exit(1 if any(problems.values()) else 0)
+    if any(problems.values()):
+        raise SystemExit("❌ Fix the spec (see above) before launching.")
+    run(instances, root, args.workdir)
+
+
+if __name__ == "__main__":
+    main()
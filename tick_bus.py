@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Shared-memory tick bus: one feeder process talks to the terminal, any number of local
+strategy processes read the same tick sequence from a ring buffer.
+
+- The feeder pulls ticks with copy_ticks_from() batches and appends them to a ring of
+  CAPACITY records (same dtype as copy_ticks) in SharedMemory "tickbus_<symbol>"
+- Single writer, no locks: records are written first, then the header's write sequence
+  is bumped; readers only trust slots below that sequence
+- Readers attach zero-copy: read() returns a NumPy recarray view of the next contiguous
+  run of new ticks (valid while the reader is open), latest() a copy of the newest tick
+  with the same fields as symbol_info_tick
+- A reader that falls more than CAPACITY ticks behind skips ahead and counts `dropped`
+- tick_source() gives scripts a drop-in for mt5.symbol_info_tick(SYMBOL) that uses the
+  bus while the feeder is alive and falls back to the terminal otherwise; it attaches
+  lazily and retries every REATTACH_S seconds, so a late or restarted feeder is picked up
+- A restarted feeder reinitializes an existing segment in place (Windows keeps the mapping
+  while any reader holds it, so it cannot be unlinked and recreated); the write sequence
+  carries on, so attached readers keep their place
+
+Usage (feeder):
+  python tick_bus.py XAUUSD_ --capacity 65536
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+CAPACITY = 65536        # ticks kept in the ring (hours of XAUUSD)
+FETCH = 5000            # max ticks per copy_ticks_from call (it starts at a whole second)
+STALE_NS = 2_000_000_000  # feeder heartbeat older than this -> readers fall back to the terminal
+REATTACH_S = 3.0        # tick_source() without a live bus retries attaching this often
+
+TICK_DTYPE = np.dtype([
+    ("time", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("last", "<f8"), ("volume", "<u8"),
+    ("time_msc", "<i8"), ("flags", "<u4"), ("volume_real", "<f8"),
+])
+Tick = namedtuple("Tick", TICK_DTYPE.names)  # same fields as mt5.symbol_info_tick()
+
+# header: int64 slots
+_MAGIC, _CAPACITY, _SEQ, _HEARTBEAT, _PID = range(5)
+_HEADER_SLOTS = 8
+_HEADER_BYTES = _HEADER_SLOTS * 8
+_MAGIC_VALUE = 0x5449434B42555331  # "TICKBUS1"
+
+
+def bus_name(symbol):
+    return f"tickbus_{symbol}"
+
+
+def _views(shm, capacity):
+    header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+    records = np.ndarray((capacity,), dtype=TICK_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+    return header, records.view(np.recarray)
+
+
+# ------------------- Feeder ------------------- #
+class TickFeeder:
+    def __init__(self, mt5, symbol, capacity=CAPACITY):
+        self.mt5 = mt5
+        self.symbol = symbol
+        self.capacity = capacity
+        size = _HEADER_BYTES + capacity * TICK_DTYPE.itemsize
+        self.shm = self._reuse(symbol, size, capacity)
+        if self.shm is None:
+            self.shm = shared_memory.SharedMemory(name=bus_name(symbol), create=True, size=size)
+        self.header, self.records = _views(self.shm, capacity)
+        seq = int(self.header[_SEQ])  # 0 on a new segment
+        self.header[_MAGIC] = 0  # readers treat the bus as down until MAGIC is back
+        self.header[:] = 0
+        self.header[_SEQ] = seq
+        self.header[_CAPACITY] = capacity
+        self.header[_PID] = os.getpid()
+        self.header[_HEARTBEAT] = time.time_ns()
+        self.header[_MAGIC] = _MAGIC_VALUE  # last: readers wait for it
+
+        tick = mt5.symbol_info_tick(symbol)
+        self.last_msc = tick.time_msc - 1 if tick else int(time.time() * 1000)
+        self.same = 0  # ticks already published that share time_msc == last_msc
+        self.fetches = 0
+
+    @staticmethod
+    def _reuse(symbol, size, capacity):
+        """The segment a previous feeder left behind, if its layout fits; else None (removed)."""
+        try:
+            old = shared_memory.SharedMemory(name=bus_name(symbol))
+        except FileNotFoundError:
+            return None
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=old.buf)
+        fits = old.size >= size and header[_MAGIC] == _MAGIC_VALUE and header[_CAPACITY] == capacity
+        del header
+        if fits:
+            return old
+        old.close()
+        old.unlink()  # another layout: recreate (on Windows only once no reader holds it)
+        return None
+
+    def publish(self, ticks):
+        n = len(ticks)
+        if not n:
+            return 0
+        seq = int(self.header[_SEQ])
+        if n > self.capacity:  # only the newest CAPACITY fit; readers see the rest as dropped
+            seq += n - self.capacity
+            ticks = ticks[-self.capacity:]
+            n = self.capacity
+        start = seq % self.capacity
+        first = min(n, self.capacity - start)
+        self.records[start:start + first] = ticks[:first]
+        if first < n:
+            self.records[:n - first] = ticks[first:]
+        self.header[_SEQ] = seq + n  # publish after the data is in place
+        return len(ticks)
+
+    def poll(self):
+        """One copy_ticks_from round trip; publishes only ticks not seen before."""
+        self.header[_HEARTBEAT] = time.time_ns()
+        ticks = self.mt5.copy_ticks_from(self.symbol, int(self.last_msc // 1000), FETCH, self.mt5.COPY_TICKS_ALL)
+        self.fetches += 1
+        if ticks is None or not len(ticks):
+            return 0
+        msc = ticks["time_msc"]
+        keep = msc > self.last_msc
+        keep[np.flatnonzero(msc == self.last_msc)[self.same:]] = True
+        new = ticks[keep]
+        if not len(new):
+            return 0
+        last = int(new["time_msc"][-1])
+        if last == self.last_msc:
+            self.same += len(new)
+        else:
+            self.last_msc = last
+            self.same = int((new["time_msc"] == last).sum())
+        return self.publish(new.astype(TICK_DTYPE, copy=False))
+
+    def run(self, interval=0.005):
+        while True:
+            if not self.poll():
+                time.sleep(interval)
+
+    def close(self):
+        self.records = self.header = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ------------------- Readers ------------------- #
+def _attach(symbol):
+    try:
+        shm = shared_memory.SharedMemory(name=bus_name(symbol), track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=bus_name(symbol))
+        try:  # readers must not unlink the feeder's segment when they exit
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+    return shm
+
+
+class TickReader:
+    def __init__(self, symbol, from_start=False):
+        self.shm = _attach(symbol)
+        header = np.ndarray((_HEADER_SLOTS,), dtype=np.int64, buffer=self.shm.buf)
+        if header[_MAGIC] != _MAGIC_VALUE:
+            del header  # no view may outlive the mapping
+            self.shm.close()
+            raise RuntimeError(f"tick bus {bus_name(symbol)} is not initialized")
+        self.capacity = int(header[_CAPACITY])
+        self.header, self.records = _views(self.shm, self.capacity)
+        head = int(self.header[_SEQ])
+        self.next_seq = max(0, head - self.capacity) if from_start else head
+        self.dropped = 0
+
+    @property
+    def seq(self):
+        return int(self.header[_SEQ])
+
+    def alive(self):
+        return time.time_ns() - int(self.header[_HEARTBEAT]) < STALE_NS
+
+    def read(self):
+        """Zero-copy view of the next contiguous run of unread ticks (may be empty)."""
+        head = int(self.header[_SEQ])
+        oldest = head - self.capacity
+        if self.next_seq < oldest:
+            self.dropped += oldest - self.next_seq
+            self.next_seq = oldest
+        n = head - self.next_seq
+        start = self.next_seq % self.capacity
+        end = start + min(n, self.capacity - start)
+        self.next_seq += end - start
+        return self.records[start:end]
+
+    def still_valid(self, seq):
+        """True if the slot written at sequence `seq` has not been overwritten yet."""
+        return int(self.header[_SEQ]) - self.capacity <= seq
+
+    def latest(self):
+        """Newest tick as a Tick namedtuple (a copy: it does not change when the slot is reused)."""
+        head = int(self.header[_SEQ])
+        if head == 0:
+            return None
+        return Tick(*self.records[(head - 1) % self.capacity].tolist())
+
+    def close(self):
+        self.records = self.header = None
+        self.shm.close()
+
+
+def tick_source(mt5, symbol, retry=REATTACH_S):
+    """
+    Callable returning the newest tick: from the bus while its feeder is alive, else the
+    terminal. Without a live bus it (re-)attaches at most every `retry` seconds, so a feeder
+    started after the script, or restarted on a new segment, is picked up.
+    """
+    reader = None
+    next_try = 0.0
+
+    def get_tick():
+        nonlocal reader, next_try
+        if reader is None or not reader.alive():
+            now = time.monotonic()
+            if now >= next_try:
+                next_try = now + retry
+                if reader is not None:
+                    reader.close()  # the feeder may have recreated the segment with another capacity
+                try:
+                    reader = TickReader(symbol)
+                except (FileNotFoundError, RuntimeError):
+                    reader = None
+        if reader is not None and reader.alive():
+            tick = reader.latest()
+            if tick is not None:
+                return tick
+        return mt5.symbol_info_tick(symbol)
+    return get_tick
+
+
+def main():
+    import MetaTrader5 as mt5
+
+    parser = argparse.ArgumentParser(description="Feed one symbol's ticks into the shared-memory tick bus.")
+    parser.add_argument("symbol")
+    parser.add_argument("--capacity", type=int, default=CAPACITY)
+    args = parser.parse_args()
+
+    if not mt5.initialize():
+        raise SystemExit(f"❌ MT5 initialize failed: {mt5.last_error()}")
+    mt5.symbol_select(args.symbol, True)
+    feeder = TickFeeder(mt5, args.symbol, args.capacity)
+    print(f"📡 Tick bus {bus_name(args.symbol)} live ({args.capacity} ticks, "
+          f"{feeder.shm.size / 1e6:.1f} MB). Ctrl+C to stop.")
+    try:
+        feeder.run()
+    except KeyboardInterrupt:
+        print(f"🛑 Feeder stopped after {int(feeder.header[_SEQ])} ticks / {feeder.fetches} fetches")
+    finally:
+        feeder.close()
+        mt5.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Time-warp harness: run unmodified strategy scripts on a virtual clock against the
+simulated terminal, a trading day in seconds.
+
+- sim_terminal.SimTerminal is installed as MetaTrader5 and fed a scripted tick stream
+  (recorded ticks via --ticks, or a --scenario path of --hours)
+- VirtualClock patches time.sleep / time.time / time.time_ns / time.monotonic and
+  datetime.now / today / utcnow onto the simulated clock: sleep(1) costs no wall time and
+  advances the market by one second, timestamps in logs and journals follow the ticks
+- Only the script's main thread warps; other threads (dashboard, journal writer) keep
+  real time so their pacing does not eat the simulated day
+- input() prompts are answered from --answers, STRATEGY_SPEC comes from --spec
+- Several tick files / days run in parallel processes (--jobs), one work dir each,
+  and each prints a JSON summary line (simulated hours, wall time, speed-up, fills, balance)
+
+Usage:
+  python time_warp.py "version 0.1/pv_increment.py" --scenario chop --hours 24 \
+      --spec '{"symbol": "XAUUSD_", "magic": 1, "gap": 2.0, "mode": "auto", "pattern": "even"}'
+  python time_warp.py "manual seprate script/new gap .py" --ticks day1.csv --ticks day2.csv \
+      --answers 1 --answers 2.0 --jobs 2
+"""
+
+import argparse
+import builtins
+import datetime as _dt
+import json
+import os
+import runpy
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sim_terminal import SCENARIOS, ScenarioEnd, SimTerminal, load_ticks, scenario_ticks
+
+_real = {name: getattr(time, name) for name in ("sleep", "time", "time_ns", "monotonic", "monotonic_ns")}
+_RealDateTime = _dt.datetime
+
+
+class VirtualClock:
+    """Context manager patching time / datetime onto sim.clock for the calling thread."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.thread = threading.get_ident()
+        self.offset = sim.clock - _real["monotonic"]()  # monotonic() starts where it really is
+
+    def _warped(self):
+        return threading.get_ident() == self.thread
+
+    def sleep(self, seconds):
+        if self._warped():
+            self.sim.sleep(seconds)
+        else:
+            _real["sleep"](seconds)
+
+    def time(self):
+        return self.sim.clock if self._warped() else _real["time"]()
+
+    def time_ns(self):
+        return int(self.sim.clock * 1e9) if self._warped() else _real["time_ns"]()
+
+    def monotonic(self):
+        return self.sim.clock - self.offset if self._warped() else _real["monotonic"]()
+
+    def monotonic_ns(self):
+        return int(self.monotonic() * 1e9)
+
+    def __enter__(self):
+        clock = self
+
+        class WarpDateTime(_RealDateTime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls.fromtimestamp(clock.time(), tz)
+
+            @classmethod
+            def today(cls):
+                return cls.now()
+
+            @classmethod
+            def utcnow(cls):
+                return cls.fromtimestamp(clock.time(), _dt.timezone.utc).replace(tzinfo=None)
+
+        for name in _real:
+            setattr(time, name, getattr(self, name))
+        _dt.datetime = WarpDateTime
+        return self
+
+    def __exit__(self, *exc):
+        for name, fn in _real.items():
+            setattr(time, name, fn)
+        _dt.datetime = _RealDateTime
+        return False
+
+
+def scripted_input(answers):
+    answers = list(answers)
+
+    def answer(prompt=""):
+        if not answers:
+            raise EOFError(f"no scripted answer left for prompt: {prompt!r}")
+        value = answers.pop(0)
+        print(f"{prompt}{value}")
+        return value
+    return answer
+
+
+def warp(script, ticks, spec=None, answers=(), quiet=True, wrap=None, **terminal):
+    """
+    Run `script` as __main__ until its ticks run out (or it exits). Returns the summary dict.
+    wrap(sim) may return a proxy the script sees instead (mt5_instrumented, mt5_cassette).
+    """
+    sim = SimTerminal(ticks, **terminal)
+    if spec:
+        os.environ["STRATEGY_SPEC"] = json.dumps(spec)
+    sys.modules["MetaTrader5"] = wrap(sim) if wrap else sim
+    builtins.input = scripted_input(answers)
+    sys.argv = [script]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    start_sim = sim.clock
+    exit_reason = "ticks exhausted"
+    stdout = sys.stdout
+    if quiet:
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    t0 = time.perf_counter()
+    try:
+        with VirtualClock(sim):
+            runpy.run_path(script, run_name="__main__")
+        exit_reason = "script returned"
+    except ScenarioEnd:
+        pass
+    except SystemExit as e:
+        exit_reason = f"exit({e.code})"
+    except EOFError as e:
+        exit_reason = str(e)
+    finally:
+        wall = time.perf_counter() - t0
+        if quiet:
+            sys.stdout.close()
+            sys.stdout = stdout
+    sim_hours = (sim.clock - start_sim) / 3600
+    return {
+        "script": script, "exit": exit_reason,
+        "from": _RealDateTime.utcfromtimestamp(sim.ticks[0][0] / 1000).isoformat(timespec="seconds"),
+        "sim_hours": round(sim_hours, 3), "wall_s": round(wall, 3),
+        "speedup": round(sim_hours * 3600 / wall) if wall else None,
+        "ticks": sim.cursor + 1, "fills": len(sim.fills), "mt5_calls": sum(sim.calls.values()),
+        "open_positions": len(sim.positions), "balance": round(sim.balance, 2),
+        "equity": round(sim.balance + sim.floating(), 2),
+    }
+
+
+def _job_args(args, source):
+    cmd = [sys.executable, os.path.abspath(__file__), args.script, "--single", "--workdir",
+           os.path.join(args.workdir, source["label"])]
+    if "ticks" in source:
+        cmd += ["--ticks", source["ticks"]]
+    else:
+        cmd += ["--scenario", source["scenario"], "--hours", str(args.hours), "--seed", str(source["seed"])]
+    if args.spec:
+        cmd += ["--spec", args.spec]
+    for a in args.answers or []:
+        cmd += ["--answers", a]
+    if args.verbose:
+        cmd.append("--verbose")
+    return cmd
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a strategy script on a virtual clock against simulated ticks.")
+    parser.add_argument("script")
+    parser.add_argument("--ticks", action="append", help="recorded ticks (.csv MT5 export or .npy); repeat for days")
+    parser.add_argument("--scenario", choices=SCENARIOS, help="synthetic tick path instead of --ticks")
+    parser.add_argument("--hours", type=float, default=24.0, help="length of a --scenario day")
+    parser.add_argument("--days", type=int, default=1, help="--scenario days (one seed each)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--spec", help="JSON instance spec passed as STRATEGY_SPEC")
+    parser.add_argument("--answers", action="append", help="scripted answer for the next input() prompt")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--workdir", default=os.path.join("runs", "warp"))
+    parser.add_argument("--verbose", action="store_true", help="show the script's output")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.script = os.path.abspath(args.script)
+
+    if args.single:
+        if args.ticks:
+            ticks = load_ticks(args.ticks[0])
+        else:
+            ticks = scenario_ticks(args.scenario or "chop", seconds=args.hours * 3600, seed=args.seed)
+        os.makedirs(args.workdir, exist_ok=True)
+        os.chdir(args.workdir)
+        summary = warp(args.script, ticks, json.loads(args.spec) if args.spec else None,
+                       args.answers or (), quiet=not args.verbose)
+        print(json.dumps(summary), flush=True)
+        return
+
+    if args.ticks:
+        sources = [{"label": os.path.splitext(os.path.basename(p))[0], "ticks": os.path.abspath(p)} for p in args.ticks]
+    else:
+        scenario = args.scenario or "chop"
+        sources = [{"label": f"{scenario}_{args.seed + d}", "scenario": scenario, "seed": args.seed + d}
+                   for d in range(args.days)]
+
+    def run(source):
+        proc = subprocess.run(_job_args(args, source), capture_output=not args.verbose, text=True)
+        lines = (proc.stdout or "").strip().splitlines()
+        try:
+            return source["label"], json.loads(lines[-1])
+        except (IndexError, ValueError):
+            return source["label"], {"exit": f"crashed (code {proc.returncode})",
+                                     "error": (proc.stderr or "").strip().splitlines()[-1:]}
+
+    print(f"⏩ {len(sources)} day(s) of {os.path.basename(args.script)} on {min(args.jobs, len(sources))} process(es)")
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for label, s in pool.map(run, sources):
+            if "sim_hours" in s:
+                print(f"📅 {label:<16} {s['sim_hours']:>6.2f}h in {s['wall_s']:>7.2f}s (×{s['speedup']}) "
+                      f"fills={s['fills']} balance={s['balance']:.2f} equity={s['equity']:.2f} — {s['exit']}")
+            else:
+                print(f"❌ {label:<16} {s['exit']} {' '.join(s.get('error', []))}")
+    print(f"⏱ all days done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
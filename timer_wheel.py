@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Hashed timer wheel: deadlines for scheduled flattens, session open/close and cooldowns,
+and a main loop that sleeps exactly until the next one instead of polling.
+
+- Time is cut into RESOLUTION ticks; a timer due at `at` lives in the bucket of its tick,
+  kept in slot (tick % SLOTS) of the wheel. Schedule and cancel are O(1); advancing one
+  tick looks at one bucket, so the cost per loop does not grow with the number of timers
+- Timers fire at their exact time (not rounded to the tick), in deadline order
+- every() re-arms on its own phase (missed periods are skipped, not replayed);
+  daily("15:00") fires every day at that UTC time
+- wait() sleeps until the next deadline (or max_wait, or until an Event is set from
+  another thread) and fires what is due; run() loops on it
+- The clock is time.time looked up on each call, so time_warp's VirtualClock drives it
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+RESOLUTION = 0.05   # seconds per wheel tick
+SLOTS = 1024        # one revolution = 51.2 s at the default resolution
+
+
+class Timer:
+    __slots__ = ("at", "key", "callback", "args", "period", "name", "active")
+
+    def __init__(self, at, callback, args, period, name):
+        self.at = at
+        self.key = 0
+        self.callback = callback
+        self.args = args
+        self.period = period
+        self.name = name or getattr(callback, "__name__", "timer")
+        self.active = True
+
+    def __repr__(self):
+        every = f" every {self.period:g}s" if self.period else ""
+        return f"<Timer {self.name} at {self.at:.3f}{every}{'' if self.active else ' cancelled'}>"
+
+
+class TimerWheel:
+    def __init__(self, resolution=RESOLUTION, slots=SLOTS, clock=None):
+        self.resolution = resolution
+        self.n = slots
+        self._slots = [{} for _ in range(slots)]   # tick -> set of timers due in that tick
+        self._clock = clock
+        self._tick = int(self.now() // resolution)  # last tick advance() reached
+        self._count = 0
+        self._next = None
+        self._dirty = False
+        self.fired = 0
+
+    def __len__(self):
+        return self._count
+
+    def now(self):
+        return self._clock() if self._clock else time.time()
+
+    # ------------------- Scheduling ------------------- #
+    def _insert(self, timer):
+        key = max(int(timer.at // self.resolution), self._tick)  # overdue -> current tick
+        timer.key = key
+        slot = self._slots[key % self.n]
+        bucket = slot.get(key)
+        if bucket is None:
+            bucket = slot[key] = set()
+        bucket.add(timer)
+        self._count += 1
+        if not self._dirty and (self._next is None or timer.at < self._next):
+            self._next = timer.at
+
+    def at(self, when, callback, *args, period=None, name=None):
+        """Call callback(*args) at epoch time `when` (then every `period` seconds if given)."""
+        timer = Timer(float(when), callback, args, period, name)
+        self._insert(timer)
+        return timer
+
+    def after(self, delay, callback, *args, name=None):
+        return self.at(self.now() + delay, callback, *args, name=name)
+
+    def every(self, period, callback, *args, first=None, name=None):
+        """Repeat every `period` seconds, first at `first` (default: one period from now)."""
+        if period <= 0:
+            raise ValueError("period must be positive")
+        return self.at(self.now() + period if first is None else first, callback, *args, period=period, name=name)
+
+    def daily(self, hhmm, callback, *args, name=None):
+        """Every day at HH:MM UTC."""
+        hour, minute = (int(x) for x in hhmm.split(":"))
+        now = datetime.fromtimestamp(self.now(), timezone.utc)
+        first = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if first <= now:
+            first += timedelta(days=1)
+        return self.at(first.timestamp(), callback, *args, period=86400.0, name=name or f"daily {hhmm}")
+
+    def cancel(self, timer):
+        if not timer.active:
+            return False
+        timer.active = False
+        slot = self._slots[timer.key % self.n]
+        bucket = slot.get(timer.key)
+        if bucket is not None and timer in bucket:
+            bucket.discard(timer)
+            if not bucket:
+                del slot[timer.key]
+            self._count -= 1
+            if timer.at == self._next:
+                self._dirty = True
+        return True
+
+    # ------------------- Expiry ------------------- #
+    def next_deadline(self):
+        """Earliest pending deadline (epoch seconds), or None with no timers."""
+        if not self._dirty:
+            return self._next
+        self._dirty = False
+        self._next = None
+        if self._count:
+            slots, n = self._slots, self.n
+            for key in range(self._tick, self._tick + n):  # usually found within a revolution
+                bucket = slots[key % n].get(key)
+                if bucket:
+                    self._next = min(t.at for t in bucket)
+                    return self._next
+            key = min(k for slot in slots for k in slot)
+            self._next = min(t.at for t in slots[key % self.n][key])
+        return self._next
+
+    def advance(self, now=None):
+        """
+        Fire every timer due by `now` (default: the clock), in deadline order; a timer one
+        of those callbacks cancels does not fire. Returns the number fired.
+        """
+        now = self.now() if now is None else now
+        target = int(now // self.resolution)
+        if target < self._tick:
+            return 0
+        slots, n = self._slots, self.n
+        if target - self._tick < n + self._count:
+            keys = range(self._tick, target + 1)
+        else:  # long sleep with few timers: visit the buckets that exist instead of every tick
+            keys = sorted(k for slot in slots for k in slot if k <= target)
+        due = []
+        for key in keys:
+            slot = slots[key % n]
+            bucket = slot.get(key)
+            if not bucket:
+                continue
+            if key < target:
+                due.extend(bucket)
+                del slot[key]
+            else:
+                ready = [t for t in bucket if t.at <= now]
+                if ready:
+                    bucket.difference_update(ready)
+                    if not bucket:
+                        del slot[key]
+                    due.extend(ready)
+        self._tick = target
+        if not due:
+            return 0
+        self._count -= len(due)
+        self._dirty = True
+        if len(due) > 1:
+            due.sort(key=lambda t: t.at)
+        fired = 0
+        for timer in due:
+            if not timer.active:  # cancelled by an earlier callback of this batch
+                continue
+            if timer.period:
+                timer.at += timer.period
+                if timer.at <= now:  # skip missed periods, keep the phase
+                    timer.at += timer.period * ((now - timer.at) // timer.period + 1)
+                self._insert(timer)
+            else:
+                timer.active = False
+            fired += 1
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"⚠️ timer {timer.name} failed: {e}")
+        self.fired += fired
+        return fired
+
+    # ------------------- Loop ------------------- #
+    def wait(self, max_wait=None, event=None):
+        """
+        Sleep until the next deadline (at most max_wait seconds; forever / until `event`
+        with no timers), then fire what is due. A set `event` wakes it early and is cleared.
+        """
+        timeout = max_wait
+        deadline = self.next_deadline()
+        if deadline is not None:
+            remaining = max(0.0, deadline - self.now())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if event is not None:
+            if event.wait(timeout):
+                event.clear()
+        elif timeout is not None and timeout > 0:
+            time.sleep(timeout)
+        return self.advance()
+
+    def run(self, until=None, event=None):
+        """wait() in a loop while timers remain (or an event can wake it) and until() is not true."""
+        while (self._count or event is not None) and not (until and until()):
+            self.wait(event=event)
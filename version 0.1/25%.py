@@ -9,9 +9,14 @@ Fixed & improved cyclic BUY/SELL STOP script for MetaTrader5.
 """
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from strategy_runner import load_instance_spec, entry_price, ladder_generator
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD"    # trading symbol (set to your broker's symbol name)
 SLIPPAGE = 500           # allowed deviation in points
@@ -19,6 +24,14 @@ MAGIC = 12345            # magic number
 LOSS_TARGET = 50.0       # equity loss stop (in $)
 POLL_INTERVAL = 0.5      # seconds between main loop polls
 DEFAULT_PROFIT_TARGET = 1.0  # default $ profit target
+PATTERN_CHOICES = {"ascending": "1", "even": "2", "odd": "3", "mega": "4", "formula25": "5"}
+
+# Headless run: strategy_runner passes the instance spec, which overrides the config and prompts
+SPEC = load_instance_spec()
+if SPEC:
+    SYMBOL = SPEC["symbol"]
+    MAGIC = SPEC["magic"]
+    LOSS_TARGET = SPEC.get("loss_target", LOSS_TARGET)
 
 # ------------------- Globals ------------------- #
 order_log = []  # stores history of triggered trades
@@ -269,18 +282,22 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
     base_ask = tick.ask
     options = [round(base_ask + i * point * 10, digits) for i in range(1, 4)]
 
-    print("\n👉 Choose starting BUY STOP price:")
-    for i, val in enumerate(options, 1):
-        print(f"{i}. {val}")
-    choice = input("Enter choice (1/2/3 or custom price): ").strip()
-    if choice in ["1", "2", "3"]:
-        buy_price = options[int(choice) - 1]
+    if SPEC:
+        buy_price = entry_price(SPEC.get("entry", "ask+10"), tick, point, digits)
+        printl(f"🤖 Headless entry {SPEC.get('entry', 'ask+10')} -> BUY STOP {buy_price}")
     else:
-        try:
-            buy_price = float(choice)
-        except ValueError:
-            printl("Invalid price entered. Aborting cycle.")
-            return "error"
+        print("\n👉 Choose starting BUY STOP price:")
+        for i, val in enumerate(options, 1):
+            print(f"{i}. {val}")
+        choice = input("Enter choice (1/2/3 or custom price): ").strip()
+        if choice in ["1", "2", "3"]:
+            buy_price = options[int(choice) - 1]
+        else:
+            try:
+                buy_price = float(choice)
+            except ValueError:
+                printl("Invalid price entered. Aborting cycle.")
+                return "error"
 
     if mode25:
         vol, expected_profit = next(vol_gen)
@@ -381,19 +398,23 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
 # ------------------- Main ------------------- #
 def main():
     try:
-        print("\n👉 Choose mode:")
-        print("m. Manual (one run)")
-        print("a. Auto (repeat runs)")
-        mode_choice = input("Enter choice (m/a): ").strip()
-        mode = "manual" if mode_choice.lower() == "m" else "auto"
-
-        print("\n👉 Choose volume/profit pattern:")
-        print("1. Ascending")
-        print("2. Even only")
-        print("3. Odd only")
-        print("4. Mega")
-        print("5. 25% Formula (Volume × 25$)")
-        vol_choice = input("Enter choice (1/2/3/4/5): ").strip()
+        if SPEC:
+            mode = SPEC.get("mode", "auto")
+            vol_choice = PATTERN_CHOICES.get(SPEC.get("pattern", "ascending"), "1")
+        else:
+            print("\n👉 Choose mode:")
+            print("m. Manual (one run)")
+            print("a. Auto (repeat runs)")
+            mode_choice = input("Enter choice (m/a): ").strip()
+            mode = "manual" if mode_choice.lower() == "m" else "auto"
+
+            print("\n👉 Choose volume/profit pattern:")
+            print("1. Ascending")
+            print("2. Even only")
+            print("3. Odd only")
+            print("4. Mega")
+            print("5. 25% Formula (Volume × 25$)")
+            vol_choice = input("Enter choice (1/2/3/4/5): ").strip()
 
         mode25 = False
         if vol_choice == "1":
@@ -419,8 +440,11 @@ def main():
             printl("Invalid choice; defaulting to ascending.")
             vol_gen = volume_pattern_gen("ascending")
             profit_gen = profit_pattern_gen("default")
+        if SPEC and SPEC.get("ladder"):
+            vol_gen = ladder_generator(SPEC["ladder"])  # explicit ladder beats the pattern volumes
+            mode25 = False
 
-        gap = None
+        gap = SPEC["gap"] if SPEC else None
         while gap is None:
             try:
                 gap = float(input("Enter gap (distance between BUY and SELL in price units): ").strip())
@@ -10,11 +10,15 @@
 """
 
 import MetaTrader5 as mt5
+import os
 import time
 from datetime import datetime
 
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from order_mirror import OrderMirror
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD_"      # change to your broker symbol if needed
 MAGIC = 123456
@@ -31,6 +35,8 @@ DIGITS = None
 VOL_MIN = None
 VOL_MAX = None
 VOL_STEP = None
+mirror = None           # OrderMirror: pending count from memory instead of orders_get per order
+bar_feed = None         # bars.BarFeed: indicators from resampled ticks instead of the terminal's bars
 
 # ------------------- Helpers ------------------- #
 def now():
@@ -41,7 +47,7 @@ def printl(*args, **kwargs):
 
 # ------------------- MT5 Connect & Symbol info ------------------- #
 def connect_mt5():
-    global sym_info, POINT, DIGITS, VOL_MIN, VOL_MAX, VOL_STEP
+    global sym_info, POINT, DIGITS, VOL_MIN, VOL_MAX, VOL_STEP, mirror
     if not mt5.initialize():
         print("❌ MT5 Initialization failed:", mt5.last_error())
         sys.exit(1)
@@ -60,6 +66,7 @@ def connect_mt5():
     VOL_MIN = float(sym_info.volume_min or 0.01)
     VOL_STEP = float(sym_info.volume_step or 0.01)
     VOL_MAX = float(sym_info.volume_max or 100.0)
+    mirror = OrderMirror(mt5, SYMBOL)
 
     printl("✅ MT5 Connected")
     printl(f"Symbol rules -> min:{VOL_MIN} step:{VOL_STEP} max:{VOL_MAX} digits:{DIGITS} point:{POINT}")
@@ -106,15 +113,20 @@ def generate_formula_table():
     return table
 
 # ------------------- Market Prediction ------------------- #
+def copy_rates(symbol, timeframe, count):
+    """Newest `count` bars from bar_feed when one is set (offline / backtest), else from the terminal."""
+    source = bar_feed if bar_feed is not None else mt5
+    return source.copy_rates_from_pos(symbol, timeframe, 0, count)
+
 def get_ma(symbol, period, timeframe=mt5.TIMEFRAME_M15, count=300):
-    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+    rates = copy_rates(symbol, timeframe, count)
     if rates is None or len(rates) < period:
         return None
     closes = rates['close']
     return sum(closes[-period:]) / period
 
 def get_atr(symbol, period=ATR_PERIOD, timeframe=mt5.TIMEFRAME_M15, count=300):
-    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
+    rates = copy_rates(symbol, timeframe, count)
     if rates is None or len(rates) < period + 1:
         return None
     highs = rates['high']
@@ -161,13 +173,10 @@ def place_order(symbol, order_type, volume, price, sl, tp):
         printl(f"⚠️ Skipping order: volume {volume} outside allowed range")
         return None
 
-    # prevent too many pendings
-    try:
-        current_pendings = mt5.orders_get(symbol=SYMBOL) or []
-    except Exception:
-        current_pendings = []
-    if len(current_pendings) >= MAX_PENDING:
-        printl(f"⚠️ Too many pending orders ({len(current_pendings)}) -> skipping")
+    # prevent too many pendings (mirror is updated by our own sends, reconciled periodically)
+    pending_count = mirror.count()
+    if pending_count >= MAX_PENDING:
+        printl(f"⚠️ Too many pending orders ({pending_count}) -> skipping")
         return None
 
     # round price/SL/TP to symbol digits
@@ -189,7 +198,7 @@ def place_order(symbol, order_type, volume, price, sl, tp):
         "type_time": mt5.ORDER_TIME_GTC,
         "type_filling": mt5.ORDER_FILLING_FOK,
     }
-    result = mt5.order_send(request)
+    result = mirror.send(request)
     if result is None:
         printl("❌ order_send returned None")
         return None
@@ -207,7 +216,7 @@ def cancel_all_pending():
     orders = mt5.orders_get(symbol=SYMBOL) or []
     for o in orders:
         try:
-            mt5.order_send({
+            mirror.send({
                 "action": mt5.TRADE_ACTION_REMOVE,
                 "order": int(o.ticket),
             })
@@ -255,7 +264,7 @@ def close_all_orders():
     orders = mt5.orders_get(symbol=SYMBOL) or []
     for o in orders:
         try:
-            mt5.order_send({
+            mirror.send({
                 "action": mt5.TRADE_ACTION_REMOVE,
                 "order": int(o.ticket),
             })
@@ -347,8 +356,7 @@ def main():
             positions = get_open_positions()
             if not positions:
                 # no positions open; check if any pending orders exist; if none -> finish
-                pendings = mt5.orders_get(symbol=SYMBOL) or []
-                if not pendings:
+                if not mirror.count():
                     break
                 # else continue waiting for triggers
                 time.sleep(2)
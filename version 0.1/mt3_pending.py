@@ -1,12 +1,21 @@
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fixed_point import PriceScale
+from grid_placer import GridPlacer
+from order_mirror import OrderMirror
+
 SYMBOL = "XAUUSD_"
 VOLUME = 0.01
 START_PRICE = 3485.00  # Initial target price
 SLIPPAGE = 50
 INCREMENT = 1.00        # Price increment for each next order
+MAGIC = 123456
+GRID_LEVELS = 50        # BUY STOPs kept live at once (START_PRICE, +INCREMENT, ...)
 
 # Initialize MT5 connection
 if not mt5.initialize():
@@ -28,60 +37,26 @@ if symbol_info is None:
     mt5.shutdown()
     quit()
 
-stop_level = symbol_info.trade_stops_level * symbol_info.point
+scale = PriceScale.from_symbol_info(symbol_info)
 
-price = START_PRICE
-order_number = 1
-pending_orders = []
+# pending state from memory; one orders_get every few seconds instead of one per loop
+mirror = OrderMirror(mt5, SYMBOL, magic=MAGIC)
+grid = GridPlacer(mt5, mirror, scale, SYMBOL, "BUY", VOLUME, scale.to_points(INCREMENT), GRID_LEVELS, MAGIC,
+                  deviation=SLIPPAGE, comment="Python Pending Buy")
 
 try:
-    while True:
-        tick = mt5.symbol_info_tick(SYMBOL)
-        current_ask = tick.ask
-        min_valid_price = current_ask + stop_level
-
-        # Adjust price if too close to current market
-        if price <= min_valid_price:
-            price = round(min_valid_price + symbol_info.point, 2)
-
-        # Check if last pending order is still active
-        last_order_active = False
-        if pending_orders:
-            # Get the status of the last pending order
-            orders = mt5.orders_get(ticket=pending_orders[-1])
-            if orders and len(orders) > 0:
-                last_order_active = True
-            else:
-                pending_orders.pop()  # Remove triggered or canceled order
+    # Whole ladder validated against stops/freeze level, then submitted back to back
+    t = time.perf_counter()
+    placed = grid.start(scale.to_points(START_PRICE))
+    print(f"🚀 {placed}/{GRID_LEVELS} BUY STOP levels live in {(time.perf_counter() - t) * 1e3:.0f} ms "
+          f"(up to {scale.to_price(grid.far_level)})")
 
-        # Place new order only if previous is still pending
-        if not last_order_active:
-            print(f"📌 Placing BUY STOP pending order {order_number} at {price}...")
-
-            request = {
-                "action": mt5.TRADE_ACTION_PENDING,
-                "symbol": SYMBOL,
-                "volume": VOLUME,
-                "type": mt5.ORDER_TYPE_BUY_STOP,
-                "price": price,
-                "deviation": SLIPPAGE,
-                "type_filling": mt5.ORDER_FILLING_FOK,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "comment": f"Python Pending Buy {order_number}",
-                "magic": 123456
-            }
-
-            result = mt5.order_send(request)
+    while True:
+        # Levels that triggered (or were removed) are replaced past the top of the grid
+        for level in grid.maintain():
+            print(f"🔔 [{datetime.now():%H:%M:%S}] Level {scale.to_price(level)} left the book "
+                  f"→ grid extended to {scale.to_price(grid.far_level)}")
 
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
-                print(f"✅ Order {order_number} placed successfully at {price}")
-                pending_orders.append(result.order)  # Track pending order
-                order_number += 1
-                price = round(price + INCREMENT, 2)  # Increment for next order
-            else:
-                print(f"❌ Failed to place order {order_number}. Retcode={result.retcode}")
-                print(result)
-        
         time.sleep(1)  # Short delay before next check
 
 except KeyboardInterrupt:
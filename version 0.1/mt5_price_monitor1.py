@@ -1,17 +1,22 @@
 # Filename: mt5_price_monitor.py
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
-import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fixed_point import PriceScale
+from price_triggers import TriggerBook, market_order, run
 
 # ---------------- USER SETTINGS ----------------
 symbol = "XAUUSD_"       # Your trading symbol in MT5
 buy_target = 3482.50     # Example Buy (Ask) target
-ahk_exe = r"C:\Program Files\AutoHotkey\v2\AutoHotkey64.exe"   # correct exe
-ahk_script = r"C:\Users\hp\OneDrive\Desktop\PlaceOrder.ahk"
+volume = 0.01            # Lot size sent when the target is reached
+deviation = 20
+magic = 123456
 
-# Path to your script
-check_interval = 0.2     # Seconds between price checks
+check_interval = 0.01    # Seconds between price checks (only new ticks are evaluated)
 # ------------------------------------------------
 
 # Initialize MT5
@@ -19,22 +24,31 @@ if not mt5.initialize():
     print("MT5 initialization failed")
     quit()
 
-print(f"Monitoring {symbol} for Buy ≥ {buy_target}")
+symbol_info = mt5.symbol_info(symbol)
+if symbol_info is None:
+    print(f"Symbol info not found for {symbol}")
+    mt5.shutdown()
+    quit()
 
-while True:
-    tick = mt5.symbol_info_tick(symbol)
-    if tick is None:
-        time.sleep(check_interval)
-        continue
+# Alerts are checked in-process and the order goes straight to order_send (no AutoHotkey GUI clicks)
+book = TriggerBook(PriceScale.from_symbol_info(symbol_info))
+book.add(buy_target, source="ask", direction="above",
+         action=market_order(mt5, symbol, "BUY", volume, deviation, magic, comment="Buy target"),
+         label="BUY target")
 
-    buy_price = tick.ask  # Buy (Ask) price
-    print(f"Buy (Ask): {buy_price:.2f}")
 
-    # --- Check Buy Target ---
-   
-    if buy_price >= buy_target:
-        print(f"BUY target reached: {buy_price:.2f}. Triggering AHK..........................................")
-        subprocess.Popen([ahk_exe, ahk_script, str(buy_price)])  # Pass price to AHK script
-        break
+def on_fire(alert, tick):
+    sent_ms = (time.perf_counter_ns() - alert.fired_at) / 1e6
+    result = alert.result
+    print(f"{alert.label} reached: {tick.ask:.2f}. order_send -> retcode={getattr(result, 'retcode', result)} "
+          f"price={getattr(result, 'price', None)} ({sent_ms:.1f} ms)")
+
+
+print(f"Monitoring {symbol} for Buy ≥ {buy_target}")
 
-mt5.shutdown()
+try:
+    run(mt5, symbol, book, check_interval, on_fire)
+except KeyboardInterrupt:
+    print("Stopped by user")
+finally:
+    mt5.shutdown()
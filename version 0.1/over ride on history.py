@@ -8,17 +8,22 @@ This script NEVER modifies MT5 account history or balances.
 Usage examples:
   python mt5_hypothetical_balance.py --days 30 --virtual_add 500.0 --csv out.csv
   python mt5_hypothetical_balance.py --from 2025-01-01 --to 2025-10-01 --virtual_add -100.0
+  python mt5_hypothetical_balance.py --days 90 --cycles --cycles_csv cycles.csv
 
 Requires:
   pip install MetaTrader5 pandas
 """
 
 import argparse
+import os
 import sys
 from datetime import datetime, timedelta
 import MetaTrader5 as mt5
 import pandas as pd
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cycle_analytics import MAX_GAP, analyze_cycles, cycles_frame, ladder_summary
+
 def init_mt5():
     if not mt5.initialize():
         raise SystemExit(f"MT5 initialize failed: {mt5.last_error()}")
@@ -73,6 +78,29 @@ def aggregate_profit(deals_df, positions_df):
         total_profit = float(positions_df['profit'].sum())
     return total_profit
 
+def print_cycles(deals_df, max_gap_hours, csv_path=None, top=5):
+    """
+    Reconstruct strategy cycles from the deals and print which ladders make money.
+    """
+    cycles = analyze_cycles(deals_df, max_gap=max_gap_hours * 3600)
+    print("=== Ladder cycles (magic + symbol) ===")
+    if not cycles["cycles"]:
+        print("No trade deals in range.")
+        return
+    print(f"{'symbol':<10} {'magic':>10} {'cycles':>7} {'win%':>6} {'net':>11} {'mean':>9} {'worst':>10} {'best':>9} {'legs':>5}")
+    for row in ladder_summary(cycles):
+        print(f"{row['symbol']:<10} {row['magic']:>10} {row['cycles']:>7} {row['win_rate']:>6.0%} {row['net']:>11.2f} "
+              f"{row['mean_net']:>9.2f} {row['worst']:>10.2f} {row['best']:>9.2f} {row['mean_legs']:>5.1f}")
+    df = cycles_frame(cycles)
+    cols = ["symbol", "magic", "start", "duration_s", "triggers", "max_legs", "peak_volume", "net", "flat"]
+    print(f"--- Worst {top} cycles ---")
+    print(df.nsmallest(top, "net")[cols].to_string(index=False))
+    print(f"--- Best {top} cycles ---")
+    print(df.nlargest(top, "net")[cols].to_string(index=False))
+    if csv_path:
+        df.to_csv(csv_path, index=False)
+        print(f"Exported {len(df)} cycles to {csv_path}")
+
 def main():
     parser = argparse.ArgumentParser(description="Compute hypothetical MT5 balance from real history (read-only).")
     group = parser.add_mutually_exclusive_group(required=False)
@@ -82,6 +110,10 @@ def main():
     parser.add_argument("--virtual_add", type=float, default=0.0,
                         help="Amount to virtually add (positive) or subtract (negative) from balance for hypothetical scenario.")
     parser.add_argument("--csv", type=str, default=None, help="Optional: export combined history + hypothetical columns to this CSV path.")
+    parser.add_argument("--cycles", action="store_true", help="Reconstruct ladder cycles and print per-ladder analytics.")
+    parser.add_argument("--max_gap_hours", type=float, default=MAX_GAP / 3600,
+                        help="Hours without a deal that start a new cycle (default: 6).")
+    parser.add_argument("--cycles_csv", type=str, default=None, help="Optional: export one row per cycle to this CSV path.")
     args = parser.parse_args()
 
     init_mt5()
@@ -136,6 +168,9 @@ def main():
         print(f"Hypothetical Equity:  {hypothetical_equity:.2f}")
         print("========================================")
 
+        if args.cycles or args.cycles_csv:
+            print_cycles(deals_df, args.max_gap_hours, args.cycles_csv)
+
         # Optional CSV export: combine deals + positions and add hypothetical columns
         if args.csv:
             # Normalize deals_df and positions_df to a single table if possible
@@ -428,16 +428,21 @@ Features:
 - Automatically distributes target profit to open positions.
 - Auto-closes positions when virtual balance reaches TARGET_BALANCE or cumulative profit reaches TARGET_PROFIT.
 - Works in LIVE or simulation mode.
-- Scheduled daily closing supported.
+- Scheduled daily closing, session window and cooldown after a target close, all on a
+  timer wheel: the loop sleeps until the next deadline instead of polling.
 """
 
 import MetaTrader5 as mt5
 import time
 import json
 import os
+import sys
 from datetime import datetime, time as dtime
 from decimal import Decimal, ROUND_DOWN
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from timer_wheel import TimerWheel
+
 STATE_FILE = "mt5_balance_manager_state.json"
 
 # ------------------- CONFIG ------------------- #
@@ -450,8 +455,11 @@ CONFIG = {
     "TARGET_PROFIT": 100.0,           # Close all if cumulative profit reaches this
     "SPLIT_MODE": "even",             # "even" or "custom"
     "CUSTOM_SPLITS": None,            # e.g., [0.5,0.3,0.2]
-    "CLOSE_TIME_UTC": None,           # e.g., "15:00"
-    "CHECK_INTERVAL": 5,              # seconds
+    "CLOSE_TIME_UTC": None,           # e.g., "15:00" -> close all once a day
+    "SESSION_UTC": None,              # e.g., ("07:00", "21:00") -> no new orders outside, close all at the end
+    "COOLDOWN_AFTER_TARGET": 0,       # seconds without new orders after a target close
+    "CHECK_INTERVAL": 5,              # seconds between target checks
+    "SUMMARY_INTERVAL": 60,           # seconds between summaries
     "DEVIATION": 20,
     "MAGIC": 123456,
     "COMMENT": "mt5_virtual_balance_manager",
@@ -545,6 +553,9 @@ class BalanceManager:
         if config["OVERRIDE_BALANCE"] is not None:
             self.state["virtual_balance"] = float(config["OVERRIDE_BALANCE"])
         save_state(self.state)
+        self.wheel = None
+        self.in_session = True
+        self.cooldown = None              # timer that ends the cooldown after a target close
 
     def get_virtual_balance(self):
         return float(self.state.get("virtual_balance", self.config["START_VIRTUAL_BALANCE"]))
@@ -599,6 +610,68 @@ class BalanceManager:
             return res
         return None
 
+    # ------------------- Scheduled Actions ------------------- #
+    def schedule(self, wheel):
+        """Register target checks, summaries, the daily close and the session window on the wheel."""
+        self.wheel = wheel
+        now = wheel.now()
+        wheel.every(self.config["CHECK_INTERVAL"], self.poll, first=now)
+        wheel.every(self.config["SUMMARY_INTERVAL"], self.summary, first=now)
+        if self.config["CLOSE_TIME_UTC"]:
+            wheel.daily(self.config["CLOSE_TIME_UTC"], self.scheduled_close, name="daily close")
+        if self.config["SESSION_UTC"]:
+            start, end = self.config["SESSION_UTC"]
+            wheel.daily(start, self.session_open, name="session open")
+            wheel.daily(end, self.session_close, name="session close")
+            t = datetime.utcfromtimestamp(now).time()
+            open_t, close_t = (dtime(*map(int, x.split(":"))) for x in (start, end))
+            self.in_session = open_t <= t < close_t if open_t <= close_t else (t >= open_t or t < close_t)
+            print(f"[{datetime.utcnow().isoformat()}] Session {start}-{end} UTC, "
+                  f"currently {'open' if self.in_session else 'closed'}")
+
+    def poll(self):
+        if self.config["LIVE"]:
+            self.update_virtual_balance_from_positions()
+        res = self.check_targets_and_close()
+        if res is not None:
+            print(f"[{datetime.utcnow().isoformat()}] Close action executed:", res)
+            self.start_cooldown()
+
+    def scheduled_close(self):
+        today = datetime.utcnow().date().isoformat()
+        if self.state.get("last_close_date") == today:  # once per day, also across restarts
+            return
+        print(f"[{datetime.utcnow().isoformat()}] Scheduled close time reached -> closing all positions")
+        res = close_all_positions()
+        self.state["last_close_date"] = today
+        save_state(self.state)
+        print(f"[{datetime.utcnow().isoformat()}] Close action executed:", res)
+
+    def session_open(self):
+        self.in_session = True
+        print(f"[{datetime.utcnow().isoformat()}] Session open")
+
+    def session_close(self):
+        self.in_session = False
+        print(f"[{datetime.utcnow().isoformat()}] Session closed -> closing all positions")
+        print(f"[{datetime.utcnow().isoformat()}] Close action executed:", close_all_positions())
+
+    def start_cooldown(self):
+        seconds = self.config["COOLDOWN_AFTER_TARGET"]
+        if not seconds or self.wheel is None:
+            return
+        if self.cooldown is not None:
+            self.wheel.cancel(self.cooldown)
+        self.cooldown = self.wheel.after(seconds, self.end_cooldown, name="cooldown")
+        print(f"[{datetime.utcnow().isoformat()}] Cooldown: no new orders for {seconds}s")
+
+    def end_cooldown(self):
+        self.cooldown = None
+        print(f"[{datetime.utcnow().isoformat()}] Cooldown over")
+
+    def can_trade(self):
+        return self.in_session and self.cooldown is None
+
     def update_virtual_balance_from_positions(self):
         if self.config["LIVE"]:
             positions = positions_get()
@@ -629,6 +702,10 @@ class BalanceManager:
 
 # ------------------- Script Functions ------------------- #
 def place_order_and_update(manager, symbol, volume, buy=True):
+    if not manager.can_trade():
+        print(f"[{datetime.utcnow().isoformat()}] Order skipped: "
+              f"{'in cooldown' if manager.cooldown else 'outside session'}")
+        return None
     if CONFIG["LIVE"]:
         res = place_market_order(symbol, volume, buy=buy)
         if res and getattr(res,"retcode",None) in (mt5.TRADE_RETCODE_DONE,10009,10008):
@@ -648,22 +725,9 @@ def main_loop():
         if CONFIG["LIVE"]: connect_mt5()
         manager = BalanceManager(CONFIG)
         print(f"[{datetime.utcnow().isoformat()}] Starting loop. Virtual Balance: {manager.get_virtual_balance()}")
-        last_summary = None
-
-        while True:
-            if CONFIG["LIVE"]:
-                manager.update_virtual_balance_from_positions()
-
-            res = manager.check_targets_and_close()
-            if res is not None:
-                print(f"[{datetime.utcnow().isoformat()}] Close action executed:", res)
-
-            now = time.time()
-            if last_summary is None or now - last_summary > 60:
-                manager.summary()
-                last_summary = now
-
-            time.sleep(CONFIG["CHECK_INTERVAL"])
+        wheel = TimerWheel()
+        manager.schedule(wheel)
+        wheel.run()  # sleeps until the next check / summary / scheduled close
 
     except KeyboardInterrupt:
         print("Interrupted by user")
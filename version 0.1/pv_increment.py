@@ -6,9 +6,16 @@ Key fix: profit target used for TP-checking is taken from the *pending order tha
 """
 
 import MetaTrader5 as mt5
+import os
+import sys
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dashboard import Dashboard
+from fixed_point import PriceScale
+from strategy_runner import load_instance_spec, entry_price, ladder_generator
+
 # ------------------- Config ------------------- #
 SYMBOL = "XAUUSD_"       # trading symbol (set to your broker's symbol name)
 SLIPPAGE = 500           # allowed deviation in points
@@ -16,6 +23,16 @@ MAGIC = 12345            # magic number
 LOSS_TARGET = 50.0       # equity loss stop (in $)
 POLL_INTERVAL = 0.5      # seconds between main loop polls
 DEFAULT_PROFIT_TARGET = 1.0  # default $ profit target if not using profit generator
+PATTERN_CHOICES = {"ascending": "1", "even": "2", "odd": "3", "mega": "4", "formula25": "5"}
+
+# Headless run: strategy_runner passes the instance spec, which overrides the config and prompts
+SPEC = load_instance_spec()
+if SPEC:
+    SYMBOL = SPEC["symbol"]
+    MAGIC = SPEC["magic"]
+    LOSS_TARGET = SPEC.get("loss_target", LOSS_TARGET)
+
+dashboard = Dashboard()  # status line is redrawn by its own thread, loop never prints
 
 # ------------------- MT5 Init ------------------- #
 if not mt5.initialize():
@@ -44,20 +61,18 @@ vol_min = symbol_info.volume_min or 0.01
 vol_step = symbol_info.volume_step or 0.01
 vol_max = symbol_info.volume_max or 100.0
 
+# Integer points / volume steps for all ladder math
+scale = PriceScale.from_symbol_info(symbol_info)
+
 # ------------------- Helpers ------------------- #
 def now():
     return datetime.now().strftime("%H:%M:%S")
 
 def normalize_volume(vol: float) -> float:
-    if vol <= vol_min:
-        return vol_min
-    steps = round((vol - vol_min) / vol_step)
-    normalized = vol_min + steps * vol_step
-    normalized = max(vol_min, min(normalized, vol_max))
-    return float(round(normalized, 8))
+    return scale.normalize_volume(vol)
 
 def printl(*args, **kwargs):
-    print(f"[{now()}]", *args, **kwargs)
+    dashboard.log(f"[{now()}]", *args)
 
 # ------------------- Generators ------------------- #
 def formula25_generator(vol_min=0.01, vol_step=0.01):
@@ -140,14 +155,6 @@ def cancel_all_pending():
             printl("Warning cancelling order:", e)
     if removed:
         printl(f"🗑️ Cleared {removed} pending orders.")
-        acc_profit = account_equity_profit()
-        trade_profit = acc_profit  # No baseline in this context
-        triggered_count = len(mt5.positions_get(symbol=SYMBOL) or [])
-        print(
-            f"❤️ Trades={triggered_count} | Profit={trade_profit:.2f} "
-            f"(Target=${'N/A'} 👾 Total=${acc_profit:.2f})",
-            end="\r"
-        )
     return removed
     
     
@@ -205,16 +212,8 @@ def place_pending_stop(order_side: str, base_price: float, volume: float):
         printl("❌ No tick available to place order.")
         return None
 
-    if order_side == "BUY":
-        mt_type = mt5.ORDER_TYPE_BUY_STOP
-        min_price = tick.ask + stop_level + (2 * point)
-        price = max(base_price, min_price)
-    else:
-        mt_type = mt5.ORDER_TYPE_SELL_STOP
-        max_price = tick.bid - stop_level - (2 * point)
-        price = min(base_price, max_price)
-
-    price = round(price, digits)
+    mt_type = mt5.ORDER_TYPE_BUY_STOP if order_side == "BUY" else mt5.ORDER_TYPE_SELL_STOP
+    price = scale.to_price(scale.clamp_stop(order_side, scale.to_points(base_price), tick))
 
     request = {
         "action": mt5.TRADE_ACTION_PENDING,
@@ -251,20 +250,25 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
         return "error"
 
     base_ask = tick.ask
-    options = [round(base_ask + i * point * 10, digits) for i in range(1, 4)]
-
-    print("\n👉 Choose starting BUY STOP price:")
-    for i, val in enumerate(options, 1):
-        print(f"{i}. {val}")
-    choice = input("Enter choice (1/2/3 or custom price): ").strip()
-    if choice in ["1", "2", "3"]:
-        buy_price = options[int(choice) - 1]
+    ask_pts = scale.to_points(base_ask)
+    options = [scale.to_price(ask_pts + i * 10) for i in range(1, 4)]
+
+    if SPEC:
+        buy_price = entry_price(SPEC.get("entry", "ask+10"), tick, point, digits)
+        printl(f"🤖 Headless entry {SPEC.get('entry', 'ask+10')} -> BUY STOP {buy_price}")
     else:
-        try:
-            buy_price = float(choice)
-        except ValueError:
-            printl("Invalid price entered. Aborting cycle.")
-            return "error"
+        print("\n👉 Choose starting BUY STOP price:")
+        for i, val in enumerate(options, 1):
+            print(f"{i}. {val}")
+        choice = input("Enter choice (1/2/3 or custom price): ").strip()
+        if choice in ["1", "2", "3"]:
+            buy_price = options[int(choice) - 1]
+        else:
+            try:
+                buy_price = float(choice)
+            except ValueError:
+                printl("Invalid price entered. Aborting cycle.")
+                return "error"
 
     # --- Prepare initial pending and store its expected profit (last_pending_expected) ---
     if mode25:
@@ -280,8 +284,12 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
     if not active_price:
         printl("❌ Failed to place initial BUY STOP. Aborting cycle.")
         return "error"
+    dashboard.start()
 
     # last_pending_expected stores the TP we expect for the pending order we just placed
+    # ladder math runs in integer points
+    gap_pts = scale.to_points(gap)
+
     last_pending_expected = expected_profit
     # This is the profit target of the *currently active triggered trade*. Will be set when a pending triggers.
     profit_target = None
@@ -294,13 +302,14 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
     triggered_count = 0
 
     while True:
+        dashboard.loop_tick(SYMBOL)
         acc_profit = account_equity_profit()
 
         # Wait until first trade is triggered
         positions = mt5.positions_get(symbol=SYMBOL)
         if not positions:
             # no open positions yet; show waiting and continue
-            print("⏳ Waiting for first trade to trigger...", end="\r")
+            dashboard.update(SYMBOL, status="⏳ waiting for first trigger", pending=active_price)
             time.sleep(POLL_INTERVAL)
             continue
 
@@ -320,11 +329,8 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
 
         # show relative trade profit using baseline
         trade_profit = acc_profit - baseline_equity
-        print(
-            f"❤️ Trades={triggered_count} | Profit={trade_profit:.2f} "
-            f"(Target=${profit_target if profit_target is not None else 'N/A'} 👾 Total=${acc_profit:.2f})",
-            end="\r"
-        )
+        dashboard.update(SYMBOL, status="running", profit=trade_profit, target=profit_target,
+                         pending=active_price, triggers=triggered_count, total=acc_profit)
 
         # Check TP/SL only if profit_target is known
         if profit_target is not None:
@@ -362,23 +368,23 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
 
                 # Decide opposite side and price
                 if pos.type == mt5.POSITION_TYPE_BUY and last_order_type == "BUY":
-                    sell_price = round(active_price - gap, digits)
+                    sell_price = scale.to_price(scale.to_points(active_price) - gap_pts)
                     printl(f"🔔 BUY triggered → placing SELL STOP {sell_price} vol={next_vol}, next TP=${next_expected_profit}")
                     active_price = place_pending_stop("SELL", sell_price, next_vol)
                     last_order_type = "SELL"
                 elif pos.type == mt5.POSITION_TYPE_SELL and last_order_type == "SELL":
-                    buy_price_next = round(active_price + gap, digits)
+                    buy_price_next = scale.to_price(scale.to_points(active_price) + gap_pts)
                     printl(f"🔔 SELL triggered → placing BUY STOP {buy_price_next} vol={next_vol}, next TP=${next_expected_profit}")
                     active_price = place_pending_stop("BUY", buy_price_next, next_vol)
                     last_order_type = "BUY"
                 else:
                     # Unexpected state - place the opposite of last_order_type to continue the cycle
                     if last_order_type == "BUY":
-                        sell_price = round(active_price - gap, digits)
+                        sell_price = scale.to_price(scale.to_points(active_price) - gap_pts)
                         active_price = place_pending_stop("SELL", sell_price, next_vol)
                         last_order_type = "SELL"
                     else:
-                        buy_price_next = round(active_price + gap, digits)
+                        buy_price_next = scale.to_price(scale.to_points(active_price) + gap_pts)
                         active_price = place_pending_stop("BUY", buy_price_next, next_vol)
                         last_order_type = "BUY"
 
@@ -394,19 +400,23 @@ def run_cycle(vol_gen, profit_gen, gap, mode25=False):
 # ------------------- Main / UI ------------------- #
 def main():
     try:
-        print("\n👉 Choose mode:")
-        print("m. Manual (one run)")
-        print("a. Auto (repeat runs)")
-        mode_choice = input("Enter choice (m/a): ").strip()
-        mode = "manual" if mode_choice.lower() == "m" else "auto"
-
-        print("\n👉 Choose volume/profit pattern:")
-        print("1. Ascending (0.01, 0.02, 0.03 …)")
-        print("2. Even only (0.02, 0.04, 0.06 …)")
-        print("3. Odd only (0.01, 0.03, 0.05 …)")
-        print("4. Mega (0.11→3, 0.12→3.5 …)")
-        print("5. 25% Formula (Target = Volume × 25 $)")
-        vol_choice = input("Enter choice (1/2/3/4/5): ").strip()
+        if SPEC:
+            mode = SPEC.get("mode", "auto")
+            vol_choice = PATTERN_CHOICES.get(SPEC.get("pattern", "ascending"), "1")
+        else:
+            print("\n👉 Choose mode:")
+            print("m. Manual (one run)")
+            print("a. Auto (repeat runs)")
+            mode_choice = input("Enter choice (m/a): ").strip()
+            mode = "manual" if mode_choice.lower() == "m" else "auto"
+
+            print("\n👉 Choose volume/profit pattern:")
+            print("1. Ascending (0.01, 0.02, 0.03 …)")
+            print("2. Even only (0.02, 0.04, 0.06 …)")
+            print("3. Odd only (0.01, 0.03, 0.05 …)")
+            print("4. Mega (0.11→3, 0.12→3.5 …)")
+            print("5. 25% Formula (Target = Volume × 25 $)")
+            vol_choice = input("Enter choice (1/2/3/4/5): ").strip()
 
         mode25 = False
         if vol_choice == "1":
@@ -429,8 +439,11 @@ def main():
             printl("Invalid choice; defaulting to ascending.")
             vol_gen = volume_pattern_gen("ascending")
             profit_gen = profit_pattern_gen("default")
+        if SPEC and SPEC.get("ladder"):
+            vol_gen = ladder_generator(SPEC["ladder"])  # explicit ladder beats the pattern volumes
+            mode25 = False
 
-        gap = None
+        gap = SPEC["gap"] if SPEC else None
         while gap is None:
             try:
                 gap = float(input("Enter gap (distance between BUY and SELL in price units): ").strip())
@@ -442,6 +455,7 @@ def main():
         else:
             while True:
                 result = run_cycle(vol_gen, profit_gen, gap, mode25)
+                dashboard.stop()  # next cycle prompts for a start price (unless headless)
                 printl(f"🔄 Restarting cycle after {result.upper()} exit...\n")
                 time.sleep(2)
 
@@ -450,6 +464,7 @@ def main():
     except Exception as e:
         printl("Unhandled exception:", e)
     finally:
+        dashboard.stop()
         mt5.shutdown()
         printl("MT5 connection closed.")
 
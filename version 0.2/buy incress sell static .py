@@ -219,10 +219,11 @@ def run_bot():
             last_type = "BUY"
 
 # ---------------- RUN ---------------- #
-try:
-    run_bot()
-except KeyboardInterrupt:
-    log("🛑 Stopped manually")
-finally:
-    mt5.shutdown()
-    log("🔌 MT5 Disconnected")
\ No newline at end of file
+if __name__ == "__main__":
+    try:
+        run_bot()
+    except KeyboardInterrupt:
+        log("🛑 Stopped manually")
+    finally:
+        mt5.shutdown()
+        log("🔌 MT5 Disconnected")
\ No newline at end of file
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Walk-forward optimization of the run_cycle parameters (gap, PROFIT_UNIT, LOSS_TARGET,
+entry offset, volume ladder) over recorded tick history.
+
+- Tick store: build_store() writes time_msc and bid / ask in integer points as raw
+  column files plus per-BLOCK extremes and meta.json; TickStore maps them read-only, so
+  every worker process reads the same page-cache pages and nothing is copied or pickled
+- replay(): back-to-back cycles of a gap pattern (gap_pattern tables; default the climb
+  ladder as new gap*.py runs it: BUY STOP at ask + entry, SELL STOP one gap below the last
+  BUY fill, BUY STOP one gap above the last BUY after a SELL fill), TP at sum(triggered
+  volume) * profit_unit, SL at -loss_target, fills at the market like SimTerminal, for a
+  whole parameter grid at once, NumPy over the grid. The block extremes bound every set's next fill and its P&L, so a
+  set skips BLOCK ticks at a time while nothing can happen and only the first block that
+  might hold an event is scanned tick by tick
+- walk_forward(): rolling windows of --train-days followed by --test-days, stepping by
+  --test-days. The grid is replayed on train, the best set by net is taken to test (out
+  of sample); windows run in a process pool and each worker opens the store itself
+- Report per window: chosen parameters, in-sample and out-of-sample net, cycles, stop
+  losses, and the best out-of-sample set for comparison; totals give the walk-forward
+  efficiency (out-of-sample net per day / in-sample net per day)
+
+Usage:
+  python walk_forward.py store XAUUSD_ticks.npy --out runs/ticks_XAUUSD --point 0.01
+  python walk_forward.py run runs/ticks_XAUUSD --gaps 1 1.5 2 3 --profit-units 25 50 75 \\
+      --loss-targets 300 500 --train-days 60 --test-days 30 --workers 4
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from equity_curve import tick_chunks
+from fixed_point import prices_to_points
+from gap_pattern import REGISTERS, compile_pattern
+from risk_of_ruin import LADDERS, ladder_preset
+
+BLOCK = 512             # ticks per block of precomputed extremes
+LOOKAHEAD = 64          # blocks checked per step before a set jumps ahead
+MAX_FILLS = 16          # pendings that can fill on a single tick
+LEGS = 200              # ladder length (the last leg repeats)
+EPS = 1e-6              # lot*points: TP / SL compare tolerance (the scan and the event sum P&L in different orders)
+DAY_MS = 86_400_000
+
+STORE_COLUMNS = {"time_msc": "<i8", "bid": "<i4", "ask": "<i4"}
+BLOCK_COLUMNS = ("max_bid", "min_bid", "max_ask", "min_ask")
+PARAMS = ("gap", "profit_unit", "loss_target", "entry", "ladder")
+
+
+# ------------------- Tick store ------------------- #
+def build_store(ticks, out_dir, point):
+    """Write the column files + block extremes for .npy / CSV / array ticks; returns meta."""
+    os.makedirs(out_dir, exist_ok=True)
+    files = {name: open(os.path.join(out_dir, f"{name}.dat"), "wb") for name in (*STORE_COLUMNS, *BLOCK_COLUMNS)}
+    rows, first, last = 0, None, None
+    try:
+        for t, bid, ask in tick_chunks(ticks):  # CHUNK is a multiple of BLOCK: blocks never straddle chunks
+            if not len(t):
+                continue
+            bid, ask = prices_to_points(bid, point), prices_to_points(ask, point)
+            cols = {"time_msc": t, "bid": bid, "ask": ask}
+            for name, dtype in STORE_COLUMNS.items():
+                files[name].write(np.ascontiguousarray(cols[name], dtype=dtype).tobytes())
+            starts = np.arange(0, len(t), BLOCK)
+            ext = {"max_bid": np.maximum.reduceat(bid, starts), "min_bid": np.minimum.reduceat(bid, starts),
+                   "max_ask": np.maximum.reduceat(ask, starts), "min_ask": np.minimum.reduceat(ask, starts)}
+            for name in BLOCK_COLUMNS:
+                files[name].write(ext[name].astype("<i4").tobytes())
+            first = int(t[0]) if first is None else first
+            last = int(t[-1])
+            rows += len(t)
+    finally:
+        for f in files.values():
+            f.close()
+    meta = {"rows": rows, "point": point, "block": BLOCK, "from_msc": first, "to_msc": last}
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+class TickStore:
+    """Read-only memmaps of a built store (shared page cache across processes)."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        rows, self.point = self.meta["rows"], self.meta["point"]
+        if self.meta["block"] != BLOCK:
+            raise ValueError(f"store built with block {self.meta['block']}, expected {BLOCK}")
+        blocks = -(-rows // BLOCK)
+        self.columns = {}
+        for name, dtype in STORE_COLUMNS.items():
+            self.columns[name] = np.memmap(os.path.join(path, f"{name}.dat"), dtype=dtype, mode="r", shape=(rows,))
+        for name in BLOCK_COLUMNS:
+            self.columns[name] = np.memmap(os.path.join(path, f"{name}.dat"), dtype="<i4", mode="r", shape=(blocks,))
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def index(self, msc):
+        return int(np.searchsorted(self.columns["time_msc"], msc, side="left"))
+
+
+# ------------------- Grid ------------------- #
+def make_grid(gaps, profit_units, loss_targets, entries=(10,), ladders=("gap666",)):
+    """Every combination as a list of parameter dicts (gap in price units, entry in points)."""
+    return [dict(zip(PARAMS, combo)) for combo in itertools.product(gaps, profit_units, loss_targets, entries, ladders)]
+
+
+def _ladder_volumes(params, presets):
+    """LEGS volumes of a set: its own "volumes" list (last one repeats) or the named preset."""
+    if "volumes" in params:
+        vols = np.asarray(params["volumes"], dtype=np.float64)[:LEGS]
+        return np.concatenate((vols, np.full(LEGS - len(vols), vols[-1])))
+    if params["ladder"] not in presets:
+        presets[params["ladder"]] = ladder_preset(params["ladder"], LEGS).volumes
+    return presets[params["ladder"]]
+
+
+def _pattern_tables(names):
+    """Compiled gap patterns stacked as [pattern, state, fill side] arrays, plus their start rows."""
+    patterns = [compile_pattern(name) for name in names]
+    states = max(len(p.states) for p in patterns)
+    tables = [p.table(states) for p in patterns]
+    out = {key: np.stack([t[key] for t in tables]) for key in tables[0]}
+    out["start_side"] = np.array([1 if p.start.side == 0 else -1 for p in patterns], dtype=np.int64)
+    out["start_price"] = np.array([p.start.price for p in patterns])
+    out["start_anchor"] = np.array([p.start.price if p.start.anchor is None else p.start.anchor for p in patterns])
+    out["start_count"] = np.array([p.start.count[2] for p in patterns])
+    out["start_vol"] = np.array([p.start.vol[2] for p in patterns])
+    out["start_state"] = np.array([p.start.state or 0 for p in patterns], dtype=np.int64)
+    return out
+
+
+def _grid_arrays(grid, point, usd_per_lot_point):
+    """
+    Per-set arrays. gap is a (sets, LEGS) schedule in points: gap * (1 + gap_growth * leg),
+    so gap_growth = 1 widens it by one gap per leg like SELL_GAP * sell_step (0 = fixed gap).
+    pattern is the index of the set's gap pattern in "patterns" (default "alternate").
+    """
+    presets = {}
+    legs = np.arange(LEGS)
+    names = list(dict.fromkeys(g.get("pattern", "alternate") for g in grid))
+    return {
+        "pattern": np.array([names.index(g.get("pattern", "alternate")) for g in grid], dtype=np.int64),
+        "patterns": _pattern_tables(names),
+        "gap": np.stack([np.rint(g["gap"] / point * (1.0 + g.get("gap_growth", 0.0) * legs)).astype(np.int64)
+                         for g in grid]),
+        "tp_unit": np.array([g["profit_unit"] for g in grid], dtype=np.float64) / usd_per_lot_point,
+        "sl": -np.array([g["loss_target"] for g in grid], dtype=np.float64) / usd_per_lot_point,
+        "entry": np.array([g["entry"] for g in grid], dtype=np.int64),
+        "volumes": np.stack([_ladder_volumes(g, presets) for g in grid]),
+    }
+
+
+# ------------------- Replay ------------------- #
+def replay(store, lo, hi, grid, contract_size=100.0):
+    """
+    Back-to-back cycles of every grid set over ticks [lo, hi). A set is a dict of gap (price
+    units), profit_unit, loss_target, entry (points) and ladder (preset name) or volumes
+    (list), optionally gap_growth and pattern (gap_pattern name or DSL text). Returns
+    per-set arrays:
+    net ($, realized + the open cycle marked at the last tick), realized, cycles, wins,
+    losses, max_legs, max_lots (peak gross open lots).
+    """
+    usd = contract_size * store.point
+    g = _grid_arrays(grid, store.point, usd)
+    bid_col, ask_col = np.asarray(store["bid"]), np.asarray(store["ask"])   # plain views: no memmap wrapping per gather
+    ext = {name: np.asarray(store[name]) for name in BLOCK_COLUMNS}
+    n = len(grid)
+    rows = np.arange(n)
+    legs = g["volumes"].shape[1]
+
+    t = np.full(n, lo + 1, dtype=np.int64)
+    k = np.zeros(n, dtype=np.int64)
+    side = np.ones(n, dtype=np.int64)
+    level = np.zeros(n, dtype=np.int64)
+    reg = {"anchor": np.zeros(n, dtype=np.int64), "base": np.zeros(n, dtype=np.int64),
+           "count": np.zeros(n, dtype=np.int64), "state": np.zeros(n, dtype=np.int64),
+           "vol": np.zeros(n, dtype=np.int64)}
+    _start(rows, np.full(n, int(bid_col[lo])), np.full(n, int(ask_col[lo])), g, side, level, reg)
+    buy_vol, buy_cost, sell_vol, sell_cost, tvol = (np.zeros(n) for _ in range(5))
+    realized = np.zeros(n)
+    cycles, wins, losses, max_legs = (np.zeros(n, dtype=np.int64) for _ in range(4))
+    max_lots = np.zeros(n)
+    last_block = (hi - 1) // BLOCK
+    ahead = np.arange(LOOKAHEAD)
+    in_block = np.arange(BLOCK)
+
+    alive = rows[t < hi]
+    while alive.size:
+        a = alive
+        sd, lv, kk = side[a], level[a], k[a]
+        bv, sv = buy_vol[a], sell_vol[a]
+        c = sell_cost[a] - buy_cost[a]
+        tgt = tvol[a] * g["tp_unit"][a] - EPS
+        sl = g["sl"][a] + EPS
+        has = kk > 0
+
+        # coarse: first block (of LOOKAHEAD) whose extremes allow a fill, TP or SL
+        b0 = t[a] // BLOCK
+        blk = np.minimum(b0[:, None] + ahead, last_block)
+        valid = (b0[:, None] + ahead) <= last_block
+        mxb, mnb, mxa, mna = (ext[name][blk] for name in BLOCK_COLUMNS)
+        possible = np.where(sd[:, None] == 1, mxa >= lv[:, None], mnb <= lv[:, None])
+        ub = bv[:, None] * mxb - sv[:, None] * mna + c[:, None]
+        lb = bv[:, None] * mnb - sv[:, None] * mxa + c[:, None]
+        possible |= has[:, None] & ((ub >= tgt[:, None]) | (lb <= sl[:, None]))
+        possible &= valid
+        found = possible.any(axis=1)
+        skip = ~found
+        t[a[skip]] = np.minimum((b0[skip] + LOOKAHEAD) * BLOCK, hi)
+
+        # fine: that block tick by tick
+        s = a[found]
+        if s.size:
+            fb = b0[found] + possible[found].argmax(axis=1)
+            start = np.maximum(t[s], fb * BLOCK)
+            end = np.minimum((fb + 1) * BLOCK, hi)
+            idx = start[:, None] + in_block
+            inside = idx < end[:, None]
+            idx = np.minimum(idx, hi - 1)
+            bid, ask = bid_col[idx], ask_col[idx]
+            sd, lv, has = side[s], level[s], k[s] > 0
+            pnl = buy_vol[s][:, None] * bid - sell_vol[s][:, None] * ask + (sell_cost[s] - buy_cost[s])[:, None]
+            hit = np.where(sd[:, None] == 1, ask >= lv[:, None], bid <= lv[:, None])
+            hit |= has[:, None] & ((pnl >= (tvol[s] * g["tp_unit"][s] - EPS)[:, None]) | (pnl <= (g["sl"][s] + EPS)[:, None]))
+            hit &= inside
+            any_hit = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            t[s[~any_hit]] = end[~any_hit]
+            e = s[any_hit]
+            te = idx[any_hit, first[any_hit]]
+            if e.size:
+                _event(e, te, bid_col, ask_col, g, legs, k, side, level, reg, buy_vol, buy_cost, sell_vol,
+                       sell_cost, tvol, realized, cycles, wins, losses, max_legs, max_lots)
+                t[e] = te + 1
+        alive = a[t[a] < hi]
+
+    bid, ask = int(bid_col[hi - 1]), int(ask_col[hi - 1])
+    open_pnl = buy_vol * bid - buy_cost + sell_cost - sell_vol * ask
+    return {"net": (realized + open_pnl) * usd, "realized": realized * usd, "cycles": cycles, "wins": wins,
+            "losses": losses, "max_legs": max_legs, "max_lots": max_lots}
+
+
+def _registers(f, fill, bid, ask, g, gap, reg, k):
+    """[fill, anchor, base, ask, bid, entry, gap, gap*n, gap*k, 1] per set, the gap_pattern row order."""
+    return np.stack((fill, reg["anchor"][f], reg["base"][f], ask, bid, g["entry"][f], gap, gap * reg["count"][f],
+                     gap * k, np.ones(len(f), dtype=np.int64)), axis=1).astype(np.float64)
+
+
+def _start(d, bid, ask, g, side, level, reg):
+    """First pending of a cycle for sets `d` from their pattern's start rule."""
+    pt, p = g["patterns"], g["pattern"][d]
+    zero = np.zeros(len(d), dtype=np.int64)
+    r = np.stack((zero, zero, zero, ask, bid, g["entry"][d], g["gap"][d, 0], zero, zero, zero + 1), axis=1)
+    price = np.rint(np.einsum("ij,ij->i", r, pt["start_price"][p])).astype(np.int64)
+    r[:, REGISTERS.index("base")] = r[:, REGISTERS.index("anchor")] = price   # unassigned start anchor = price
+    reg["anchor"][d] = np.rint(np.einsum("ij,ij->i", r, pt["start_anchor"][p])).astype(np.int64)
+    reg["base"][d] = price
+    reg["count"][d] = np.rint(pt["start_count"][p]).astype(np.int64)
+    reg["vol"][d] = np.rint(pt["start_vol"][p]).astype(np.int64)
+    reg["state"][d] = pt["start_state"][p]
+    side[d] = pt["start_side"][p]
+    level[d] = price
+
+
+def _event(e, te, bid_col, ask_col, g, legs, k, side, level, reg, buy_vol, buy_cost, sell_vol, sell_cost,
+           tvol, realized, cycles, wins, losses, max_legs, max_lots):
+    """Fills (possibly several levels on one tick), then the TP / SL check, for sets `e` at ticks `te`."""
+    bid, ask = bid_col[te].astype(np.int64), ask_col[te].astype(np.int64)
+    pt = g["patterns"]
+    f, fb, fa = e, bid, ask
+    for _ in range(MAX_FILLS):
+        fire = np.where(side[f] == 1, fa >= level[f], fb <= level[f])
+        f, fb, fa = f[fire], fb[fire], fa[fire]
+        if not f.size:
+            break
+        vol = g["volumes"][f, np.minimum(reg["vol"][f], legs - 1)]
+        gap = g["gap"][f, np.minimum(k[f], legs - 1)]
+        buy = side[f] == 1
+        fill = np.where(buy, fa, fb)
+        buy_vol[f] += np.where(buy, vol, 0.0)
+        buy_cost[f] += np.where(buy, vol * fill, 0.0)
+        sell_vol[f] += np.where(buy, 0.0, vol)
+        sell_cost[f] += np.where(buy, 0.0, vol * fill)
+        tvol[f] += vol
+        k[f] += 1
+        # the pattern's row for (state, fill side): every formula is over the registers before the updates
+        cell = (g["pattern"][f], reg["state"][f], np.where(buy, 0, 1))
+        r = _registers(f, fill, fb, fa, g, gap, reg, k[f])
+        counters = np.stack((reg["count"][f], k[f], np.ones(len(f), dtype=np.int64)), axis=1)
+        level[f] = np.rint(np.einsum("ij,ij->i", r, pt["price"][cell])).astype(np.int64)
+        reg["anchor"][f] = np.rint(np.einsum("ij,ij->i", r, pt["anchor"][cell])).astype(np.int64)
+        reg["count"][f] = np.rint(np.einsum("ij,ij->i", counters, pt["count"][cell])).astype(np.int64)
+        reg["vol"][f] = np.rint(np.einsum("ij,ij->i", counters, pt["vol"][cell])).astype(np.int64)
+        reg["state"][f] = pt["state"][cell]
+        side[f] = pt["side"][cell]
+        max_legs[f] = np.maximum(max_legs[f], k[f])
+        max_lots[f] = np.maximum(max_lots[f], buy_vol[f] + sell_vol[f])
+
+    pnl = buy_vol[e] * bid - buy_cost[e] + sell_cost[e] - sell_vol[e] * ask
+    has = k[e] > 0
+    tp = has & (pnl >= tvol[e] * g["tp_unit"][e] - EPS)
+    sl = has & ~tp & (pnl <= g["sl"][e] + EPS)
+    done = tp | sl
+    d = e[done]
+    realized[d] += pnl[done]
+    cycles[d] += 1
+    wins[e[tp]] += 1
+    losses[e[sl]] += 1
+    # the next cycle starts on the same tick with the pattern's start rule
+    k[d] = 0
+    _start(d, bid[done], ask[done], g, side, level, reg)
+    for arr in (buy_vol, buy_cost, sell_vol, sell_cost, tvol):
+        arr[d] = 0.0
+
+
+# ------------------- Walk-forward ------------------- #
+def make_windows(store, train_days, test_days, step_days=None):
+    """[(train_lo, train_hi, test_lo, test_hi, test_start_msc)] tick index ranges, stepping by test_days."""
+    step = int((step_days or test_days) * DAY_MS)
+    train, test = int(train_days * DAY_MS), int(test_days * DAY_MS)
+    first, last = store.meta["from_msc"], store.meta["to_msc"]
+    out = []
+    start = first
+    while start + train + test <= last + 1:
+        a, b, c = store.index(start), store.index(start + train), store.index(start + train + test)
+        if b - a > 1 and c - b > 1:
+            out.append((a, b, b, c, start + train))
+        start += step
+    return out
+
+
+def _run_window(path, window, grid, contract_size):
+    store = TickStore(path)
+    train_lo, train_hi, test_lo, test_hi, test_msc = window
+    t0 = time.perf_counter()
+    ins = replay(store, train_lo, train_hi, grid, contract_size)
+    oos = replay(store, test_lo, test_hi, grid, contract_size)
+    best = int(np.lexsort((ins["losses"], -ins["net"]))[0])   # highest net, fewer stop losses on ties
+    oracle = int(np.argmax(oos["net"]))
+    days = (store["time_msc"][train_hi - 1] - store["time_msc"][train_lo]) / DAY_MS
+    test_days = (store["time_msc"][test_hi - 1] - store["time_msc"][test_lo]) / DAY_MS
+    return {
+        "test_from": datetime.fromtimestamp(test_msc / 1000, timezone.utc).strftime("%Y-%m-%d"),
+        "params": grid[best], "train_days": round(float(days), 2), "test_days": round(float(test_days), 2),
+        "is_net": round(float(ins["net"][best]), 2), "is_cycles": int(ins["cycles"][best]),
+        "is_losses": int(ins["losses"][best]),
+        "oos_net": round(float(oos["net"][best]), 2), "oos_cycles": int(oos["cycles"][best]),
+        "oos_losses": int(oos["losses"][best]), "oos_max_lots": round(float(oos["max_lots"][best]), 2),
+        "oos_rank": int((oos["net"] > oos["net"][best]).sum()) + 1,
+        "oracle_params": grid[oracle], "oracle_net": round(float(oos["net"][oracle]), 2),
+        "ticks": int(train_hi - train_lo + test_hi - test_lo), "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def walk_forward(path, grid, train_days, test_days, step_days=None, contract_size=100.0, workers=1):
+    """Run every window (in `workers` processes); returns the per-window result dicts in time order."""
+    windows = make_windows(TickStore(path), train_days, test_days, step_days)
+    if workers > 1 and len(windows) > 1:
+        with ProcessPoolExecutor(min(workers, len(windows))) as pool:
+            return list(pool.map(_run_window, *zip(*[(path, w, grid, contract_size) for w in windows])))
+    return [_run_window(path, w, grid, contract_size) for w in windows]
+
+
+def summarize(results):
+    is_net = sum(r["is_net"] for r in results)
+    oos_net = sum(r["oos_net"] for r in results)
+    is_days = sum(r["train_days"] for r in results)
+    oos_days = sum(r["test_days"] for r in results)
+    is_rate = is_net / is_days if is_days else 0.0
+    oos_rate = oos_net / oos_days if oos_days else 0.0
+    chosen = {json.dumps(r["params"], sort_keys=True) for r in results}
+    return {
+        "windows": len(results), "oos_net": round(oos_net, 2), "oos_days": round(oos_days, 1),
+        "oos_losses": sum(r["oos_losses"] for r in results),
+        "oos_positive_windows": sum(r["oos_net"] > 0 for r in results),
+        "efficiency": round(oos_rate / is_rate, 3) if is_rate > 0 else None,
+        "distinct_params": len(chosen),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward optimization of the cycle parameters on recorded ticks.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("store", help="build the memory-mapped tick store")
+    s.add_argument("ticks", help=".npy (copy_ticks dtype) or MT5 tick CSV")
+    s.add_argument("--out", required=True)
+    s.add_argument("--point", type=float, default=0.01)
+    r = sub.add_parser("run", help="walk-forward over a built store")
+    r.add_argument("store")
+    r.add_argument("--gaps", type=float, nargs="+", default=[1.0, 1.5, 2.0, 3.0], help="price units")
+    r.add_argument("--profit-units", type=float, nargs="+", default=[25.0, 50.0, 75.0])
+    r.add_argument("--loss-targets", type=float, nargs="+", default=[300.0, 500.0])
+    r.add_argument("--entries", type=int, nargs="+", default=[10], help="first BUY STOP: ask + points")
+    r.add_argument("--ladders", nargs="+", choices=LADDERS, default=["gap666"])
+    r.add_argument("--train-days", type=float, default=60.0)
+    r.add_argument("--test-days", type=float, default=30.0)
+    r.add_argument("--step-days", type=float, help="default: --test-days")
+    r.add_argument("--contract-size", type=float, default=100.0)
+    r.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    r.add_argument("--json", help="write the per-window results here")
+    args = parser.parse_args()
+
+    if args.cmd == "store":
+        t0 = time.perf_counter()
+        meta = build_store(args.ticks, args.out, args.point)
+        print(f"📦 {meta['rows']:,} ticks -> {args.out} in {time.perf_counter() - t0:.1f}s")
+        return
+
+    grid = make_grid(args.gaps, args.profit_units, args.loss_targets, args.entries, args.ladders)
+    t0 = time.perf_counter()
+    results = walk_forward(args.store, grid, args.train_days, args.test_days, args.step_days,
+                           args.contract_size, args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"🚶 {len(results)} windows x {len(grid)} parameter sets in {elapsed:.1f}s")
+    print(f"{'test from':<11} {'gap':>5} {'pu':>5} {'sl':>6} {'ladder':<9} {'IS net':>10} {'OOS net':>10} "
+          f"{'cyc':>5} {'SL':>3} {'rank':>5} {'best OOS':>10}")
+    for w in results:
+        p = w["params"]
+        print(f"{w['test_from']:<11} {p['gap']:>5g} {p['profit_unit']:>5g} {p['loss_target']:>6g} {p['ladder']:<9} "
+              f"{w['is_net']:>10.2f} {w['oos_net']:>10.2f} {w['oos_cycles']:>5} {w['oos_losses']:>3} "
+              f"{w['oos_rank']:>5} {w['oracle_net']:>10.2f}")
+    s = summarize(results)
+    eff = f"{s['efficiency']:.2f}" if s["efficiency"] is not None else "n/a"
+    print(f"📊 out of sample: net {s['oos_net']:.2f} over {s['oos_days']} days, {s['oos_losses']} stop losses, "
+          f"{s['oos_positive_windows']}/{s['windows']} windows positive, efficiency {eff}, "
+          f"{s['distinct_params']} distinct parameter sets chosen")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": s, "windows": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()